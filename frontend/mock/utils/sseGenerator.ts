@@ -3,7 +3,7 @@
  */
 
 export interface ChatMessage {
-  type: 'message_update' | 'message_completed' | 'response_completed' | 'status' | 'error'
+  type: 'message_update' | 'message_completed' | 'response_completed' | 'status' | 'error' | 'analyse_result'
   session_id: string
   message: any
 }
@@ -152,6 +152,14 @@ export function generateMockChatMessages(userInput: string): ChatMessage[] {
       }
     })
 
+    // Inlined analysis result
+    const { result } = generateMockChartData(analyseId)
+    messages.push({
+      type: 'analyse_result',
+      session_id: sessionId,
+      message: { analyse_id: analyseId, result, truncated: false }
+    })
+
   } else {
     const messageId = generateMessageId()
 
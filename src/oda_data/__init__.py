@@ -0,0 +1,129 @@
+"""分析脚本使用的本地财务数据.
+
+读取同步命令导出的 Parquet 快照，不需要 Tushare token，也不访问网络::
+
+    import oda_data
+
+    df = oda_data.income("300059.SZ", report_type="2")
+    stocks = oda_data.stock_basic(["ts_code", "name", "industry"])
+    top = oda_data.sql("SELECT ts_code, n_income_attr_p FROM income LIMIT 10")
+    income_all = oda_data.frame("income")
+
+完整数据集（``frame``、不带参数的 ``stock_basic``）优先从共享缓存零拷贝打开，
+多个脚本进程共享同一份内存。
+"""
+
+import pandas as pd
+
+from oda_data.cache import (
+    cache_dir,
+    open_frame,
+    publish_frame,
+    refresh_snapshot_frames,
+)
+from oda_data.reader import (
+    TABLES,
+    FinancialDataReader,
+    close_reader,
+    get_reader,
+    parquet_dir,
+)
+
+__all__ = [
+    "FinancialDataReader",
+    "cache_dir",
+    "close_reader",
+    "frame",
+    "get_reader",
+    "income",
+    "open_frame",
+    "parquet_dir",
+    "publish_frame",
+    "refresh_snapshot_frames",
+    "sql",
+    "stock_basic",
+]
+
+
+def _require_reader() -> FinancialDataReader:
+    reader = get_reader()
+    if reader is None:
+        raise RuntimeError(f"本地数据快照不存在: {parquet_dir()}")
+    return reader
+
+
+def income(
+    ts_code: str,
+    report_type: str | None = None,
+    start_ann_date: str | None = None,
+    end_ann_date: str | None = None,
+    period: str | None = None,
+    fields: list[str] | None = None,
+) -> pd.DataFrame:
+    """查询某个公司的利润表，字段与 Tushare income 接口一致.
+
+    Args:
+        ts_code: 股票代码
+        report_type: 报告类型，"1"=合并报表，"2"=单季合并报表
+        start_ann_date: 公告日期开始（包含），YYYYMMDD
+        end_ann_date: 公告日期结束（包含），YYYYMMDD
+        period: 报告期，YYYYMMDD
+        fields: 返回字段，默认全部
+
+    Returns:
+        pd.DataFrame: 按公告日期倒序的利润表
+    """
+    return _require_reader().income(
+        ts_code, report_type, start_ann_date, end_ann_date, period, fields
+    )
+
+
+def stock_basic(fields: list[str] | None = None) -> pd.DataFrame:
+    """查询全部股票列表（包括退市和暂停上市的股票）.
+
+    Args:
+        fields: 返回字段，默认全部
+
+    Returns:
+        pd.DataFrame: 按股票代码排序的股票列表
+    """
+    try:
+        df = open_frame("stock_basic")
+    except FileNotFoundError:
+        return _require_reader().stock_basic(fields)
+    return df if fields is None else df[fields]
+
+
+def frame(name: str) -> pd.DataFrame:
+    """获取完整数据集（"income" 或 "stock_basic"）.
+
+    优先从共享缓存零拷贝打开，文本列为 category 类型，已有列只读；
+    缓存不存在时从快照读取。
+
+    Args:
+        name: 数据集名称
+
+    Returns:
+        pd.DataFrame: 完整数据集
+
+    Raises:
+        ValueError: 如果数据集不存在
+    """
+    if name not in TABLES:
+        raise ValueError(f"未知数据集: {name}，可用: {list(TABLES)}")
+    try:
+        return open_frame(name)
+    except FileNotFoundError:
+        return _require_reader().sql(f"SELECT * FROM {name} ORDER BY ALL")
+
+
+def sql(query: str) -> pd.DataFrame:
+    """对 income、stock_basic 表执行 SQL（DuckDB 语法）.
+
+    Args:
+        query: SQL 语句
+
+    Returns:
+        pd.DataFrame: 查询结果
+    """
+    return _require_reader().sql(query)
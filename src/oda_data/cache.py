@@ -0,0 +1,256 @@
+"""进程间共享的只读 DataFrame 缓存.
+
+服务把常用的完整数据集（如股票列表、利润表）按列写成 ``.npy`` 文件，分析脚本
+以内存映射的方式打开：多个脚本进程共享操作系统页缓存中的同一份数据，
+不会各自把数据集复制到自己的堆中，打开的耗时也与数据量无关。
+
+目录结构::
+
+    {缓存目录}/{名称}.current          # 当前版本的目录名
+    {缓存目录}/{名称}.{版本}/meta.json  # 列名、行数、字符串列的取值
+    {缓存目录}/{名称}.{版本}/{序号}.npy  # 每列一个文件
+
+数值、布尔和时间列直接保存；字符串列保存为分类编码，取值列表放在 meta.json 中。
+发布新版本时先写完整个版本目录，再原子替换 ``.current`` 文件，最后删除旧版本：
+已经映射旧版本的进程不受影响（文件删除后映射仍有效）。
+"""
+
+import errno
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from oda_data.reader import TABLES, FinancialDataReader
+
+# 优先使用内存文件系统，数据不落盘
+DEFAULT_CACHE_DIR = os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    "oda_frames",
+)
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_META_FILE = "meta.json"
+# 直接保存的 dtype 种类：布尔、整数、无符号整数、浮点、时间
+_NUMERIC_KINDS = "biufmM"
+# 打开时版本恰好被替换的重试次数
+_OPEN_ATTEMPTS = 3
+
+
+def cache_dir() -> str:
+    """获取缓存目录的绝对路径.
+
+    Returns:
+        环境变量 ODA_FRAME_CACHE_DIR 或默认目录的绝对路径
+    """
+    return os.path.abspath(os.getenv("ODA_FRAME_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def publish_frame(
+    name: str,
+    df: pd.DataFrame,
+    directory: str | None = None,
+    source_version: str | None = None,
+) -> None:
+    """发布一个数据集的新版本.
+
+    索引不会保存，打开时使用默认的 RangeIndex。
+
+    Args:
+        name: 数据集名称，只能包含字母、数字和下划线
+        df: 数据
+        directory: 缓存目录，默认 cache_dir()
+        source_version: 数据来源的版本，用于判断是否需要重新发布
+
+    Raises:
+        ValueError: 如果名称不合法
+        TypeError: 如果某列既不是数值列也不是字符串列
+        OSError: 如果缓存目录的剩余空间不足
+    """
+    if not _NAME_PATTERN.match(name):
+        raise ValueError(f"数据集名称不合法: {name}")
+    directory = directory or cache_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    # 字符串列按指针大小估算，编码后不会更大；容器中 /dev/shm 默认只有 64MB
+    needed = int(df.memory_usage(index=False).sum())
+    free = shutil.disk_usage(directory).free
+    if free < needed:
+        raise OSError(
+            errno.ENOSPC,
+            f"缓存目录剩余空间 {free / 2**20:.1f}MB，"
+            f"数据集 {name} 约需 {needed / 2**20:.1f}MB",
+            directory,
+        )
+
+    version = f"{name}.{time.time_ns()}"
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+    try:
+        columns = []
+        for i, column in enumerate(df.columns):
+            series = df[column]
+            categories = None
+            if series.dtype.kind in _NUMERIC_KINDS:
+                values = series.to_numpy()
+            else:
+                categorical = pd.Categorical(series)
+                categories = categorical.categories.tolist()
+                if not all(isinstance(value, str) for value in categories):
+                    raise TypeError(f"列 {column} 的类型 {series.dtype} 不支持共享")
+                # 编码使用 pandas 为该取值数量选择的 dtype，打开时无需转换
+                values = categorical.codes
+            np.save(os.path.join(version_dir, f"{i}.npy"), np.ascontiguousarray(values))
+            columns.append({"name": str(column), "categories": categories})
+
+        meta = {"rows": len(df), "columns": columns, "source_version": source_version}
+        with open(os.path.join(version_dir, _META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        previous = _current_version(directory, name)
+        pointer = os.path.join(directory, f"{name}.current")
+        with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(f"{pointer}.tmp", pointer)
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    if previous is not None and previous != version:
+        shutil.rmtree(os.path.join(directory, previous), ignore_errors=True)
+
+
+def open_frame(name: str, directory: str | None = None) -> pd.DataFrame:
+    """以只读、零拷贝的方式打开数据集的当前版本.
+
+    Args:
+        name: 数据集名称
+        directory: 缓存目录，默认 cache_dir()
+
+    Returns:
+        pd.DataFrame: 各列映射到缓存文件的只读 DataFrame。新增、替换列和非原地运算
+        不受影响；原地修改已有列的值（如 ``df.loc[mask, col] = v``）前需要先 ``copy()``
+
+    Raises:
+        FileNotFoundError: 如果数据集未发布
+    """
+    directory = directory or cache_dir()
+    for attempt in range(_OPEN_ATTEMPTS):
+        version = _current_version(directory, name)
+        if version is None:
+            raise FileNotFoundError(f"共享数据集不存在: {name}")
+        try:
+            return _open_version(os.path.join(directory, version))
+        except FileNotFoundError:
+            # 打开过程中发布了新版本，旧版本已被删除
+            if attempt == _OPEN_ATTEMPTS - 1:
+                raise
+    raise AssertionError("unreachable")
+
+
+def frame_source_version(name: str, directory: str | None = None) -> str | None:
+    """获取已发布数据集的来源版本.
+
+    Args:
+        name: 数据集名称
+        directory: 缓存目录，默认 cache_dir()
+
+    Returns:
+        发布时记录的来源版本，未发布时返回 None
+    """
+    directory = directory or cache_dir()
+    version = _current_version(directory, name)
+    if version is None:
+        return None
+    try:
+        meta = _read_meta(os.path.join(directory, version))
+    except FileNotFoundError:
+        return None
+    return meta["source_version"]
+
+
+def _current_version(directory: str, name: str) -> str | None:
+    try:
+        with open(os.path.join(directory, f"{name}.current"), encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _read_meta(version_dir: str) -> dict:
+    with open(os.path.join(version_dir, _META_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _open_version(version_dir: str) -> pd.DataFrame:
+    meta = _read_meta(version_dir)
+    data = {}
+    for i, column in enumerate(meta["columns"]):
+        path = os.path.join(version_dir, f"{i}.npy")
+        # 空数组无法映射；映射的数组转为普通 ndarray 视图，避免 memmap 子类传播到计算结果
+        values = np.load(path, mmap_mode="r" if meta["rows"] else None).view(np.ndarray)
+        if column["categories"] is not None:
+            values = pd.Categorical.from_codes(
+                values,
+                dtype=pd.CategoricalDtype(column["categories"]),
+                validate=False,
+            )
+        data[column["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+_refresh_lock = threading.Lock()
+# 发布失败的 (缓存目录, 数据集) 及当时的来源版本，快照更新前不再重试
+_failed_versions: dict[tuple[str, str], str] = {}
+
+
+def refresh_snapshot_frames(
+    reader: FinancialDataReader, directory: str | None = None
+) -> list[str]:
+    """把有更新的 Parquet 快照发布到共享缓存.
+
+    以快照文件的修改时间作为来源版本，未变化的快照不会重新发布，
+    同步命令导出新快照后再次调用即可更新。发布失败（如空间不足）的快照
+    在更新前不再重试，脚本从 Parquet 快照读取，每次调用不会重复读取整张表。
+
+    Args:
+        reader: 快照读取器
+        directory: 缓存目录，默认 cache_dir()
+
+    Returns:
+        本次发布的数据集名称
+
+    Raises:
+        Exception: 发布失败时抛出发布时的异常，其余数据集不再处理
+    """
+    directory = directory or cache_dir()
+    published = []
+    with _refresh_lock:
+        for table in TABLES:
+            if not reader.has_table(table):
+                continue
+            source_version = str(os.stat(reader.table_path(table)).st_mtime_ns)
+            key = (directory, table)
+            if _failed_versions.get(key) == source_version:
+                continue
+            if frame_source_version(table, directory) == source_version:
+                continue
+            try:
+                publish_frame(
+                    table,
+                    reader.sql(f"SELECT * FROM {table}"),
+                    directory,
+                    source_version,
+                )
+            except Exception:
+                _failed_versions[key] = source_version
+                raise
+            _failed_versions.pop(key, None)
+            published.append(table)
+    return published
@@ -0,0 +1,285 @@
+"""读取本地财务数据快照.
+
+同步命令（``python -m tushare_mcp_server.store sync``）把股票列表和利润表导出为
+Parquet 快照，本模块在内存 DuckDB 中以视图的形式查询这些文件：
+不持有数据库文件的锁，同步过程中也可以读取；文件由操作系统按页缓存，
+多个进程（服务和分析脚本）共享同一份缓存。
+"""
+
+import os
+import threading
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_PARQUET_DIR = "data/parquet"
+
+# 快照中的表
+TABLES = ("stock_basic", "income")
+
+# 只读查询默认的行数上限和超时（秒）
+DEFAULT_QUERY_MAX_ROWS = 200
+DEFAULT_QUERY_TIMEOUT = 10.0
+
+
+def parquet_dir() -> str:
+    """获取快照目录的绝对路径.
+
+    Returns:
+        环境变量 TUSHARE_PARQUET_DIR 或默认目录的绝对路径
+    """
+    return os.path.abspath(os.getenv("TUSHARE_PARQUET_DIR", DEFAULT_PARQUET_DIR))
+
+
+class FinancialDataReader:
+    """基于 Parquet 快照的只读数据访问.
+
+    查询方法是同步的，每次查询只需毫秒级时间；在事件循环中调用时使用
+    ``asyncio.to_thread``。每个线程使用各自的游标，可以并发读取。
+    连接只允许读取快照目录，禁止访问其他文件和网络。
+
+    Attributes:
+        directory: 快照目录
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        """初始化读取器.
+
+        Args:
+            directory: 快照目录，其中的 ``{表名}.parquet`` 对应各表
+        """
+        import duckdb
+
+        self._duckdb = duckdb
+        self.directory: str = os.path.abspath(directory)
+        self._conn = duckdb.connect(":memory:")
+        self._conn.execute(
+            "SET allowed_directories = ?", [[self.directory + os.sep]]
+        )
+        self._conn.execute("SET enable_external_access = false")
+        self._conn.execute("SET lock_configuration = true")
+        self._views: set[str] = set()
+        self._views_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _cursor(self):
+        """获取当前线程的游标，并为新出现的快照创建视图."""
+        self._ensure_views()
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._conn.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    def _ensure_views(self) -> None:
+        """为已存在的快照文件创建视图，服务启动后才首次同步时也能读取."""
+        if len(self._views) == len(TABLES):
+            return
+        with self._views_lock:
+            for table in TABLES:
+                path = self.table_path(table)
+                if table in self._views or not os.path.exists(path):
+                    continue
+                self._conn.execute(
+                    f"CREATE OR REPLACE VIEW {table} AS "
+                    f"SELECT * FROM read_parquet('{path}')"
+                )
+                self._views.add(table)
+
+    def table_path(self, table: str) -> str:
+        """获取某张表的快照文件路径.
+
+        Args:
+            table: 表名
+
+        Returns:
+            快照文件路径
+        """
+        return os.path.join(self.directory, f"{table}.parquet")
+
+    def has_table(self, table: str) -> bool:
+        """快照中是否有某张表.
+
+        Args:
+            table: 表名
+
+        Returns:
+            快照文件是否存在
+        """
+        return os.path.exists(self.table_path(table))
+
+    def has_stock_basic(self) -> bool:
+        """股票列表是否已同步."""
+        return self.has_table("stock_basic")
+
+    def has_income(self) -> bool:
+        """利润表是否已同步."""
+        return self.has_table("income")
+
+    def close(self) -> None:
+        """关闭连接."""
+        self._conn.close()
+
+    def stock_basic(self, fields: list[str] | None = None) -> pd.DataFrame:
+        """查询股票列表.
+
+        Args:
+            fields: 返回字段，默认全部
+
+        Returns:
+            pd.DataFrame: 按股票代码排序的股票列表
+        """
+        columns = self._select_list("stock_basic", fields)
+        return self._cursor().execute(
+            f"SELECT {columns} FROM stock_basic ORDER BY ts_code"
+        ).df()
+
+    def income(
+        self,
+        ts_code: str,
+        report_type: str | None = None,
+        start_ann_date: str | None = None,
+        end_ann_date: str | None = None,
+        period: str | None = None,
+        fields: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """查询某个公司的利润表，参数与 Tushare income 接口一致.
+
+        Args:
+            ts_code: 股票代码
+            report_type: 报告类型
+            start_ann_date: 公告日期开始（包含）
+            end_ann_date: 公告日期结束（包含）
+            period: 报告期
+            fields: 返回字段，默认全部
+
+        Returns:
+            pd.DataFrame: 按公告日期倒序的利润表
+        """
+        conditions = ["ts_code = ?"]
+        params: list[str] = [ts_code]
+        for condition, value in (
+            ("report_type = ?", report_type),
+            ("ann_date >= ?", start_ann_date),
+            ("ann_date <= ?", end_ann_date),
+            ("end_date = ?", period),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+
+        columns = self._select_list("income", fields)
+        return self._cursor().execute(
+            f"SELECT {columns} FROM income WHERE {' AND '.join(conditions)} "
+            "ORDER BY ann_date DESC, end_date DESC",
+            params,
+        ).df()
+
+    def sql(self, sql: str) -> pd.DataFrame:
+        """执行 SQL 并返回完整结果，供分析脚本使用.
+
+        Args:
+            sql: SQL 语句
+
+        Returns:
+            pd.DataFrame: 查询结果
+        """
+        return self._cursor().execute(sql).df()
+
+    def query(
+        self,
+        sql: str,
+        max_rows: int = DEFAULT_QUERY_MAX_ROWS,
+        timeout: float = DEFAULT_QUERY_TIMEOUT,
+    ) -> tuple[list[str], list[tuple], bool]:
+        """执行一条只读 SQL 查询，限制行数和时间.
+
+        Args:
+            sql: 单条 SELECT（可以带 WITH）语句
+            max_rows: 最多返回的行数
+            timeout: 超时（秒），超时后中断查询
+
+        Returns:
+            (列名, 数据行, 是否因超过行数上限被截断)
+
+        Raises:
+            ValueError: 如果不是单条 SELECT 语句
+            TimeoutError: 如果查询超时
+            duckdb.Error: 如果查询执行失败
+        """
+        statements = self._conn.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError("只能执行一条 SQL 语句")
+        if statements[0].type != self._duckdb.StatementType.SELECT:
+            raise ValueError("只能执行 SELECT 查询")
+
+        # 每次查询使用独立的游标，超时中断不影响其他查询
+        self._ensure_views()
+        cursor = self._conn.cursor()
+        timer = threading.Timer(timeout, cursor.interrupt)
+        timer.start()
+        try:
+            cursor.execute(sql)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchmany(max_rows + 1)
+        except self._duckdb.InterruptException as e:
+            raise TimeoutError(f"查询超过 {timeout} 秒") from e
+        finally:
+            timer.cancel()
+            cursor.close()
+
+        truncated = len(rows) > max_rows
+        rows = [
+            tuple(float(v) if isinstance(v, Decimal) else v for v in row)
+            for row in rows[:max_rows]
+        ]
+        return columns, rows, truncated
+
+    def _select_list(self, table: str, fields: list[str] | None) -> str:
+        """校验查询字段并生成 SELECT 列表，字段名会拼接进 SQL."""
+        if fields is None:
+            return "*"
+        allowed = {
+            row[0]
+            for row in self._cursor().execute(f"DESCRIBE {table}").fetchall()
+        }
+        unknown = [name for name in fields if name not in allowed]
+        if unknown:
+            raise ValueError(f"未知字段: {unknown}")
+        return ", ".join(fields)
+
+
+_reader: FinancialDataReader | None = None
+_reader_lock = threading.Lock()
+
+
+def get_reader() -> FinancialDataReader | None:
+    """获取全局读取器.
+
+    快照目录不存在或未安装 duckdb 时返回 None，调用方改为访问 Tushare 接口。
+
+    Returns:
+        FinancialDataReader 单例，或 None
+    """
+    global _reader
+    if _reader is None:
+        directory = parquet_dir()
+        if not os.path.isdir(directory):
+            return None
+        try:
+            import duckdb  # noqa: F401
+        except ImportError:
+            return None
+        with _reader_lock:
+            if _reader is None:
+                _reader = FinancialDataReader(directory)
+    return _reader
+
+
+def close_reader() -> None:
+    """关闭全局读取器."""
+    global _reader
+    if _reader is not None:
+        _reader.close()
+        _reader = None
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""Conversation memory that compacts old turns before they reach the prompt."""
+
+import copy
+from dataclasses import dataclass
+
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg, TextBlock, ToolResultBlock
+
+from one_dragon_agent.core.model.token_estimator import estimate_msg_tokens
+from one_dragon_agent.core.system.json_codec import get_json_codec
+
+
+@dataclass
+class CompactionStats:
+    """Result of the latest compaction.
+
+    Attributes:
+        original_tokens: Estimated tokens of the full conversation.
+        compacted_tokens: Estimated tokens of the compacted conversation.
+        compacted_results: Number of tool results replaced by a summary.
+        dropped_turns: Number of old turns dropped to fit the token budget.
+    """
+
+    original_tokens: int = 0
+    compacted_tokens: int = 0
+    compacted_results: int = 0
+    dropped_turns: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of prompt tokens saved by compaction."""
+        if self.original_tokens == 0:
+            return 0.0
+        return 1 - self.compacted_tokens / self.original_tokens
+
+
+class CompactingMemory(InMemoryMemory):
+    """In-memory conversation memory with a compacted prompt view.
+
+    The full conversation is stored unchanged; only the view returned by
+    ``get_memory`` (which the agent formats into the prompt) is compacted:
+
+    - The most recent turns are kept verbatim. A turn starts at a user message.
+    - In older turns, large tool results are replaced by a short summary that
+      keeps the tool name and, for record lists, the row count and fields.
+    - If the view still exceeds the token budget, whole old turns are dropped
+      from the oldest, so tool calls and their results always stay paired.
+    - If it is still over budget with only the recent turns left, large tool
+      results of the recent turns are summarized too, from the oldest. The
+      newest turn is always kept verbatim, as the agent is working on it.
+
+    Compacted messages and token estimates are cached by message ID, so each
+    reasoning step only processes messages added since the previous one.
+
+    Attributes:
+        token_budget: Maximum estimated prompt tokens of the memory view.
+        keep_recent_turns: Number of most recent turns kept verbatim.
+        max_tool_result_chars: Tool results longer than this are summarized.
+        summary_chars: Length of the text preview kept in a summary.
+        stats: Result of the latest compaction.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 32000,
+        keep_recent_turns: int = 2,
+        max_tool_result_chars: int = 1000,
+        summary_chars: int = 200,
+    ) -> None:
+        """Initialize the memory.
+
+        Args:
+            token_budget: Maximum estimated prompt tokens of the memory view.
+            keep_recent_turns: Number of most recent turns kept verbatim.
+            max_tool_result_chars: Tool results longer than this are summarized.
+            summary_chars: Length of the text preview kept in a summary.
+        """
+        super().__init__()
+        self.token_budget: int = token_budget
+        self.keep_recent_turns: int = keep_recent_turns
+        self.max_tool_result_chars: int = max_tool_result_chars
+        self.summary_chars: int = summary_chars
+        self.stats: CompactionStats = CompactionStats()
+        self._compacted_cache: dict[str, tuple[Msg, int, int]] = {}
+        self._tokens_cache: dict[str, int] = {}
+
+    async def get_memory(self, *args, **kwargs) -> list[Msg]:
+        """Get the compacted view of the conversation.
+
+        Returns:
+            Messages to be formatted into the prompt.
+        """
+        memories = await super().get_memory(*args, **kwargs)
+        return self.compact(memories)
+
+    async def clear(self) -> None:
+        """Clear the memory and the compaction caches."""
+        await super().clear()
+        self._compacted_cache.clear()
+        self._tokens_cache.clear()
+
+    def compact(self, memories: list[Msg]) -> list[Msg]:
+        """Build the compacted view of a conversation and update ``stats``.
+
+        Args:
+            memories: The full conversation.
+
+        Returns:
+            The compacted conversation.
+        """
+        turns = _split_turns(memories)
+        recent_start = max(0, len(turns) - self.keep_recent_turns)
+
+        stats = CompactionStats()
+        view: list[list[Msg]] = []
+        view_tokens: list[int] = []
+        for i, turn in enumerate(turns):
+            stats.original_tokens += sum(self._tokens(msg) for msg in turn)
+            if i < recent_start:
+                turn_view, turn_tokens = self._compact_turn(turn, stats)
+            else:
+                turn_view = turn
+                turn_tokens = sum(self._tokens(msg) for msg in turn)
+            view.append(turn_view)
+            view_tokens.append(turn_tokens)
+
+        total = sum(view_tokens)
+        dropped = 0
+        while total > self.token_budget and dropped < recent_start:
+            total -= view_tokens[dropped]
+            dropped += 1
+
+        # Only recent turns are left, summarize them except the newest one
+        for i in range(recent_start, len(turns) - 1):
+            if total <= self.token_budget:
+                break
+            turn_view, turn_tokens = self._compact_turn(turns[i], stats)
+            total += turn_tokens - view_tokens[i]
+            view[i] = turn_view
+
+        stats.compacted_tokens = total
+        stats.dropped_turns = dropped
+        self.stats = stats
+        return [msg for turn in view[dropped:] for msg in turn]
+
+    def _compact_turn(
+        self, turn: list[Msg], stats: CompactionStats
+    ) -> tuple[list[Msg], int]:
+        """Replace large tool results of a turn by summaries.
+
+        Args:
+            turn: Messages of the turn.
+            stats: Stats of the running compaction, updated in place.
+
+        Returns:
+            The compacted messages and their estimated tokens.
+        """
+        turn_view = []
+        turn_tokens = 0
+        for msg in turn:
+            compacted, replaced, tokens = self._compact_msg(msg)
+            stats.compacted_results += replaced
+            turn_view.append(compacted)
+            turn_tokens += tokens
+        return turn_view, turn_tokens
+
+    def _tokens(self, msg: Msg) -> int:
+        """Estimate the tokens of a message, cached by message ID."""
+        tokens = self._tokens_cache.get(msg.id)
+        if tokens is None:
+            tokens = estimate_msg_tokens(msg)
+            self._tokens_cache[msg.id] = tokens
+        return tokens
+
+    def _compact_msg(self, msg: Msg) -> tuple[Msg, int, int]:
+        """Replace large tool results of a message by summaries.
+
+        The compacted message keeps the original ID, so it is cached by the
+        ID together with its own token estimate.
+
+        Args:
+            msg: The message to compact.
+
+        Returns:
+            The compacted message (the original one if nothing changed), the
+            number of replaced tool results and the estimated tokens of the
+            compacted message.
+        """
+        cached = self._compacted_cache.get(msg.id)
+        if cached is not None:
+            return cached
+
+        result = (msg, 0, self._tokens(msg))
+        if not isinstance(msg.content, str):
+            blocks = []
+            replaced = 0
+            for block in msg.content:
+                text = _tool_result_text(block)
+                if text is not None and len(text) > self.max_tool_result_chars:
+                    block = ToolResultBlock(
+                        type="tool_result",
+                        id=block["id"],
+                        name=block["name"],
+                        output=[
+                            TextBlock(
+                                type="text",
+                                text=self._summarize(block["name"], text),
+                            )
+                        ],
+                    )
+                    replaced += 1
+                blocks.append(block)
+            if replaced > 0:
+                compacted = copy.copy(msg)
+                compacted.content = blocks
+                result = (compacted, replaced, estimate_msg_tokens(compacted))
+
+        self._compacted_cache[msg.id] = result
+        return result
+
+    def _summarize(self, tool_name: str, text: str) -> str:
+        """Summarize a large tool result.
+
+        Args:
+            tool_name: Name of the tool that produced the result.
+            text: The full text of the result.
+
+        Returns:
+            A short reference to the result.
+        """
+        header = f"[历史工具结果已压缩: {tool_name}，原始长度 {len(text)} 字符"
+        if text[:1] == "[":
+            try:
+                records = get_json_codec().loads(text)
+            except ValueError:
+                records = None
+            if isinstance(records, list) and records and isinstance(records[0], dict):
+                fields = "、".join(records[0].keys())
+                return f"{header}，共 {len(records)} 条记录，字段: {fields}。如需数据请重新调用工具]"
+        return f"{header}，如需完整内容请重新调用工具] {text[:self.summary_chars]}…"
+
+
+def _split_turns(memories: list[Msg]) -> list[list[Msg]]:
+    """Split a conversation into turns, each starting at a user message."""
+    turns: list[list[Msg]] = []
+    for msg in memories:
+        if msg.role == "user" or not turns:
+            turns.append([msg])
+        else:
+            turns[-1].append(msg)
+    return turns
+
+
+def _tool_result_text(block: dict) -> str | None:
+    """Get the text of a tool result block, or None for other blocks."""
+    if block.get("type") != "tool_result":
+        return None
+    output = block.get("output", "")
+    if isinstance(output, str):
+        return output
+    return "".join(b.get("text", "") for b in output if b.get("type") == "text")
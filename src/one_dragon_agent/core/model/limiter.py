@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""按模型配置限制并发模型调用.
+
+每个模型配置一个 ModelCallLimiter，限制同时进行的调用数和每分钟 token 预算。
+超出限制的调用排队等待，各会话之间轮转出队，避免一个会话的多次调用占满配额。
+收到 429 时并发上限减半并暂停出队，之后每次成功调用逐步恢复（AIMD）。
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+
+# 未返回 Retry-After 时的退避上限（秒）
+_MAX_BACKOFF_SECONDS = 30.0
+
+_registry = get_metrics_registry()
+_queue_wait = _registry.histogram(
+    "oda_model_queue_wait_seconds", "模型调用排队等待时间（秒）", ("config_id",)
+)
+_queued = _registry.gauge(
+    "oda_model_calls_queued", "排队等待的模型调用数", ("config_id",)
+)
+_in_flight = _registry.gauge(
+    "oda_model_calls_in_flight", "进行中的模型调用数", ("config_id",)
+)
+_rate_limited = _registry.counter(
+    "oda_model_rate_limited_total", "模型调用收到 429 的次数", ("config_id",)
+)
+
+StatusCallback = Callable[[dict], Awaitable[None]]
+
+
+@dataclass
+class ModelCallPermit:
+    """一次已获准的模型调用.
+
+    Attributes:
+        tokens: 获准时从预算中预扣的 token 数
+        wait_seconds: 排队等待时间（秒）
+    """
+
+    tokens: int
+    wait_seconds: float = 0.0
+
+
+@dataclass
+class _Waiter:
+    """排队中的调用."""
+
+    tokens: int
+    future: asyncio.Future = field(repr=False)
+
+
+class ModelCallLimiter:
+    """单个模型配置的调用限制器.
+
+    Attributes:
+        max_in_flight: 最大并发调用数
+        tokens_per_minute: 每分钟 token 预算，0 表示不限制
+        limit: 当前自适应并发上限（收到 429 后降低）
+    """
+
+    def __init__(
+        self,
+        config_id: int,
+        max_in_flight: int | None = None,
+        tokens_per_minute: int | None = None,
+    ) -> None:
+        """初始化限制器.
+
+        Args:
+            config_id: 模型配置 ID，用作指标标签
+            max_in_flight: 最大并发调用数，默认读取环境变量 MODEL_MAX_IN_FLIGHT 或 16
+            tokens_per_minute: 每分钟 token 预算，默认读取环境变量
+                MODEL_TOKENS_PER_MINUTE 或 0（不限制）
+        """
+        if max_in_flight is None:
+            max_in_flight = int(os.getenv("MODEL_MAX_IN_FLIGHT", "16"))
+        if tokens_per_minute is None:
+            tokens_per_minute = int(os.getenv("MODEL_TOKENS_PER_MINUTE", "0"))
+        self.max_in_flight: int = max(1, max_in_flight)
+        self.tokens_per_minute: int = tokens_per_minute
+        self.limit: float = float(self.max_in_flight)
+
+        self._in_flight_count: int = 0
+        self._waiters: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._queued_count: int = 0
+        self._tokens: float = float(tokens_per_minute)
+        self._refilled_at: float = time.monotonic()
+        self._cooldown_until: float = 0.0
+        self._consecutive_rate_limits: int = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+        label = str(config_id)
+        self._wait_metric = _queue_wait.labels(label)
+        self._queued_metric = _queued.labels(label)
+        self._in_flight_metric = _in_flight.labels(label)
+        self._rate_limited_metric = _rate_limited.labels(label)
+
+    @property
+    def in_flight(self) -> int:
+        """进行中的调用数."""
+        return self._in_flight_count
+
+    @property
+    def queued(self) -> int:
+        """排队中的调用数."""
+        return self._queued_count
+
+    async def acquire(
+        self,
+        session_id: str,
+        tokens: int,
+        on_wait: StatusCallback | None = None,
+    ) -> ModelCallPermit:
+        """获取一次调用许可，超出限制时排队.
+
+        Args:
+            session_id: 发起调用的会话，用于公平轮转
+            tokens: 预计消耗的 token，用于预扣每分钟预算
+            on_wait: 需要排队时调用一次，参数为排队状态
+
+        Returns:
+            ModelCallPermit: 调用结束后必须传给 release
+        """
+        if self._queued_count == 0 and self._can_admit(tokens):
+            self._admit(tokens)
+            return ModelCallPermit(tokens)
+
+        start = time.perf_counter()
+        waiter = _Waiter(tokens, asyncio.get_running_loop().create_future())
+        self._waiters.setdefault(session_id, deque()).append(waiter)
+        self._queued_count += 1
+        self._queued_metric.set(self._queued_count)
+        self._dispatch()
+
+        try:
+            if on_wait is not None and not waiter.future.done():
+                await on_wait(
+                    {
+                        "hint": "model_queued",
+                        "queue_position": self._queued_count,
+                        "in_flight": self._in_flight_count,
+                    }
+                )
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 已获准但调用方被取消，归还许可
+                self.release(ModelCallPermit(tokens), 0)
+            else:
+                self._remove_waiter(session_id, waiter)
+            raise
+
+        wait_seconds = time.perf_counter() - start
+        self._wait_metric.observe(wait_seconds)
+        return ModelCallPermit(tokens, wait_seconds)
+
+    def release(
+        self,
+        permit: ModelCallPermit,
+        used_tokens: int,
+        error: BaseException | None = None,
+    ) -> None:
+        """结束一次调用，按实际用量修正预算并调整并发上限.
+
+        Args:
+            permit: acquire 返回的许可
+            used_tokens: 实际消耗的 token
+            error: 调用失败时的异常，429 会触发退避
+        """
+        self._in_flight_count -= 1
+        self._in_flight_metric.set(self._in_flight_count)
+        if self.tokens_per_minute:
+            self._tokens += permit.tokens - used_tokens
+
+        retry_after = _rate_limit_retry_after(error)
+        if retry_after is not None:
+            self._on_rate_limited(retry_after)
+        elif error is None:
+            self._consecutive_rate_limits = 0
+            self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+
+        self._dispatch()
+
+    def _on_rate_limited(self, retry_after: float) -> None:
+        """收到 429：并发上限减半，暂停出队一段时间."""
+        self._consecutive_rate_limits += 1
+        self._rate_limited_metric.inc()
+        self.limit = max(1.0, self.limit / 2)
+        backoff = retry_after or min(
+            _MAX_BACKOFF_SECONDS, 2.0 ** (self._consecutive_rate_limits - 1)
+        )
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + backoff)
+        logger.warning(
+            f"模型调用被限流，并发上限降为 {int(self.limit)}，暂停 {backoff:.1f} 秒"
+        )
+
+    def _refill(self) -> None:
+        """按经过的时间补充 token 预算."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60,
+        )
+        self._refilled_at = now
+
+    def _can_admit(self, tokens: int) -> bool:
+        """检查并发、退避和 token 预算是否允许立即开始调用."""
+        if self._in_flight_count >= int(self.limit):
+            return False
+        if time.monotonic() < self._cooldown_until:
+            return False
+        if not self.tokens_per_minute:
+            return True
+        self._refill()
+        # 超过整分钟预算的调用在预算满时放行，避免永远等待
+        return self._tokens >= min(tokens, self.tokens_per_minute)
+
+    def _admit(self, tokens: int) -> None:
+        """占用一个并发名额并预扣 token."""
+        self._in_flight_count += 1
+        self._in_flight_metric.set(self._in_flight_count)
+        if self.tokens_per_minute:
+            self._tokens -= tokens
+
+    def _dispatch(self) -> None:
+        """按会话轮转放行排队的调用，放行不了时安排定时重试."""
+        while self._waiters:
+            session_id, queue = next(iter(self._waiters.items()))
+            waiter = queue[0]
+            if waiter.future.done():
+                # 调用方已被取消，但 acquire 中的清理还未执行
+                self._pop_waiter(session_id, queue)
+                continue
+            if not self._can_admit(waiter.tokens):
+                self._schedule_retry(waiter.tokens)
+                return
+
+            self._pop_waiter(session_id, queue)
+            self._admit(waiter.tokens)
+            waiter.future.set_result(None)
+
+    def _pop_waiter(self, session_id: str, queue: deque[_Waiter]) -> None:
+        """移出会话队首的排队调用，会话还有排队调用时轮转到末尾."""
+        queue.popleft()
+        if queue:
+            self._waiters.move_to_end(session_id)
+        else:
+            del self._waiters[session_id]
+        self._queued_count -= 1
+        self._queued_metric.set(self._queued_count)
+
+    def _schedule_retry(self, tokens: int) -> None:
+        """在退避结束或 token 预算足够时重新出队."""
+        if self._in_flight_count >= int(self.limit):
+            # 由下一次 release 触发
+            return
+
+        now = time.monotonic()
+        delay = max(0.0, self._cooldown_until - now)
+        if delay == 0 and self.tokens_per_minute:
+            needed = min(tokens, self.tokens_per_minute) - self._tokens
+            delay = needed * 60 / self.tokens_per_minute
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(
+            max(delay, 0.001), self._on_timer
+        )
+
+    def _on_timer(self) -> None:
+        """定时器到期后重新出队."""
+        self._timer = None
+        self._dispatch()
+
+    def _remove_waiter(self, session_id: str, waiter: _Waiter) -> None:
+        """移除被取消的排队调用."""
+        queue = self._waiters.get(session_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del self._waiters[session_id]
+        self._queued_count -= 1
+        self._queued_metric.set(self._queued_count)
+        self._dispatch()
+
+
+def _rate_limit_retry_after(error: BaseException | None) -> float | None:
+    """判断异常是否为 429，返回建议等待秒数（无 Retry-After 时为 0）.
+
+    Args:
+        error: 模型调用抛出的异常
+
+    Returns:
+        429 时返回 Retry-After 秒数或 0，其他情况返回 None
+    """
+    if error is None or getattr(error, "status_code", None) != 429:
+        return None
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
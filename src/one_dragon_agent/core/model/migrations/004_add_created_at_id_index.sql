@@ -0,0 +1,7 @@
+-- 为 model_configs 表添加列表分页索引
+-- 版本: 004
+-- 日期: 2026-10-19
+-- 说明: 配置列表按 created_at DESC, id DESC 排序并使用 (created_at, id) 游标分页，
+--       复合索引使排序和游标条件都能走索引，避免全表扫描和 filesort
+
+CREATE INDEX idx_created_at_id ON model_configs (created_at, id);
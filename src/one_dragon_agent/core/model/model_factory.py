@@ -4,6 +4,8 @@
 import time
 from typing import Any
 
+import httpx
+
 from one_dragon_agent.core.model.models import ModelConfigInternal
 from one_dragon_agent.core.model.qwen.qwen_chat_model import QwenChatModel
 from one_dragon_agent.core.system.log import get_logger
@@ -15,6 +17,8 @@ logger = get_logger(__name__)
 _token_cache: dict[int, dict] = {}
 _TOKEN_REFRESH_BUFFER = 5 * 60 * 1000  # 5 分钟缓冲期（毫秒）
 
+QWEN_API_BASE_URL = "https://portal.qwen.ai/v1"
+
 
 class ModelFactory:
     """模型工厂类.
@@ -26,12 +30,20 @@ class ModelFactory:
     """
 
     @staticmethod
-    def create_model(config: ModelConfigInternal, model_id: str):
+    def create_model(
+        config: ModelConfigInternal,
+        model_id: str,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """根据配置创建模型实例.
 
+        会话使用的模型应通过 ModelRegistry 获取以共享实例和连接池，
+        这里每次调用都会创建新实例。
+
         Args:
             config: 模型配置对象(包含 api_key)
             model_id: 要使用的模型 ID（必须是 config.models 中的一个）
+            http_client: 共享的 HTTP 客户端，None 时由 openai SDK 创建独立连接池
 
         Returns:
             AgentScope 模型实例（OpenAIChatModel 或 QwenChatModel）
@@ -48,20 +60,25 @@ class ModelFactory:
 
         # 根据 provider 创建对应的模型
         if config.provider == "openai":
-            return ModelFactory._create_openai_model(config, model_id)
+            return ModelFactory._create_openai_model(config, model_id, http_client)
         elif config.provider == "qwen":
-            return ModelFactory._create_qwen_model(config, model_id)
+            return ModelFactory._create_qwen_model(config, model_id, http_client)
         else:
             msg = f"不支持的 provider: {config.provider}"
             raise ValueError(msg)
 
     @staticmethod
-    def _create_openai_model(config: ModelConfigInternal, model_id: str):
+    def _create_openai_model(
+        config: ModelConfigInternal,
+        model_id: str,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """创建 OpenAI 兼容的模型实例.
 
         Args:
             config: 模型配置对象
             model_id: 要使用的模型 ID
+            http_client: 共享的 HTTP 客户端
 
         Returns:
             OpenAIChatModel 实例
@@ -71,14 +88,22 @@ class ModelFactory:
 
         logger.info(f"创建 OpenAI 模型: {model_id}, base_url: {config.base_url}")
 
+        client_kwargs = {"base_url": config.base_url}
+        if http_client is not None:
+            client_kwargs["http_client"] = http_client
+
         return OpenAIChatModel(
             model_name=model_id,
             api_key=config.api_key,
-            client_kwargs={"base_url": config.base_url},
+            client_kwargs=client_kwargs,
         )
 
     @staticmethod
-    def _create_qwen_model(config: ModelConfigInternal, model_id: str):
+    def _create_qwen_model(
+        config: ModelConfigInternal,
+        model_id: str,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """创建 Qwen 模型实例.
 
         使用数据库配置中的 OAuth token，并在 token 接近过期时自动刷新。
@@ -86,6 +111,7 @@ class ModelFactory:
         Args:
             config: 模型配置对象（需包含 OAuth 字段）
             model_id: 要使用的模型 ID
+            http_client: 共享的 HTTP 客户端
 
         Returns:
             QwenChatModelWithConfig 实例
@@ -112,6 +138,7 @@ class ModelFactory:
             model_name=model_id,
             access_token=token_data["access_token"],
             config_id=config.id,
+            http_client=http_client,
         )
 
     @staticmethod
@@ -228,6 +255,7 @@ class ModelFactory:
                 asyncio.run(ModelFactory._update_token_in_db(config.id, new_token))
 
             logger.info(f"配置 {config.id} 的 token 刷新成功")
+            ModelFactory._invalidate_shared_models(config.id)
 
             return {
                 "access_token": new_token.access_token,
@@ -280,6 +308,30 @@ class ModelFactory:
 
             await repository.update_oauth_token(config_id, token_data)
 
+    @staticmethod
+    def cached_token_expires_at(config_id: int) -> int | None:
+        """获取缓存的 token 过期时间.
+
+        Args:
+            config_id: 配置 ID
+
+        Returns:
+            过期时间戳（毫秒），未缓存时返回 None
+        """
+        cached = _token_cache.get(config_id)
+        return None if cached is None else cached.get("expires_at")
+
+    @staticmethod
+    def _invalidate_shared_models(config_id: int | None) -> None:
+        """移除注册表中使用旧 token 的共享模型实例."""
+        from one_dragon_agent.core.model.registry import get_model_registry
+
+        registry = get_model_registry()
+        if config_id is None:
+            registry.clear()
+        else:
+            registry.invalidate(config_id)
+
     @staticmethod
     def clear_token_cache(config_id: int | None = None) -> None:
         """清除 token 缓存.
@@ -294,6 +346,7 @@ class ModelFactory:
         elif config_id in _token_cache:
             del _token_cache[config_id]
             logger.info(f"已清除配置 {config_id} 的 token 缓存")
+        ModelFactory._invalidate_shared_models(config_id)
 
 
 class QwenChatModelWithConfig:
@@ -310,7 +363,11 @@ class QwenChatModelWithConfig:
     """
 
     def __init__(
-        self, model_name: str, access_token: str, config_id: int
+        self,
+        model_name: str,
+        access_token: str,
+        config_id: int,
+        http_client: httpx.AsyncClient | None = None,
     ) -> None:
         """初始化 QwenChatModelWithConfig.
 
@@ -318,21 +375,23 @@ class QwenChatModelWithConfig:
             model_name: 模型名称
             access_token: OAuth 访问令牌
             config_id: 配置 ID
+            http_client: 共享的 HTTP 客户端
 
         """
         self._model_name = model_name
         self._access_token = access_token
         self._config_id = config_id
         self._client = None
-        self._setup_client()
+        self._setup_client(http_client)
 
-    def _setup_client(self) -> None:
+    def _setup_client(self, http_client: httpx.AsyncClient | None = None) -> None:
         """设置 OpenAI 客户端."""
         import openai
 
         self._client = openai.AsyncOpenAI(
             api_key=self._access_token,
-            base_url="https://portal.qwen.ai/v1",
+            base_url=QWEN_API_BASE_URL,
+            http_client=http_client,
         )
 
     async def _call_api(self, messages: list[dict], **kwargs: Any) -> Any:
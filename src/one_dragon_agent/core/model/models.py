@@ -304,6 +304,7 @@ class PaginatedModelConfigResponse(BaseModel):
         page: 当前页码
         page_size: 每页记录数
         items: 模型配置列表
+        next_cursor: 下一页游标，没有下一页时为 None
     """
 
     total: int = Field(..., ge=0, description="总记录数")
@@ -312,6 +313,55 @@ class PaginatedModelConfigResponse(BaseModel):
     items: list[ModelConfigResponse] = Field(
         default_factory=list, description="模型配置列表"
     )
+    next_cursor: str | None = Field(None, description="下一页游标")
+
+
+class BulkImportRequest(BaseModel):
+    """批量导入模型配置请求模型.
+
+    Attributes:
+        items: 待导入的配置列表，字段与创建请求相同，按名称新增或更新
+    """
+
+    items: list[dict] = Field(
+        ..., min_length=1, max_length=1000, description="待导入的配置列表"
+    )
+
+
+class BulkImportItemResult(BaseModel):
+    """单个配置的导入结果.
+
+    Attributes:
+        index: 在请求 items 中的位置
+        name: 配置名称
+        status: 导入结果（created / updated / error）
+        id: 配置 ID（导入失败时为 None）
+        error: 错误信息（导入成功时为 None）
+    """
+
+    index: int = Field(..., ge=0, description="在请求 items 中的位置")
+    name: str | None = Field(None, description="配置名称")
+    status: Literal["created", "updated", "error"] = Field(..., description="导入结果")
+    id: int | None = Field(None, description="配置 ID")
+    error: str | None = Field(None, description="错误信息")
+
+
+class BulkImportResponse(BaseModel):
+    """批量导入模型配置响应模型.
+
+    Attributes:
+        created: 新增的配置数
+        updated: 更新的配置数
+        failed: 导入失败的配置数
+        items: 每个配置的导入结果（与请求顺序一致）
+    """
+
+    created: int = Field(..., ge=0, description="新增的配置数")
+    updated: int = Field(..., ge=0, description="更新的配置数")
+    failed: int = Field(..., ge=0, description="导入失败的配置数")
+    items: list[BulkImportItemResult] = Field(
+        default_factory=list, description="每个配置的导入结果"
+    )
 
 
 class TestConnectionRequest(BaseModel):
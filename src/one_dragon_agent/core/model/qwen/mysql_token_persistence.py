@@ -10,7 +10,11 @@ from datetime import datetime
 from sqlalchemy import update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from one_dragon_agent.core.model.repository import model_configs_table
+from one_dragon_agent.core.model.repository import (
+    SELECT_OAUTH_BY_ID,
+    decode_oauth_row,
+    model_configs_table,
+)
 from one_dragon_agent.core.model.qwen.oauth import QwenOAuthToken
 from one_dragon_agent.core.system.log import get_logger
 
@@ -107,10 +111,9 @@ class MySQLTokenPersistence:
             QwenOAuthToken 如果存在且有效，否则返回 None
 
         """
-        table = model_configs_table
-
-        stmt = table.select().where(table.c.id == config_id)
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(
+            SELECT_OAUTH_BY_ID, {"config_id": config_id}
+        )
         row = result.fetchone()
 
         if not row:
@@ -118,31 +121,12 @@ class MySQLTokenPersistence:
             return None
 
         # 检查是否有 OAuth token
-        if not row.oauth_access_token or not row.oauth_refresh_token:
+        fields = decode_oauth_row(row)
+        if fields is None:
             logger.info(f"配置 {config_id} 没有 OAuth token")
             return None
 
-        # 解析 metadata（如果存在）
-        import json
-
-        resource_url = None
-        if row.oauth_metadata:
-            try:
-                metadata = (
-                    json.loads(row.oauth_metadata)
-                    if isinstance(row.oauth_metadata, str)
-                    else row.oauth_metadata
-                )
-                resource_url = metadata.get("resource_url")
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        token = QwenOAuthToken(
-            access_token=row.oauth_access_token,
-            refresh_token=row.oauth_refresh_token,
-            expires_at=row.oauth_expires_at,
-            resource_url=resource_url,
-        )
+        token = QwenOAuthToken(**fields)
 
         logger.info(f"从配置 {config_id} 加载 Token")
         return token
@@ -211,13 +195,12 @@ class MySQLTokenPersistence:
             是否有 token
 
         """
-        table = model_configs_table
-
-        stmt = table.select().where(table.c.id == config_id)
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(
+            SELECT_OAUTH_BY_ID, {"config_id": config_id}
+        )
         row = result.fetchone()
 
         if not row:
             return False
 
-        return bool(row.oauth_access_token and row.oauth_refresh_token)
+        return decode_oauth_row(row) is not None
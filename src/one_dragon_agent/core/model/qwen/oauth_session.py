@@ -263,6 +263,20 @@ class OAuthSessionManager:
                 session.interval = min(int(session.interval * 1.5), 10)
                 logger.info(f"会话 {session_id} 轮询间隔调整为 {session.interval} 秒")
 
+    def count_sessions_by_status(self) -> dict[str, int]:
+        """按状态统计会话数量.
+
+        只读取内存中的会话，不加锁，供指标采集使用。
+
+        Returns:
+            {状态: 会话数量}
+
+        """
+        counts: dict[str, int] = {}
+        for session in self._sessions.values():
+            counts[session.status] = counts.get(session.status, 0) + 1
+        return counts
+
     def _start_cleanup_task(self) -> None:
         """启动清理任务."""
         if self._cleanup_task is None or self._cleanup_task.done():
@@ -298,6 +298,21 @@ class QwenTokenManager:
             self._token = new_token
             await self._persistence.save_token(new_token)
 
+    def status(self) -> dict:
+        """Get token state without loading or refreshing the token.
+
+        Returns:
+            Whether a token is loaded, its expiry (ms) and whether the
+            background refresh timer is running.
+
+        """
+        return {
+            "has_token": self._token is not None,
+            "expires_at": None if self._token is None else self._token.expires_at,
+            "refresh_running": self._refresh_task is not None
+            and not self._refresh_task.done(),
+        }
+
     async def shutdown(self) -> None:
         """Shutdown token manager and stop refresh timer."""
         self._stop_event.set()
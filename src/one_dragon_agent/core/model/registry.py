@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""进程级模型实例注册表.
+
+同一个 (config_id, model_id) 在所有会话间共享一个模型实例；同一个 provider 主机
+的所有模型共享一个 httpx 连接池，池的上限即该主机的总出站连接数上限。
+每个配置共享一个 ModelCallLimiter，限制该配置的并发调用和 token 预算。
+会话各自的 InstrumentedChatModel 包装只记录用量和排队，不持有连接。
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import urlparse
+
+import httpx
+
+from one_dragon_agent.core.model.limiter import ModelCallLimiter
+from one_dragon_agent.core.model.model_factory import (
+    QWEN_API_BASE_URL,
+    ModelFactory,
+)
+from one_dragon_agent.core.model.models import ModelConfigInternal
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+# Qwen token 在过期前 5 分钟视为失效，与 ModelFactory 的刷新缓冲期一致
+_TOKEN_EXPIRY_BUFFER_MS = 5 * 60 * 1000
+
+
+@dataclass
+class _RegistryEntry:
+    """注册表中的模型实例.
+
+    Attributes:
+        model: 共享的模型实例
+        updated_at: 创建实例时配置的更新时间，配置更新后实例失效
+        expires_at: 实例使用的 OAuth token 过期时间（毫秒），None 表示不过期
+    """
+
+    model: object
+    updated_at: datetime
+    expires_at: int | None
+
+
+class ModelRegistry:
+    """按 (config_id, model_id) 共享模型实例的注册表.
+
+    配置更新（updated_at 变化）或 token 即将过期时自动重建实例，
+    配置修改、删除和 token 刷新时也会显式调用 invalidate 释放旧实例。
+
+    Attributes:
+        max_connections: 每个 provider 主机的最大连接数
+        max_keepalive_connections: 每个 provider 主机保持的空闲连接数
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+    ) -> None:
+        """初始化注册表.
+
+        Args:
+            max_connections: 每个主机的最大连接数，默认读取环境变量
+                MODEL_HTTP_MAX_CONNECTIONS 或 100
+            max_keepalive_connections: 每个主机的空闲连接数，默认读取环境变量
+                MODEL_HTTP_MAX_KEEPALIVE 或 20
+        """
+        if max_connections is None:
+            max_connections = int(os.getenv("MODEL_HTTP_MAX_CONNECTIONS", "100"))
+        if max_keepalive_connections is None:
+            max_keepalive_connections = int(os.getenv("MODEL_HTTP_MAX_KEEPALIVE", "20"))
+        self.max_connections: int = max_connections
+        self.max_keepalive_connections: int = max_keepalive_connections
+        self._entries: dict[tuple[int, str], _RegistryEntry] = {}
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+        self._limiters: dict[int, ModelCallLimiter] = {}
+
+    def get_model(self, config: ModelConfigInternal, model_id: str):
+        """获取共享的模型实例，不存在或已失效时创建.
+
+        Args:
+            config: 模型配置对象（包含 api_key / OAuth 字段）
+            model_id: 模型 ID
+
+        Returns:
+            AgentScope 模型实例
+
+        Raises:
+            ValueError: 如果配置无效或模型 ID 不存在
+        """
+        key = (config.id, model_id)
+        entry = self._entries.get(key)
+        if entry is not None and self._is_valid(entry, config):
+            return entry.model
+
+        model = ModelFactory.create_model(
+            config, model_id, http_client=self._get_http_client(config)
+        )
+        expires_at = None
+        if config.provider == "qwen":
+            expires_at = ModelFactory.cached_token_expires_at(config.id)
+        self._entries[key] = _RegistryEntry(model, config.updated_at, expires_at)
+        logger.debug(f"创建共享模型实例: 配置 {config.id}, 模型 {model_id}")
+        return model
+
+    def get_limiter(self, config_id: int) -> ModelCallLimiter:
+        """获取配置的调用限制器.
+
+        限制器不随实例失效而重建，配置更新后排队和退避状态保持不变。
+
+        Args:
+            config_id: 配置 ID
+
+        Returns:
+            ModelCallLimiter: 该配置共享的限制器
+        """
+        limiter = self._limiters.get(config_id)
+        if limiter is None:
+            limiter = ModelCallLimiter(config_id)
+            self._limiters[config_id] = limiter
+        return limiter
+
+    def invalidate(self, config_id: int) -> None:
+        """移除某个配置的所有模型实例，下次获取时重建.
+
+        Args:
+            config_id: 配置 ID
+        """
+        keys = [key for key in self._entries if key[0] == config_id]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            logger.info(f"已移除配置 {config_id} 的 {len(keys)} 个共享模型实例")
+
+    def clear(self) -> None:
+        """移除所有模型实例，保留 HTTP 连接池."""
+        self._entries.clear()
+
+    def size(self) -> int:
+        """获取当前共享的模型实例数."""
+        return len(self._entries)
+
+    async def aclose(self) -> None:
+        """清空注册表并关闭所有 HTTP 连接池."""
+        self.clear()
+        clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    @staticmethod
+    def _is_valid(entry: _RegistryEntry, config: ModelConfigInternal) -> bool:
+        """检查实例是否仍与配置一致且 token 未临近过期."""
+        if entry.updated_at != config.updated_at:
+            return False
+        if entry.expires_at is None:
+            return True
+        return entry.expires_at > int(time.time() * 1000) + _TOKEN_EXPIRY_BUFFER_MS
+
+    def _get_http_client(self, config: ModelConfigInternal) -> httpx.AsyncClient:
+        """获取配置所在 provider 主机的共享 HTTP 客户端."""
+        base_url = QWEN_API_BASE_URL if config.provider == "qwen" else config.base_url
+        host = urlparse(base_url).netloc or base_url
+        client = self._http_clients.get(host)
+        if client is None:
+            # 超时与 openai SDK 默认值一致，连接池由该主机的所有模型共享
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+                timeout=httpx.Timeout(600.0, connect=5.0),
+                follow_redirects=True,
+            )
+            self._http_clients[host] = client
+        return client
+
+
+_registry: ModelRegistry | None = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """获取全局模型注册表.
+
+    Returns:
+        ModelRegistry 单例
+    """
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
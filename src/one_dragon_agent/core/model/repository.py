@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """通用模型配置数据库仓库."""
 
+import base64
 import json
+import time
 from datetime import datetime
 
 from sqlalchemy import (
@@ -9,16 +11,19 @@ from sqlalchemy import (
     MetaData,
     select,
     update,
+    tuple_,
     delete,
     func,
     Column,
     BigInteger,
+    Integer,
     String,
     Text,
     Boolean,
     DateTime,
     Index,
     JSON,
+    bindparam,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
@@ -29,6 +34,7 @@ from one_dragon_agent.core.model.models import (
     ModelConfigResponse,
     ModelConfigInternal,
 )
+from one_dragon_agent.core.system.json_codec import get_json_codec
 from one_dragon_agent.core.system.log import get_logger
 
 logger = get_logger(__name__)
@@ -40,7 +46,13 @@ metadata = MetaData()
 model_configs_table = Table(
     "model_configs",
     metadata,
-    Column("id", BigInteger, primary_key=True, autoincrement=True),
+    # SQLite 只对 INTEGER 主键自增，本地基准测试使用 SQLite 替身
+    Column(
+        "id",
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    ),
     Column("name", String(255), unique=True, nullable=False),
     Column("provider", String(50), nullable=False),
     Column("base_url", Text, nullable=False),
@@ -60,8 +72,245 @@ model_configs_table = Table(
     Index("idx_provider", "provider"),
     Index("idx_is_active", "is_active"),
     Index("idx_oauth_expires_at", "oauth_expires_at"),
+    # 列表按 (created_at, id) 做游标分页（004 迁移添加）
+    Index("idx_created_at_id", "created_at", "id"),
 )
 
+# OAuth 相关列
+_OAUTH_FIELDS = (
+    "oauth_access_token",
+    "oauth_token_type",
+    "oauth_refresh_token",
+    "oauth_expires_at",
+    "oauth_scope",
+    "oauth_metadata",
+)
+
+# 批量导入时每条 INSERT 语句包含的最大行数
+_UPSERT_BATCH_SIZE = 500
+
+# 公开视图（列表、详情）读取的列，不包含 api_key 和 OAuth 令牌等敏感字段
+PUBLIC_COLUMNS = (
+    model_configs_table.c.id,
+    model_configs_table.c.name,
+    model_configs_table.c.provider,
+    model_configs_table.c.base_url,
+    model_configs_table.c.models,
+    model_configs_table.c.is_active,
+    model_configs_table.c.created_at,
+    model_configs_table.c.updated_at,
+)
+
+# 内部视图读取的列：公开列 + api_key + OAuth 字段
+INTERNAL_COLUMNS = (
+    *PUBLIC_COLUMNS,
+    model_configs_table.c.api_key,
+    model_configs_table.c.oauth_access_token,
+    model_configs_table.c.oauth_token_type,
+    model_configs_table.c.oauth_refresh_token,
+    model_configs_table.c.oauth_expires_at,
+    model_configs_table.c.oauth_scope,
+    model_configs_table.c.oauth_metadata,
+)
+
+# OAuth 视图（token 持久化）读取的列
+OAUTH_COLUMNS = (
+    model_configs_table.c.oauth_access_token,
+    model_configs_table.c.oauth_refresh_token,
+    model_configs_table.c.oauth_expires_at,
+    model_configs_table.c.oauth_metadata,
+)
+
+# 按 ID 查询各视图的语句，只构建一次，编译结果由 SQLAlchemy 缓存复用
+SELECT_PUBLIC_BY_ID = select(*PUBLIC_COLUMNS).where(
+    model_configs_table.c.id == bindparam("config_id")
+)
+SELECT_INTERNAL_BY_ID = select(*INTERNAL_COLUMNS).where(
+    model_configs_table.c.id == bindparam("config_id")
+)
+SELECT_OAUTH_BY_ID = select(*OAUTH_COLUMNS).where(
+    model_configs_table.c.id == bindparam("config_id")
+)
+
+
+def _decode_json(value):
+    """解析 JSON 列，部分驱动会以字符串返回 JSON 列."""
+    if isinstance(value, (str, bytes)):
+        return get_json_codec().loads(value)
+    return value
+
+
+def _decode_metadata(value) -> dict | None:
+    """解析 oauth_metadata 列，无效内容视为 None."""
+    if not value:
+        return None
+    try:
+        return _decode_json(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def decode_public_row(row) -> ModelConfigResponse:
+    """按 PUBLIC_COLUMNS 的列顺序解码一行为响应模型.
+
+    Args:
+        row: 查询 PUBLIC_COLUMNS 得到的记录
+
+    Returns:
+        配置响应模型
+    """
+    config_id, name, provider, base_url, models, is_active, created_at, updated_at = row
+    return ModelConfigResponse(
+        id=config_id,
+        name=name,
+        provider=provider,
+        base_url=base_url,
+        models=_decode_json(models),
+        is_active=bool(is_active),
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+
+
+def decode_internal_row(row) -> dict:
+    """按 INTERNAL_COLUMNS 的列顺序解码一行为字典.
+
+    Args:
+        row: 查询 INTERNAL_COLUMNS 得到的记录
+
+    Returns:
+        包含 api_key 和 OAuth 字段的配置字典
+    """
+    (
+        config_id,
+        name,
+        provider,
+        base_url,
+        models,
+        is_active,
+        created_at,
+        updated_at,
+        api_key,
+        oauth_access_token,
+        oauth_token_type,
+        oauth_refresh_token,
+        oauth_expires_at,
+        oauth_scope,
+        oauth_metadata,
+    ) = row
+    return {
+        "id": config_id,
+        "name": name,
+        "provider": provider,
+        "base_url": base_url,
+        "api_key": api_key,
+        "models": _decode_json(models),
+        "is_active": bool(is_active),
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "oauth_access_token": oauth_access_token,
+        "oauth_token_type": oauth_token_type,
+        "oauth_refresh_token": oauth_refresh_token,
+        "oauth_expires_at": oauth_expires_at,
+        "oauth_scope": oauth_scope,
+        "oauth_metadata": _decode_metadata(oauth_metadata),
+    }
+
+
+def decode_oauth_row(row) -> dict | None:
+    """按 OAUTH_COLUMNS 的列顺序解码一行为 token 字段.
+
+    Args:
+        row: 查询 OAUTH_COLUMNS 得到的记录
+
+    Returns:
+        access_token、refresh_token、expires_at、resource_url 字典，
+        没有 token 时返回 None
+    """
+    access_token, refresh_token, expires_at, metadata = row
+    if not access_token or not refresh_token:
+        return None
+    metadata = _decode_metadata(metadata)
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "expires_at": expires_at,
+        "resource_url": metadata.get("resource_url") if isinstance(metadata, dict) else None,
+    }
+
+
+def encode_cursor(created_at: datetime, config_id: int) -> str:
+    """将列表最后一条记录的排序键编码为游标.
+
+    Args:
+        created_at: 创建时间
+        config_id: 配置 ID
+
+    Returns:
+        URL 安全的游标字符串
+    """
+    raw = json.dumps([created_at.isoformat(), config_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """解析游标.
+
+    Args:
+        cursor: encode_cursor 生成的游标
+
+    Returns:
+        (创建时间, 配置 ID)
+
+    Raises:
+        ValueError: 如果游标格式无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, config_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(config_id)
+    except Exception as e:
+        msg = f"无效的分页游标: {cursor}"
+        raise ValueError(msg) from e
+
+
+class ConfigCountCache:
+    """按过滤条件缓存配置总数.
+
+    游标分页不需要精确总数，短时间内复用 COUNT(*) 结果即可；
+    仓库的写操作会清空缓存。
+
+    Attributes:
+        ttl: 缓存有效期（秒）
+    """
+
+    def __init__(self, ttl: float = 30.0) -> None:
+        """初始化缓存.
+
+        Args:
+            ttl: 缓存有效期（秒）
+        """
+        self.ttl: float = ttl
+        self._entries: dict[tuple[bool | None, str | None], tuple[float, int]] = {}
+
+    def get(self, key: tuple[bool | None, str | None]) -> int | None:
+        """获取未过期的总数."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def set(self, key: tuple[bool | None, str | None], total: int) -> None:
+        """记录总数."""
+        self._entries[key] = (time.monotonic(), total)
+
+    def clear(self) -> None:
+        """清空缓存."""
+        self._entries.clear()
+
+
+config_count_cache = ConfigCountCache()
+
 
 class ModelConfigORM:
     """模型配置 ORM 模型（使用 SQLAlchemy Core）.
@@ -83,11 +332,7 @@ class ModelConfigORM:
             响应模型字典
         """
         # 解析 JSON 字段
-        models_data = (
-            json.loads(row["models"])
-            if isinstance(row["models"], str)
-            else row["models"]
-        )
+        models_data = _decode_json(row["models"])
 
         return {
             "id": row["id"],
@@ -119,6 +364,25 @@ class ModelConfigORM:
             "is_active": config.is_active,
         }
 
+    @staticmethod
+    def oauth_to_dict(token_data: dict) -> dict:
+        """将 OAuth token 数据转换为数据库记录.
+
+        Args:
+            token_data: OAuth token 数据字典
+
+        Returns:
+            数据库记录字典
+        """
+        return {
+            "oauth_access_token": token_data.get("access_token"),
+            "oauth_token_type": token_data.get("token_type", "Bearer"),
+            "oauth_refresh_token": token_data.get("refresh_token"),
+            "oauth_expires_at": token_data.get("expires_at"),
+            "oauth_scope": token_data.get("scope"),
+            "oauth_metadata": token_data.get("metadata"),
+        }
+
 
 class ModelConfigRepository:
     """模型配置仓库类.
@@ -137,11 +401,16 @@ class ModelConfigRepository:
         """
         self._session = session
 
-    async def create_config(self, config: ModelConfigCreate) -> ModelConfigResponse:
+    async def create_config(
+        self, config: ModelConfigCreate, oauth_token_data: dict | None = None
+    ) -> ModelConfigResponse:
         """创建模型配置.
 
+        只执行一条 INSERT，响应由写入的值和自增 ID 构造，不再回查。
+
         Args:
             config: 创建请求模型
+            oauth_token_data: OAuth token 数据字典（可选），与配置一起写入
 
         Returns:
             创建的配置
@@ -151,8 +420,11 @@ class ModelConfigRepository:
         """
         table = model_configs_table
         data = ModelConfigORM.create_to_dict(config)
-        data["created_at"] = datetime.now()
-        data["updated_at"] = datetime.now()
+        if oauth_token_data is not None:
+            data.update(ModelConfigORM.oauth_to_dict(oauth_token_data))
+        now = datetime.now()
+        data["created_at"] = now
+        data["updated_at"] = now
 
         try:
             # 使用 SQLAlchemy Core 插入数据
@@ -162,12 +434,10 @@ class ModelConfigRepository:
 
             result = await self._session.execute(stmt)
             await self._session.commit()
+            config_count_cache.clear()
 
-            # 获取插入的 ID
-            config_id = result.lastrowid
-
-            # 查询并返回完整的配置
-            return await self._get_by_id_internal(config_id)
+            data["id"] = result.lastrowid
+            return ModelConfigResponse(**ModelConfigORM.dict_to_orm(data))
 
         except IntegrityError as e:
             await self._session.rollback()
@@ -203,20 +473,16 @@ class ModelConfigRepository:
         Raises:
             ValueError: 如果配置不存在
         """
-        table = model_configs_table
-
-        stmt = select(table).where(table.c.id == config_id)
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(
+            SELECT_PUBLIC_BY_ID, {"config_id": config_id}
+        )
         row = result.fetchone()
 
         if not row:
             msg = f"配置 ID {config_id} 不存在"
             raise ValueError(msg)
 
-        # 将 SQLAlchemy Row 对象转换为字典
-        row_dict = dict(row._mapping)
-        config_data = ModelConfigORM.dict_to_orm(row_dict)
-        return ModelConfigResponse(**config_data)
+        return decode_public_row(row)
 
     async def get_config_internal(self, config_id: int) -> ModelConfigInternal:
         """根据 ID 查询配置(包含 api_key 和 OAuth 字段,仅供内部使用).
@@ -230,59 +496,7 @@ class ModelConfigRepository:
         Raises:
             ValueError: 如果配置不存在
         """
-        table = model_configs_table
-
-        stmt = select(table).where(table.c.id == config_id)
-        result = await self._session.execute(stmt)
-        row = result.fetchone()
-
-        if not row:
-            msg = f"配置 ID {config_id} 不存在"
-            raise ValueError(msg)
-
-        # 将 SQLAlchemy Row 对象转换为字典
-        row_dict = dict(row._mapping)
-
-        # 解析 JSON 字段
-        models_data = (
-            json.loads(row_dict["models"])
-            if isinstance(row_dict["models"], str)
-            else row_dict["models"]
-        )
-
-        # 解析 OAuth metadata（如果存在）
-        oauth_metadata = None
-        if row_dict.get("oauth_metadata"):
-            try:
-                oauth_metadata = (
-                    json.loads(row_dict["oauth_metadata"])
-                    if isinstance(row_dict["oauth_metadata"], str)
-                    else row_dict["oauth_metadata"]
-                )
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        # 构建 ModelConfigInternal 所需的字典(包含 api_key 和 OAuth 字段)
-        config_data = {
-            "id": row_dict["id"],
-            "name": row_dict["name"],
-            "provider": row_dict["provider"],
-            "base_url": row_dict["base_url"],
-            "api_key": row_dict["api_key"],  # 包含 api_key
-            "models": models_data,
-            "is_active": bool(row_dict["is_active"]),
-            "created_at": row_dict["created_at"],
-            "updated_at": row_dict["updated_at"],
-            # OAuth 字段
-            "oauth_access_token": row_dict.get("oauth_access_token"),
-            "oauth_token_type": row_dict.get("oauth_token_type"),
-            "oauth_refresh_token": row_dict.get("oauth_refresh_token"),
-            "oauth_expires_at": row_dict.get("oauth_expires_at"),
-            "oauth_scope": row_dict.get("oauth_scope"),
-            "oauth_metadata": oauth_metadata,
-        }
-
-        return ModelConfigInternal(**config_data)
+        return ModelConfigInternal(**await self._get_internal_fields(config_id))
 
     async def get_config_with_oauth(self, config_id: int) -> dict:
         """根据 ID 查询配置(包含 api_key 和 OAuth 字段).
@@ -298,56 +512,30 @@ class ModelConfigRepository:
         Raises:
             ValueError: 如果配置不存在
         """
-        table = model_configs_table
+        return await self._get_internal_fields(config_id)
 
-        stmt = select(table).where(table.c.id == config_id)
-        result = await self._session.execute(stmt)
-        row = result.fetchone()
+    async def _get_internal_fields(self, config_id: int) -> dict:
+        """查询内部视图并解码（内部方法）.
 
-        if not row:
-            msg = f"配置 ID {config_id} 不存在"
-            raise ValueError(msg)
+        Args:
+            config_id: 配置 ID
 
-        # 将 SQLAlchemy Row 对象转换为字典
-        row_dict = dict(row._mapping)
+        Returns:
+            包含 api_key 和 OAuth 字段的配置字典
 
-        # 解析 JSON 字段
-        models_data = (
-            json.loads(row_dict["models"])
-            if isinstance(row_dict["models"], str)
-            else row_dict["models"]
+        Raises:
+            ValueError: 如果配置不存在
+        """
+        result = await self._session.execute(
+            SELECT_INTERNAL_BY_ID, {"config_id": config_id}
         )
+        row = result.fetchone()
 
-        # 解析 OAuth metadata
-        oauth_metadata = None
-        if row_dict.get("oauth_metadata"):
-            try:
-                oauth_metadata = (
-                    json.loads(row_dict["oauth_metadata"])
-                    if isinstance(row_dict["oauth_metadata"], str)
-                    else row_dict["oauth_metadata"]
-                )
-            except (json.JSONDecodeError, TypeError):
-                pass
+        if not row:
+            msg = f"配置 ID {config_id} 不存在"
+            raise ValueError(msg)
 
-        return {
-            "id": row_dict["id"],
-            "name": row_dict["name"],
-            "provider": row_dict["provider"],
-            "base_url": row_dict["base_url"],
-            "api_key": row_dict["api_key"],
-            "models": models_data,
-            "is_active": bool(row_dict["is_active"]),
-            "created_at": row_dict["created_at"],
-            "updated_at": row_dict["updated_at"],
-            # OAuth 字段
-            "oauth_access_token": row_dict.get("oauth_access_token"),
-            "oauth_token_type": row_dict.get("oauth_token_type"),
-            "oauth_refresh_token": row_dict.get("oauth_refresh_token"),
-            "oauth_expires_at": row_dict.get("oauth_expires_at"),
-            "oauth_scope": row_dict.get("oauth_scope"),
-            "oauth_metadata": oauth_metadata,
-        }
+        return decode_internal_row(row)
 
     async def update_oauth_token(
         self, config_id: int, token_data: dict
@@ -367,12 +555,7 @@ class ModelConfigRepository:
             update(table)
             .where(table.c.id == config_id)
             .values(
-                oauth_access_token=token_data.get("access_token"),
-                oauth_token_type=token_data.get("token_type", "Bearer"),
-                oauth_refresh_token=token_data.get("refresh_token"),
-                oauth_expires_at=token_data.get("expires_at"),
-                oauth_scope=token_data.get("scope"),
-                oauth_metadata=token_data.get("metadata"),
+                **ModelConfigORM.oauth_to_dict(token_data),
                 updated_at=datetime.now(),
             )
         )
@@ -404,44 +587,211 @@ class ModelConfigRepository:
         Returns:
             (配置列表, 总记录数)
         """
+        conditions = self._list_conditions(is_active, provider)
+
+        # 查询总数
+        total = await self._count_configs(conditions)
+
+        # 查询分页数据
+        offset = (page - 1) * page_size
+        select_stmt = (
+            self._list_select(conditions).limit(page_size).offset(offset)
+        )
+
+        result = await self._session.execute(select_stmt)
+        return self._rows_to_configs(result.fetchall()), total
+
+    async def get_configs_after(
+        self,
+        cursor: str | None = None,
+        page_size: int = 20,
+        is_active: bool | None = None,
+        provider: str | None = None,
+    ) -> tuple[list[ModelConfigResponse], str | None, int]:
+        """按 (created_at, id) 游标分页查询配置列表.
+
+        与 OFFSET 分页不同，翻到任意深度都只扫描 page_size 行索引；
+        总数使用 config_count_cache 缓存的近似值。
+
+        Args:
+            cursor: 上一页返回的游标，为 None 时从第一页开始
+            page_size: 每页记录数
+            is_active: 是否启用（可选过滤条件）
+            provider: 提供商（可选过滤条件）
+
+        Returns:
+            (配置列表, 下一页游标, 近似总记录数)，没有下一页时游标为 None
+
+        Raises:
+            ValueError: 如果游标格式无效
+        """
         table = model_configs_table
+        conditions = self._list_conditions(is_active, provider)
+        key = (is_active, provider)
+        total = config_count_cache.get(key)
+        if total is None:
+            total = await self._count_configs(conditions)
+            config_count_cache.set(key, total)
+
+        if cursor is not None:
+            created_at, config_id = decode_cursor(cursor)
+            # 行值比较可以直接在 (created_at, id) 索引上做范围查找
+            conditions.append(
+                tuple_(table.c.created_at, table.c.id) < (created_at, config_id)
+            )
 
-        # 构建查询条件
+        # 多取一条用于判断是否还有下一页
+        result = await self._session.execute(
+            self._list_select(conditions).limit(page_size + 1)
+        )
+        rows = result.fetchall()
+        configs = self._rows_to_configs(rows[:page_size])
+
+        next_cursor = None
+        if len(rows) > page_size:
+            last = configs[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return configs, next_cursor, total
+
+    @staticmethod
+    def _list_conditions(is_active: bool | None, provider: str | None) -> list:
+        """构建列表查询的过滤条件."""
+        table = model_configs_table
         conditions = []
         if is_active is not None:
             conditions.append(table.c.is_active == is_active)
         if provider is not None:
             conditions.append(table.c.provider == provider)
+        return conditions
 
-        # 查询总数
-        count_stmt = select(func.count()).select_from(table)
+    @staticmethod
+    def _list_select(conditions: list):
+        """构建按 (created_at, id) 倒序、只读取公开列的列表查询."""
+        table = model_configs_table
+        return (
+            select(*PUBLIC_COLUMNS)
+            .where(*conditions)
+            .order_by(table.c.created_at.desc(), table.c.id.desc())
+        )
+
+    async def _count_configs(self, conditions: list) -> int:
+        """统计满足条件的配置数."""
+        count_stmt = select(func.count()).select_from(model_configs_table)
         if conditions:
             count_stmt = count_stmt.where(*conditions)
+        result = await self._session.execute(count_stmt)
+        return result.scalar() or 0
 
-        total_result = await self._session.execute(count_stmt)
-        total = total_result.scalar() or 0
+    @staticmethod
+    def _rows_to_configs(rows) -> list[ModelConfigResponse]:
+        """将数据库记录转换为响应模型列表."""
+        return [decode_public_row(row) for row in rows]
 
-        # 查询分页数据
-        offset = (page - 1) * page_size
-        select_stmt = (
-            select(table)
-            .where(*conditions)
-            .order_by(table.c.created_at.desc())
-            .limit(page_size)
-            .offset(offset)
+    async def get_ids_by_names(self, names: list[str]) -> dict[str, int]:
+        """根据名称批量查询配置 ID.
+
+        Args:
+            names: 配置名称列表
+
+        Returns:
+            名称到配置 ID 的映射，不存在的名称不在结果中
+        """
+        if not names:
+            return {}
+        table = model_configs_table
+        result = await self._session.execute(
+            select(table.c.name, table.c.id).where(table.c.name.in_(names))
         )
+        return dict(result.fetchall())
 
-        result = await self._session.execute(select_stmt)
-        rows = result.fetchall()
+    async def upsert_configs(
+        self, configs: list[tuple[ModelConfigCreate, dict | None]]
+    ) -> dict[str, int]:
+        """按名称批量新增或更新配置（单个事务）.
+
+        需要更新的列相同的配置合并为一条多行
+        ``INSERT ... ON DUPLICATE KEY UPDATE``：没有提供 api_key 或
+        OAuth token 的配置在更新时保留数据库中的原值。
+
+        Args:
+            configs: (创建请求, OAuth token 数据) 列表，名称不能重复
+
+        Returns:
+            名称到配置 ID 的映射
+
+        Raises:
+            ValueError: 如果写入违反数据库约束
+        """
+        now = datetime.now()
+        groups: dict[tuple[bool, bool], list[dict]] = {}
+        for config, oauth_token_data in configs:
+            row = ModelConfigORM.create_to_dict(config)
+            if oauth_token_data is not None:
+                row.update(ModelConfigORM.oauth_to_dict(oauth_token_data))
+            else:
+                row.update(dict.fromkeys(_OAUTH_FIELDS))
+            row["created_at"] = now
+            row["updated_at"] = now
+            key = (bool(config.api_key), oauth_token_data is not None)
+            groups.setdefault(key, []).append(row)
+
+        try:
+            for (has_api_key, has_oauth), rows in groups.items():
+                columns = ["provider", "base_url", "models", "is_active", "updated_at"]
+                if has_api_key:
+                    columns.append("api_key")
+                if has_oauth:
+                    columns.extend(_OAUTH_FIELDS)
+                for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+                    await self._session.execute(
+                        self._upsert_statement(
+                            rows[start : start + _UPSERT_BATCH_SIZE], columns
+                        )
+                    )
+            ids = await self.get_ids_by_names([config.name for config, _ in configs])
+            await self._session.commit()
+        except IntegrityError as e:
+            await self._session.rollback()
+            logger.error(f"批量导入配置失败: {e}")
+            msg = f"批量导入配置失败: {e.orig}"
+            raise ValueError(msg) from e
+
+        config_count_cache.clear()
+        return ids
 
-        # 转换为响应模型
-        configs = []
-        for row in rows:
-            row_dict = dict(row._mapping)
-            config_data = ModelConfigORM.dict_to_orm(row_dict)
-            configs.append(ModelConfigResponse(**config_data))
+    def _upsert_statement(self, rows: list[dict], update_columns: list[str]):
+        """构建按名称冲突时更新指定列的多行插入语句.
 
-        return configs, total
+        Args:
+            rows: 待插入的记录
+            update_columns: 名称冲突时更新的列
+
+        Returns:
+            INSERT 语句
+
+        Raises:
+            ValueError: 如果数据库不支持
+        """
+        table = model_configs_table
+        dialect = self._session.get_bind().dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+            stmt = mysql_insert(table).values(rows)
+            return stmt.on_duplicate_key_update(
+                {column: stmt.inserted[column] for column in update_columns}
+            )
+        if dialect == "sqlite":
+            # 本地测试使用的 SQLite 替身
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            stmt = sqlite_insert(table).values(rows)
+            return stmt.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={column: stmt.excluded[column] for column in update_columns},
+            )
+        msg = f"批量导入不支持数据库 {dialect}"
+        raise ValueError(msg)
 
     async def update_config(
         self, config_id: int, config_update: ModelConfigUpdate
@@ -488,26 +838,7 @@ class ModelConfigRepository:
             if config_update.updated_at is not None:
                 stmt = stmt.where(table.c.updated_at == config_update.updated_at)
 
-            result = await self._session.execute(stmt)
-            await self._session.commit()
-
-            if result.rowcount == 0:
-                # 需要区分是记录不存在还是乐观锁冲突
-                if config_update.updated_at is not None:
-                    # 先检查记录是否存在
-                    exists = await self.get_config_by_id(config_id)
-                    if exists is None:
-                        msg = f"配置 ID {config_id} 不存在"
-                        raise ValueError(msg)
-                    # 记录存在但 updated_at 不匹配，说明已被其他用户修改
-                    msg = "配置已被其他用户修改，请刷新。"
-                    raise ValueError(msg)
-                # 没有 updated_at 的情况，说明记录不存在
-                msg = f"配置 ID {config_id} 不存在"
-                raise ValueError(msg)
-
-            return await self._get_by_id_internal(config_id)
-
+            updated, row = await self._update_and_fetch(stmt, config_id)
         except IntegrityError as e:
             await self._session.rollback()
             logger.error(f"更新配置失败: {e}")
@@ -516,6 +847,40 @@ class ModelConfigRepository:
                 raise ValueError(msg) from e
             raise
 
+        if row is None:
+            msg = f"配置 ID {config_id} 不存在"
+            raise ValueError(msg)
+        if not updated:
+            # 记录存在但 updated_at 不匹配，说明已被其他用户修改
+            msg = "配置已被其他用户修改，请刷新。"
+            raise ValueError(msg)
+        return row
+
+    async def _update_and_fetch(
+        self, stmt, config_id: int
+    ) -> tuple[bool, ModelConfigResponse | None]:
+        """在同一事务内执行 UPDATE 并读取更新后的配置.
+
+        读取的结果同时用于构造响应和区分"记录不存在"与"乐观锁冲突"，
+        不需要在更新失败后再额外查询。
+
+        Args:
+            stmt: UPDATE 语句
+            config_id: 配置 ID
+
+        Returns:
+            (是否有记录被更新, 当前配置)，配置不存在时为 None
+        """
+        result = await self._session.execute(stmt)
+        row = (
+            await self._session.execute(SELECT_PUBLIC_BY_ID, {"config_id": config_id})
+        ).fetchone()
+        await self._session.commit()
+        config_count_cache.clear()
+
+        config = decode_public_row(row) if row is not None else None
+        return result.rowcount > 0, config
+
     async def delete_config(self, config_id: int) -> bool:
         """删除模型配置.
 
@@ -533,6 +898,7 @@ class ModelConfigRepository:
         stmt = delete(table).where(table.c.id == config_id)
         result = await self._session.execute(stmt)
         await self._session.commit()
+        config_count_cache.clear()
 
         if result.rowcount == 0:
             msg = f"配置 ID {config_id} 不存在"
@@ -557,6 +923,7 @@ class ModelConfigRepository:
         result = await self._session.execute(stmt)
         deleted_count = result.rowcount
         await self._session.commit()
+        config_count_cache.clear()
 
         logger.info(f"已删除 {deleted_count} 条测试数据（前缀: {prefix}）")
         return deleted_count
@@ -630,11 +997,8 @@ class ModelConfigRepository:
             .values(is_active=is_active, updated_at=datetime.now())
         )
 
-        result = await self._session.execute(stmt)
-        await self._session.commit()
-
-        if result.rowcount == 0:
+        _, config = await self._update_and_fetch(stmt, config_id)
+        if config is None:
             msg = f"配置 ID {config_id} 不存在"
             raise ValueError(msg)
-
-        return await self._get_by_id_internal(config_id)
+        return config
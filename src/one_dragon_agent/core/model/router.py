@@ -2,13 +2,16 @@
 """通用模型配置 API 路由."""
 
 import os
-from typing import Annotated
+from typing import Annotated, AsyncGenerator
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import delete, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from one_dragon_agent.core.model.models import (
+    BulkImportRequest,
+    BulkImportResponse,
     ModelConfigCreate,
     ModelConfigResponse,
     ModelConfigUpdate,
@@ -18,6 +21,7 @@ from one_dragon_agent.core.model.models import (
 )
 from one_dragon_agent.core.model.repository import model_configs_table
 from one_dragon_agent.core.model.service import ModelConfigService
+from one_dragon_agent.core.system.json_codec import get_json_codec
 from one_dragon_agent.core.system.log import get_logger
 
 logger = get_logger(__name__)
@@ -34,11 +38,11 @@ async def get_db_session() -> AsyncSession:
     Raises:
         HTTPException: 如果无法获取数据库会话
     """
-    from one_dragon_alpha.services.mysql import MySQLConnectionService
+    from one_dragon_alpha.services.mysql import get_mysql_connection_service
 
     try:
-        # 获取 MySQL 连接服务实例
-        mysql_service = MySQLConnectionService()
+        # 获取共享的 MySQL 连接服务实例
+        mysql_service = get_mysql_connection_service()
         async with await mysql_service.get_session() as session:
             yield session
     except Exception as e:
@@ -103,6 +107,9 @@ async def list_configs(
         bool | None, Query(description="是否启用（可选过滤条件）")
     ] = None,
     provider: Annotated[str | None, Query(description="提供商（可选过滤条件）")] = None,
+    cursor: Annotated[
+        str | None, Query(description="上一页返回的 next_cursor（游标分页）")
+    ] = None,
     session: SessionDep = None,
 ) -> PaginatedModelConfigResponse:
     """获取模型配置列表（支持分页和过滤）.
@@ -112,6 +119,7 @@ async def list_configs(
         page_size: 每页记录数（最大 100）
         is_active: 是否启用（可选过滤条件）
         provider: 提供商（可选过滤条件）
+        cursor: 游标（可选），传入时忽略 page
         session: 数据库会话
 
     Returns:
@@ -127,6 +135,7 @@ async def list_configs(
             page_size=page_size,
             is_active=is_active,
             provider=provider,
+            cursor=cursor,
         )
     except ValueError as e:
         logger.error(f"查询配置列表失败: {e}")
@@ -142,6 +151,109 @@ async def list_configs(
         ) from e
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkImportResponse,
+    summary="批量导入模型配置",
+)
+async def bulk_import_configs(
+    request: BulkImportRequest,
+    session: SessionDep,
+) -> BulkImportResponse:
+    """按名称批量新增或更新模型配置.
+
+    所有校验通过的配置在同一个事务中写入，每个配置的结果单独返回。
+
+    Args:
+        request: 批量导入请求
+        session: 数据库会话
+
+    Returns:
+        批量导入结果
+
+    Raises:
+        HTTPException: 如果写入数据库失败
+    """
+    try:
+        service = ModelConfigService(session)
+        return await service.bulk_import_model_configs(request.items)
+    except ValueError as e:
+        logger.error(f"批量导入配置失败: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    except Exception as e:
+        logger.exception("批量导入配置时发生未知错误")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="服务器内部错误",
+        ) from e
+
+
+async def export_ndjson_generator(
+    is_active: bool | None, provider: str | None
+) -> AsyncGenerator[bytes, None]:
+    """按批生成 NDJSON 格式的配置导出内容.
+
+    StreamingResponse 在依赖项退出后才开始发送，因此这里单独获取数据库会话。
+
+    Args:
+        is_active: 是否启用（可选过滤条件）
+        provider: 提供商（可选过滤条件）
+
+    Yields:
+        每批配置对应的 NDJSON 行
+    """
+    from one_dragon_alpha.services.mysql import get_mysql_connection_service
+
+    codec = get_json_codec()
+    async with await get_mysql_connection_service().get_session() as session:
+        service = ModelConfigService(session)
+        async for configs in service.export_model_configs(
+            is_active=is_active, provider=provider
+        ):
+            yield b"".join(codec.dumpb(config) + b"\n" for config in configs)
+
+
+@router.get(
+    "/export",
+    summary="导出模型配置（NDJSON）",
+    response_class=StreamingResponse,
+)
+async def export_configs(
+    is_active: Annotated[
+        bool | None, Query(description="是否启用（可选过滤条件）")
+    ] = None,
+    provider: Annotated[str | None, Query(description="提供商（可选过滤条件）")] = None,
+) -> StreamingResponse:
+    """以 NDJSON 流式导出模型配置，每行一个配置，不包含 api_key 和 OAuth token.
+
+    导出的每一行都可以直接作为批量导入的 items 元素。
+
+    Args:
+        is_active: 是否启用（可选过滤条件）
+        provider: 提供商（可选过滤条件）
+
+    Returns:
+        NDJSON 流式响应
+
+    Raises:
+        HTTPException: 如果 provider 不支持
+    """
+    if provider is not None and provider not in ("openai", "qwen"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的 provider: {provider}",
+        )
+
+    return StreamingResponse(
+        export_ndjson_generator(is_active, provider),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="model_configs.ndjson"'},
+    )
+
+
 @router.delete(
     "/cleanup-test-data",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""跨模型配置的故障转移和对冲请求.
+
+一次模型调用可以配置多个端点（模型配置 + 模型 ID）：按延迟 EWMA 选择最快的
+健康端点作为首选，首个响应块在阈值内未到达时向下一个端点发出对冲请求，
+先返回首个响应块的端点胜出，其余请求取消；端点在首个响应块之前出错时转移到
+下一个端点。首个响应块之后的错误不再转移，因为已流出的累加内容无法续接。
+"""
+
+import asyncio
+import inspect
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator
+
+from agentscope.model import ChatModelBase, ChatResponse
+
+from one_dragon_agent.core.model.models import ModelConfigInternal
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+EndpointKey = tuple[int, str]
+
+
+@dataclass
+class RoutingPolicy:
+    """一次聊天请求的路由策略.
+
+    Attributes:
+        fallbacks: 备用端点的 (配置, 模型 ID)，按优先级排列
+        hedge_after: 首个响应块超过该秒数未到达时发出对冲请求，None 表示不对冲
+        failover: 端点出错时是否转移到下一个端点
+    """
+
+    fallbacks: list[tuple[ModelConfigInternal, str]] = field(default_factory=list)
+    hedge_after: float | None = None
+    failover: bool = True
+
+
+@dataclass
+class EndpointStats:
+    """端点的延迟和健康状态.
+
+    Attributes:
+        ttft_ewma: 首个响应块时间的指数加权平均（秒），None 表示尚无样本
+        failures: 连续失败次数
+        unhealthy_until: 在该时间（monotonic）之前视为不健康
+    """
+
+    ttft_ewma: float | None = None
+    failures: int = 0
+    unhealthy_until: float = 0.0
+
+
+class EndpointTracker:
+    """按端点记录首个响应块时间的 EWMA 和失败情况.
+
+    Attributes:
+        alpha: EWMA 中新样本的权重
+        unhealthy_seconds: 失败后视为不健康的秒数
+    """
+
+    def __init__(
+        self, alpha: float = 0.3, unhealthy_seconds: float | None = None
+    ) -> None:
+        """初始化记录器.
+
+        Args:
+            alpha: EWMA 中新样本的权重
+            unhealthy_seconds: 失败后视为不健康的秒数，默认读取环境变量
+                MODEL_ENDPOINT_UNHEALTHY_SECONDS 或 30
+        """
+        if unhealthy_seconds is None:
+            unhealthy_seconds = float(
+                os.getenv("MODEL_ENDPOINT_UNHEALTHY_SECONDS", "30")
+            )
+        self.alpha: float = alpha
+        self.unhealthy_seconds: float = unhealthy_seconds
+        self._stats: dict[EndpointKey, EndpointStats] = {}
+
+    def get_stats(self, key: EndpointKey) -> EndpointStats:
+        """获取端点状态，不存在时创建."""
+        return self._stats.setdefault(key, EndpointStats())
+
+    def record_success(self, key: EndpointKey, ttft: float) -> None:
+        """记录一次成功调用的首个响应块时间.
+
+        Args:
+            key: 端点 (config_id, model_id)
+            ttft: 首个响应块时间（秒）
+        """
+        stats = self.get_stats(key)
+        stats.failures = 0
+        stats.unhealthy_until = 0.0
+        self.record_latency(key, ttft)
+
+    def record_latency(self, key: EndpointKey, ttft: float) -> None:
+        """记录一个延迟样本而不改变健康状态.
+
+        对冲落败的端点以其已等待的时间作为样本，使慢端点的 EWMA 随之上升。
+
+        Args:
+            key: 端点 (config_id, model_id)
+            ttft: 首个响应块时间或已等待时间（秒）
+        """
+        stats = self.get_stats(key)
+        stats.ttft_ewma = (
+            ttft
+            if stats.ttft_ewma is None
+            else self.alpha * ttft + (1 - self.alpha) * stats.ttft_ewma
+        )
+
+    def record_failure(self, key: EndpointKey) -> None:
+        """记录一次失败，端点在一段时间内排到健康端点之后.
+
+        Args:
+            key: 端点 (config_id, model_id)
+        """
+        stats = self.get_stats(key)
+        stats.failures += 1
+        stats.unhealthy_until = time.monotonic() + self.unhealthy_seconds
+
+    def rank(self, keys: list[EndpointKey]) -> list[EndpointKey]:
+        """按健康状态和延迟排序端点.
+
+        健康端点在前并按 EWMA 升序；尚无样本的端点视为最快以获得样本；
+        相同时保持传入顺序。不健康端点保留在最后作为兜底。
+
+        Args:
+            keys: 按配置优先级排列的端点
+
+        Returns:
+            排序后的端点
+        """
+        now = time.monotonic()
+
+        def sort_key(key: EndpointKey) -> tuple[bool, float]:
+            stats = self._stats.get(key)
+            if stats is None:
+                return (False, 0.0)
+            return (stats.unhealthy_until > now, stats.ttft_ewma or 0.0)
+
+        return sorted(keys, key=sort_key)
+
+    def clear(self) -> None:
+        """清空所有记录."""
+        self._stats.clear()
+
+
+_tracker: EndpointTracker | None = None
+
+
+def get_endpoint_tracker() -> EndpointTracker:
+    """获取全局端点记录器.
+
+    Returns:
+        EndpointTracker 单例
+    """
+    global _tracker
+    if _tracker is None:
+        _tracker = EndpointTracker()
+    return _tracker
+
+
+@dataclass
+class _FirstChunk:
+    """端点返回的首个响应块.
+
+    Attributes:
+        key: 端点
+        first: 首个响应块（非流式时为完整响应）
+        rest: 流式响应的剩余部分，非流式时为 None
+        ttft: 首个响应块时间（秒）
+    """
+
+    key: EndpointKey
+    first: ChatResponse
+    rest: AsyncGenerator[ChatResponse, None] | None
+    ttft: float
+
+
+class RoutedChatModel(ChatModelBase):
+    """在多个端点间故障转移和对冲的模型.
+
+    Attributes:
+        endpoints: 端点到模型的映射，插入顺序即配置优先级
+        policy: 路由策略
+    """
+
+    def __init__(
+        self,
+        endpoints: dict[EndpointKey, ChatModelBase],
+        policy: RoutingPolicy,
+        tracker: EndpointTracker | None = None,
+    ) -> None:
+        """初始化路由模型.
+
+        Args:
+            endpoints: 端点到模型的映射，第一个为首选端点
+            policy: 路由策略
+            tracker: 端点记录器，默认使用全局记录器
+        """
+        primary = next(iter(endpoints.values()))
+        super().__init__(model_name=primary.model_name, stream=primary.stream)
+        self.endpoints: dict[EndpointKey, ChatModelBase] = endpoints
+        self.policy: RoutingPolicy = policy
+        self._tracker: EndpointTracker = tracker or get_endpoint_tracker()
+
+    async def __call__(
+        self, *args: Any, **kwargs: Any
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        """按路由策略调用端点，返回最先产生首个响应块的结果."""
+        order = self._tracker.rank(list(self.endpoints))
+        # 进行中的请求及其端点和开始时间
+        pending: dict[asyncio.Task, tuple[EndpointKey, float]] = {}
+        next_index = 0
+        hedged = False
+        won = False
+        last_error: BaseException | None = None
+
+        def launch() -> None:
+            nonlocal next_index
+            key = order[next_index]
+            next_index += 1
+            task = asyncio.create_task(self._first_chunk(key, args, kwargs))
+            pending[task] = (key, time.perf_counter())
+
+        launch()
+        try:
+            while pending:
+                can_hedge = (
+                    self.policy.hedge_after is not None
+                    and not hedged
+                    and next_index < len(order)
+                )
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.policy.hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = True
+                    logger.info(
+                        f"首个响应块超过 {self.policy.hedge_after} 秒，"
+                        f"对冲到端点 {order[next_index]}"
+                    )
+                    launch()
+                    continue
+
+                winner = None
+                for task in done:
+                    key, _ = pending.pop(task)
+                    if task.exception() is None:
+                        if winner is None:
+                            winner = task.result()
+                        else:
+                            await _close(task.result())
+                        continue
+                    last_error = task.exception()
+                    self._tracker.record_failure(key)
+                    logger.warning(f"端点 {key} 调用失败: {last_error}")
+
+                if winner is not None:
+                    won = True
+                    self._tracker.record_success(winner.key, winner.ttft)
+                    return self._result(winner)
+
+                if self.policy.failover and not pending and next_index < len(order):
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            for task, (key, started) in pending.items():
+                try:
+                    result = await task
+                except asyncio.CancelledError:
+                    if won:
+                        # 落败端点至少需要已等待的时间
+                        elapsed = time.perf_counter() - started
+                        self._tracker.record_latency(key, elapsed)
+                    continue
+                except BaseException:
+                    continue
+                await _close(result)
+
+        raise last_error
+
+    async def _first_chunk(
+        self, key: EndpointKey, args: tuple, kwargs: dict
+    ) -> _FirstChunk:
+        """调用一个端点直到得到首个响应块."""
+        start = time.perf_counter()
+        response = await self.endpoints[key](*args, **kwargs)
+        if not inspect.isasyncgen(response):
+            return _FirstChunk(key, response, None, time.perf_counter() - start)
+
+        try:
+            first = await anext(response)
+        except BaseException:
+            await response.aclose()
+            raise
+        return _FirstChunk(key, first, response, time.perf_counter() - start)
+
+    @staticmethod
+    def _result(
+        chunk: _FirstChunk,
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        """将胜出端点的首个响应块还原为原始的返回形式."""
+        if chunk.rest is None:
+            return chunk.first
+        return _prepend(chunk.first, chunk.rest)
+
+
+async def _prepend(
+    first: ChatResponse, rest: AsyncGenerator[ChatResponse, None]
+) -> AsyncGenerator[ChatResponse, None]:
+    """先产生首个响应块，再产生剩余部分."""
+    try:
+        yield first
+        async for chunk in rest:
+            yield chunk
+    finally:
+        await rest.aclose()
+
+
+async def _close(chunk: _FirstChunk) -> None:
+    """关闭落败端点的流式响应，释放连接和调用许可."""
+    if chunk.rest is not None:
+        await chunk.rest.aclose()
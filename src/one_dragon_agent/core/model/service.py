@@ -2,10 +2,14 @@
 """通用模型配置服务层."""
 
 from datetime import datetime
+from typing import AsyncIterator
 
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from one_dragon_agent.core.model.models import (
+    BulkImportItemResult,
+    BulkImportResponse,
     ModelConfigCreate,
     ModelConfigUpdate,
     ModelConfigResponse,
@@ -14,7 +18,10 @@ from one_dragon_agent.core.model.models import (
     TestConnectionResponse,
     PaginatedModelConfigResponse,
 )
-from one_dragon_agent.core.model.repository import ModelConfigRepository
+from one_dragon_agent.core.model.repository import (
+    ModelConfigRepository,
+    encode_cursor,
+)
 from one_dragon_agent.core.system.log import get_logger
 
 logger = get_logger(__name__)
@@ -101,36 +108,181 @@ class ModelConfigService:
         # 验证配置名称唯一性
         await self.validate_config_unique(config.name)
 
-        # 创建配置
-        created_config = await self._repository.create_config(config)
-
-        # 如果是 Qwen provider 且有 oauth_token，保存到数据库
+        # Qwen provider 的 oauth_token 与配置在同一条 INSERT 中写入
+        oauth_token_data = None
         if config.provider == "qwen" and config.oauth_token:
-            from one_dragon_agent.core.model.qwen.token_encryption import (
-                get_token_encryption,
+            oauth_token_data = self._build_oauth_token_data(config.oauth_token)
+
+        return await self._repository.create_config(config, oauth_token_data)
+
+    @staticmethod
+    def _build_oauth_token_data(oauth_token: dict) -> dict:
+        """将创建请求中的 OAuth token 转换为加密后的 token 数据.
+
+        Args:
+            oauth_token: 创建请求中的 OAuth token
+
+        Returns:
+            OAuth token 数据字典
+        """
+        from one_dragon_agent.core.model.qwen.token_encryption import (
+            get_token_encryption,
+        )
+
+        encryption = get_token_encryption()
+        token_data = {
+            "access_token": encryption.encrypt(oauth_token["access_token"]),
+            "token_type": "Bearer",
+            "refresh_token": encryption.encrypt(oauth_token["refresh_token"]),
+            "expires_at": oauth_token["expires_at"],
+            "scope": "openid profile email model.completion",
+            "metadata": None,
+        }
+        if oauth_token.get("resource_url"):
+            import json
+
+            token_data["metadata"] = json.dumps(
+                {"resource_url": oauth_token["resource_url"]}
             )
+        return token_data
 
-            encryption = get_token_encryption()
-            token_data = {
-                "access_token": encryption.encrypt(config.oauth_token["access_token"]),
-                "token_type": "Bearer",
-                "refresh_token": encryption.encrypt(config.oauth_token["refresh_token"]),
-                "expires_at": config.oauth_token["expires_at"],
-                "scope": "openid profile email model.completion",
-                "metadata": None,
-            }
-            if config.oauth_token.get("resource_url"):
-                import json
-
-                token_data["metadata"] = json.dumps(
-                    {"resource_url": config.oauth_token["resource_url"]}
+    async def bulk_import_model_configs(self, items: list[dict]) -> BulkImportResponse:
+        """批量导入模型配置（按名称新增或更新）.
+
+        校验通过的配置在同一个事务中写入，校验失败的配置单独报告错误，
+        不影响其他配置。更新已有配置时，未提供的 api_key / oauth_token 保持不变。
+
+        Args:
+            items: 待导入的配置，字段与创建请求相同
+
+        Returns:
+            批量导入结果
+
+        Raises:
+            ValueError: 如果写入数据库失败（此时所有配置都不会写入）
+        """
+        results: list[BulkImportItemResult] = []
+        valid: list[tuple[int, ModelConfigCreate]] = []
+        seen: set[str] = set()
+        for index, item in enumerate(items):
+            try:
+                config = ModelConfigCreate.model_validate(item)
+            except ValidationError as e:
+                name = item.get("name") if isinstance(item, dict) else None
+                results.append(
+                    BulkImportItemResult(
+                        index=index,
+                        name=name if isinstance(name, str) else None,
+                        status="error",
+                        error=_format_validation_error(e),
+                    )
+                )
+                continue
+            if config.name in seen:
+                results.append(
+                    BulkImportItemResult(
+                        index=index,
+                        name=config.name,
+                        status="error",
+                        error="配置名称在导入数据中重复",
+                    )
+                )
+                continue
+            seen.add(config.name)
+            valid.append((index, config))
+
+        existing = await self._repository.get_ids_by_names(
+            [config.name for _, config in valid]
+        )
+
+        accepted: list[tuple[int, ModelConfigCreate, dict | None]] = []
+        for index, config in valid:
+            is_new = config.name not in existing
+            error = None
+            if is_new and config.provider == "openai" and not config.api_key:
+                error = "OpenAI provider 必须提供 api_key"
+            elif is_new and config.provider == "qwen" and not config.oauth_token:
+                error = "Qwen provider 必须提供 oauth_token"
+            if error is not None:
+                results.append(
+                    BulkImportItemResult(
+                        index=index, name=config.name, status="error", error=error
+                    )
                 )
+                continue
+            oauth_token_data = None
+            if config.provider == "qwen" and config.oauth_token:
+                try:
+                    oauth_token_data = self._build_oauth_token_data(config.oauth_token)
+                except (KeyError, TypeError) as e:
+                    results.append(
+                        BulkImportItemResult(
+                            index=index,
+                            name=config.name,
+                            status="error",
+                            error=f"oauth_token 缺少字段: {e}",
+                        )
+                    )
+                    continue
+            accepted.append((index, config, oauth_token_data))
+
+        ids = {}
+        if accepted:
+            ids = await self._repository.upsert_configs(
+                [(config, token) for _, config, token in accepted]
+            )
 
-            await self._repository.update_oauth_token(
-                created_config.id, token_data
+        _invalidate_shared_models(
+            *(ids[config.name] for _, config, _ in accepted if config.name in existing)
+        )
+        for index, config, _ in accepted:
+            results.append(
+                BulkImportItemResult(
+                    index=index,
+                    name=config.name,
+                    status="updated" if config.name in existing else "created",
+                    id=ids.get(config.name),
+                )
             )
+        results.sort(key=lambda r: r.index)
+
+        return BulkImportResponse(
+            created=sum(r.status == "created" for r in results),
+            updated=sum(r.status == "updated" for r in results),
+            failed=sum(r.status == "error" for r in results),
+            items=results,
+        )
+
+    async def export_model_configs(
+        self,
+        is_active: bool | None = None,
+        provider: str | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[ModelConfigResponse]]:
+        """按游标分批读取全部配置，用于导出.
 
-        return created_config
+        导出内容不包含 api_key 和 OAuth token。
+
+        Args:
+            is_active: 是否启用（可选过滤条件）
+            provider: 提供商（可选过滤条件）
+            batch_size: 每批读取的记录数
+
+        Yields:
+            一批配置
+        """
+        cursor = None
+        while True:
+            configs, cursor, _ = await self._repository.get_configs_after(
+                cursor=cursor,
+                page_size=batch_size,
+                is_active=is_active,
+                provider=provider,
+            )
+            if configs:
+                yield configs
+            if cursor is None:
+                break
 
     async def get_model_config_internal(self, config_id: int) -> ModelConfigInternal:
         """获取包含 api_key 的完整配置(仅供内部使用).
@@ -171,17 +323,24 @@ class ModelConfigService:
         page_size: int = 20,
         is_active: bool | None = None,
         provider: str | None = None,
+        cursor: str | None = None,
     ) -> PaginatedModelConfigResponse:
         """获取配置列表.
 
+        传入 cursor 时使用游标分页，忽略 page，总数为缓存的近似值。
+
         Args:
             page: 页码（从 1 开始）
             page_size: 每页记录数（最大 100）
             is_active: 是否启用（可选过滤条件）
             provider: 提供商（可选过滤条件）
+            cursor: 上一页返回的 next_cursor（可选）
 
         Returns:
             分页响应
+
+        Raises:
+            ValueError: 如果 provider 不支持或游标无效
         """
         # 验证 provider 字段
         if provider is not None and provider not in ("openai", "qwen"):
@@ -191,6 +350,21 @@ class ModelConfigService:
         # 限制 page_size 最大值
         page_size = min(page_size, 100)
 
+        if cursor is not None:
+            configs, next_cursor, total = await self._repository.get_configs_after(
+                cursor=cursor,
+                page_size=page_size,
+                is_active=is_active,
+                provider=provider,
+            )
+            return PaginatedModelConfigResponse(
+                total=total,
+                page=page,
+                page_size=page_size,
+                items=configs,
+                next_cursor=next_cursor,
+            )
+
         configs, total = await self._repository.get_configs(
             page=page,
             page_size=page_size,
@@ -198,11 +372,17 @@ class ModelConfigService:
             provider=provider,
         )
 
+        # 页码分页也返回游标，客户端可从任意一页切换到游标分页
+        next_cursor = None
+        if len(configs) == page_size and page * page_size < total:
+            next_cursor = encode_cursor(configs[-1].created_at, configs[-1].id)
+
         return PaginatedModelConfigResponse(
             total=total,
             page=page,
             page_size=page_size,
             items=configs,
+            next_cursor=next_cursor,
         )
 
     async def update_model_config(
@@ -225,7 +405,9 @@ class ModelConfigService:
             msg = f"不支持的 provider: {config_update.provider}"
             raise ValueError(msg)
 
-        return await self._repository.update_config(config_id, config_update)
+        updated = await self._repository.update_config(config_id, config_update)
+        _invalidate_shared_models(config_id)
+        return updated
 
     async def delete_model_config(self, config_id: int) -> bool:
         """删除模型配置.
@@ -239,7 +421,9 @@ class ModelConfigService:
         Raises:
             ValueError: 如果配置不存在
         """
-        return await self._repository.delete_config(config_id)
+        deleted = await self._repository.delete_config(config_id)
+        _invalidate_shared_models(config_id)
+        return deleted
 
     async def toggle_config_status(
         self, config_id: int, is_active: bool
@@ -256,7 +440,9 @@ class ModelConfigService:
         Raises:
             ValueError: 如果配置不存在
         """
-        return await self._repository.toggle_config_status(config_id, is_active)
+        updated = await self._repository.toggle_config_status(config_id, is_active)
+        _invalidate_shared_models(config_id)
+        return updated
 
     @staticmethod
     async def test_connection(request: TestConnectionRequest) -> TestConnectionResponse:
@@ -359,3 +545,32 @@ class ModelConfigService:
                     message=f"连接失败: {str(e)}",
                     raw_error={"error": str(e)},
                 )
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """将 Pydantic 校验错误转换为简短的错误信息.
+
+    Args:
+        error: 校验错误
+
+    Returns:
+        以分号分隔的错误信息
+    """
+    messages = []
+    for item in error.errors():
+        loc = ".".join(str(part) for part in item["loc"])
+        messages.append(f"{loc}: {item['msg']}" if loc else item["msg"])
+    return "; ".join(messages)
+
+
+def _invalidate_shared_models(*config_ids: int) -> None:
+    """配置变更后移除注册表中的共享模型实例.
+
+    Args:
+        *config_ids: 变更的配置 ID
+    """
+    from one_dragon_agent.core.model.registry import get_model_registry
+
+    registry = get_model_registry()
+    for config_id in config_ids:
+        registry.invalidate(config_id)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Cheap prompt token estimation.
+
+The estimate does not depend on a provider tokenizer, so it can run on every
+reasoning step: a CJK character is counted as about one token and other text
+as about four characters per token.
+"""
+
+from typing import Any
+
+from agentscope.message import Msg
+
+from one_dragon_agent.core.system.json_codec import dumps_compact
+
+# 每条消息的角色、分隔符等固定开销
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text.
+
+    CJK characters take 3 bytes in UTF-8 while ASCII takes 1, so the number of
+    wide characters is derived from the encoded length without scanning the
+    text in Python.
+
+    Args:
+        text: The text to estimate.
+
+    Returns:
+        Estimated number of tokens.
+    """
+    if not text:
+        return 0
+    length = len(text)
+    wide = (len(text.encode("utf-8")) - length) // 2
+    return wide + (length - wide + 3) // 4
+
+
+def estimate_block_tokens(block: dict[str, Any]) -> int:
+    """Estimate the number of tokens of a content block.
+
+    Args:
+        block: A content block of a message (text, thinking, tool_use, tool_result).
+
+    Returns:
+        Estimated number of tokens, 0 for unsupported block types.
+    """
+    block_type = block.get("type")
+    if block_type == "text":
+        return estimate_tokens(block.get("text", ""))
+    if block_type == "thinking":
+        return estimate_tokens(block.get("thinking", ""))
+    if block_type == "tool_use":
+        return estimate_tokens(block.get("name", "")) + estimate_tokens(
+            dumps_compact(block.get("input", {}))
+        )
+    if block_type == "tool_result":
+        output = block.get("output", "")
+        if isinstance(output, str):
+            return estimate_tokens(output)
+        return sum(estimate_block_tokens(b) for b in output)
+    return 0
+
+
+def estimate_msg_tokens(msg: Msg) -> int:
+    """Estimate the number of prompt tokens a message takes.
+
+    Args:
+        msg: The message to estimate.
+
+    Returns:
+        Estimated number of tokens.
+    """
+    if isinstance(msg.content, str):
+        return _MESSAGE_OVERHEAD_TOKENS + estimate_tokens(msg.content)
+    return _MESSAGE_OVERHEAD_TOKENS + sum(
+        estimate_block_tokens(block) for block in msg.content
+    )
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""模型调用用量统计.
+
+在模型调用路径上包装一层 InstrumentedChatModel，记录每次调用的
+prompt/completion token、首 token 时间（TTFT）、总耗时和每轮迭代次数，
+并按会话和模型配置聚合。传入 ModelCallLimiter 时，调用先排队获取许可，
+流式响应消费完毕后才归还。
+"""
+
+import asyncio
+import inspect
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator
+
+from agentscope.model import ChatModelBase, ChatResponse
+
+from one_dragon_agent.core.model.limiter import (
+    ModelCallLimiter,
+    ModelCallPermit,
+    StatusCallback,
+)
+from one_dragon_agent.core.model.token_estimator import (
+    estimate_block_tokens,
+    estimate_tokens,
+)
+from one_dragon_agent.core.system.json_codec import dumps_compact
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ModelUsageStats:
+    """模型调用的累计用量.
+
+    Attributes:
+        calls: 调用次数
+        errors: 失败的调用次数
+        prompt_tokens: 累计 prompt token
+        completion_tokens: 累计 completion token
+        ttft_seconds: 累计首 token 时间（秒）
+        latency_seconds: 累计调用耗时（秒）
+        max_latency_seconds: 单次调用最大耗时（秒）
+        turns: 发生过模型调用的对话轮次数
+        max_iterations: 单轮最多的模型调用次数
+    """
+
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    ttft_seconds: float = 0.0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    turns: int = 0
+    max_iterations: int = 0
+
+    def add_call(
+        self,
+        prompt_tokens: int,
+        completion_tokens: int,
+        ttft: float,
+        latency: float,
+        error: bool,
+        iteration: int,
+    ) -> None:
+        """累加一次调用.
+
+        Args:
+            prompt_tokens: 本次 prompt token
+            completion_tokens: 本次 completion token
+            ttft: 本次首 token 时间（秒）
+            latency: 本次调用耗时（秒）
+            error: 本次调用是否失败
+            iteration: 本次调用是当前轮次的第几次调用（从 1 开始）
+        """
+        self.calls += 1
+        self.errors += int(error)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.ttft_seconds += ttft
+        self.latency_seconds += latency
+        self.max_latency_seconds = max(self.max_latency_seconds, latency)
+        if iteration == 1:
+            self.turns += 1
+        self.max_iterations = max(self.max_iterations, iteration)
+
+
+class ModelUsageRecorder:
+    """按会话和模型配置聚合模型调用用量.
+
+    按会话的记录只保留最近活跃的 ``max_sessions`` 个会话，超过时丢弃最久未活跃的会话；
+    按模型配置的记录不受影响。
+
+    Attributes:
+        max_sessions: 保留用量的会话数上限
+    """
+
+    def __init__(self, max_sessions: int | None = None) -> None:
+        """初始化记录器.
+
+        Args:
+            max_sessions: 保留用量的会话数上限，默认读取环境变量
+                MODEL_USAGE_MAX_SESSIONS 或 1000
+        """
+        if max_sessions is None:
+            max_sessions = int(os.getenv("MODEL_USAGE_MAX_SESSIONS", "1000"))
+        self.max_sessions: int = max(1, max_sessions)
+        self._by_session: OrderedDict[str, ModelUsageStats] = OrderedDict()
+        self._by_config: dict[tuple[int, str], ModelUsageStats] = {}
+        self._turn_iterations: OrderedDict[str, int] = OrderedDict()
+
+    def begin_turn(self, session_id: str) -> None:
+        """标记会话开始新的一轮对话，用于统计每轮迭代次数.
+
+        Args:
+            session_id: 会话 ID
+        """
+        self._turn_iterations[session_id] = 0
+        self._touch(session_id)
+
+    def _touch(self, session_id: str) -> None:
+        """把会话标记为最近活跃，超过上限时丢弃最久未活跃的会话."""
+        for records in (self._by_session, self._turn_iterations):
+            if session_id in records:
+                records.move_to_end(session_id)
+            while len(records) > self.max_sessions:
+                records.popitem(last=False)
+
+    def record(
+        self,
+        session_id: str,
+        config_id: int,
+        model_id: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        ttft: float,
+        latency: float,
+        error: bool = False,
+    ) -> None:
+        """记录一次模型调用.
+
+        Args:
+            session_id: 会话 ID
+            config_id: 模型配置 ID
+            model_id: 模型 ID
+            prompt_tokens: prompt token
+            completion_tokens: completion token
+            ttft: 首 token 时间（秒）
+            latency: 调用耗时（秒）
+            error: 调用是否失败
+        """
+        iteration = self._turn_iterations.get(session_id, 0) + 1
+        self._turn_iterations[session_id] = iteration
+
+        for stats in (
+            self._by_session.setdefault(session_id, ModelUsageStats()),
+            self._by_config.setdefault((config_id, model_id), ModelUsageStats()),
+        ):
+            stats.add_call(
+                prompt_tokens, completion_tokens, ttft, latency, error, iteration
+            )
+        self._touch(session_id)
+
+    def get_session_stats(self, session_id: str) -> ModelUsageStats | None:
+        """获取会话的用量.
+
+        Args:
+            session_id: 会话 ID
+
+        Returns:
+            会话用量，没有调用记录时返回 None
+        """
+        return self._by_session.get(session_id)
+
+    def get_all_session_stats(self) -> dict[str, ModelUsageStats]:
+        """获取所有会话的用量."""
+        return dict(self._by_session)
+
+    def get_all_config_stats(self) -> dict[tuple[int, str], ModelUsageStats]:
+        """获取所有模型配置的用量，键为 (config_id, model_id)."""
+        return dict(self._by_config)
+
+    def clear(self) -> None:
+        """清空所有记录."""
+        self._by_session.clear()
+        self._by_config.clear()
+        self._turn_iterations.clear()
+
+
+_recorder: ModelUsageRecorder | None = None
+
+
+def get_model_usage_recorder() -> ModelUsageRecorder:
+    """获取全局模型用量记录器.
+
+    Returns:
+        ModelUsageRecorder 单例
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = ModelUsageRecorder()
+    return _recorder
+
+
+class InstrumentedChatModel(ChatModelBase):
+    """记录用量的模型包装.
+
+    将调用委托给内部模型（OpenAIChatModel、QwenChatModel 等），
+    流式调用时包装返回的生成器以测量首 token 时间。
+    模型未返回 usage 时按 token_estimator 估算。
+    耗时从获得限制器许可时开始计算，不包含排队时间。
+
+    Attributes:
+        model: 被包装的模型
+        session_id: 会话 ID
+        config_id: 模型配置 ID
+        model_id: 模型 ID
+    """
+
+    def __init__(
+        self,
+        model: ChatModelBase,
+        session_id: str,
+        config_id: int,
+        model_id: str,
+        recorder: ModelUsageRecorder | None = None,
+        limiter: ModelCallLimiter | None = None,
+        on_status: StatusCallback | None = None,
+    ) -> None:
+        """初始化模型包装.
+
+        Args:
+            model: 被包装的模型
+            session_id: 会话 ID
+            config_id: 模型配置 ID
+            model_id: 模型 ID
+            recorder: 用量记录器，默认使用全局记录器
+            limiter: 调用限制器，None 表示不限制
+            on_status: 调用排队和出队时的状态回调
+        """
+        super().__init__(model_name=model.model_name, stream=model.stream)
+        self.model: ChatModelBase = model
+        self.session_id: str = session_id
+        self.config_id: int = config_id
+        self.model_id: str = model_id
+        self._recorder: ModelUsageRecorder = recorder or get_model_usage_recorder()
+        self._limiter: ModelCallLimiter | None = limiter
+        self._on_status: StatusCallback | None = on_status
+
+    def __getattr__(self, name: str) -> Any:
+        """未定义的属性委托给内部模型."""
+        model = self.__dict__.get("model")
+        if model is None:
+            raise AttributeError(name)
+        return getattr(model, name)
+
+    async def __call__(
+        self, *args: Any, **kwargs: Any
+    ) -> ChatResponse | AsyncGenerator[ChatResponse, None]:
+        """获取调用许可后调用内部模型并记录用量."""
+        permit = await self._acquire(args, kwargs)
+        start = time.perf_counter()
+        try:
+            response = await self.model(*args, **kwargs)
+        except asyncio.CancelledError as e:
+            # 对冲落败或客户端断开，预扣的 token 按已消耗处理
+            self._release(permit, 0 if permit is None else permit.tokens, e)
+            raise
+        except Exception as e:
+            used = self._record(start, None, None, args, kwargs, error=True)
+            self._release(permit, used, e)
+            raise
+
+        if inspect.isasyncgen(response):
+            return self._wrap_stream(response, start, args, kwargs, permit)
+
+        used = self._record(start, time.perf_counter(), response, args, kwargs)
+        self._release(permit, used)
+        return response
+
+    async def _acquire(self, args: tuple, kwargs: dict) -> ModelCallPermit | None:
+        """从限制器获取调用许可，排队时通过状态回调通知会话."""
+        if self._limiter is None:
+            return None
+
+        permit = await self._limiter.acquire(
+            self.session_id, _estimate_prompt_tokens(args, kwargs), self._on_status
+        )
+        if permit.wait_seconds and self._on_status is not None:
+            await self._on_status(
+                {
+                    "hint": "model_dequeued",
+                    "queue_wait_ms": round(permit.wait_seconds * 1000),
+                }
+            )
+        return permit
+
+    def _release(
+        self,
+        permit: ModelCallPermit | None,
+        used_tokens: int,
+        error: BaseException | None = None,
+    ) -> None:
+        """归还调用许可."""
+        if permit is not None:
+            self._limiter.release(permit, used_tokens, error)
+
+    async def _wrap_stream(
+        self,
+        stream: AsyncGenerator[ChatResponse, None],
+        start: float,
+        args: tuple,
+        kwargs: dict,
+        permit: ModelCallPermit | None = None,
+    ) -> AsyncGenerator[ChatResponse, None]:
+        """包装流式响应，记录首个响应块的时间，消费完毕后归还许可.
+
+        流被取消或提前关闭（对冲落败、客户端断开）时不记录用量，
+        归还许可时也不按成功调用调整并发上限。
+        """
+        first_at = None
+        last = None
+        try:
+            async for chunk in stream:
+                if first_at is None:
+                    first_at = time.perf_counter()
+                last = chunk
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit) as e:
+            # 与 __call__ 一致，预扣的 token 按已消耗处理
+            self._release(permit, 0 if permit is None else permit.tokens, e)
+            raise
+        except Exception as e:
+            used = self._record(start, first_at, last, args, kwargs, error=True)
+            self._release(permit, used, e)
+            raise
+
+        used = self._record(start, first_at, last, args, kwargs)
+        self._release(permit, used)
+
+    def _record(
+        self,
+        start: float,
+        first_at: float | None,
+        response: ChatResponse | None,
+        args: tuple,
+        kwargs: dict,
+        error: bool = False,
+    ) -> int:
+        """记录一次调用的用量.
+
+        Returns:
+            本次调用的总 token（prompt + completion）
+        """
+        end = time.perf_counter()
+        usage = None if response is None else response.usage
+        if usage is not None:
+            prompt_tokens = usage.input_tokens
+            completion_tokens = usage.output_tokens
+        else:
+            prompt_tokens = _estimate_prompt_tokens(args, kwargs)
+            completion_tokens = (
+                0
+                if response is None
+                else sum(estimate_block_tokens(b) for b in response.content)
+            )
+
+        self._recorder.record(
+            self.session_id,
+            self.config_id,
+            self.model_id,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            ttft=(first_at or end) - start,
+            latency=end - start,
+            error=error,
+        )
+        return prompt_tokens + completion_tokens
+
+
+def _estimate_prompt_tokens(args: tuple, kwargs: dict) -> int:
+    """估算模型调用的 prompt token（消息和工具定义）."""
+    messages = args[0] if args else kwargs.get("messages", [])
+    tools = args[1] if len(args) > 1 else kwargs.get("tools")
+    return estimate_tokens(dumps_compact(messages)) + (
+        0 if tools is None else estimate_tokens(dumps_compact(tools))
+    )
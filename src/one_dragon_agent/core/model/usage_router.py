@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""模型用量统计 API 路由."""
+
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel
+
+from one_dragon_agent.core.model.usage import (
+    ModelUsageStats,
+    get_model_usage_recorder,
+)
+
+router = APIRouter(prefix="/api/models/usage", tags=["模型用量"])
+
+
+class ModelUsageStatsResponse(BaseModel):
+    """模型用量统计响应."""
+
+    calls: int
+    errors: int
+    prompt_tokens: int
+    completion_tokens: int
+    avg_ttft_ms: float
+    avg_latency_ms: float
+    max_latency_ms: float
+    turns: int
+    avg_iterations: float
+    max_iterations: int
+
+    @classmethod
+    def from_stats(cls, stats: ModelUsageStats) -> "ModelUsageStatsResponse":
+        """从累计用量构造响应.
+
+        Args:
+            stats: 累计用量
+
+        Returns:
+            用量统计响应
+        """
+        calls = max(stats.calls, 1)
+        return cls(
+            calls=stats.calls,
+            errors=stats.errors,
+            prompt_tokens=stats.prompt_tokens,
+            completion_tokens=stats.completion_tokens,
+            avg_ttft_ms=stats.ttft_seconds / calls * 1000,
+            avg_latency_ms=stats.latency_seconds / calls * 1000,
+            max_latency_ms=stats.max_latency_seconds * 1000,
+            turns=stats.turns,
+            avg_iterations=stats.calls / max(stats.turns, 1),
+            max_iterations=stats.max_iterations,
+        )
+
+
+class ConfigUsageResponse(ModelUsageStatsResponse):
+    """单个模型配置的用量统计响应."""
+
+    config_id: int
+    model_id: str
+
+
+class ModelUsageResponse(BaseModel):
+    """全部模型用量统计响应."""
+
+    sessions: dict[str, ModelUsageStatsResponse]
+    configs: list[ConfigUsageResponse]
+
+
+@router.get(
+    "",
+    response_model=ModelUsageResponse,
+    summary="获取模型用量统计",
+)
+async def get_model_usage() -> ModelUsageResponse:
+    """获取按会话和模型配置聚合的模型用量统计.
+
+    Returns:
+        各会话及各模型配置的用量统计
+    """
+    recorder = get_model_usage_recorder()
+    return ModelUsageResponse(
+        sessions={
+            session_id: ModelUsageStatsResponse.from_stats(stats)
+            for session_id, stats in recorder.get_all_session_stats().items()
+        },
+        configs=[
+            ConfigUsageResponse(
+                config_id=config_id,
+                model_id=model_id,
+                **ModelUsageStatsResponse.from_stats(stats).model_dump(),
+            )
+            for (config_id, model_id), stats in recorder.get_all_config_stats().items()
+        ],
+    )
+
+
+@router.get(
+    "/sessions/{session_id}",
+    response_model=ModelUsageStatsResponse,
+    summary="获取会话的模型用量统计",
+)
+async def get_session_model_usage(session_id: str) -> ModelUsageStatsResponse:
+    """获取单个会话的模型用量统计.
+
+    Args:
+        session_id: 会话 ID
+
+    Returns:
+        会话的用量统计
+
+    Raises:
+        HTTPException: 会话没有模型调用记录
+    """
+    stats = get_model_usage_recorder().get_session_stats(session_id)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"会话 {session_id} 没有模型调用记录",
+        )
+    return ModelUsageStatsResponse.from_stats(stats)
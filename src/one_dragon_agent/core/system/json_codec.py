@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""JSON 编解码模块.
+
+提供可插拔的 JSON 序列化后端，优先使用 orjson / msgspec，
+不可用时回退到标准库 json。
+
+所有后端输出的都是紧凑格式（无空格）且保留非 ASCII 字符，
+与 ``json.dumps(obj, ensure_ascii=False, separators=(",", ":"))``
+以及 Pydantic 的 ``model_dump_json()`` 对常规数据字节一致。
+
+已知差异（仅影响少见的浮点数）:
+- NaN / Infinity: orjson / msgspec 输出 ``null``（与 Pydantic 一致），标准库输出 ``NaN``
+- 科学计数法: orjson / msgspec 输出 ``1e-5``（与 Pydantic 一致），标准库输出 ``1e-05``
+"""
+
+import json
+import os
+from datetime import date, datetime
+from enum import StrEnum
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class JsonDecodeError(ValueError):
+    """JSON 反序列化失败.
+
+    统一各后端的解码异常（orjson.JSONDecodeError、msgspec.DecodeError、
+    json.JSONDecodeError），调用方无需关心当前使用的后端。
+    """
+
+
+class JsonBackend(StrEnum):
+    """JSON 序列化后端.
+
+    Attributes:
+        ORJSON: 使用 orjson
+        MSGSPEC: 使用 msgspec
+        STDLIB: 使用标准库 json
+    """
+
+    ORJSON = "orjson"
+    MSGSPEC = "msgspec"
+    STDLIB = "stdlib"
+
+
+def _default(obj: Any) -> Any:
+    """处理后端原生不支持的类型.
+
+    Args:
+        obj: 待序列化对象
+
+    Returns:
+        可被 JSON 序列化的对象
+
+    Raises:
+        TypeError: 如果对象类型不支持
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+class JsonCodec:
+    """JSON 编解码器.
+
+    在初始化时绑定具体后端的编解码函数，调用时没有额外的分支判断。
+
+    Attributes:
+        backend: 当前使用的后端
+    """
+
+    def __init__(self, backend: JsonBackend | str | None = None) -> None:
+        """初始化编解码器.
+
+        Args:
+            backend: 指定后端，为 None 时按 orjson > msgspec > stdlib 自动选择
+
+        Raises:
+            ValueError: 如果指定的后端不存在或未安装
+        """
+        if backend is None:
+            self.backend = self._detect_backend()
+        else:
+            self.backend = JsonBackend(backend)
+
+        self._dumps: Callable[[Any], str]
+        self._dumpb: Callable[[Any], bytes]
+        self._loads: Callable[[str | bytes], Any]
+        self._decode_error: type[Exception]
+        self._bind_backend()
+
+    @staticmethod
+    def _detect_backend() -> JsonBackend:
+        """自动检测可用的最快后端.
+
+        Returns:
+            可用的后端
+        """
+        try:
+            import orjson  # noqa: F401
+
+            return JsonBackend.ORJSON
+        except ImportError:
+            pass
+
+        try:
+            import msgspec  # noqa: F401
+
+            return JsonBackend.MSGSPEC
+        except ImportError:
+            pass
+
+        return JsonBackend.STDLIB
+
+    def _bind_backend(self) -> None:
+        """绑定后端的编解码函数.
+
+        Raises:
+            ValueError: 如果后端未安装
+        """
+        try:
+            if self.backend == JsonBackend.ORJSON:
+                import orjson
+
+                option = orjson.OPT_NON_STR_KEYS
+
+                def dumpb(obj: Any) -> bytes:
+                    return orjson.dumps(obj, default=_default, option=option)
+
+                def dumps(obj: Any) -> str:
+                    return orjson.dumps(obj, default=_default, option=option).decode()
+
+                self._dumps = dumps
+                self._dumpb = dumpb
+                self._loads = orjson.loads
+                self._decode_error = orjson.JSONDecodeError
+            elif self.backend == JsonBackend.MSGSPEC:
+                import msgspec
+
+                encoder = msgspec.json.Encoder(enc_hook=_default)
+                decoder = msgspec.json.Decoder()
+
+                def dumps(obj: Any) -> str:
+                    return encoder.encode(obj).decode()
+
+                self._dumps = dumps
+                self._dumpb = encoder.encode
+                self._loads = decoder.decode
+                self._decode_error = msgspec.DecodeError
+            else:
+                dumps = json.JSONEncoder(
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                    default=_default,
+                ).encode
+
+                def dumpb(obj: Any) -> bytes:
+                    return dumps(obj).encode("utf-8")
+
+                self._dumps = dumps
+                self._dumpb = dumpb
+                self._loads = json.loads
+                self._decode_error = json.JSONDecodeError
+        except ImportError as e:
+            msg = f"JSON 后端 '{self.backend}' 未安装"
+            raise ValueError(msg) from e
+
+    def dumps(self, obj: Any) -> str:
+        """序列化为紧凑的 JSON 字符串.
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON 字符串
+        """
+        return self._dumps(obj)
+
+    def dumpb(self, obj: Any) -> bytes:
+        """序列化为 UTF-8 编码的 JSON 字节串.
+
+        Args:
+            obj: 待序列化对象
+
+        Returns:
+            JSON 字节串
+        """
+        return self._dumpb(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        """反序列化 JSON.
+
+        Args:
+            data: JSON 字符串或字节串
+
+        Returns:
+            反序列化后的对象
+
+        Raises:
+            JsonDecodeError: 如果数据不是合法的 JSON
+        """
+        try:
+            return self._loads(data)
+        except self._decode_error as e:
+            raise JsonDecodeError(str(e)) from e
+
+
+# 默认编解码器实例（单例模式）
+_default_codec: JsonCodec | None = None
+
+
+def get_json_codec() -> JsonCodec:
+    """获取默认的 JSON 编解码器（单例）.
+
+    可通过环境变量 JSON_BACKEND（orjson / msgspec / stdlib）强制指定后端。
+
+    Returns:
+        JsonCodec 实例
+    """
+    global _default_codec
+    if _default_codec is None:
+        backend = os.getenv("JSON_BACKEND") or None
+        _default_codec = JsonCodec(backend)
+        logger.info(f"JSON 序列化后端: {_default_codec.backend}")
+    return _default_codec
+
+
+def set_json_codec(codec: JsonCodec | None) -> None:
+    """替换默认的 JSON 编解码器.
+
+    Args:
+        codec: 新的编解码器，为 None 时在下次获取时重新检测
+    """
+    global _default_codec
+    _default_codec = codec
+
+
+def dumps_compact(obj: Any) -> str:
+    """使用默认编解码器序列化为紧凑 JSON 字符串.
+
+    等价于 ``json.dumps(obj, ensure_ascii=False, separators=(",", ":"))``。
+
+    Args:
+        obj: 待序列化对象
+
+    Returns:
+        JSON 字符串
+    """
+    return get_json_codec().dumps(obj)
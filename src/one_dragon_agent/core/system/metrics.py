@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""Low-overhead metrics with Prometheus text exposition.
+
+Metrics are plain objects with preallocated storage: incrementing a counter
+or observing a histogram value only updates existing numbers. Labeled
+children are created once and should be cached by the caller on hot paths.
+Values derived from other services (pool sizes, session counts) are set by
+collect hooks right before rendering, so they cost nothing between scrapes.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Iterator
+
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+# 适用于 HTTP 请求耗时的默认桶（秒），最后一个桶为 +Inf
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter."""
+        self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge."""
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge."""
+        self.value -= amount
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets: tuple[float, ...] = buckets
+        # 最后一个位置对应 +Inf 桶
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """Record an observed value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily:
+    """A named metric with a fixed set of label names.
+
+    Attributes:
+        name: Metric name.
+        help: Help text.
+        type: Prometheus metric type (counter, gauge, histogram).
+        label_names: Names of the labels.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        type: str,
+        label_names: tuple[str, ...],
+        factory: Callable[[], Counter | Gauge | Histogram],
+    ) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.type: str = type
+        self.label_names: tuple[str, ...] = label_names
+        self._factory = factory
+        self._children: dict[tuple[str, ...], Counter | Gauge | Histogram] = {}
+
+    def labels(self, *values: str):
+        """Get the child metric of a label combination, creating it once.
+
+        Args:
+            *values: Label values, in the order of ``label_names``.
+
+        Returns:
+            The child Counter, Gauge or Histogram.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                msg = f"{self.name} 需要标签 {self.label_names}，实际为 {values}"
+                raise ValueError(msg)
+            child = self._factory()
+            self._children[values] = child
+        return child
+
+    def clear(self) -> None:
+        """Remove all children (used for gauges rebuilt on every collect)."""
+        self._children.clear()
+
+    def render(self) -> Iterator[str]:
+        """Render the family in Prometheus text format."""
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        for values, child in self._children.items():
+            labels = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.label_names, values)
+            )
+            if isinstance(child, Histogram):
+                yield from self._render_histogram(labels, child)
+            else:
+                yield f"{self.name}{_braces(labels)} {_format(child.value)}"
+
+    def _render_histogram(self, labels: str, histogram: Histogram) -> Iterator[str]:
+        """Render the cumulative buckets, sum and count of a histogram."""
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{{prefix}le="{_format(bound)}"}} {cumulative}'
+        yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {histogram.count}'
+        yield f"{self.name}_sum{_braces(labels)} {_format(histogram.sum)}"
+        yield f"{self.name}_count{_braces(labels)} {histogram.count}"
+
+
+class MetricsRegistry:
+    """Registry of metric families and collect hooks."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._families: dict[str, MetricFamily] = {}
+        self._collect_hooks: list[Callable[[], None]] = []
+
+    def counter(
+        self, name: str, help: str, label_names: tuple[str, ...] = ()
+    ) -> MetricFamily:
+        """Get or create a counter family."""
+        return self._family(name, help, "counter", label_names, Counter)
+
+    def gauge(
+        self, name: str, help: str, label_names: tuple[str, ...] = ()
+    ) -> MetricFamily:
+        """Get or create a gauge family."""
+        return self._family(name, help, "gauge", label_names, Gauge)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> MetricFamily:
+        """Get or create a histogram family."""
+        return self._family(
+            name, help, "histogram", label_names, lambda: Histogram(buckets)
+        )
+
+    def _family(
+        self,
+        name: str,
+        help: str,
+        type: str,
+        label_names: tuple[str, ...],
+        factory: Callable[[], Counter | Gauge | Histogram],
+    ) -> MetricFamily:
+        """Get a registered family or register a new one."""
+        family = self._families.get(name)
+        if family is None:
+            family = MetricFamily(name, help, type, label_names, factory)
+            self._families[name] = family
+        elif family.type != type or family.label_names != label_names:
+            msg = f"指标 {name} 已以不同的类型或标签注册"
+            raise ValueError(msg)
+        return family
+
+    def add_collect_hook(self, hook: Callable[[], None]) -> None:
+        """Register a hook that refreshes derived values before rendering.
+
+        Args:
+            hook: Callable setting gauge values; errors are logged and ignored.
+        """
+        if hook not in self._collect_hooks:
+            self._collect_hooks.append(hook)
+
+    def render(self) -> str:
+        """Run collect hooks and render all metrics in Prometheus text format.
+
+        Returns:
+            The exposition text.
+        """
+        for hook in self._collect_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.warning(f"指标采集失败 {getattr(hook, '__name__', hook)}: {e}")
+
+        lines = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _braces(labels: str) -> str:
+    """Wrap a rendered label list in braces if it is not empty."""
+    return f"{{{labels}}}" if labels else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    """Format a sample value."""
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+_registry: MetricsRegistry | None = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry.
+
+    Returns:
+        MetricsRegistry singleton.
+    """
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
@@ -1,8 +1,7 @@
-import json
-
 from agentscope.message import TextBlock
 from agentscope.tool import ToolResponse
 
+from one_dragon_agent.core.system.json_codec import dumps_compact
 from tushare_mcp_server.main import stock_basic_by_name_like
 
 
@@ -23,7 +22,7 @@ async def tushare_stock_basic_by_name_like(name_like: str) -> ToolResponse:
         content=[
             TextBlock(
                 type="text",
-                text=json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                text=dumps_compact(data),
             ),
         ]
     )
@@ -1,9 +1,9 @@
-import json
 from typing import Optional
 
 from agentscope.message import TextBlock
 from agentscope.tool import ToolResponse
 
+from one_dragon_agent.core.system.json_codec import dumps_compact
 from tushare_mcp_server.main import income
 
 
@@ -40,7 +40,7 @@ async def tushare_income(
         content=[
             TextBlock(
                 type="text",
-                text=json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                text=dumps_compact(data),
             ),
         ]
     )
\ No newline at end of file
@@ -0,0 +1,49 @@
+import asyncio
+
+from agentscope.message import TextBlock
+from agentscope.tool import ToolResponse
+
+from oda_data import get_reader
+from one_dragon_agent.core.system.json_codec import dumps_compact
+
+
+async def tushare_sql_query(sql: str) -> ToolResponse:
+    """
+    对本地缓存的A股数据执行只读SQL查询（DuckDB语法），适合排序、筛选、分组汇总等简单统计，
+    例如"2024年四季度单季净利润同比增长最快的10家公司"。复杂分析或需要图表时使用analyse_by_code工具。
+
+    可用的表:
+    - stock_basic: ts_code 股票代码, symbol, name 股票名称, area 地区, industry 行业,
+      market 市场类型, list_date 上市日期, list_status 上市状态(L上市 D退市 P暂停上市)
+    - income: 利润表，ts_code, ann_date 公告日期, end_date 报告期, report_type 报告类型("1"=合并报表, "2"=单季合并报表),
+      update_flag 更新标识(同一报告期有多条时取"1"), total_revenue 营业总收入, revenue 营业收入,
+      operate_profit 营业利润, total_profit 利润总额, n_income 净利润(含少数股东损益),
+      n_income_attr_p 净利润(不含少数股东损益), basic_eps 基本每股收益, rd_exp 研发费用,
+      其余数值字段与 tushare income 接口一致。金额单位为元，日期均为 YYYYMMDD 格式的字符串。
+
+    Args:
+        sql: 单条 SELECT 查询语句，结果最多返回200行，超过10秒会被中断
+
+    Returns:
+        查询结果 {"columns": [...], "rows": [[...], ...], "truncated": 是否被截断}，出错时返回错误信息
+    """
+    reader = get_reader()
+    if reader is None or not reader.has_income():
+        text = "<error>本地数据仓库尚未同步，请使用其他tushare工具</error>"
+    else:
+        try:
+            columns, rows, truncated = await asyncio.to_thread(reader.query, sql)
+            text = dumps_compact(
+                {"columns": columns, "rows": rows, "truncated": truncated}
+            )
+        except Exception as e:
+            text = f"<error>{type(e).__name__}: {e}</error>"
+
+    return ToolResponse(
+        content=[
+            TextBlock(
+                type="text",
+                text=text,
+            ),
+        ]
+    )
@@ -1,6 +1,18 @@
 # -*- coding: utf-8 -*-
 """聊天会话模块."""
 
+from one_dragon_alpha.chat.analyse_agent_cache import AnalyseAgentCache
 from one_dragon_alpha.chat.chat_session import ChatSession
+from one_dragon_alpha.chat.workspace_manager import (
+    WorkspaceManager,
+    WorkspaceQuotaExceeded,
+    get_workspace_manager,
+)
 
-__all__ = ["ChatSession"]
+__all__ = [
+    "AnalyseAgentCache",
+    "ChatSession",
+    "WorkspaceManager",
+    "WorkspaceQuotaExceeded",
+    "get_workspace_manager",
+]
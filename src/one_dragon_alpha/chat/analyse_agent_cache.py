@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""会话内分析 Agent 的有界缓存.
+
+每个分析 Agent 持有完整的代码迭代记忆和工具集。会话只保留最近使用的若干个，
+淘汰时把记忆写入分析工作目录，之后再使用该分析 ID 时重建 Agent 并恢复记忆。
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from agentscope.agent import AgentBase
+
+from one_dragon_agent.core.system.json_codec import get_json_codec
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_AGENTS = 4
+
+
+def get_max_agents() -> int:
+    """获取每个会话保留的分析 Agent 数.
+
+    Returns:
+        ANALYSE_AGENTS_PER_SESSION 或默认值
+    """
+    return int(os.getenv("ANALYSE_AGENTS_PER_SESSION", DEFAULT_MAX_AGENTS))
+
+
+class AnalyseAgentCache:
+    """分析 Agent 的 LRU 缓存.
+
+    超过容量时按最近使用顺序淘汰空闲的 Agent，正在运行的 Agent 不会被淘汰。
+    淘汰的 Agent 的记忆序列化到 ``memory_file(analyse_id)``，
+    再次获取时由 ``factory`` 重建并加载该文件。
+
+    Attributes:
+        max_agents: 保留的 Agent 数上限
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], Awaitable[AgentBase]],
+        memory_file: Callable[[int], str],
+        max_agents: int | None = None,
+    ) -> None:
+        """初始化缓存.
+
+        Args:
+            factory: 根据分析 ID 创建新 Agent
+            memory_file: 分析 ID 对应的记忆文件路径
+            max_agents: 保留的 Agent 数上限，默认 get_max_agents()
+        """
+        self.max_agents: int = max(1, max_agents or get_max_agents())
+        self._factory = factory
+        self._memory_file = memory_file
+        self._agents: OrderedDict[int, AgentBase] = OrderedDict()
+        self._in_use: dict[int, int] = {}
+        self._loading: dict[int, asyncio.Future] = {}
+
+    def __contains__(self, analyse_id: int) -> bool:
+        """分析 ID 的 Agent 是否在内存中."""
+        return analyse_id in self._agents
+
+    def __len__(self) -> int:
+        """内存中的 Agent 数."""
+        return len(self._agents)
+
+    async def get(self, analyse_id: int) -> AgentBase:
+        """获取分析 Agent，不在内存中时重建并恢复记忆.
+
+        Args:
+            analyse_id: 分析 ID
+
+        Returns:
+            AgentBase: 分析 Agent
+        """
+        agent = self._agents.get(analyse_id)
+        if agent is not None:
+            self._agents.move_to_end(analyse_id)
+            return agent
+
+        # 并发获取同一个分析 ID 时只重建一次
+        loading = self._loading.get(analyse_id)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[analyse_id] = future
+        try:
+            agent = await self._factory(analyse_id)
+            await asyncio.to_thread(self._load_memory, analyse_id, agent)
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有等待者时避免 "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._loading[analyse_id]
+
+        self._agents[analyse_id] = agent
+        future.set_result(agent)
+        await self._evict_idle()
+        return agent
+
+    @asynccontextmanager
+    async def use(self, analyse_id: int) -> AsyncIterator[AgentBase]:
+        """获取分析 Agent，并在使用期间禁止淘汰.
+
+        Args:
+            analyse_id: 分析 ID
+
+        Yields:
+            AgentBase: 分析 Agent
+        """
+        self._in_use[analyse_id] = self._in_use.get(analyse_id, 0) + 1
+        agent = None
+        try:
+            agent = await self.get(analyse_id)
+            yield agent
+        finally:
+            self._in_use[analyse_id] -= 1
+            if self._in_use[analyse_id] == 0:
+                del self._in_use[analyse_id]
+            # 使用期间被 clear 移出缓存时，保存运行期间新增的记忆
+            if agent is not None and self._agents.get(analyse_id) is not agent:
+                await asyncio.to_thread(self._save_memory, analyse_id, agent)
+            await self._evict_idle()
+
+    async def clear(self) -> None:
+        """保存全部记忆并清空缓存，之后获取时重建 Agent.
+
+        记忆在线程中写入，不阻塞事件循环；写入期间获取的 Agent 仍是缓存中的旧 Agent，
+        写入完成后才移出缓存，重建时不会读到未写完的记忆文件。
+        """
+        agents = list(self._agents.items())
+        await asyncio.to_thread(self._save_all, agents)
+        for analyse_id, agent in agents:
+            # 写入期间新建的 Agent 已使用新的模型，保留在缓存中
+            if self._agents.get(analyse_id) is agent:
+                del self._agents[analyse_id]
+
+    async def _evict_idle(self) -> None:
+        """超过容量时按最近使用顺序淘汰空闲的 Agent."""
+        excess = len(self._agents) - self.max_agents
+        if excess <= 0:
+            return
+        evicted = [
+            analyse_id for analyse_id in self._agents if analyse_id not in self._in_use
+        ][:excess]
+        for analyse_id in evicted:
+            agent = self._agents.pop(analyse_id)
+            await asyncio.to_thread(self._save_memory, analyse_id, agent)
+
+    def _save_all(self, agents: list[tuple[int, AgentBase]]) -> None:
+        """把多个 Agent 的记忆写入记忆文件."""
+        for analyse_id, agent in agents:
+            self._save_memory(analyse_id, agent)
+
+    def _save_memory(self, analyse_id: int, agent: AgentBase) -> None:
+        """把 Agent 的记忆写入记忆文件.
+
+        Args:
+            analyse_id: 分析 ID
+            agent: 分析 Agent
+        """
+        path = self._memory_file(analyse_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(get_json_codec().dumpb(agent.memory.state_dict()))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"保存分析 {analyse_id} 的记忆失败: {e}")
+
+    def _load_memory(self, analyse_id: int, agent: AgentBase) -> None:
+        """从记忆文件恢复 Agent 的记忆，文件不存在时保持空记忆.
+
+        Args:
+            analyse_id: 分析 ID
+            agent: 新建的分析 Agent
+        """
+        path = self._memory_file(analyse_id)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "rb") as f:
+                agent.memory.load_state_dict(get_json_codec().loads(f.read()))
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"恢复分析 {analyse_id} 的记忆失败: {e}")
@@ -1,5 +1,6 @@
-import json
+import asyncio
 import os
+from contextlib import aclosing
 from typing import AsyncGenerator, Optional
 
 from agentscope.agent import AgentBase, ReActAgent
@@ -18,10 +19,22 @@ from agentscope.tool import (
 
 from one_dragon_alpha.agent.tushare.tools.basic import tushare_stock_basic_by_name_like
 from one_dragon_alpha.agent.tushare.tools.financial import tushare_income
+from one_dragon_alpha.agent.tushare.tools.sql import tushare_sql_query
+from one_dragon_alpha.chat.analyse_agent_cache import AnalyseAgentCache
+from one_dragon_alpha.chat.workspace_manager import (
+    WorkspaceQuotaExceeded,
+    get_workspace_manager,
+)
 from one_dragon_alpha.session.session import Session
 from one_dragon_alpha.tool.code import execute_python_code_by_path
-from one_dragon_agent.core.model.model_factory import ModelFactory
 from one_dragon_agent.core.model.models import ModelConfigInternal
+from one_dragon_agent.core.model.registry import get_model_registry
+from one_dragon_agent.core.model.routing import RoutedChatModel, RoutingPolicy
+from one_dragon_agent.core.model.usage import (
+    InstrumentedChatModel,
+    get_model_usage_recorder,
+)
+from one_dragon_agent.core.system.json_codec import dumps_compact
 
 
 class ChatSession(Session):
@@ -44,13 +57,19 @@ class ChatSession(Session):
             memory=memory,
         )
 
-        self._workspace_dir = os.getenv("WORKSPACE_DIR")
-        self._analyse_by_code_map: dict[int, AgentBase] = {}
+        self._workspaces = get_workspace_manager()
+        # 最近使用的分析 Agent，淘汰的记忆保存在各自的分析目录中
+        self._analyse_agents = AnalyseAgentCache(
+            self._create_analyse_by_code_agent,
+            self._get_analyse_by_code_memory_file,
+        )
         self._current_analyse_id: int = 0
 
         # 模型配置缓存
         self._current_model_config_id: int | None = None
         self._current_model_id: str | None = None
+        # 当前使用的共享模型实例和路由参数，变化时重建 Agent
+        self._current_model_key: tuple | None = None
 
     def _get_main_agent(self, memory: MemoryBase, model) -> AgentBase:
         """创建主 Agent.
@@ -66,6 +85,7 @@ class ChatSession(Session):
 
         toolkit.register_tool_function(tushare_stock_basic_by_name_like)
         toolkit.register_tool_function(tushare_income)
+        toolkit.register_tool_function(tushare_sql_query)
         toolkit.register_tool_function(self.analyse_by_code)
         toolkit.register_tool_function(self.display_analyse_by_code_result)
 
@@ -81,24 +101,61 @@ class ChatSession(Session):
 
         return agent
 
-    def set_model(self, config: ModelConfigInternal, model_id: str):
+    def set_model(
+        self,
+        config: ModelConfigInternal,
+        model_id: str,
+        routing: RoutingPolicy | None = None,
+    ) -> bool:
         """设置模型配置并重建主 Agent.
 
+        分析 Agent 缓存由调用方清空（``chat`` 中 await ``_analyse_agents.clear()``），
+        保存记忆的磁盘写入不在本方法中同步执行。
+
         Args:
             config: 模型配置对象(包含 api_key)
             model_id: 要使用的模型 ID
+            routing: 路由策略，包含备用端点时在端点间故障转移和对冲
 
+        Returns:
+            是否重建了主 Agent，模型未变化时为 False
         """
-        # 检查是否需要切换
-        if (
-            self._current_model_config_id == config.id
-            and self._current_model_id == model_id
-        ):
+        endpoints = [(config, model_id)]
+        if routing is not None:
+            endpoints.extend(routing.fallbacks)
+
+        # 从注册表获取共享模型，配置更新或 token 刷新后会得到新实例
+        registry = get_model_registry()
+        shared_models = tuple(
+            registry.get_model(endpoint_config, endpoint_model_id)
+            for endpoint_config, endpoint_model_id in endpoints
+        )
+        model_key = (
+            shared_models,
+            None if routing is None else (routing.hedge_after, routing.failover),
+        )
+        if model_key == self._current_model_key:
             # 模型未变化，无需重建
-            return
-
-        # 使用 ModelFactory 创建模型
-        model = ModelFactory.create_model(config, model_id)
+            return False
+
+        # 包装共享模型以按会话记录用量，并经各自配置的限制器排队
+        instrumented = {
+            (endpoint_config.id, endpoint_model_id): InstrumentedChatModel(
+                shared_model,
+                session_id=self.session_id,
+                config_id=endpoint_config.id,
+                model_id=endpoint_model_id,
+                limiter=registry.get_limiter(endpoint_config.id),
+                on_status=self._put_status,
+            )
+            for (endpoint_config, endpoint_model_id), shared_model in zip(
+                endpoints, shared_models
+            )
+        }
+        if len(instrumented) > 1:
+            model = RoutedChatModel(instrumented, routing)
+        else:
+            model = next(iter(instrumented.values()))
 
         # 创建新的主 Agent(复用 _get_main_agent 方法)
         new_agent = self._get_main_agent(self.memory, model)
@@ -116,9 +173,8 @@ class ChatSession(Session):
         # 更新缓存
         self._current_model_config_id = config.id
         self._current_model_id = model_id
-
-        # 清空分析 Agent 缓存，强制重建
-        self._analyse_by_code_map.clear()
+        self._current_model_key = model_key
+        return True
 
     async def chat(
         self,
@@ -126,6 +182,7 @@ class ChatSession(Session):
         model_config_id: int,
         model_id: str,
         config: ModelConfigInternal,
+        routing: RoutingPolicy | None = None,
     ) -> AsyncGenerator:
         """处理聊天消息.
 
@@ -134,20 +191,22 @@ class ChatSession(Session):
             model_config_id: 模型配置 ID
             model_id: 模型 ID
             config: 模型配置对象（已验证）
+            routing: 路由策略（可选）
 
         Yields:
             SessionMessage 对象
         """
-        # 检查是否需要切换模型
-        if (
-            self._current_model_config_id != model_config_id
-            or self._current_model_id != model_id
-        ):
-            self.set_model(config, model_id)
+        # 切换模型或配置更新后重建 Agent，未变化时 set_model 直接返回
+        if self.set_model(config, model_id, routing):
+            # 清空分析 Agent 缓存，强制用新模型重建，记忆保存后在重建时恢复
+            await self._analyse_agents.clear()
+
+        get_model_usage_recorder().begin_turn(self.session_id)
 
         # 调用父类的 chat 方法（不传递 model_config_id 和 model_id）
-        async for message in super().chat(user_input):
-            yield message
+        async with aclosing(super().chat(user_input)) as messages:
+            async for message in messages:
+                yield message
 
     async def display_analyse_by_code_result(
         self,
@@ -162,11 +221,7 @@ class ChatSession(Session):
             content=[
                 TextBlock(
                     type="text",
-                    text=json.dumps(
-                        {"analyse_id": analyse_id},
-                        ensure_ascii=False,
-                        separators=(",", ":"),
-                    ),
+                    text=dumps_compact({"analyse_id": analyse_id}),
                 )
             ]
         )
@@ -183,37 +238,55 @@ class ChatSession(Session):
             goal (str): 需要写代码进行分析的目标
             analyse_id (Optional[int]): 分析ID，传入后继续在原有分析基础上修改，否则开启一个新的分析。
         """
+        try:
+            self._workspaces.check_quota(self.session_id)
+        except WorkspaceQuotaExceeded as e:
+            return ToolResponse(
+                content=[
+                    TextBlock(
+                        type="text",
+                        text=dumps_compact({"analyse_id": analyse_id, "error": str(e)}),
+                    )
+                ]
+            )
+
         if analyse_id is None:
             self._current_analyse_id += 1
             analyse_id = self._current_analyse_id
 
-        agent = await self._get_analyse_by_code_agent(analyse_id)
-        msg = await agent(Msg(name="user", content=goal, role="user"))
+        try:
+            async with self._analyse_agents.use(analyse_id) as agent:
+                msg = await agent(Msg(name="user", content=goal, role="user"))
+        finally:
+            await asyncio.to_thread(
+                self._workspaces.record_usage, self.session_id, analyse_id
+            )
 
         return ToolResponse(
             content=[
                 TextBlock(
                     type="text",
-                    text=json.dumps(
-                        {"analyse_id": analyse_id, "result": msg.to_dict()},
-                        ensure_ascii=False,
-                        separators=(",", ":"),
+                    text=dumps_compact(
+                        {"analyse_id": analyse_id, "result": msg.to_dict()}
                     ),
                 )
             ]
         )
 
-    async def _get_analyse_by_code_agent(self, analyse_id: int) -> AgentBase:
-        if analyse_id in self._analyse_by_code_map:
-            return self._analyse_by_code_map[analyse_id]
-
+    async def _create_analyse_by_code_agent(self, analyse_id: int) -> AgentBase:
         analyse_workspace = self._get_analyse_by_code_dir(analyse_id)
 
         toolkit = Toolkit()
         toolkit.register_tool_function(view_text_file)
         toolkit.register_tool_function(write_text_file)
         toolkit.register_tool_function(insert_text_file)
-        toolkit.register_tool_function(execute_python_code_by_path)
+        # 凭据和临时目录通过子进程环境变量传入，不暴露给模型
+        toolkit.register_tool_function(
+            execute_python_code_by_path,
+            preset_kwargs={
+                "env": self._workspaces.script_env(self.session_id, analyse_id)
+            },
+        )
         context7 = HttpStatelessClient(
             name="context7",
             transport="streamable_http",
@@ -233,23 +306,17 @@ class ChatSession(Session):
             max_iters=100,
         )
 
-        self._analyse_by_code_map[analyse_id] = agent
         return agent
 
     def _get_analyse_by_code_dir(self, analyse_id: int) -> str:
-        base_dir = os.path.join(self._workspace_dir, "analyse_by_code")
-        if not os.path.exists(base_dir):
-            os.makedirs(base_dir)
-
-        current_dir = os.path.join(base_dir, f"{self.session_id}-{analyse_id}")
-        if not os.path.exists(current_dir):
-            os.makedirs(current_dir)
+        return self._workspaces.analysis_dir(self.session_id, analyse_id)
 
-        dotenv_file = os.path.join(current_dir, ".env")
-        with open(dotenv_file, "w") as f:
-            f.write(f"TUSHARE_API_TOKEN={os.getenv('TUSHARE_API_TOKEN')}")
-
-        return current_dir
+    def _get_analyse_by_code_memory_file(self, analyse_id: int) -> str:
+        return os.path.join(
+            self._workspaces.root,
+            f"{self.session_id}-{analyse_id}",
+            ".agent_memory.json",
+        )
 
     def _get_analyse_by_code_sys_prompt(self, analyse_workspace: str) -> str:
         return _ANALYSE_BY_CODE_SYSTEM_PROMPT % (analyse_workspace)
@@ -265,6 +332,7 @@ _MAIN_SYSTEM_PROMPT = """
 
 # 工具使用规范
 
+- 跨多只股票的排序、筛选、分组汇总等简单统计，优先使用tushare_sql_query工具直接查询。
 - 以下情况优先使用analyse_by_code工具：
     1. 需要多种数据组合分析的场景。
     2. 需要多个步骤，有数学运算或同级的场景。
@@ -300,8 +368,9 @@ _ANALYSE_BY_CODE_SYSTEM_PROMPT = """
 # 代码规范
 
 - 使用 python 3.11 的语法。
-- 使用 tushare 库来获取股票相关信息。
-- 使用 dotenv 来读取环境变量。
+- 利润表和股票列表优先使用 oda_data 库读取本地数据，其他数据使用 tushare 库获取。
+- 使用 os.environ 读取环境变量，所需的 token 已设置在环境变量中，不要读取或创建 .env 文件。
+- 需要临时文件时使用 tempfile 模块创建，不要写入当前工作目录。
 - 不需要捕捉异常，整个代码逻辑应该能正常运行，不应该出现异常。
 - 定义一个存放当前工作目录的变量，不要使用 os.pwd()，使用系统提示的完整的绝对路径。
 - 优先使用pandas相关函数处理数据，避免for遍历。
@@ -309,6 +378,15 @@ _ANALYSE_BY_CODE_SYSTEM_PROMPT = """
 - 不清楚依赖库的使用方法时，使用context7查询相关文档。
 - 必须使用标准库获取当前时间，再计算其他对应的所需的时间字段。
 
+## oda_data库使用规范
+
+oda_data 读取本地同步的全部A股数据，无需 token，比 tushare 更快，返回 pandas.DataFrame，字段与 tushare 同名接口一致：
+
+- oda_data.income(ts_code, report_type=None, start_ann_date=None, end_ann_date=None, period=None, fields=None): 利润表，按公告日期倒序。report_type "1"=合并报表，"2"=单季合并报表；同一报告期有多条时取 update_flag="1" 的记录。
+- oda_data.stock_basic(fields=None): 全部股票列表，包括退市(list_status="D")和暂停上市(list_status="P")的股票。
+- oda_data.sql(query): 对 income、stock_basic 两张表执行 DuckDB SQL，适合跨多只股票的筛选和汇总。
+- oda_data.frame(name): 获取完整的 "income" 或 "stock_basic" 数据集，从多个分析共享的内存中直接打开，无需加载；文本列为 category 类型，已有列只读，需要原地修改时先 copy()。需要全表计算时优先使用，只需少量数据时使用 oda_data.sql 筛选。
+
 ## Tushare库使用规范
 
 - 使用环境变量 TUSHARE_API_TOKEN 获取 token。
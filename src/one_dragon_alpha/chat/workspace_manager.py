@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""分析工作目录的生命周期管理.
+
+每个分析在 ``WORKSPACE_DIR/analyse_by_code/{session_id}-{analyse_id}`` 中编写和运行脚本。
+管理器统计每个会话和全部工作目录的磁盘占用，超过配额时拒绝开始新的分析；
+后台定期删除已不存在的会话的工作目录；可选地把脚本的临时目录放在 tmpfs 上；
+脚本所需的凭据通过子进程的环境变量传入，不再写入工作目录。
+"""
+
+import asyncio
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+
+_registry = get_metrics_registry()
+_workspace_bytes = _registry.gauge(
+    "oda_workspace_bytes", "分析工作目录（含临时目录）占用的字节数"
+).labels()
+_workspaces_removed = _registry.counter(
+    "oda_workspaces_removed_total", "回收的分析工作目录数"
+).labels()
+
+# 传入脚本子进程的凭据
+_CREDENTIAL_ENV_NAMES = ("TUSHARE_API_TOKEN",)
+
+DEFAULT_SESSION_QUOTA_MB = 512
+DEFAULT_TOTAL_QUOTA_MB = 10240
+DEFAULT_SESSION_TTL_HOURS = 24
+DEFAULT_GC_INTERVAL = 600
+
+
+class WorkspaceQuotaExceeded(Exception):
+    """工作目录的磁盘占用超过配额."""
+
+
+@dataclass
+class WorkspaceUsage:
+    """一个分析工作目录的磁盘占用.
+
+    Attributes:
+        session_id: 会话 ID
+        size: 工作目录和临时目录的总字节数
+        modified_at: 其中文件的最后修改时间
+    """
+
+    session_id: str
+    size: int
+    modified_at: float
+
+
+def workspace_root() -> str:
+    """获取分析工作目录的根目录.
+
+    Returns:
+        WORKSPACE_DIR 下的 analyse_by_code 目录
+    """
+    return os.path.join(os.getenv("WORKSPACE_DIR", "workspace"), "analyse_by_code")
+
+
+def _env_float(name: str, default: float) -> float:
+    """读取数值环境变量."""
+    return float(os.getenv(name, default))
+
+
+def _scan(path: str) -> tuple[int, float]:
+    """统计目录下文件的总字节数和最后修改时间，目录不存在时为 (0, 0)."""
+    try:
+        size, modified_at = 0, os.stat(path).st_mtime
+    except OSError:
+        return 0, 0.0
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                size += stat.st_size
+                modified_at = max(modified_at, stat.st_mtime)
+    return size, modified_at
+
+
+class WorkspaceManager:
+    """分析工作目录的配额统计和回收.
+
+    占用在每次分析结束后按该分析的目录重新统计，回收时全量重新扫描。
+    仍在内存中的会话的工作目录不会被回收；其他会话的工作目录在最后修改
+    超过 ``session_ttl`` 后回收，全部占用超过 ``total_quota`` 时从最久未修改的开始提前回收。
+
+    Attributes:
+        session_quota: 每个会话的配额（字节）
+        total_quota: 全部工作目录的配额（字节）
+        session_ttl: 会话不存在后工作目录保留的秒数
+        interval: 后台回收的间隔秒数
+    """
+
+    def __init__(
+        self,
+        root: str | None = None,
+        scratch_root: str | None = None,
+        session_quota: int | None = None,
+        total_quota: int | None = None,
+        session_ttl: float | None = None,
+        interval: float | None = None,
+    ) -> None:
+        """初始化管理器.
+
+        Args:
+            root: 工作目录的根目录，默认 workspace_root()
+            scratch_root: 临时目录的根目录（如 /dev/shm/oda_scratch），默认 WORKSPACE_SCRATCH_DIR，未设置时不单独创建临时目录
+            session_quota: 每个会话的配额，默认 WORKSPACE_SESSION_QUOTA_MB
+            total_quota: 全部工作目录的配额，默认 WORKSPACE_TOTAL_QUOTA_MB
+            session_ttl: 工作目录保留的秒数，默认 WORKSPACE_SESSION_TTL_HOURS
+            interval: 后台回收的间隔秒数，默认 WORKSPACE_GC_INTERVAL
+        """
+        self._root = root
+        self._scratch_root = (
+            scratch_root
+            if scratch_root is not None
+            else os.getenv("WORKSPACE_SCRATCH_DIR") or None
+        )
+        self.session_quota: int = (
+            session_quota
+            if session_quota is not None
+            else int(
+                _env_float("WORKSPACE_SESSION_QUOTA_MB", DEFAULT_SESSION_QUOTA_MB)
+                * 2**20
+            )
+        )
+        self.total_quota: int = (
+            total_quota
+            if total_quota is not None
+            else int(
+                _env_float("WORKSPACE_TOTAL_QUOTA_MB", DEFAULT_TOTAL_QUOTA_MB) * 2**20
+            )
+        )
+        self.session_ttl: float = (
+            session_ttl
+            if session_ttl is not None
+            else _env_float("WORKSPACE_SESSION_TTL_HOURS", DEFAULT_SESSION_TTL_HOURS)
+            * 3600
+        )
+        self.interval: float = (
+            interval
+            if interval is not None
+            else _env_float("WORKSPACE_GC_INTERVAL", DEFAULT_GC_INTERVAL)
+        )
+        self._usage: dict[str, WorkspaceUsage] = {}
+        # record_usage 和 collect 在不同线程中执行
+        self._usage_lock = threading.Lock()
+        # collect 扫描期间 record_usage 统计过的目录，扫描结束后保留这些统计
+        self._recorded: set[str] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def root(self) -> str:
+        """工作目录的根目录."""
+        return self._root or workspace_root()
+
+    def analysis_dir(self, session_id: str, analyse_id: int) -> str:
+        """获取分析的工作目录，不存在时创建.
+
+        Args:
+            session_id: 会话 ID
+            analyse_id: 分析 ID
+
+        Returns:
+            工作目录的绝对路径
+        """
+        path = os.path.abspath(os.path.join(self.root, f"{session_id}-{analyse_id}"))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def scratch_dir(self, session_id: str, analyse_id: int) -> str | None:
+        """获取分析的临时目录，不存在时创建；未配置临时目录时返回 None.
+
+        Args:
+            session_id: 会话 ID
+            analyse_id: 分析 ID
+
+        Returns:
+            临时目录的绝对路径或 None
+        """
+        if self._scratch_root is None:
+            return None
+        path = os.path.abspath(
+            os.path.join(self._scratch_root, f"{session_id}-{analyse_id}")
+        )
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def script_env(self, session_id: str, analyse_id: int) -> dict[str, str]:
+        """分析脚本子进程额外的环境变量.
+
+        包含已配置的凭据，以及配置了临时目录时的 TMPDIR（tempfile 使用）和 ODA_SCRATCH_DIR。
+
+        Args:
+            session_id: 会话 ID
+            analyse_id: 分析 ID
+
+        Returns:
+            环境变量
+        """
+        env = {
+            name: value
+            for name in _CREDENTIAL_ENV_NAMES
+            if (value := os.getenv(name)) is not None
+        }
+        scratch = self.scratch_dir(session_id, analyse_id)
+        if scratch is not None:
+            env["TMPDIR"] = scratch
+            env["ODA_SCRATCH_DIR"] = scratch
+        return env
+
+    def session_usage(self, session_id: str) -> int:
+        """会话全部工作目录的字节数."""
+        with self._usage_lock:
+            return sum(
+                u.size for u in self._usage.values() if u.session_id == session_id
+            )
+
+    def total_usage(self) -> int:
+        """全部工作目录的字节数."""
+        with self._usage_lock:
+            return sum(u.size for u in self._usage.values())
+
+    def check_quota(self, session_id: str) -> None:
+        """开始分析前检查配额.
+
+        Args:
+            session_id: 会话 ID
+
+        Raises:
+            WorkspaceQuotaExceeded: 会话或全部工作目录的占用超过配额
+        """
+        used = self.session_usage(session_id)
+        if used >= self.session_quota:
+            raise WorkspaceQuotaExceeded(
+                f"当前会话的分析工作目录已占用 {used / 2**20:.1f}MB，"
+                f"超过配额 {self.session_quota / 2**20:.0f}MB"
+            )
+        total = self.total_usage()
+        if total >= self.total_quota:
+            raise WorkspaceQuotaExceeded(
+                f"分析工作目录已占用 {total / 2**20:.1f}MB，"
+                f"超过总配额 {self.total_quota / 2**20:.0f}MB"
+            )
+
+    def record_usage(self, session_id: str, analyse_id: int) -> int:
+        """重新统计一个分析的占用，在分析结束后调用.
+
+        Args:
+            session_id: 会话 ID
+            analyse_id: 分析 ID
+
+        Returns:
+            该分析的字节数
+        """
+        name = f"{session_id}-{analyse_id}"
+        usage = self._scan_workspace(session_id, name)
+        with self._usage_lock:
+            self._usage[name] = usage
+            if self._recorded is not None:
+                self._recorded.add(name)
+            total = sum(u.size for u in self._usage.values())
+        _workspace_bytes.set(total)
+        return usage.size
+
+    def collect(self, active_sessions: Iterable[str]) -> list[str]:
+        """扫描全部工作目录并回收已不存在的会话的工作目录.
+
+        Args:
+            active_sessions: 仍在内存中的会话 ID
+
+        Returns:
+            回收的工作目录名
+        """
+        active = set(active_sessions)
+        with self._usage_lock:
+            self._recorded = set()
+        usage: dict[str, WorkspaceUsage] = {}
+        for name in self._workspace_names():
+            session_id = name.rpartition("-")[0]
+            usage[name] = self._scan_workspace(session_id, name)
+
+        now = time.time()
+        candidates = sorted(
+            (
+                (u.modified_at, name)
+                for name, u in usage.items()
+                if u.session_id not in active
+            ),
+        )
+        total = sum(u.size for u in usage.values())
+        removed = []
+        for modified_at, name in candidates:
+            if now - modified_at < self.session_ttl and total <= self.total_quota:
+                break
+            self._remove(name)
+            total -= usage.pop(name).size
+            removed.append(name)
+
+        with self._usage_lock:
+            # 扫描期间结束的分析以 record_usage 的统计为准
+            for name in self._recorded.difference(removed):
+                usage[name] = self._usage[name]
+            self._recorded = None
+            self._usage = usage
+            total = sum(u.size for u in usage.values())
+        _workspace_bytes.set(total)
+        _workspaces_removed.inc(len(removed))
+        return removed
+
+    def start(self, active_sessions: Callable[[], Iterable[str]]) -> None:
+        """启动后台回收，第一轮立即执行.
+
+        Args:
+            active_sessions: 返回仍在内存中的会话 ID
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(active_sessions))
+
+    async def _loop(self, active_sessions: Callable[[], Iterable[str]]) -> None:
+        """每个间隔回收一次."""
+        while True:
+            try:
+                removed = await asyncio.to_thread(
+                    self.collect, list(active_sessions())
+                )
+                if removed:
+                    logger.info(f"已回收分析工作目录: {len(removed)} 个")
+            except Exception as e:
+                logger.warning(f"回收分析工作目录失败: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def stop(self) -> None:
+        """停止后台回收."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _workspace_names(self) -> list[str]:
+        """工作目录和临时目录的目录名."""
+        names = set()
+        for root in (self.root, self._scratch_root):
+            if root is None:
+                continue
+            try:
+                with os.scandir(root) as entries:
+                    names.update(e.name for e in entries if e.is_dir())
+            except FileNotFoundError:
+                continue
+        return sorted(names)
+
+    def _scan_workspace(self, session_id: str, name: str) -> WorkspaceUsage:
+        """统计工作目录和临时目录的占用."""
+        size, modified_at = _scan(os.path.join(self.root, name))
+        if self._scratch_root is not None:
+            scratch_size, scratch_modified_at = _scan(
+                os.path.join(self._scratch_root, name)
+            )
+            size += scratch_size
+            modified_at = max(modified_at, scratch_modified_at)
+        return WorkspaceUsage(session_id, size, modified_at)
+
+    def _remove(self, name: str) -> None:
+        """删除工作目录和临时目录."""
+        for root in (self.root, self._scratch_root):
+            if root is not None:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+_manager: WorkspaceManager | None = None
+
+
+def get_workspace_manager() -> WorkspaceManager:
+    """获取全局的工作目录管理器."""
+    global _manager
+    if _manager is None:
+        _manager = WorkspaceManager()
+    return _manager
@@ -6,19 +6,40 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from one_dragon_alpha.chat.workspace_manager import get_workspace_manager
 from one_dragon_alpha.server.chat.router import router as chat_router
 from one_dragon_alpha.server.context import OneDragonAlphaContext
+from one_dragon_alpha.server.health.router import router as health_router
+from one_dragon_alpha.server.metrics.middleware import MetricsMiddleware
+from one_dragon_alpha.server.metrics.router import router as metrics_router
+from one_dragon_alpha.services.mysql import close_mysql_connection_service
+from one_dragon_alpha.services.mysql.migration import prepare_database
+from one_dragon_alpha.tool.code import refresh_shared_frames
+from one_dragon_agent.core.model.registry import get_model_registry
 from one_dragon_agent.core.model.router import router as model_config_router
+from one_dragon_agent.core.model.usage_router import router as model_usage_router
 from one_dragon_agent.core.model.qwen.oauth_router import router as qwen_oauth_router
+from oda_data import close_reader
+from tushare_mcp_server.client import close_tushare_client
 
 
 @asynccontextmanager
 async def lifespan(api: FastAPI):
     """Application lifespan events."""
     # Initialize global context on startup
-    OneDragonAlphaContext.initialize()
+    context = OneDragonAlphaContext.initialize()
+    await prepare_database()
+    await refresh_shared_frames()
+    context.health_monitor.start()
+    get_workspace_manager().start(context.session_service.session_ids)
     yield
     # Cleanup on shutdown
+    await context.health_monitor.stop()
+    await get_workspace_manager().stop()
+    await get_model_registry().aclose()
+    await close_tushare_client()
+    close_reader()
+    await close_mysql_connection_service()
     OneDragonAlphaContext.reset()
 
 
@@ -44,6 +65,8 @@ allow_origins = [
     "https://api.momojie.online",
 ]
 
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allow_origins,
@@ -55,7 +78,10 @@ app.add_middleware(
 # Include API routers
 app.include_router(chat_router)
 app.include_router(model_config_router)
+app.include_router(model_usage_router)
 app.include_router(qwen_oauth_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,311 @@
+"""Post-processing of ECharts options in analysis results.
+
+Generated ``result.json`` files may contain daily series spanning decades.
+Before they are sent to the browser, oversized line series are downsampled
+with Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape
+(peaks, troughs and trend changes) with a fraction of the points, and
+numeric arrays can optionally be encoded as base64 typed arrays.
+"""
+
+import base64
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from one_dragon_agent.core.system.json_codec import get_json_codec
+
+DEFAULT_MAX_POINTS = 2000
+# Buckets at least this large are searched with numpy, smaller ones with
+# plain Python, where the per-call overhead of numpy dominates.
+_NUMPY_BUCKET_SIZE = 32
+# Arrays shorter than this are left as JSON, the encoding overhead dominates.
+_MIN_TYPED_LENGTH = 64
+
+ResultEncoding = Literal["json", "typed"]
+
+
+@dataclass
+class ResultReport:
+    """Size report of a post-processed analysis result.
+
+    Attributes:
+        original_bytes: Size of the result file.
+        delivered_bytes: Size of the processed result as JSON.
+        original_points: Data points of all series before processing.
+        delivered_points: Data points of all series after processing.
+        downsampled_series: Number of downsampled series.
+    """
+
+    original_bytes: int = 0
+    delivered_bytes: int = 0
+    original_points: int = 0
+    delivered_points: int = 0
+    downsampled_series: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert to a dictionary."""
+        return asdict(self)
+
+
+def get_max_points() -> int:
+    """Get the target number of points per chart axis.
+
+    Returns:
+        ANALYSE_RESULT_MAX_POINTS or the default.
+    """
+    return int(os.getenv("ANALYSE_RESULT_MAX_POINTS", DEFAULT_MAX_POINTS))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Select the points to keep with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into ``threshold - 2`` buckets and from each bucket the point
+    forming the largest triangle with the previously selected point and the
+    average of the next bucket is kept.
+
+    The chain of selected points is inherently sequential, so everything
+    that does not depend on it is computed for all points at once: with
+    ``a`` the previously selected point, ``b`` a candidate and ``c`` the
+    next bucket's average, twice the triangle area is
+    ``|(bx*cy - by*cx) + ax*(by - cy) + ay*(cx - bx)|``, whose three terms
+    per candidate are precomputed, leaving two multiply-adds per candidate
+    in the sequential pass.
+
+    Args:
+        x: X values, ascending.
+        y: Y values, finite.
+        threshold: Number of points to keep.
+
+    Returns:
+        Ascending indices of the kept points.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    # The third vertex of bucket i is the average of bucket i + 1, or the
+    # last point for the last bucket.
+    next_x = np.append(((cum_x[ends] - cum_x[starts]) / counts)[1:], x[-1])
+    next_y = np.append(((cum_y[ends] - cum_y[starts]) / counts)[1:], y[-1])
+
+    # The third vertex of every candidate point
+    bucket_of = np.repeat(np.arange(len(counts)), counts)
+    cx = next_x[bucket_of]
+    cy = next_y[bucket_of]
+    inner_x, inner_y = x[1 : n - 1], y[1 : n - 1]
+    p = inner_x * cy - inner_y * cx
+    q = inner_y - cy
+    r = cx - inner_x
+
+    selected = [0]
+    ax, ay = float(x[0]), float(y[0])
+    if (n - 2) / (threshold - 2) >= _NUMPY_BUCKET_SIZE:
+        for start, end in zip((starts - 1).tolist(), (ends - 1).tolist()):
+            best = start + int(
+                np.argmax(np.abs(p[start:end] + ax * q[start:end] + ay * r[start:end]))
+            )
+            selected.append(best + 1)
+            ax, ay = float(inner_x[best]), float(inner_y[best])
+    else:
+        p_list, q_list, r_list = p.tolist(), q.tolist(), r.tolist()
+        x_list, y_list = inner_x.tolist(), inner_y.tolist()
+        for start, end in zip((starts - 1).tolist(), (ends - 1).tolist()):
+            best, best_area = start, -1.0
+            for j in range(start, end):
+                area = abs(p_list[j] + ax * q_list[j] + ay * r_list[j])
+                if area > best_area:
+                    best, best_area = j, area
+            selected.append(best + 1)
+            ax, ay = x_list[best], y_list[best]
+    selected.append(n - 1)
+    return np.array(selected, dtype=np.intp)
+
+
+def _numeric(values: list) -> np.ndarray | None:
+    """Convert a list of plain numbers to float64, None if any is not one."""
+    if not all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+    ):
+        return None
+    array = np.asarray(values, dtype=np.float64)
+    return array if np.isfinite(array).all() else None
+
+
+def _pairs(data: list) -> tuple[np.ndarray, np.ndarray] | None:
+    """Split ``[[x, y], ...]`` data into x and y, None if not pairs.
+
+    Non-numeric x values (e.g. date strings on a time axis) are replaced by
+    their positions, the data is assumed to be sorted by x.
+    """
+    if not all(isinstance(item, (list, tuple)) and len(item) >= 2 for item in data):
+        return None
+    y = _numeric([item[1] for item in data])
+    if y is None:
+        return None
+    x = _numeric([item[0] for item in data])
+    if x is None or (np.diff(x) < 0).any():
+        x = np.arange(len(data), dtype=np.float64)
+    return x, y
+
+
+def _as_list(value: Any) -> list[dict]:
+    """Normalize a component option (object or array of objects) to a list."""
+    if isinstance(value, dict):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, dict)]
+    return []
+
+
+def downsample_option(
+    option: dict[str, Any], max_points: int, report: ResultReport
+) -> None:
+    """Downsample the oversized line series of one ECharts option in place.
+
+    - Series with ``[[x, y], ...]`` data are downsampled independently.
+    - Series with plain value arrays on a category x axis share the axis
+      categories, so the kept indices of all line series on the axis are
+      merged and applied to the categories and every series on the axis.
+      Axes whose series do not all have one value per category are skipped.
+
+    Args:
+        option: ECharts option.
+        max_points: Target number of points per series or category axis.
+        report: Report to update.
+    """
+    series_list = _as_list(option.get("series"))
+    x_axes = _as_list(option.get("xAxis"))
+    by_axis: dict[int, list[dict]] = {}
+
+    for series in series_list:
+        data = series.get("data")
+        if not isinstance(data, list):
+            continue
+        report.original_points += len(data)
+        if series.get("type") == "line" and len(data) > max_points:
+            pairs = _pairs(data)
+            if pairs is not None:
+                keep = lttb_indices(pairs[0], pairs[1], max_points)
+                series["data"] = [data[i] for i in keep]
+                report.downsampled_series += 1
+                continue
+        axis_index = series.get("xAxisIndex", 0)
+        if isinstance(axis_index, int):
+            by_axis.setdefault(axis_index, []).append(series)
+
+    for axis_index, axis_series in by_axis.items():
+        if axis_index >= len(x_axes):
+            continue
+        axis = x_axes[axis_index]
+        categories = axis.get("data")
+        if axis.get("type", "category") != "category" or not isinstance(
+            categories, list
+        ):
+            continue
+        n = len(categories)
+        if n <= max_points or any(len(s["data"]) != n for s in axis_series):
+            continue
+        lines = [
+            values
+            for values in (
+                _numeric(s["data"]) for s in axis_series if s.get("type") == "line"
+            )
+            if values is not None
+        ]
+        if not lines:
+            continue
+        x = np.arange(n, dtype=np.float64)
+        threshold = max(3, max_points // len(lines))
+        keep = np.unique(
+            np.concatenate([lttb_indices(x, y, threshold) for y in lines])
+        )
+        axis["data"] = [categories[i] for i in keep]
+        for series in axis_series:
+            series["data"] = [series["data"][i] for i in keep]
+        report.downsampled_series += len(lines)
+
+    report.delivered_points += sum(
+        len(s["data"]) for s in series_list if isinstance(s.get("data"), list)
+    )
+
+
+def encode_typed_array(values: list) -> dict[str, Any] | None:
+    """Encode a numeric array as a base64 typed array.
+
+    float32 is used when it represents every value exactly, otherwise
+    float64, so values such as 12.34 are not displayed as 12.34000015.
+    ``[[x, y], ...]`` data is flattened and its shape recorded. Decoding: ``new Float32Array(buffer)`` (or Float64Array)
+    over the base64-decoded bytes, then split into rows of ``shape[1]``.
+
+    Args:
+        values: Flat numbers or equal-length rows of numbers.
+
+    Returns:
+        ``{"$typed": "float32" | "float64", "shape": [...], "data": base64}``,
+        or None if the values are not numeric or the encoding is not smaller
+        than JSON.
+    """
+    if len(values) < _MIN_TYPED_LENGTH:
+        return None
+    if all(isinstance(v, (list, tuple)) for v in values):
+        width = len(values[0])
+        if any(len(row) != width for row in values):
+            return None
+        array = _numeric([v for row in values for v in row])
+        shape = [len(values), width]
+    else:
+        array = _numeric(values)
+        shape = [len(values)]
+    if array is None:
+        return None
+
+    as_float32 = array.astype(np.float32)
+    if np.array_equal(as_float32, array):
+        dtype, raw = "float32", as_float32.tobytes()
+    else:
+        dtype, raw = "float64", array.tobytes()
+    # base64 length, short decimals (e.g. prices) are smaller as JSON
+    if 4 * math.ceil(len(raw) / 3) >= len(get_json_codec().dumpb(values)):
+        return None
+    return {"$typed": dtype, "shape": shape, "data": base64.b64encode(raw).decode()}
+
+
+def process_result(
+    result: Any,
+    max_points: int | None = None,
+    encoding: ResultEncoding = "json",
+) -> ResultReport:
+    """Post-process every chart in ``result["echarts_list"]`` in place.
+
+    Args:
+        result: Parsed result.json.
+        max_points: Target number of points, defaults to get_max_points().
+        encoding: "typed" to encode series data as typed arrays.
+
+    Returns:
+        Report of the processed points; the byte sizes are filled in by the
+        caller, which knows the file and delivered payload sizes.
+    """
+    report = ResultReport()
+    if not isinstance(result, dict):
+        return report
+    max_points = max_points or get_max_points()
+    for option in _as_list(result.get("echarts_list")):
+        downsample_option(option, max_points, report)
+        if encoding == "typed":
+            for series in _as_list(option.get("series")):
+                data = series.get("data")
+                if isinstance(data, list):
+                    encoded = encode_typed_array(data)
+                    if encoded is not None:
+                        series["data"] = encoded
+    return report
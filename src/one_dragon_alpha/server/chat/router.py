@@ -1,18 +1,50 @@
-import json
+import asyncio
 import os
+from contextlib import aclosing
 from enum import StrEnum
-from typing import Annotated, Any, AsyncGenerator
+from typing import Annotated, Any, AsyncGenerator, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from one_dragon_agent.core.model.models import ModelConfigInternal
+from one_dragon_agent.core.model.routing import RoutingPolicy
+from one_dragon_agent.core.system.json_codec import JsonDecodeError, get_json_codec
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+from one_dragon_alpha.server.chat.echarts import (
+    ResultEncoding,
+    ResultReport,
+    process_result,
+)
 from one_dragon_alpha.server.dependencies import ContextDep
+from one_dragon_alpha.server.ws_manager import WebSocketConnection
 from one_dragon_alpha.session.session import Session
 
+logger = get_logger(__name__)
+
+_active_sse_streams = (
+    get_metrics_registry()
+    .gauge("oda_active_sse_streams", "进行中的 SSE 聊天流数量")
+    .labels()
+)
+_result_bytes = get_metrics_registry().counter(
+    "oda_analyse_result_bytes_total",
+    "分析结果的字节数（original=结果文件，delivered=降采样和编码后发送的结果）",
+    ("stage",),
+)
+_result_bytes_original = _result_bytes.labels("original")
+_result_bytes_delivered = _result_bytes.labels("delivered")
+
 router = APIRouter(prefix="/chat")
 
+# Results larger than this are not inlined into the chat stream and must be
+# fetched via /chat/get_analyse_by_code_result.
+DEFAULT_INLINE_RESULT_MAX_BYTES = 1024 * 1024
+_DISPLAY_RESULT_TOOL = "display_analyse_by_code_result"
+
 
 async def get_db_session() -> AsyncSession:
     """获取数据库会话依赖.
@@ -23,11 +55,11 @@ async def get_db_session() -> AsyncSession:
     Raises:
         HTTPException: 如果无法获取数据库会话
     """
-    from one_dragon_alpha.services.mysql import MySQLConnectionService
+    from one_dragon_alpha.services.mysql import get_mysql_connection_service
 
     try:
-        # 获取 MySQL 连接服务实例
-        mysql_service = MySQLConnectionService()
+        # 获取共享的 MySQL 连接服务实例
+        mysql_service = get_mysql_connection_service()
         async with await mysql_service.get_session() as session:
             yield session
     except Exception as e:
@@ -44,6 +76,18 @@ async def get_db_session() -> AsyncSession:
 SessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 
 
+class ModelEndpointRef(BaseModel):
+    """A model within a model configuration, used as a fallback endpoint.
+
+    Attributes:
+        model_config_id: Model configuration ID.
+        model_id: Model ID within the configuration.
+    """
+
+    model_config_id: int
+    model_id: str
+
+
 class ChatRequest(BaseModel):
     """Request model for chat operations.
 
@@ -53,12 +97,17 @@ class ChatRequest(BaseModel):
         user_input: The user's message content.
         model_config_id: Model configuration ID to use for this request.
         model_id: Model ID within the configuration to use.
+        fallbacks: Fallback endpoints, tried on errors and used for hedging.
+        hedge_after_ms: Send a hedged request to the next endpoint when the
+                        first chunk has not arrived after this many milliseconds.
     """
 
     session_id: str | None = None
     user_input: str
     model_config_id: int
     model_id: str
+    fallbacks: list[ModelEndpointRef] = Field(default_factory=list)
+    hedge_after_ms: int | None = Field(default=None, gt=0)
 
 
 class GetAnalysisRequest(BaseModel):
@@ -67,10 +116,38 @@ class GetAnalysisRequest(BaseModel):
     Attributes:
         session_id: Unique identifier for chat session.
         analyse_id: Analysis ID to retrieve results for.
+        max_points: Target number of points of downsampled line series,
+                    defaults to ANALYSE_RESULT_MAX_POINTS.
+        encoding: "typed" to encode numeric series data as base64 typed arrays.
     """
 
     session_id: str
     analyse_id: int
+    max_points: int | None = Field(default=None, ge=3)
+    encoding: ResultEncoding = "json"
+
+
+class ChatWsRequest(BaseModel):
+    """Client message sent over the chat WebSocket.
+
+    Attributes:
+        type: "chat" to start a turn, "interrupt" to interrupt the running turn.
+        session_id: Chat session ID. Optional for "chat" - a new session
+                   will be created if not provided. Required for "interrupt".
+        user_input: The user's message content (for "chat").
+        model_config_id: Model configuration ID to use (for "chat").
+        model_id: Model ID within the configuration to use (for "chat").
+        fallbacks: Fallback endpoints (for "chat"), see ``ChatRequest``.
+        hedge_after_ms: Hedging threshold (for "chat"), see ``ChatRequest``.
+    """
+
+    type: Literal["chat", "interrupt"] = "chat"
+    session_id: str | None = None
+    user_input: str = ""
+    model_config_id: int | None = None
+    model_id: str | None = None
+    fallbacks: list[ModelEndpointRef] = Field(default_factory=list)
+    hedge_after_ms: int | None = Field(default=None, gt=0)
 
 
 class ChatResponseType(StrEnum):
@@ -86,7 +163,10 @@ class ChatResponseType(StrEnum):
                          multiple messages (text, tool calls, tool results).
         RESPONSE_COMPLETED: Final chunk of whole response (SSE/WebSocket).
                            Used to indicate completion of entire response.
-        STATUS: Status update message.
+        STATUS: Status update message, e.g. turn started or model call queued.
+        ANALYSE_RESULT: Parsed result.json of an analysis shown by the
+                        display_analyse_by_code_result tool, sent right after
+                        the tool result message (SSE/WebSocket).
         ERROR: Error response message.
     """
 
@@ -95,7 +175,8 @@ class ChatResponseType(StrEnum):
     RESPONSE_COMPLETED = (
         "response_completed"  # Final chunk of whole response (SSE/WebSocket)
     )
-    STATUS = "status"  # Status update (WebSocket)
+    STATUS = "status"  # Status update (SSE/WebSocket)
+    ANALYSE_RESULT = "analyse_result"  # Inlined analysis result (SSE/WebSocket)
     ERROR = "error"  # Error response (all channels)
 
 
@@ -113,6 +194,28 @@ class ChatResponse(BaseModel):
     message: dict[str, Any]
 
 
+def encode_chat_frame(
+    session_id: str, response_type: ChatResponseType, message: dict[str, Any]
+) -> str:
+    """Encode one chat response frame as JSON.
+
+    The output is byte-compatible with ``ChatResponse(...).model_dump_json()``
+    but skips Pydantic model construction and validation, which dominates the
+    per-chunk cost of streaming.
+
+    Args:
+        session_id: Unique identifier for chat session.
+        response_type: Type of response message.
+        message: Response message as a dictionary.
+
+    Returns:
+        JSON string of the frame.
+    """
+    return get_json_codec().dumps(
+        {"session_id": session_id, "type": response_type.value, "message": message}
+    )
+
+
 def get_session(context: ContextDep, session_id: str | None) -> tuple[str, Session]:
     """Helper function to get or create session and retrieve session object.
 
@@ -146,6 +249,282 @@ def get_session(context: ContextDep, session_id: str | None) -> tuple[str, Sessi
     return session_id, session
 
 
+async def validate_model_config(
+    db_session: AsyncSession, model_config_id: int, model_id: str
+) -> ModelConfigInternal:
+    """Load a model configuration and validate it can serve a chat request.
+
+    Args:
+        db_session: Database session for loading model configuration.
+        model_config_id: Model configuration ID.
+        model_id: Model ID within the configuration.
+
+    Returns:
+        Full model configuration (including api_key).
+
+    Raises:
+        HTTPException: If configuration is not found (404), disabled (400)
+                       or does not contain the model (400).
+    """
+    # 导入 ModelConfigService
+    from one_dragon_agent.core.model.service import ModelConfigService
+
+    # 验证模型配置并获取完整配置(包含 api_key)
+    service = ModelConfigService(db_session)
+    try:
+        config = await service.get_model_config_internal(model_config_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+    # 验证配置是否启用
+    if not config.is_active:
+        raise HTTPException(status_code=400, detail=f"模型配置 '{config.name}' 已禁用")
+
+    # 验证 model_id 是否在配置中
+    model_ids = [m.model_id for m in config.models]
+    if model_id not in model_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"模型 ID '{model_id}' 不在配置 '{config.name}' 中。可用模型: {model_ids}",
+        )
+
+    return config
+
+
+def build_routing_policy(
+    fallbacks: list[ModelEndpointRef],
+    fallback_configs: list[ModelConfigInternal],
+    hedge_after_ms: int | None,
+) -> RoutingPolicy | None:
+    """Build the routing policy of a chat request.
+
+    Args:
+        fallbacks: Fallback endpoints from the request.
+        fallback_configs: Validated configurations of the fallback endpoints.
+        hedge_after_ms: Hedging threshold in milliseconds.
+
+    Returns:
+        The routing policy, or None if the request has no fallback endpoints.
+    """
+    if not fallbacks:
+        return None
+    return RoutingPolicy(
+        fallbacks=[
+            (config, fallback.model_id)
+            for fallback, config in zip(fallbacks, fallback_configs)
+        ],
+        hedge_after=None if hedge_after_ms is None else hedge_after_ms / 1000,
+    )
+
+
+def get_analyse_result_file(
+    workspace_dir: str, session_id: str, analyse_id: int
+) -> str:
+    """Get the path of the result.json written by an analysis.
+
+    Args:
+        workspace_dir: Workspace directory.
+        session_id: Unique identifier for chat session.
+        analyse_id: Analysis ID.
+
+    Returns:
+        Path of the result file.
+    """
+    return os.path.join(
+        workspace_dir, "analyse_by_code", f"{session_id}-{analyse_id}", "result.json"
+    )
+
+
+def displayed_analyse_ids(message: dict[str, Any]) -> list[tuple[str, int]]:
+    """Find the analyses shown by display_analyse_by_code_result in a message.
+
+    Args:
+        message: Message dictionary as sent in a chat frame.
+
+    Returns:
+        List of (tool call ID, analysis ID).
+    """
+    content = message.get("content")
+    if not isinstance(content, list):
+        return []
+
+    displayed = []
+    for block in content:
+        if (
+            not isinstance(block, dict)
+            or block.get("type") != "tool_result"
+            or block.get("name") != _DISPLAY_RESULT_TOOL
+        ):
+            continue
+        output = block.get("output")
+        if isinstance(output, list):
+            output = "".join(
+                item.get("text", "")
+                for item in output
+                if isinstance(item, dict) and item.get("type") == "text"
+            )
+        try:
+            analyse_id = get_json_codec().loads(output)["analyse_id"]
+        except Exception:
+            continue
+        if isinstance(analyse_id, int):
+            displayed.append((block.get("id", ""), analyse_id))
+    return displayed
+
+
+def read_analyse_result(
+    result_file: str,
+    max_points: int | None = None,
+    encoding: ResultEncoding = "json",
+) -> tuple[Any, ResultReport]:
+    """Read a result.json and post-process its charts for delivery.
+
+    Oversized line series are downsampled, see
+    ``one_dragon_alpha.server.chat.echarts``.
+
+    Args:
+        result_file: Path of the result file.
+        max_points: Target number of points, defaults to the configured value.
+        encoding: "typed" to encode numeric series data as typed arrays.
+
+    Returns:
+        Tuple of (processed result, size report).
+
+    Raises:
+        OSError: If the file cannot be read.
+        JsonDecodeError: If the file is not valid JSON, whichever JSON
+            backend is configured.
+    """
+    codec = get_json_codec()
+    with open(result_file, "rb") as f:
+        raw = f.read()
+    result = codec.loads(raw)
+    report = process_result(result, max_points, encoding)
+    report.original_bytes = len(raw)
+    report.delivered_bytes = len(codec.dumpb(result))
+    _result_bytes_original.inc(report.original_bytes)
+    _result_bytes_delivered.inc(report.delivered_bytes)
+    return result, report
+
+
+async def load_inline_analyse_result(
+    session_id: str, analyse_id: int
+) -> dict[str, Any] | None:
+    """Load an analysis result to be pushed in the chat stream.
+
+    Args:
+        session_id: Unique identifier for chat session.
+        analyse_id: Analysis ID.
+
+    Returns:
+        ``{"analyse_id", "result", "truncated", "report"}``, see
+        ``read_analyse_result``. ``result`` is None and ``truncated`` is True
+        when the processed result exceeds the size cap
+        (ANALYSE_RESULT_INLINE_MAX_BYTES). None if the result cannot be read;
+        the client can still use /chat/get_analyse_by_code_result.
+    """
+    workspace_dir = os.getenv("WORKSPACE_DIR")
+    if not workspace_dir:
+        return None
+    result_file = get_analyse_result_file(workspace_dir, session_id, analyse_id)
+    max_bytes = int(
+        os.getenv("ANALYSE_RESULT_INLINE_MAX_BYTES", DEFAULT_INLINE_RESULT_MAX_BYTES)
+    )
+
+    try:
+        result, report = await asyncio.to_thread(read_analyse_result, result_file)
+    except Exception as e:
+        logger.warning(f"无法读取分析结果 {session_id}-{analyse_id}: {e}")
+        return None
+    truncated = report.delivered_bytes > max_bytes
+    return {
+        "analyse_id": analyse_id,
+        "result": None if truncated else result,
+        "truncated": truncated,
+        "report": report.to_dict(),
+    }
+
+
+async def chat_frame_generator(
+    session_id: str,
+    session: Session,
+    user_input: str,
+    model_config_id: int,
+    model_id: str,
+    config,
+    routing: RoutingPolicy | None = None,
+) -> AsyncGenerator[str, None]:
+    """Generate encoded chat response frames for one turn.
+
+    This is transport independent: SSE wraps each frame in a ``data:`` line,
+    WebSocket sends each frame as a text message.
+
+    When a display_analyse_by_code_result tool result completes, the parsed
+    result.json of that analysis follows as an ``analyse_result`` frame, so
+    the client can render it without another request.
+
+    The turn is claimed on the session before it starts, so a turn that
+    races another one on the same session, from any connection or
+    transport, ends with an error frame instead of running concurrently.
+
+    Args:
+        session_id: Unique identifier for chat session.
+        session: Session instance for processing chat message.
+        user_input: The user's message content.
+        model_config_id: Model configuration ID.
+        model_id: Model ID within the configuration.
+        config: Model configuration object.
+        routing: Routing policy across fallback endpoints (optional).
+
+    Yields:
+        JSON-encoded ChatResponse frames.
+    """
+    inlined_tool_calls: set[str] = set()
+    try:
+        with session.turn():
+            async with aclosing(
+                session.chat(
+                    user_input, model_config_id, model_id, config, routing=routing
+                )
+            ) as session_messages:
+                async for session_message in session_messages:
+                    if session_message.status is not None:
+                        yield encode_chat_frame(
+                            session_id, ChatResponseType.STATUS, session_message.status
+                        )
+                        continue
+                    response_type = (
+                        ChatResponseType.RESPONSE_COMPLETED
+                        if session_message.response_completed
+                        else (
+                            ChatResponseType.MESSAGE_COMPLETED
+                            if session_message.message_completed
+                            else ChatResponseType.MESSAGE_UPDATE
+                        )
+                    )
+                    message = (
+                        {}
+                        if session_message.msg is None
+                        else session_message.msg.to_dict()
+                    )
+                    yield encode_chat_frame(session_id, response_type, message)
+                    if not session_message.message_completed:
+                        continue
+                    for tool_call_id, analyse_id in displayed_analyse_ids(message):
+                        if tool_call_id in inlined_tool_calls:
+                            continue
+                        inlined_tool_calls.add(tool_call_id)
+                        payload = await load_inline_analyse_result(
+                            session_id, analyse_id
+                        )
+                        if payload is not None:
+                            yield encode_chat_frame(
+                                session_id, ChatResponseType.ANALYSE_RESULT, payload
+                            )
+    except Exception as e:
+        yield encode_chat_frame(session_id, ChatResponseType.ERROR, {"hint": str(e)})
+
+
 async def stream_response_generator(
     session_id: str,
     session: Session,
@@ -154,12 +533,17 @@ async def stream_response_generator(
     model_id: str,
     config,
     context: ContextDep,
+    routing: RoutingPolicy | None = None,
 ) -> AsyncGenerator[str, None]:
     """Generate streaming response chunks.
 
     This generator creates Server-Sent Events (SSE) format responses
     for real-time chat streaming by delegating to the Session object.
 
+    When the client disconnects, the response task is cancelled while this
+    generator is suspended. The inner generators are closed right away, which
+    cancels the agent task instead of letting it run to completion unobserved.
+
     Args:
         session_id: Unique identifier for chat session.
         session: Session instance for processing chat message.
@@ -168,38 +552,31 @@ async def stream_response_generator(
         model_id: Model ID within the configuration.
         config: Model configuration object.
         context: Dependency context providing services.
+        routing: Routing policy across fallback endpoints (optional).
 
     Yields:
         SSE-formatted response chunks.
     """
+    _active_sse_streams.inc()
     try:
-        async for session_message in session.chat(
-            user_input, model_config_id, model_id, config
-        ):
-            response_type = (
-                ChatResponseType.RESPONSE_COMPLETED
-                if session_message.response_completed
-                else (
-                    ChatResponseType.MESSAGE_COMPLETED
-                    if session_message.message_completed
-                    else ChatResponseType.MESSAGE_UPDATE
-                )
+        async with aclosing(
+            chat_frame_generator(
+                session_id,
+                session,
+                user_input,
+                model_config_id,
+                model_id,
+                config,
+                routing,
             )
-            response = ChatResponse(
-                type=response_type,
-                session_id=session_id,
-                message={}
-                if session_message.msg is None
-                else session_message.msg.to_dict(),
-            )
-            yield f"data: {response.model_dump_json()}\n\n"
-    except Exception as e:
-        response = ChatResponse(
-            type=ChatResponseType.ERROR,
-            session_id=session_id,
-            message={"hint": str(e)},
-        )
-        yield f"data: {response.model_dump_json()}\n\n"
+        ) as frames:
+            async for frame in frames:
+                yield f"data: {frame}\n\n"
+    except asyncio.CancelledError:
+        logger.info(f"客户端已断开，取消会话 {session_id} 的当前轮次")
+        raise
+    finally:
+        _active_sse_streams.dec()
 
 
 @router.post("/stream")
@@ -221,32 +598,24 @@ async def chat_stream(
         Streaming response with SSE format.
 
     Raises:
-        HTTPException: If model configuration is invalid or not found.
+        HTTPException: If model configuration is invalid or not found, or
+            409 if the session is already running a turn.
     """
-    # 导入 ModelConfigService
-    from one_dragon_agent.core.model.service import ModelConfigService
-
-    # 验证模型配置并获取完整配置(包含 api_key)
-    service = ModelConfigService(session)
-    try:
-        config = await service.get_model_config_internal(request.model_config_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e)) from e
-
-    # 验证配置是否启用
-    if not config.is_active:
-        raise HTTPException(status_code=400, detail=f"模型配置 '{config.name}' 已禁用")
-
-    # 验证 model_id 是否在配置中
-    model_ids = [m.model_id for m in config.models]
-    if request.model_id not in model_ids:
-        raise HTTPException(
-            status_code=400,
-            detail=f"模型 ID '{request.model_id}' 不在配置 '{config.name}' 中。可用模型: {model_ids}",
-        )
+    config = await validate_model_config(
+        session, request.model_config_id, request.model_id
+    )
+    fallback_configs = [
+        await validate_model_config(session, f.model_config_id, f.model_id)
+        for f in request.fallbacks
+    ]
+    routing = build_routing_policy(
+        request.fallbacks, fallback_configs, request.hedge_after_ms
+    )
 
     # 获取或创建 Session
     session_id, tushare_session = get_session(context, request.session_id)
+    if tushare_session.busy:
+        raise HTTPException(status_code=409, detail="Session is busy with another turn")
 
     return StreamingResponse(
         stream_response_generator(
@@ -257,6 +626,7 @@ async def chat_stream(
             model_id=request.model_id,
             config=config,
             context=context,
+            routing=routing,
         ),
         media_type="text/event-stream",
         headers={
@@ -266,6 +636,201 @@ async def chat_stream(
     )
 
 
+async def _load_model_config_for_ws(
+    model_config_id: int, model_id: str
+) -> ModelConfigInternal:
+    """Load and validate a model configuration for a WebSocket turn.
+
+    Args:
+        model_config_id: Model configuration ID.
+        model_id: Model ID within the configuration.
+
+    Returns:
+        Full model configuration (including api_key).
+
+    Raises:
+        HTTPException: If configuration is invalid or database is unreachable.
+    """
+    from one_dragon_alpha.services.mysql import get_mysql_connection_service
+
+    try:
+        mysql_service = get_mysql_connection_service()
+    except Exception as e:
+        logger.error(f"无法获取数据库会话: {e}")
+        raise HTTPException(status_code=500, detail="无法连接到数据库") from e
+
+    async with await mysql_service.get_session() as db_session:
+        return await validate_model_config(db_session, model_config_id, model_id)
+
+
+async def _run_ws_turn(
+    context: ContextDep,
+    connection: WebSocketConnection,
+    session_id: str,
+    session: Session,
+    request: ChatWsRequest,
+) -> None:
+    """Run one chat turn and send its frames over a WebSocket connection.
+
+    Args:
+        context: Dependency context providing services.
+        connection: The connection that requested the turn.
+        session_id: Unique identifier for chat session.
+        session: Session instance for processing chat message.
+        request: The chat request.
+    """
+    manager = context.chat_ws_manager
+    try:
+        config = await _load_model_config_for_ws(
+            request.model_config_id, request.model_id
+        )
+        fallback_configs = [
+            await _load_model_config_for_ws(f.model_config_id, f.model_id)
+            for f in request.fallbacks
+        ]
+    except HTTPException as e:
+        await connection.send(
+            encode_chat_frame(session_id, ChatResponseType.ERROR, {"hint": e.detail})
+        )
+        return
+
+    manager.broadcast(
+        session_id,
+        encode_chat_frame(session_id, ChatResponseType.STATUS, {"hint": "turn_started"}),
+    )
+
+    async with aclosing(
+        chat_frame_generator(
+            session_id,
+            session,
+            request.user_input,
+            request.model_config_id,
+            request.model_id,
+            config,
+            build_routing_policy(
+                request.fallbacks, fallback_configs, request.hedge_after_ms
+            ),
+        )
+    ) as frames:
+        async for frame in frames:
+            if not await connection.send(frame):
+                # 客户端已断开
+                return
+
+    manager.broadcast(
+        session_id,
+        encode_chat_frame(
+            session_id, ChatResponseType.STATUS, {"hint": "turn_completed"}
+        ),
+    )
+
+
+@router.websocket("/ws")
+async def chat_ws(websocket: WebSocket, context: ContextDep) -> None:
+    """Persistent chat transport multiplexing many turns over one connection.
+
+    Client messages are ``ChatWsRequest`` JSON objects. A "chat" message
+    starts a turn whose frames (same format as the SSE endpoint) are sent
+    back tagged with their session_id, so turns of different sessions can
+    run concurrently on the same connection. An "interrupt" message
+    interrupts the running turn of a session. Status events are fanned out
+    to every connection subscribed to the session.
+
+    Args:
+        websocket: The incoming WebSocket.
+        context: Dependency context providing services.
+    """
+    manager = context.chat_ws_manager
+    connection = await manager.connect(websocket)
+    turns: dict[str, asyncio.Task] = {}
+
+    await connection.send(
+        encode_chat_frame("", ChatResponseType.STATUS, {"hint": "connected"})
+    )
+
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                request = ChatWsRequest.model_validate_json(raw)
+            except ValidationError as e:
+                await connection.send(
+                    encode_chat_frame("", ChatResponseType.ERROR, {"hint": str(e)})
+                )
+                continue
+
+            if request.type == "interrupt":
+                session = (
+                    None
+                    if request.session_id is None
+                    else context.session_service.get_session(request.session_id)
+                )
+                if session is None:
+                    await connection.send(
+                        encode_chat_frame(
+                            request.session_id or "",
+                            ChatResponseType.ERROR,
+                            {"hint": f"Session not found: {request.session_id}"},
+                        )
+                    )
+                    continue
+                await session.interrupt()
+                manager.broadcast(
+                    request.session_id,
+                    encode_chat_frame(
+                        request.session_id,
+                        ChatResponseType.STATUS,
+                        {"hint": "interrupted"},
+                    ),
+                )
+                continue
+
+            if request.model_config_id is None or request.model_id is None:
+                await connection.send(
+                    encode_chat_frame(
+                        request.session_id or "",
+                        ChatResponseType.ERROR,
+                        {"hint": "model_config_id and model_id are required"},
+                    )
+                )
+                continue
+
+            try:
+                session_id, session = get_session(context, request.session_id)
+            except HTTPException as e:
+                await connection.send(
+                    encode_chat_frame(
+                        request.session_id or "",
+                        ChatResponseType.ERROR,
+                        {"hint": e.detail},
+                    )
+                )
+                continue
+
+            # 同一个会话同时只能有一个进行中的轮次，包括其他连接和 SSE 的轮次
+            running = turns.get(session_id)
+            if session.busy or (running is not None and not running.done()):
+                await connection.send(
+                    encode_chat_frame(
+                        session_id,
+                        ChatResponseType.ERROR,
+                        {"hint": "Session is busy with another turn"},
+                    )
+                )
+                continue
+
+            manager.subscribe(connection.connection_id, session_id)
+            turns[session_id] = asyncio.create_task(
+                _run_ws_turn(context, connection, session_id, session, request)
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in turns.values():
+            task.cancel()
+        await manager.disconnect(connection.connection_id)
+
+
 @router.post("/get_analyse_by_code_result")
 async def get_analyse_by_code_result(
     request: GetAnalysisRequest, context: ContextDep
@@ -273,7 +838,9 @@ async def get_analyse_by_code_result(
     """Get analysis results by session ID and analysis ID.
 
     This endpoint retrieves the analysis results stored in the workspace
-    directory for a specific session and analysis ID combination.
+    directory for a specific session and analysis ID combination. Oversized
+    line series are downsampled before they are returned, and the response
+    reports the original and delivered sizes.
 
     Args:
         request: Request containing session_id and analyse_id.
@@ -301,9 +868,10 @@ async def get_analyse_by_code_result(
         )
 
     # Construct analysis directory path
-    analyse_dir = os.path.join(
-        workspace_dir, "analyse_by_code", f"{request.session_id}-{request.analyse_id}"
+    result_file = get_analyse_result_file(
+        workspace_dir, request.session_id, request.analyse_id
     )
+    analyse_dir = os.path.dirname(result_file)
 
     # Check if analysis directory exists
     if not os.path.exists(analyse_dir):
@@ -313,7 +881,6 @@ async def get_analyse_by_code_result(
         )
 
     # Check if result.json file exists
-    result_file = os.path.join(analyse_dir, "result.json")
     if not os.path.exists(result_file):
         raise HTTPException(
             status_code=404,
@@ -321,17 +888,19 @@ async def get_analyse_by_code_result(
         )
 
     try:
-        # Read and return the result.json file
-        with open(result_file, "r", encoding="utf-8") as f:
-            result_data = json.load(f)
+        # Read the result.json file and downsample oversized series
+        result_data, report = await asyncio.to_thread(
+            read_analyse_result, result_file, request.max_points, request.encoding
+        )
 
         return {
             "session_id": request.session_id,
             "analyse_id": request.analyse_id,
             "result": result_data,
+            "report": report.to_dict(),
         }
 
-    except json.JSONDecodeError as e:
+    except JsonDecodeError as e:
         raise HTTPException(
             status_code=500, detail=f"Invalid JSON in result file: {str(e)}"
         )
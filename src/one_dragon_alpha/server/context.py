@@ -2,6 +2,7 @@
 
 from typing import Optional
 
+from one_dragon_alpha.server.health.monitor import HealthMonitor
 from one_dragon_alpha.server.ws_manager import WebSocketConnectionManager
 from one_dragon_alpha.session.session_service import SessionService
 
@@ -15,6 +16,7 @@ class OneDragonAlphaContext:
         """Initialize the context with required services."""
         self.session_service = SessionService()
         self.chat_ws_manager = WebSocketConnectionManager()
+        self.health_monitor = HealthMonitor()
     
     @classmethod
     def get_instance(cls) -> 'OneDragonAlphaContext':
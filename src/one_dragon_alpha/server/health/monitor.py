@@ -0,0 +1,213 @@
+"""Background health monitor serving cached readiness snapshots."""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ComponentHealth:
+    """Health of a single dependency.
+
+    Attributes:
+        healthy: Whether the dependency is usable.
+        required: Whether the server is not ready without it.
+        detail: Human readable status.
+        latency_ms: Time the check took.
+        data: Extra check-specific values.
+    """
+
+    healthy: bool
+    required: bool
+    detail: str
+    latency_ms: float = 0.0
+    data: dict = field(default_factory=dict)
+
+
+@dataclass
+class HealthSnapshot:
+    """Result of one round of health checks.
+
+    Attributes:
+        checked_at: Unix timestamp of the round.
+        components: Health of each dependency by name.
+    """
+
+    checked_at: float
+    components: dict[str, ComponentHealth]
+
+    @property
+    def ready(self) -> bool:
+        """Whether all required dependencies are healthy."""
+        return all(c.healthy for c in self.components.values() if c.required)
+
+
+HealthCheck = Callable[[], Awaitable[ComponentHealth]]
+
+
+class HealthMonitor:
+    """Run health checks periodically and keep the latest snapshot.
+
+    Probes read the snapshot and never trigger checks themselves, so the
+    load on MySQL and external services is one check per interval no matter
+    how often the orchestrator probes.
+
+    Attributes:
+        interval: Seconds between two rounds of checks.
+        timeout: Seconds each check may take before it counts as failed.
+        snapshot: The latest snapshot, None before the first round.
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        timeout: float = 5.0,
+        checks: dict[str, tuple[HealthCheck, bool]] | None = None,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between rounds, defaults to env HEALTH_CHECK_INTERVAL or 15.
+            timeout: Seconds each check may take.
+            checks: Mapping of name to (check, required). Defaults to the
+                database, Tushare and Qwen token manager checks.
+        """
+        if interval is None:
+            interval = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+        self.interval: float = interval
+        self.timeout: float = timeout
+        self.snapshot: HealthSnapshot | None = None
+        self._checks: dict[str, tuple[HealthCheck, bool]] = (
+            checks
+            if checks is not None
+            else {
+                "database": (check_database, True),
+                "tushare": (check_tushare, False),
+                "qwen_token": (check_qwen_token, False),
+            }
+        )
+        self._task: asyncio.Task | None = None
+
+    def is_stale(self) -> bool:
+        """Whether the snapshot is missing or has not been refreshed for 3 intervals."""
+        return (
+            self.snapshot is None
+            or time.time() - self.snapshot.checked_at > self.interval * 3
+        )
+
+    async def refresh(self) -> HealthSnapshot:
+        """Run all checks concurrently and replace the snapshot.
+
+        Returns:
+            The new snapshot.
+        """
+        names = list(self._checks)
+        results = await asyncio.gather(
+            *(self._run_check(name) for name in names)
+        )
+        self.snapshot = HealthSnapshot(
+            checked_at=time.time(), components=dict(zip(names, results))
+        )
+        return self.snapshot
+
+    async def _run_check(self, name: str) -> ComponentHealth:
+        """Run one check with timeout, turning errors into unhealthy results."""
+        check, required = self._checks[name]
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = ComponentHealth(False, required, f"检查超时（{self.timeout} 秒）")
+        except Exception as e:
+            result = ComponentHealth(False, required, f"检查失败: {e}")
+        result.required = required
+        result.latency_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def start(self) -> None:
+        """Start the background loop; the first round runs immediately.
+
+        Startup is not blocked by slow dependencies: until the first round
+        completes the snapshot is None and readiness reports ``starting``.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self) -> None:
+        """Refresh the snapshot every interval."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"健康检查失败: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def stop(self) -> None:
+        """Stop the background refresh loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+async def check_database() -> ComponentHealth:
+    """Check MySQL through the shared connection service."""
+    from one_dragon_alpha.services.mysql import get_mysql_connection_service
+
+    status = await get_mysql_connection_service().health_check()
+    return ComponentHealth(
+        healthy=status.is_healthy,
+        required=True,
+        detail=status.message if status.error is None else status.error,
+        data={
+            "pool_size": status.pool_size,
+            "pool_overflow": status.pool_overflow,
+            "checked_out": status.checked_out,
+        },
+    )
+
+
+async def check_tushare() -> ComponentHealth:
+    """Check that a Tushare token is configured and the API host accepts TCP connections.
+
+    A TCP connect stands in for a real query, which would consume API quota.
+    The host is the one the shared Tushare client sends requests to.
+    """
+    from tushare_mcp_server.client import get_tushare_client
+
+    if not os.getenv("TUSHARE_API_TOKEN"):
+        return ComponentHealth(False, False, "未配置 TUSHARE_API_TOKEN")
+
+    url = urlparse(get_tushare_client().base_url)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    _, writer = await asyncio.open_connection(url.hostname, port)
+    writer.close()
+    await writer.wait_closed()
+    return ComponentHealth(True, False, f"{url.hostname}:{port} 可连接")
+
+
+async def check_qwen_token() -> ComponentHealth:
+    """Report the Qwen token manager state without loading or refreshing tokens."""
+    from one_dragon_agent.core.model.qwen.token_manager import QwenTokenManager
+
+    manager = QwenTokenManager._instance
+    if manager is None:
+        return ComponentHealth(True, False, "未启用")
+
+    status = manager.status()
+    if not status["has_token"]:
+        return ComponentHealth(False, False, "未加载 token", data=status)
+    if status["expires_at"] < time.time() * 1000:
+        return ComponentHealth(False, False, "token 已过期", data=status)
+    return ComponentHealth(True, False, "token 有效", data=status)
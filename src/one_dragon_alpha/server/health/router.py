@@ -0,0 +1,56 @@
+"""Liveness and readiness probe endpoints."""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from one_dragon_alpha.server.dependencies import ContextDep
+
+router = APIRouter(tags=["健康检查"])
+
+
+@router.get("/healthz", summary="存活检查")
+async def healthz() -> dict:
+    """Liveness probe.
+
+    Does no I/O: answering at all means the event loop is alive.
+
+    Returns:
+        Fixed ok status.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz", summary="就绪检查")
+async def readyz(context: ContextDep) -> JSONResponse:
+    """Readiness probe backed by the cached health snapshot.
+
+    Args:
+        context: Dependency context providing the health monitor.
+
+    Returns:
+        200 with the snapshot when all required dependencies are healthy,
+        503 otherwise or when the snapshot is missing or stale.
+    """
+    monitor = context.health_monitor
+    snapshot = monitor.snapshot
+    if snapshot is None:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", "components": {}},
+        )
+
+    stale = monitor.is_stale()
+    ready = snapshot.ready and not stale
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else ("stale" if stale else "not_ready"),
+            "checked_at": snapshot.checked_at,
+            "components": {
+                name: asdict(component)
+                for name, component in snapshot.components.items()
+            },
+        },
+    )
@@ -0,0 +1,80 @@
+"""ASGI middleware recording HTTP request latency per route."""
+
+import time
+
+from one_dragon_agent.core.system.metrics import Histogram, get_metrics_registry
+
+# 未匹配到路由的请求统一归为一个标签，避免任意路径造成标签爆炸
+_UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Record request latency histograms labeled by method and route template.
+
+    The route template (e.g. ``/api/models/configs/{config_id}``) is read from
+    ``scope["route"]`` after routing, so path parameters do not create new
+    series. Histograms are cached per (method, route) in nested dicts keyed by
+    strings that already exist, so a request only does two dict lookups and
+    updates preallocated counters.
+
+    Streaming responses are measured until the last body chunk is sent.
+    """
+
+    def __init__(self, app) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application.
+        """
+        self.app = app
+        registry = get_metrics_registry()
+        self._latency = registry.histogram(
+            "oda_http_request_duration_seconds",
+            "HTTP 请求耗时（秒）",
+            ("method", "route"),
+        )
+        self._in_progress = registry.gauge(
+            "oda_http_requests_in_progress", "进行中的 HTTP 请求数"
+        ).labels()
+        self._errors = registry.counter(
+            "oda_http_request_errors_total", "返回 5xx 或抛出异常的 HTTP 请求数"
+        ).labels()
+        self._histograms: dict[str, dict[str, Histogram]] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Handle an ASGI call."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_progress.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or _UNMATCHED_ROUTE
+            self._histogram(scope["method"], path).observe(
+                time.perf_counter() - start
+            )
+            if status_code >= 500:
+                self._errors.inc()
+
+    def _histogram(self, method: str, path: str) -> Histogram:
+        """Get the cached histogram of a route."""
+        by_path = self._histograms.get(method)
+        if by_path is None:
+            by_path = self._histograms[method] = {}
+        histogram = by_path.get(path)
+        if histogram is None:
+            histogram = by_path[path] = self._latency.labels(method, path)
+        return histogram
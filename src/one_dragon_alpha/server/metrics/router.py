@@ -0,0 +1,70 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+from one_dragon_alpha.server.context import OneDragonAlphaContext
+
+router = APIRouter()
+
+_registry = get_metrics_registry()
+_sessions = _registry.gauge("oda_chat_sessions", "内存中的聊天会话数").labels()
+_ws_connections = _registry.gauge(
+    "oda_chat_ws_connections", "活跃的聊天 WebSocket 连接数"
+).labels()
+_db_pool = _registry.gauge(
+    "oda_db_pool_connections", "数据库连接池连接数", ("state",)
+)
+_oauth_sessions = _registry.gauge(
+    "oda_qwen_oauth_sessions", "Qwen OAuth 设备码会话数", ("status",)
+)
+
+
+def _collect_context() -> None:
+    """采集会话数和 WebSocket 连接数."""
+    context = OneDragonAlphaContext._instance
+    if context is None:
+        return
+    _sessions.set(context.session_service.session_count())
+    _ws_connections.set(len(context.chat_ws_manager.active_connections))
+
+
+def _collect_db_pool() -> None:
+    """采集共享数据库连接池的状态，连接服务未创建时不采集."""
+    from one_dragon_alpha.services.mysql import current_mysql_connection_service
+
+    service = current_mysql_connection_service()
+    if service is None:
+        return
+    for state, value in service.pool_stats().items():
+        _db_pool.labels(state).set(value)
+
+
+def _collect_oauth_sessions() -> None:
+    """采集各状态的 Qwen OAuth 会话数."""
+    from one_dragon_agent.core.model.qwen.oauth_session import (
+        get_oauth_session_manager,
+    )
+
+    # 已不存在的状态需要归零，因此每次重建
+    _oauth_sessions.clear()
+    for status, count in get_oauth_session_manager().count_sessions_by_status().items():
+        _oauth_sessions.labels(status).set(count)
+
+
+_registry.add_collect_hook(_collect_context)
+_registry.add_collect_hook(_collect_db_pool)
+_registry.add_collect_hook(_collect_oauth_sessions)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose all metrics in Prometheus text format.
+
+    Returns:
+        Prometheus text exposition of the registry.
+    """
+    return PlainTextResponse(
+        _registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
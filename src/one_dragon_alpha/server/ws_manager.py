@@ -1,23 +1,204 @@
+# -*- coding: utf-8 -*-
+"""WebSocket connection management for chat transport."""
+
+import asyncio
 from typing import Dict
 
+import shortuuid
 from fastapi import WebSocket
 
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class WebSocketConnection:
+    """A single client WebSocket connection with a bounded send queue.
+
+    All frames for the connection go through one sender task, so concurrent
+    turns never interleave partial writes. When the client reads slowly the
+    queue fills up and producers awaiting ``send`` are paused (backpressure),
+    instead of buffering frames without limit.
+
+    Attributes:
+        connection_id: Unique identifier for the connection.
+        websocket: The underlying WebSocket.
+        session_ids: Chat sessions this connection is subscribed to.
+        send_queue: Bounded queue of encoded frames waiting to be sent.
+        closed: Whether the connection has been closed.
+    """
+
+    def __init__(
+        self, connection_id: str, websocket: WebSocket, max_queue_size: int
+    ) -> None:
+        """Initialize the connection.
+
+        Args:
+            connection_id: Unique identifier for the connection.
+            websocket: The underlying WebSocket (already accepted).
+            max_queue_size: Maximum number of frames buffered before send blocks.
+        """
+        self.connection_id: str = connection_id
+        self.websocket: WebSocket = websocket
+        self.session_ids: set[str] = set()
+        self.send_queue: asyncio.Queue[str | None] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self.closed: bool = False
+        self._sender_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the sender task."""
+        if self._sender_task is None:
+            self._sender_task = asyncio.create_task(self._sender_loop())
+
+    async def _sender_loop(self) -> None:
+        """Send queued frames to the client until closed."""
+        try:
+            while True:
+                frame = await self.send_queue.get()
+                if frame is None:
+                    break
+                await self.websocket.send_text(frame)
+        except Exception as e:
+            logger.info(f"WebSocket {self.connection_id} sender stopped: {e}")
+        finally:
+            self.closed = True
+
+    async def send(self, frame: str) -> bool:
+        """Queue a frame, waiting while the send queue is full.
+
+        Args:
+            frame: Encoded frame to send.
+
+        Returns:
+            False if the connection is already closed, True otherwise.
+        """
+        if self.closed:
+            return False
+        await self.send_queue.put(frame)
+        return True
+
+    def try_send(self, frame: str) -> bool:
+        """Queue a frame without waiting.
+
+        Used for best-effort status events, which are dropped rather than
+        blocking the caller when the client is not keeping up.
+
+        Args:
+            frame: Encoded frame to send.
+
+        Returns:
+            Whether the frame was queued.
+        """
+        if self.closed:
+            return False
+        try:
+            self.send_queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def close(self) -> None:
+        """Stop the sender task and mark the connection closed."""
+        self.closed = True
+        if self._sender_task is None or self._sender_task.done():
+            return
+        try:
+            self.send_queue.put_nowait(None)
+            await asyncio.wait_for(self._sender_task, timeout=1)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self._sender_task.cancel()
+
 
 # Connection manager for tracking active WebSocket sessions
 class WebSocketConnectionManager:
-    """Manager for tracking WebSocket connections per session."""
+    """Manager for tracking WebSocket connections and their chat sessions.
+
+    A connection may carry many chat sessions, and a session may be watched
+    by several connections (e.g. multiple browser tabs). Status events are
+    fanned out to every connection subscribed to the session.
+
+    Attributes:
+        active_connections: Mapping of connection ID to connection.
+        max_queue_size: Send queue size for new connections.
+    """
+
+    def __init__(self, max_queue_size: int = 256):
+        self.active_connections: Dict[str, WebSocketConnection] = {}
+        self.max_queue_size: int = max_queue_size
+        self._session_connections: Dict[str, set[str]] = {}
+
+    async def connect(self, websocket: WebSocket) -> WebSocketConnection:
+        """Accept a WebSocket and register it as a new connection.
+
+        Args:
+            websocket: The incoming WebSocket.
+
+        Returns:
+            The registered connection with its sender task running.
+        """
+        await websocket.accept()
+        connection = WebSocketConnection(
+            shortuuid.uuid(), websocket, self.max_queue_size
+        )
+        connection.start()
+        self.active_connections[connection.connection_id] = connection
+        return connection
+
+    async def disconnect(self, connection_id: str) -> None:
+        """Unregister a connection and stop its sender task.
+
+        Args:
+            connection_id: The connection to remove.
+        """
+        connection = self.active_connections.pop(connection_id, None)
+        if connection is None:
+            return
+        for session_id in connection.session_ids:
+            connection_ids = self._session_connections.get(session_id)
+            if connection_ids is not None:
+                connection_ids.discard(connection_id)
+                if not connection_ids:
+                    del self._session_connections[session_id]
+        await connection.close()
+
+    def subscribe(self, connection_id: str, session_id: str) -> None:
+        """Subscribe a connection to status events of a session.
+
+        Args:
+            connection_id: The subscribing connection.
+            session_id: The chat session to follow.
+        """
+        connection = self.active_connections.get(connection_id)
+        if connection is None:
+            return
+        connection.session_ids.add(session_id)
+        self._session_connections.setdefault(session_id, set()).add(connection_id)
+
+    def get_connection(self, connection_id: str) -> WebSocketConnection | None:
+        """Get a connection by ID."""
+        return self.active_connections.get(connection_id)
 
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+    def get_session_connections(self, session_id: str) -> list[WebSocketConnection]:
+        """Get all connections subscribed to a session."""
+        return [
+            self.active_connections[connection_id]
+            for connection_id in self._session_connections.get(session_id, ())
+            if connection_id in self.active_connections
+        ]
 
-    def add_connection(self, session_id: str, websocket: WebSocket) -> None:
-        """Add a WebSocket connection for a session."""
-        self.active_connections[session_id] = websocket
+    def broadcast(self, session_id: str, frame: str) -> int:
+        """Fan out an encoded frame to every connection of a session.
 
-    def remove_connection(self, session_id: str) -> None:
-        """Remove a WebSocket connection for a session."""
-        self.active_connections.pop(session_id, None)
+        Args:
+            session_id: The chat session the frame belongs to.
+            frame: Encoded frame to send.
 
-    def get_connection(self, session_id: str) -> WebSocket | None:
-        """Get WebSocket connection for a session."""
-        return self.active_connections.get(session_id)
\ No newline at end of file
+        Returns:
+            Number of connections the frame was queued on.
+        """
+        return sum(
+            connection.try_send(frame)
+            for connection in self.get_session_connections(session_id)
+        )
@@ -2,7 +2,19 @@
 """MySQL connection service module."""
 
 from one_dragon_alpha.services.mysql.config import MySQLConfig
-from one_dragon_alpha.services.mysql.connection_service import MySQLConnectionService
+from one_dragon_alpha.services.mysql.connection_service import (
+    MySQLConnectionService,
+    close_mysql_connection_service,
+    current_mysql_connection_service,
+    get_mysql_connection_service,
+)
 from one_dragon_alpha.services.mysql.health import HealthStatus
 
-__all__ = ["HealthStatus", "MySQLConfig", "MySQLConnectionService"]
+__all__ = [
+    "HealthStatus",
+    "MySQLConfig",
+    "MySQLConnectionService",
+    "close_mysql_connection_service",
+    "current_mysql_connection_service",
+    "get_mysql_connection_service",
+]
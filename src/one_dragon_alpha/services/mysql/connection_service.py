@@ -170,6 +170,21 @@ class MySQLConnectionService:
                 error="Database connection failed",
             )
 
+    def pool_stats(self) -> dict[str, int]:
+        """Get connection pool statistics without touching the database.
+
+        Returns:
+            dict[str, int]: Pool size, overflow, checked-out and checked-in
+            connection counts.
+        """
+        pool = self._engine.pool
+        return {
+            "size": pool.size(),
+            "overflow": pool.overflow(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+        }
+
     async def __aenter__(self) -> Self:
         """Async context manager entry.
 
@@ -185,3 +200,38 @@ class MySQLConnectionService:
             *args: Exception info if any.
         """
         await self.close()
+
+
+_service: MySQLConnectionService | None = None
+
+
+def get_mysql_connection_service() -> MySQLConnectionService:
+    """Get the process-wide MySQL connection service.
+
+    Request handlers share one engine and connection pool instead of
+    creating a service per request. A closed service is replaced.
+
+    Returns:
+        MySQLConnectionService: The shared service instance.
+    """
+    global _service
+    if _service is None or _service._is_closed:
+        _service = MySQLConnectionService()
+    return _service
+
+
+def current_mysql_connection_service() -> MySQLConnectionService | None:
+    """Get the shared MySQL connection service if it has been created.
+
+    Returns:
+        MySQLConnectionService | None: The shared service, or None.
+    """
+    return _service
+
+
+async def close_mysql_connection_service() -> None:
+    """Close and forget the shared MySQL connection service."""
+    global _service
+    if _service is not None:
+        await _service.close()
+        _service = None
@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+"""Versioned SQL migration runner and startup schema check.
+
+Migration files are named ``<version>_<description>.sql`` (for example
+``003_add_oauth_fields.sql``) and applied in version order. Applied
+versions are recorded in the ``schema_migrations`` table together with a
+checksum of the file, so editing an applied file is reported instead of
+silently ignored.
+
+Command line usage::
+
+    python -m one_dragon_alpha.services.mysql.migration status
+    python -m one_dragon_alpha.services.mysql.migration migrate
+    python -m one_dragon_alpha.services.mysql.migration baseline 004
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from one_dragon_alpha.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+# 模型配置表的迁移脚本目录
+DEFAULT_MIGRATIONS_DIR = (
+    Path(__file__).resolve().parents[3]
+    / "one_dragon_agent"
+    / "core"
+    / "model"
+    / "migrations"
+)
+
+# 多个进程同时启动时只允许一个执行迁移（MySQL GET_LOCK 名称）
+_LOCK_NAME = "oda_schema_migrations"
+_LOCK_TIMEOUT_SECONDS = 60
+
+_FILENAME_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+_CREATE_TABLE_PATTERN = re.compile(
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?", re.IGNORECASE
+)
+
+_migrations_metadata = MetaData()
+
+schema_migrations_table = Table(
+    "schema_migrations",
+    _migrations_metadata,
+    Column("version", String(32), primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("checksum", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.now),
+)
+
+
+class MigrationError(Exception):
+    """Raised when migrations cannot be applied."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A migration file.
+
+    Attributes:
+        version: Version prefix of the file name, e.g. ``003``.
+        name: Description part of the file name.
+        path: Path of the SQL file.
+        checksum: SHA-256 of the file content.
+    """
+
+    version: str
+    name: str
+    path: Path
+    checksum: str
+
+    @classmethod
+    def from_path(cls, path: Path) -> Migration:
+        """Create a migration from a file path.
+
+        Args:
+            path: Path of a ``<version>_<description>.sql`` file.
+
+        Returns:
+            Migration: The migration.
+
+        Raises:
+            ValueError: If the file name does not match the naming pattern.
+        """
+        match = _FILENAME_PATTERN.match(path.name)
+        if match is None:
+            msg = f"Invalid migration file name: {path.name}"
+            raise ValueError(msg)
+        checksum = hashlib.sha256(path.read_bytes()).hexdigest()
+        return cls(match.group(1), match.group(2), path, checksum)
+
+    def statements(self) -> list[str]:
+        """Split the file into SQL statements.
+
+        Full-line ``--`` comments are dropped and statements are split on
+        ``;``, so statements must not contain semicolons inside string
+        literals.
+
+        Returns:
+            list[str]: Statements in file order.
+        """
+        lines = [
+            line
+            for line in self.path.read_text(encoding="utf-8").splitlines()
+            if not line.lstrip().startswith("--")
+        ]
+        return [s.strip() for s in "\n".join(lines).split(";") if s.strip()]
+
+    def created_tables(self) -> list[str]:
+        """Get the names of tables created by this migration."""
+        return _CREATE_TABLE_PATTERN.findall(self.path.read_text(encoding="utf-8"))
+
+
+def load_migrations(directory: Path = DEFAULT_MIGRATIONS_DIR) -> list[Migration]:
+    """Load migration files from a directory in version order.
+
+    Args:
+        directory: Directory containing ``.sql`` migration files.
+
+    Returns:
+        list[Migration]: Migrations sorted by version.
+
+    Raises:
+        ValueError: If a file name is invalid or two files share a version.
+    """
+    migrations = sorted(
+        (Migration.from_path(path) for path in directory.glob("*.sql")),
+        key=lambda m: int(m.version),
+    )
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        msg = f"Duplicate migration versions in {directory}: {versions}"
+        raise ValueError(msg)
+    return migrations
+
+
+class MigrationRunner:
+    """Apply pending migrations and record them in ``schema_migrations``.
+
+    Each migration runs on one connection and its version row is written in
+    the same transaction as its statements. MySQL commits DDL implicitly, so
+    for DDL files this guarantees only that a version is recorded after all
+    of its statements succeeded; a failed file stays pending and the error
+    names the statement that failed.
+
+    Attributes:
+        engine: Engine of the target database.
+        migrations: Known migrations in version order.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, directory: Path = DEFAULT_MIGRATIONS_DIR
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            engine: Engine of the target database.
+            directory: Directory containing the migration files.
+        """
+        self.engine: AsyncEngine = engine
+        self.migrations: list[Migration] = load_migrations(directory)
+
+    async def status(self) -> list[tuple[Migration, bool]]:
+        """Get every known migration and whether it has been applied.
+
+        Returns:
+            list[tuple[Migration, bool]]: (migration, applied) pairs.
+        """
+        async with self.engine.connect() as conn:
+            applied = await self._applied(conn)
+        return [(m, m.version in applied) for m in self.migrations]
+
+    async def migrate(self) -> list[Migration]:
+        """Apply all pending migrations in version order.
+
+        Returns:
+            list[Migration]: The migrations applied by this call.
+
+        Raises:
+            MigrationError: If the lock cannot be acquired, the database has
+                unrecorded tables, or a statement fails.
+        """
+        async with self.engine.connect() as conn:
+            await self._acquire_lock(conn)
+            try:
+                applied = await self._applied(conn)
+                pending = [m for m in self.migrations if m.version not in applied]
+                if not applied and pending:
+                    await self._check_untracked_tables(conn, pending)
+
+                for migration in pending:
+                    await self._apply(conn, migration)
+                return pending
+            finally:
+                await self._release_lock(conn)
+
+    async def baseline(self, version: str) -> list[Migration]:
+        """Record migrations up to a version as applied without running them.
+
+        Used once for databases whose schema was created by running the SQL
+        files by hand.
+
+        Args:
+            version: Last version already present in the database.
+
+        Returns:
+            list[Migration]: The migrations newly recorded.
+
+        Raises:
+            MigrationError: If the version is unknown.
+        """
+        if version not in {m.version for m in self.migrations}:
+            msg = f"Unknown migration version: {version}"
+            raise MigrationError(msg)
+
+        async with self.engine.connect() as conn:
+            applied = await self._applied(conn)
+            recorded = [
+                m
+                for m in self.migrations
+                if int(m.version) <= int(version) and m.version not in applied
+            ]
+            for migration in recorded:
+                await conn.execute(_record(migration))
+            await conn.commit()
+        return recorded
+
+    async def _applied(self, conn: AsyncConnection) -> dict[str, str]:
+        """Create the versions table if needed and read applied versions.
+
+        Returns:
+            dict[str, str]: Checksum of each applied version.
+        """
+        await conn.run_sync(_migrations_metadata.create_all)
+        result = await conn.execute(
+            select(
+                schema_migrations_table.c.version, schema_migrations_table.c.checksum
+            )
+        )
+        applied = dict(result.all())
+        await conn.commit()
+
+        for migration in self.migrations:
+            checksum = applied.get(migration.version)
+            if checksum is not None and checksum != migration.checksum:
+                logger.warning(
+                    f"Migration {migration.path.name} was modified after it was applied"
+                )
+        return applied
+
+    async def _check_untracked_tables(
+        self, conn: AsyncConnection, pending: list[Migration]
+    ) -> None:
+        """Refuse to migrate a database whose tables were created by hand.
+
+        Raises:
+            MigrationError: If a table created by a pending migration exists.
+        """
+        existing = set(await conn.run_sync(lambda c: inspect(c).get_table_names()))
+        untracked = sorted(
+            {t for m in pending for t in m.created_tables()} & existing
+        )
+        if untracked:
+            msg = (
+                f"Tables {untracked} exist but no migrations are recorded; "
+                f"run 'baseline <version>' with the last version applied by hand"
+            )
+            raise MigrationError(msg)
+
+    async def _apply(self, conn: AsyncConnection, migration: Migration) -> None:
+        """Run one migration and record its version.
+
+        Raises:
+            MigrationError: If a statement fails.
+        """
+        logger.info(f"Applying migration {migration.path.name}")
+        statement = ""
+        try:
+            for statement in migration.statements():
+                await conn.exec_driver_sql(statement)
+            await conn.execute(_record(migration))
+            await conn.commit()
+        except SQLAlchemyError as e:
+            await conn.rollback()
+            msg = f"Migration {migration.path.name} failed at: {statement[:200]}"
+            raise MigrationError(msg) from e
+
+    async def _acquire_lock(self, conn: AsyncConnection) -> None:
+        """Take the MySQL named lock so only one process migrates at a time.
+
+        Raises:
+            MigrationError: If the lock is not acquired within the timeout.
+        """
+        if conn.dialect.name != "mysql":
+            return
+        result = await conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": _LOCK_NAME, "timeout": _LOCK_TIMEOUT_SECONDS},
+        )
+        acquired = result.scalar()
+        await conn.commit()
+        if acquired != 1:
+            msg = f"Could not acquire migration lock within {_LOCK_TIMEOUT_SECONDS}s"
+            raise MigrationError(msg)
+
+    async def _release_lock(self, conn: AsyncConnection) -> None:
+        """Release the MySQL named lock."""
+        if conn.dialect.name != "mysql":
+            return
+        await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": _LOCK_NAME})
+        await conn.commit()
+
+
+def _record(migration: Migration):
+    """Build the INSERT recording a migration as applied."""
+    return insert(schema_migrations_table).values(
+        version=migration.version,
+        name=migration.name,
+        checksum=migration.checksum,
+        applied_at=datetime.now(),
+    )
+
+
+async def verify_schema(engine: AsyncEngine, metadata: MetaData) -> list[str]:
+    """Compare the database with the tables, columns and indexes in metadata.
+
+    Only named indexes declared in metadata are checked, so a missing index
+    is reported at startup instead of showing up later as slow queries.
+
+    Args:
+        engine: Engine of the target database.
+        metadata: Metadata declaring the expected schema.
+
+    Returns:
+        list[str]: Human readable problems, empty if the schema matches.
+    """
+
+    def _inspect(conn: Connection) -> list[str]:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        problems = []
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                problems.append(f"missing table {table.name}")
+                continue
+
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            problems.extend(
+                f"missing column {table.name}.{column.name}"
+                for column in table.columns
+                if column.name not in columns
+            )
+
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            problems.extend(
+                f"missing index {table.name}.{index.name}"
+                for index in table.indexes
+                if index.name not in indexes
+            )
+        return problems
+
+    async with engine.connect() as conn:
+        return await conn.run_sync(_inspect)
+
+
+async def prepare_database(auto_migrate: bool | None = None) -> list[str]:
+    """Apply pending migrations and verify the schema once at startup.
+
+    Failures are logged instead of raised so that the server still starts
+    and reports the database through its readiness probe. The schema is
+    verified even when migrating fails, so the log shows what is missing.
+
+    Args:
+        auto_migrate: Whether to apply pending migrations, defaults to env
+            MYSQL_AUTO_MIGRATE (true).
+
+    Returns:
+        list[str]: Migration errors followed by schema problems, empty if
+            everything succeeded.
+    """
+    from one_dragon_agent.core.model.repository import metadata
+    from one_dragon_alpha.services.mysql.connection_service import (
+        get_mysql_connection_service,
+    )
+
+    if auto_migrate is None:
+        auto_migrate = os.getenv("MYSQL_AUTO_MIGRATE", "true").lower() == "true"
+
+    try:
+        engine = get_mysql_connection_service().get_engine()
+    except (SQLAlchemyError, ValueError, OSError) as e:
+        logger.error(f"Database preparation failed: {e}")
+        return [str(e)]
+
+    errors: list[str] = []
+    if auto_migrate:
+        try:
+            applied = await MigrationRunner(engine).migrate()
+            if applied:
+                logger.info(
+                    f"Applied migrations: {', '.join(m.path.name for m in applied)}"
+                )
+        except (MigrationError, SQLAlchemyError, ValueError, OSError) as e:
+            logger.error(f"Database migration failed: {e}")
+            errors.append(str(e))
+
+    try:
+        problems = await verify_schema(engine, metadata)
+    except (SQLAlchemyError, ValueError, OSError) as e:
+        logger.error(f"Schema check failed: {e}")
+        return [*errors, str(e)]
+
+    for problem in problems:
+        logger.warning(f"Schema check: {problem}")
+    if not problems:
+        logger.info("Schema check passed")
+    return [*errors, *problems]
+
+
+async def _run_cli(args: argparse.Namespace) -> None:
+    """Run a CLI command against the database configured in the environment."""
+    from one_dragon_alpha.services.mysql.connection_service import (
+        MySQLConnectionService,
+    )
+
+    async with MySQLConnectionService() as service:
+        runner = MigrationRunner(service.get_engine(), Path(args.dir))
+        if args.command == "status":
+            for migration, applied in await runner.status():
+                mark = "applied" if applied else "pending"
+                print(f"{mark:8} {migration.path.name}")
+        elif args.command == "migrate":
+            applied = await runner.migrate()
+            for migration in applied:
+                print(f"applied  {migration.path.name}")
+            if not applied:
+                print("nothing to apply")
+        else:
+            for migration in await runner.baseline(args.version):
+                print(f"recorded {migration.path.name}")
+
+
+def main() -> None:
+    """Command line entry point."""
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Manage database migrations")
+    parser.add_argument(
+        "--dir", default=str(DEFAULT_MIGRATIONS_DIR), help="migrations directory"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="list applied and pending migrations")
+    commands.add_parser("migrate", help="apply pending migrations")
+    baseline = commands.add_parser(
+        "baseline", help="record migrations applied by hand up to a version"
+    )
+    baseline.add_argument("version")
+    args = parser.parse_args()
+
+    load_dotenv()
+    asyncio.run(_run_cli(args))
+
+
+if __name__ == "__main__":
+    main()
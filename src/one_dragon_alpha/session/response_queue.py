@@ -0,0 +1,176 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+from one_dragon_alpha.session.session_message import SessionMessage
+
+_registry = get_metrics_registry()
+_high_water = _registry.gauge(
+    "oda_response_queue_high_water", "响应队列中同时等待的消息块数的最大值"
+).labels()
+_coalesced = _registry.counter(
+    "oda_response_queue_coalesced_total", "替换了队列中同一消息的旧消息块的次数"
+).labels()
+_dropped = _registry.counter(
+    "oda_response_queue_dropped_total", "队列已满或已关闭时丢弃的消息块数"
+).labels()
+
+
+@dataclass
+class ResponseQueueStats:
+    """Counters describing how a response queue has been used.
+
+    Attributes:
+        high_water_mark: Largest number of chunks ever waiting in the queue.
+        coalesced: Chunks that replaced a stale queued chunk of the same message.
+        dropped: Chunks discarded because the queue was full or closed.
+    """
+
+    high_water_mark: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+
+
+class CoalescingResponseQueue:
+    """Bounded queue of response chunks that coalesces cumulative updates.
+
+    AgentScope streams cumulative chunks: every update of a message carries
+    the full content so far. An update still waiting in the queue is
+    therefore stale as soon as a newer chunk of the same message arrives,
+    and is replaced in place instead of enqueuing another copy.
+
+    Backpressure policy when the queue is full:
+    - Streaming updates are dropped (the completed chunk of the same message
+      always follows and carries the full content).
+    - Completed chunks wait for space, pausing the producer.
+
+    After ``close`` every put is dropped, so a producer whose consumer has
+    gone away never blocks or accumulates memory.
+
+    Attributes:
+        maxsize: Maximum number of chunks waiting in the queue.
+        stats: Usage counters of the queue, also exported as process-wide
+            metrics (``oda_response_queue_*``).
+    """
+
+    def __init__(self, maxsize: int = 64):
+        """Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of chunks waiting in the queue.
+        """
+        self.maxsize: int = maxsize
+        self.stats: ResponseQueueStats = ResponseQueueStats()
+        # Each slot is a single-element list so a queued chunk can be replaced
+        # in place without searching the deque.
+        self._slots: deque[list[SessionMessage]] = deque()
+        self._pending: dict[str, list[SessionMessage]] = {}
+        self._closed: bool = False
+        self._not_empty: asyncio.Event = asyncio.Event()
+        self._not_full: asyncio.Event = asyncio.Event()
+        self._not_full.set()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue has been closed."""
+        return self._closed
+
+    def qsize(self) -> int:
+        """Number of chunks waiting in the queue."""
+        return len(self._slots)
+
+    async def put(self, item: SessionMessage) -> None:
+        """Put a chunk into the queue.
+
+        Args:
+            item: The chunk to queue.
+        """
+        if self._closed:
+            self._drop(1)
+            return
+
+        msg_id = None if item.msg is None else item.msg.id
+        slot = None if msg_id is None else self._pending.get(msg_id)
+        if slot is not None:
+            # Replace the stale cumulative chunk of the same message
+            slot[0] = item
+            self.stats.coalesced += 1
+            _coalesced.inc()
+            if item.message_completed or item.response_completed:
+                del self._pending[msg_id]
+            return
+
+        is_update = (
+            msg_id is not None
+            and not item.message_completed
+            and not item.response_completed
+        )
+        if is_update:
+            if len(self._slots) >= self.maxsize:
+                self._drop(1)
+                return
+            slot = [item]
+            self._pending[msg_id] = slot
+            self._append(slot)
+            return
+
+        while len(self._slots) >= self.maxsize and not self._closed:
+            self._not_full.clear()
+            await self._not_full.wait()
+
+        if self._closed:
+            self._drop(1)
+            return
+        self._append([item])
+
+    def _drop(self, count: int) -> None:
+        """Count discarded chunks."""
+        self.stats.dropped += count
+        _dropped.inc(count)
+
+    def _append(self, slot: list[SessionMessage]) -> None:
+        """Append a slot and update the high-water mark."""
+        self._slots.append(slot)
+        if len(self._slots) > self.stats.high_water_mark:
+            self.stats.high_water_mark = len(self._slots)
+            if self.stats.high_water_mark > _high_water.value:
+                _high_water.set(self.stats.high_water_mark)
+        self._not_empty.set()
+
+    async def get(self) -> SessionMessage:
+        """Get the next chunk, waiting until one is available.
+
+        Returns:
+            The next chunk.
+        """
+        while not self._slots:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        slot = self._slots.popleft()
+        item = slot[0]
+        if item.msg is not None and self._pending.get(item.msg.id) is slot:
+            del self._pending[item.msg.id]
+        self._not_full.set()
+        return item
+
+    def close(self) -> None:
+        """Close the queue, discarding queued chunks and releasing producers."""
+        self._closed = True
+        if self._slots:
+            self._drop(len(self._slots))
+        self._slots.clear()
+        self._pending.clear()
+        self._not_full.set()
+
+    def reset(self) -> None:
+        """Discard queued chunks and reopen the queue for a new turn.
+
+        Stats are kept, so they describe the whole life of the session.
+        """
+        self._closed = False
+        self._slots.clear()
+        self._pending.clear()
+        self._not_empty.clear()
+        self._not_full.set()
@@ -1,12 +1,34 @@
 import asyncio
-from typing import Any, AsyncGenerator
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Iterator
 
 from agentscope.agent import AgentBase
 from agentscope.memory import MemoryBase
 from agentscope.message import Msg
 
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_alpha.session.response_queue import CoalescingResponseQueue
 from one_dragon_alpha.session.session_message import SessionMessage
 
+logger = get_logger(__name__)
+
+
+class SessionBusyError(RuntimeError):
+    """Raised when a turn is started on a session that is already running one.
+
+    Attributes:
+        session_id: The busy session.
+    """
+
+    def __init__(self, session_id: str):
+        """Initialize the error.
+
+        Args:
+            session_id: The busy session.
+        """
+        super().__init__("Session is busy with another turn")
+        self.session_id: str = session_id
+
 
 class Session:
     """Chat session management with streaming response processing.
@@ -18,14 +40,15 @@ class Session:
         agent: The agent instance for processing chat messages.
         session_id: Unique identifier for the session.
         memory: Memory instance for storing conversation history.
-        response_queue: Async queue for storing response chunks.
+        response_queue: Bounded queue for storing response chunks.
     """
 
     def __init__(
         self,
         session_id: str,
         agent: AgentBase,
-        memory: MemoryBase
+        memory: MemoryBase,
+        max_queue_size: int = 64,
     ):
         """Initialize the session.
 
@@ -33,11 +56,16 @@ class Session:
             session_id: Unique identifier for the session.
             agent: The agent instance for processing chat messages.
             memory: Memory instance for storing conversation history.
+            max_queue_size: Maximum number of response chunks waiting to be consumed.
         """
         self.session_id: str = session_id
         self.agent: AgentBase = agent
         self.memory: MemoryBase = memory
-        self.response_queue: asyncio.Queue = asyncio.Queue()
+        self.response_queue: CoalescingResponseQueue = CoalescingResponseQueue(
+            maxsize=max_queue_size
+        )
+        self._agent_task: asyncio.Task | None = None
+        self._turn_running: bool = False
 
         # Bind hooks in constructor
         self.agent.register_instance_hook(
@@ -46,6 +74,34 @@ class Session:
             hook=self._pre_print_hook,
         )
 
+    @property
+    def busy(self) -> bool:
+        """Whether a turn is running on this session.
+
+        Returns:
+            True if a turn started from any connection or transport is running.
+        """
+        return self._turn_running
+
+    @contextmanager
+    def turn(self) -> Iterator[None]:
+        """Mark a turn as running on this session for the duration of the block.
+
+        Only one turn may run on a session at a time, no matter which
+        connection or transport started it. The check and the claim happen
+        without awaiting, so two concurrent requests cannot both pass.
+
+        Raises:
+            SessionBusyError: If another turn is running on this session.
+        """
+        if self._turn_running:
+            raise SessionBusyError(self.session_id)
+        self._turn_running = True
+        try:
+            yield
+        finally:
+            self._turn_running = False
+
     async def _put_chunk(self, msg: SessionMessage) -> None:
         """Put a response chunk into the queue.
 
@@ -54,6 +110,14 @@ class Session:
         """
         await self.response_queue.put(msg)
 
+    async def _put_status(self, status: dict) -> None:
+        """Put a status update into the queue.
+
+        Args:
+            status: Status payload sent to the client as a status frame.
+        """
+        await self._put_chunk(SessionMessage(None, False, False, status=status))
+
     async def _get_chunk(self) -> SessionMessage:
         """Get a response chunk from the queue.
 
@@ -92,16 +156,30 @@ class Session:
     def _on_response_completed(self, task: asyncio.Task) -> None:
         """Callback when agent response processing is completed.
 
+        Tasks of earlier turns that were abandoned by their consumer are
+        ignored, so they cannot end the stream of the current turn.
+
         Args:
             task: The completed agent task.
         """
+        if task is not self._agent_task:
+            return
         try:
             task.result()
             asyncio.create_task(self._put_chunk(SessionMessage(None, False, True)))
         except asyncio.CancelledError:
-            print("Task was cancelled")
+            logger.info(f"Agent task of session {self.session_id} was cancelled")
         except Exception as e:
-            print(f"Task failed with exception: {e}")
+            logger.exception(f"Agent task of session {self.session_id} failed: {e}")
+            asyncio.create_task(
+                self._put_chunk(
+                    SessionMessage(
+                        msg=Msg(name=self.agent.id, content=str(e), role="system"),
+                        message_completed=False,
+                        response_completed=True,
+                    )
+                )
+            )
 
     async def chat(
         self, user_input: str
@@ -111,6 +189,10 @@ class Session:
         This method processes a user input message and yields SessionMessage
         objects as the agent generates responses in real-time.
 
+        If the consumer stops iterating before the response is completed
+        (e.g. the client disconnected), the agent task is cancelled and the
+        chunks it still produces are discarded.
+
         Args:
             user_input: The user's message content.
             model_config_id: Model configuration ID to use.
@@ -119,9 +201,12 @@ class Session:
         Yields:
             SessionMessage objects containing response chunks and completion status.
         """
+        self.response_queue.reset()
+        agent_task: asyncio.Task | None = None
         try:
             msg = Msg(name="user", content=user_input, role="user")
             agent_task = asyncio.create_task(self.agent(msg))
+            self._agent_task = agent_task
             agent_task.add_done_callback(self._on_response_completed)
 
             while True:
@@ -142,6 +227,11 @@ class Session:
                 response_completed=True,
             )
 
+        finally:
+            if agent_task is not None and not agent_task.done():
+                self.response_queue.close()
+                agent_task.cancel()
+
     async def interrupt(self) -> None:
         """Interrupt the current agent processing.
 
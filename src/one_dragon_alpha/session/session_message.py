@@ -10,3 +10,5 @@ class SessionMessage:
     msg: Optional[Msg]
     message_completed: bool
     response_completed: bool
+    # Status update that is not part of any message, e.g. model call queueing
+    status: Optional[dict] = None
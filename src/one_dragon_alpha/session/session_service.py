@@ -1,8 +1,9 @@
 from typing import Optional
 
 import shortuuid
-from agentscope.memory import InMemoryMemory, MemoryBase
+from agentscope.memory import MemoryBase
 
+from one_dragon_agent.core.agent.compacting_memory import CompactingMemory
 from one_dragon_alpha.chat.chat_session import ChatSession
 from one_dragon_alpha.session.session import Session
 
@@ -34,7 +35,7 @@ class SessionService:
         """
         session_id = shortuuid.uuid()
 
-        memory = InMemoryMemory()
+        memory = CompactingMemory()
         self._memory_cache[session_id] = memory
 
         session = ChatSession(session_id, memory)
@@ -50,4 +51,20 @@ class SessionService:
         Returns:
             The session instance if session exists, None otherwise.
         """
-        return self._session_cache.get(session_id)
\ No newline at end of file
+        return self._session_cache.get(session_id)
+
+    def session_ids(self) -> list[str]:
+        """Get the IDs of all sessions held by the service.
+
+        Returns:
+            The session IDs.
+        """
+        return list(self._session_cache)
+
+    def session_count(self) -> int:
+        """Get the number of active sessions.
+
+        Returns:
+            The number of sessions held by the service.
+        """
+        return len(self._session_cache)
@@ -1,14 +1,18 @@
-import os
+import asyncio
 from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
-import tushare as ts
-from tushare.pro.client import DataApi
 
+from tushare_mcp_server.client import (
+    AsyncTushareClient,
+    close_tushare_client,
+    get_tushare_client,
+)
 
-def _get_ts_client() -> DataApi:
-    return ts.pro_api(os.getenv("TUSHARE_API_TOKEN"))
+
+def _get_ts_client() -> AsyncTushareClient:
+    return get_tushare_client()
 
 
 def _get_dt(day_delta: int = 0) -> str:
@@ -98,7 +102,7 @@ def trade_date_to_period(trade_date: str) -> str:
         return f"{year}1231"
 
 
-def _get_turnover(
+async def _get_turnover(
     ts_code: str,
     quarter_start_date: str,
     quarter_end_date: str,
@@ -115,7 +119,7 @@ def _get_turnover(
         pd.DataFrame: 交易额数据 ["ts_code": 指数代码, "trade_date": 交易日期, "amount": 交易额(千元)]
     """
     client = _get_ts_client()
-    return client.index_daily(
+    return await client.index_daily(
         ts_code=ts_code,
         start_date=quarter_start_date,
         end_date=quarter_end_date,
@@ -123,7 +127,7 @@ def _get_turnover(
     )
 
 
-def _get_all_turnover_by_period(
+async def _get_all_turnover_by_period(
     start_period: str,
     end_period: str
 ) -> pd.DataFrame:
@@ -146,15 +150,17 @@ def _get_all_turnover_by_period(
         periods.append(current_period)
         current_period = _get_next_period(current_period)
 
-    # 获取每个指数在所有周期内的交易额数据
-    all_index_data = []
-    for ts_code in index_ts_code_list:
-        # 获取该指数最早周期的开始日期
-        earliest_start_date = _get_quarter_start_date(start_period)
-        latest_end_date = end_period
+    # 获取该指数最早周期的开始日期
+    earliest_start_date = _get_quarter_start_date(start_period)
+    latest_end_date = end_period
 
-        # 一次性获取该指数在所有周期内的数据
-        index_data = _get_turnover(ts_code, earliest_start_date, latest_end_date)
+    # 并发获取每个指数在所有周期内的交易额数据
+    index_data_list = await asyncio.gather(*[
+        _get_turnover(ts_code, earliest_start_date, latest_end_date)
+        for ts_code in index_ts_code_list
+    ])
+    all_index_data = []
+    for ts_code, index_data in zip(index_ts_code_list, index_data_list):
         if not index_data.empty:
             index_data['index_code'] = ts_code  # 添加指数代码标识
             all_index_data.append(index_data)
@@ -190,7 +196,7 @@ def _get_all_turnover_by_period(
     return result_df
 
 
-def _get_dc_member(
+async def _get_dc_member(
     ts_code: str,
     trade_date: str
 ) -> pd.DataFrame:
@@ -206,8 +212,8 @@ def _get_dc_member(
         pd.DataFrame: 板块成员数据 ["ts_code": 成分股票代码, "name": 股票名称]
     """
     client = _get_ts_client()
-    latest_trade_date = _get_latest_trade_date(trade_date)
-    df = client.dc_member(
+    latest_trade_date = await _get_latest_trade_date(trade_date)
+    df = await client.dc_member(
         ts_code=ts_code,
         trade_date=latest_trade_date,
         fields=["trade_date", 'con_code', 'name']
@@ -216,7 +222,7 @@ def _get_dc_member(
     return df
 
 
-def _get_latest_trade_date(date_str: str) -> str:
+async def _get_latest_trade_date(date_str: str) -> str:
     """
     Args:
         date_str: 日期 YYYYMMDD格式
@@ -227,13 +233,17 @@ def _get_latest_trade_date(date_str: str) -> str:
     client = _get_ts_client()
     is_current_trade_date = False
     pretrade_date = '19000101'
-    for exchange in ['SSE', 'SZSE']:  # 上交所, 深交所
-        df = client.trade_cal(
+    exchanges = ['SSE', 'SZSE']  # 上交所, 深交所
+    df_list = await asyncio.gather(*[
+        client.trade_cal(
             exchange=exchange,
             start_date=date_str,
             end_date=date_str,
             fields=['cal_date', 'is_open', 'pretrade_date']
         )
+        for exchange in exchanges
+    ])
+    for df in df_list:
         if len(df) == 0:
             continue
 
@@ -249,7 +259,7 @@ def _get_latest_trade_date(date_str: str) -> str:
         return pretrade_date
 
 
-def _get_income(
+async def _get_income(
     ts_code: str,
     end_date_from: str,
     end_date_to: str,
@@ -266,7 +276,7 @@ def _get_income(
         pd.DataFrame: 利润数据 ["ts_code": 股票代码, "end_date": 季度最后一天, "n_income_attr_p": 净利润(不含少数股东损益)(元)]
     """
     client = _get_ts_client()
-    df = client.income(
+    df = await client.income(
         ts_code=ts_code,
         report_type='2',  # 单季合并
         fields=['ts_code', 'end_date', 'n_income_attr_p']
@@ -274,7 +284,7 @@ def _get_income(
     return df[(df['end_date'] >= end_date_from) & (df['end_date'] <= end_date_to)]
 
 
-def get_brokerage_profits_by_period(
+async def get_brokerage_profits_by_period(
     start_period: str,
     end_period: str
 ) -> pd.DataFrame:
@@ -291,21 +301,19 @@ def get_brokerage_profits_by_period(
     """
     brokerage_index_ts_code = 'BK0711.DC'  # 东财的券商概念版块
     # 获取最新的券商板块成分股
-    dc_member_df = _get_dc_member(brokerage_index_ts_code, _get_dt(-1))
+    dc_member_df = await _get_dc_member(brokerage_index_ts_code, _get_dt(-1))
 
     if dc_member_df.empty:
         return pd.DataFrame(columns=['end_date', 'ts_code', 'name', 'n_income_attr_p'])
 
-    all_dfs = []
-
-    # 获取每个券商公司在指定时间范围内的利润数据
-    for _, row in dc_member_df.iterrows():
-        ts_code = row['ts_code']
-        name = row['name']
-
-        # 获取该公司在时间范围内的所有季度利润数据
-        income_df = _get_income(ts_code, start_period, end_period)
+    # 并发获取每个券商公司在时间范围内的所有季度利润数据，并发数受客户端连接池限制
+    income_df_list = await asyncio.gather(*[
+        _get_income(ts_code, start_period, end_period)
+        for ts_code in dc_member_df['ts_code']
+    ])
 
+    all_dfs = []
+    for name, income_df in zip(dc_member_df['name'], income_df_list):
         if not income_df.empty:
             # 直接添加name列
             income_df['name'] = name
@@ -318,14 +326,15 @@ def get_brokerage_profits_by_period(
     return pd.concat(all_dfs, ignore_index=True)
 
 
-def _get_analyse_df(
+async def _get_analyse_df(
     start_period: str,
     end_period: str,
 ) -> pd.DataFrame:
-    # 获取券商利润数据
-    brokerage_df = get_brokerage_profits_by_period(start_period, end_period)
-    # 获取A股市场交易额数据
-    turnover_df = _get_all_turnover_by_period(start_period, end_period)
+    # 同时获取券商利润数据和A股市场交易额数据
+    brokerage_df, turnover_df = await asyncio.gather(
+        get_brokerage_profits_by_period(start_period, end_period),
+        _get_all_turnover_by_period(start_period, end_period),
+    )
 
     if brokerage_df.empty or turnover_df.empty:
         return pd.DataFrame()
@@ -343,6 +352,14 @@ def _get_analyse_df(
     return merged_df
 
 
+async def _load_analyse_df(start_period: str, end_period: str) -> pd.DataFrame:
+    """获取分析数据，结束后关闭绑定在当前事件循环上的 Tushare 客户端."""
+    try:
+        return await _get_analyse_df(start_period, end_period)
+    finally:
+        await close_tushare_client()
+
+
 def analyse(start_period: str = "20150331", end_period: str = "20250630"):
     """
     分析券商利润与市场交易额的关系并绘制图表
@@ -352,7 +369,7 @@ def analyse(start_period: str = "20150331", end_period: str = "20250630"):
         end_period: 结束季度，格式为 YYYYMMDD
     """
     # 获取合并后的数据
-    merged_df = _get_analyse_df(start_period, end_period)
+    merged_df = asyncio.run(_load_analyse_df(start_period, end_period))
 
     if merged_df.empty:
         print("没有获取到数据，请检查参数和网络连接")
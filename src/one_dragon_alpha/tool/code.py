@@ -1,14 +1,101 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import os
 import sys
+import time
+from pathlib import Path
 
 from agentscope.message import TextBlock
 from agentscope.tool import ToolResponse
 
+import oda_data
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+
+_registry = get_metrics_registry()
+_executions = _registry.counter(
+    "oda_code_executions_total",
+    "Python 代码子进程执行次数",
+    ("outcome",),
+)
+_executions_ok = _executions.labels("ok")
+_executions_error = _executions.labels("error")
+_executions_timeout = _executions.labels("timeout")
+_execution_seconds = _registry.histogram(
+    "oda_code_execution_seconds", "Python 代码子进程执行耗时（秒）"
+).labels()
+_executions_running = _registry.gauge(
+    "oda_code_executions_running", "正在运行的 Python 代码子进程数"
+).labels()
+
+# oda_data 所在的源码目录，加入脚本的 PYTHONPATH
+_ODA_DATA_PATH = str(Path(oda_data.__file__).resolve().parent.parent)
+
+# 从服务进程传给脚本的环境变量，其他变量（数据库密码、模型 API Key 等）不传给脚本；
+# 代理和 CA 证书供脚本访问 tushare 等 HTTP 接口，SYSTEMROOT、TEMP、TMP 是 Windows 上需要的
+_INHERITED_ENV_NAMES = (
+    "PATH",
+    "HOME",
+    "LANG",
+    "LC_ALL",
+    "LC_CTYPE",
+    "PYTHONPATH",
+    "HTTP_PROXY",
+    "HTTPS_PROXY",
+    "NO_PROXY",
+    "http_proxy",
+    "https_proxy",
+    "no_proxy",
+    "SSL_CERT_FILE",
+    "REQUESTS_CA_BUNDLE",
+    "SYSTEMROOT",
+    "TEMP",
+    "TMP",
+)
+
+
+def _script_env() -> dict[str, str]:
+    """子进程的环境变量，脚本可以直接 import oda_data 读取本地数据快照.
+
+    只包含白名单中的变量，凭据等由调用方通过 env 参数传入。
+    """
+    env = {
+        name: value
+        for name in _INHERITED_ENV_NAMES
+        if (value := os.getenv(name)) is not None
+    }
+    python_path = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = (
+        _ODA_DATA_PATH
+        if not python_path
+        else os.pathsep.join([_ODA_DATA_PATH, python_path])
+    )
+    # 脚本的工作目录不同，使用绝对路径
+    env["TUSHARE_PARQUET_DIR"] = oda_data.parquet_dir()
+    env["ODA_FRAME_CACHE_DIR"] = oda_data.cache_dir()
+    return env
+
+
+async def refresh_shared_frames() -> None:
+    """把有更新的数据快照发布到共享缓存，失败时脚本改为从快照读取."""
+    reader = oda_data.get_reader()
+    if reader is None:
+        return
+    try:
+        published = await asyncio.to_thread(oda_data.refresh_snapshot_frames, reader)
+    except Exception as e:
+        logger.warning(f"发布共享数据集失败: {e}")
+        return
+    if published:
+        logger.info(f"已发布共享数据集: {published}")
+
 
 async def execute_python_code_by_path(
     code_file_path: str,
     timeout: float = 300,
+    env: dict[str, str] | None = None,
 ) -> ToolResponse:
     """Execute the given python code in a temp file and capture the return
     code, standard output and error. Note you must `print` the output to get
@@ -19,19 +106,29 @@ async def execute_python_code_by_path(
             .py file path to execute
         timeout (`float`, defaults to `300`):
             The maximum time (in seconds) allowed for the code to run.
+        env (`dict[str, str] | None`, optional):
+            Extra environment variables of the process, preset by the
+            caller (e.g. credentials) and not exposed to the model. Other
+            variables of the server process are not inherited, except an
+            allowlist such as PATH and HOME.
 
     Returns:
         `ToolResponse`:
             The response containing the return code, standard output, and
             standard error of the executed code.
     """
+    await refresh_shared_frames()
+    start = time.perf_counter()
     proc = await asyncio.create_subprocess_exec(
         sys.executable,
         "-u",
         code_file_path,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
+        env=_script_env() if env is None else {**_script_env(), **env},
     )
+    _executions_running.inc()
+    timed_out = False
 
     try:
         await asyncio.wait_for(proc.wait(), timeout=timeout)
@@ -46,6 +143,7 @@ async def execute_python_code_by_path(
             f"the timeout of {timeout} seconds."
         )
         returncode = -1
+        timed_out = True
         try:
             proc.terminate()
             stdout, stderr = await proc.communicate()
@@ -59,6 +157,17 @@ async def execute_python_code_by_path(
             stdout_str = ""
             stderr_str = stderr_suffix
 
+    finally:
+        _executions_running.dec()
+        _execution_seconds.observe(time.perf_counter() - start)
+
+    if timed_out:
+        _executions_timeout.inc()
+    elif returncode == 0:
+        _executions_ok.inc()
+    else:
+        _executions_error.inc()
+
     return ToolResponse(
         content=[
             TextBlock(
@@ -0,0 +1,231 @@
+"""异步 Tushare Pro 客户端.
+
+与 ``ts.pro_api(token)`` 返回的 ``DataApi`` 使用相同的 HTTP 协议，
+但通过共享的 ``httpx.AsyncClient`` 发送请求，连接在调用之间保持复用。
+参数相同的并发调用合并为一次上游请求（single-flight），各调用方得到各自的 DataFrame。
+调用方式与 ``DataApi`` 一致::
+
+    client = get_tushare_client()
+    df = await client.stock_basic(fields="ts_code,name")
+"""
+
+import asyncio
+import json
+import os
+from functools import partial
+from typing import Any
+
+import httpx
+import pandas as pd
+
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+
+DEFAULT_API_URL = "http://api.waditu.com/dataapi"
+
+_metrics = get_metrics_registry()
+_upstream_requests = _metrics.counter(
+    "oda_tushare_requests_total", "发往 Tushare 的上游请求数", ("api_name",)
+)
+_coalesced_calls = _metrics.counter(
+    "oda_tushare_coalesced_total",
+    "与进行中的相同请求合并、未单独发起上游请求的调用数",
+    ("api_name",),
+)
+
+_Rows = tuple[list[str], list[list[Any]]]
+
+
+class TushareError(Exception):
+    """Tushare 接口返回错误."""
+
+    def __init__(self, api_name: str, code: int, msg: str) -> None:
+        """初始化异常.
+
+        Args:
+            api_name: 接口名称
+            code: Tushare 返回的错误码
+            msg: Tushare 返回的错误信息
+        """
+        super().__init__(f"{api_name}: {msg}")
+        self.api_name = api_name
+        self.code = code
+
+
+class AsyncTushareClient:
+    """基于连接池的异步 Tushare Pro 客户端.
+
+    Attributes:
+        base_url: 接口地址，请求发送到 ``{base_url}/{api_name}``
+    """
+
+    def __init__(
+        self,
+        token: str | None = None,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """初始化客户端.
+
+        Args:
+            token: Tushare token，默认读取环境变量 TUSHARE_API_TOKEN
+            base_url: 接口地址，默认读取环境变量 TUSHARE_API_URL
+            timeout: 请求超时（秒）
+            max_connections: 最大连接数，默认读取环境变量
+                TUSHARE_HTTP_MAX_CONNECTIONS 或 10
+            http_client: 外部传入的 HTTP 客户端，由调用方负责关闭
+        """
+        if max_connections is None:
+            max_connections = int(os.getenv("TUSHARE_HTTP_MAX_CONNECTIONS", "10"))
+        self._token = token if token is not None else os.getenv("TUSHARE_API_TOKEN")
+        self.base_url: str = (
+            base_url or os.getenv("TUSHARE_API_URL") or DEFAULT_API_URL
+        ).rstrip("/")
+        self._in_flight: dict[str, asyncio.Task[_Rows]] = {}
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+        )
+
+    async def query(
+        self, api_name: str, fields: str | list[str] = "", **params: Any
+    ) -> pd.DataFrame:
+        """调用 Tushare 接口.
+
+        Args:
+            api_name: 接口名称，如 "stock_basic"
+            fields: 返回字段，逗号分隔的字符串或字段列表
+            **params: 接口参数
+
+        Returns:
+            pd.DataFrame: 接口返回的数据
+
+        Raises:
+            TushareError: 如果接口返回错误
+            httpx.HTTPError: 如果请求失败
+        """
+        columns, items = await self._request(api_name, fields, params)
+        return pd.DataFrame(items, columns=columns)
+
+    async def query_arrow(
+        self, api_name: str, fields: str | list[str] = "", **params: Any
+    ):
+        """调用 Tushare 接口并返回 Arrow 表，需要安装 pyarrow.
+
+        Args:
+            api_name: 接口名称
+            fields: 返回字段
+            **params: 接口参数
+
+        Returns:
+            pyarrow.Table: 接口返回的数据
+
+        Raises:
+            ImportError: 如果未安装 pyarrow
+            TushareError: 如果接口返回错误
+        """
+        import pyarrow as pa
+
+        columns, items = await self._request(api_name, fields, params)
+        return pa.table(
+            {name: [row[i] for row in items] for i, name in enumerate(columns)}
+        )
+
+    async def _request(
+        self, api_name: str, fields: str | list[str], params: dict[str, Any]
+    ) -> _Rows:
+        """发送请求，返回字段名和数据行.
+
+        接口名、字段和参数相同的请求进行中时，等待该请求的结果而不再发起新请求。
+        上游请求在独立的任务中运行，个别调用方取消不影响其他调用方。
+        """
+        if not isinstance(fields, str):
+            fields = ",".join(fields)
+        fields = ",".join(f.strip() for f in fields.split(",") if f.strip())
+        # 值为 None 的参数与不传等价
+        params = {k: v for k, v in params.items() if v is not None}
+        key = json.dumps(
+            [api_name, fields, params], sort_keys=True, ensure_ascii=False, default=str
+        )
+
+        task = self._in_flight.get(key)
+        if task is None:
+            _upstream_requests.labels(api_name).inc()
+            task = asyncio.create_task(self._post(api_name, fields, params))
+            self._in_flight[key] = task
+
+            def on_done(done: asyncio.Task) -> None:
+                self._in_flight.pop(key, None)
+                if not done.cancelled():
+                    # 调用方都已取消时避免 "exception was never retrieved" 警告
+                    done.exception()
+
+            task.add_done_callback(on_done)
+        else:
+            _coalesced_calls.labels(api_name).inc()
+        return await asyncio.shield(task)
+
+    async def _post(
+        self, api_name: str, fields: str, params: dict[str, Any]
+    ) -> _Rows:
+        """向上游发送一次请求."""
+        response = await self._http_client.post(
+            f"{self.base_url}/{api_name}",
+            json={
+                "api_name": api_name,
+                "token": self._token,
+                "params": params,
+                "fields": fields,
+            },
+        )
+        response.raise_for_status()
+        result = response.json()
+        if result["code"] != 0:
+            raise TushareError(api_name, result["code"], result["msg"])
+        data = result["data"]
+        return data["fields"], data["items"]
+
+    def __getattr__(self, name: str):
+        """按接口名调用，与 DataApi 一致，如 ``await client.income(ts_code=...)``."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return partial(self.query, name)
+
+    async def aclose(self) -> None:
+        """关闭自己创建的 HTTP 客户端."""
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncTushareClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+_client: AsyncTushareClient | None = None
+
+
+def get_tushare_client() -> AsyncTushareClient:
+    """获取全局 Tushare 客户端.
+
+    Returns:
+        AsyncTushareClient 单例
+    """
+    global _client
+    if _client is None:
+        _client = AsyncTushareClient()
+    return _client
+
+
+async def close_tushare_client() -> None:
+    """关闭全局 Tushare 客户端，下次获取时重新创建."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
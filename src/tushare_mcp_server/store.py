@@ -0,0 +1,358 @@
+"""本地 Tushare 财务数据仓库.
+
+在嵌入式 DuckDB 中保存全部 A 股的股票列表和利润表，不再每次分析都从 Tushare
+下载。利润表按公告日期（ann_date）增量同步：每次只拉取上次同步之后公告的数据。
+
+DuckDB 文件同一时间只能被一个进程以读写方式打开，因此数据库文件只由同步命令使用；
+同步完成后把各表导出为 Parquet 快照，服务和其他进程通过 ``oda_data`` 读取快照。
+
+同步命令::
+
+    python -m tushare_mcp_server.store sync [--start 20150101]
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from oda_data.reader import TABLES, parquet_dir
+from one_dragon_agent.core.system.log import get_logger
+from tushare_mcp_server.client import AsyncTushareClient
+from tushare_mcp_server.fields import INCOME_FIELD_MAPPING
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_PATH = "data/tushare.duckdb"
+
+STOCK_BASIC_FIELDS = [
+    "ts_code",
+    "symbol",
+    "name",
+    "area",
+    "industry",
+    "market",
+    "list_date",
+    "list_status",
+]
+
+# 利润表的键和文本字段，其余字段均为数值
+_INCOME_KEY_FIELDS = [
+    "ts_code",
+    "ann_date",
+    "f_ann_date",
+    "end_date",
+    "report_type",
+    "comp_type",
+    "update_flag",
+]
+INCOME_FIELDS = _INCOME_KEY_FIELDS + [
+    name for name in INCOME_FIELD_MAPPING if name not in _INCOME_KEY_FIELDS
+]
+
+# 首次同步利润表的默认起始公告日期
+DEFAULT_SYNC_START = "20150101"
+# 单次请求返回的最大行数，达到时按 offset 翻页
+_PAGE_SIZE = 5000
+# 同时同步的公告日数
+_SYNC_BATCH_DAYS = 8
+
+_SCHEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS stock_basic (
+        {", ".join(f"{name} VARCHAR" for name in STOCK_BASIC_FIELDS)},
+        PRIMARY KEY (ts_code)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS income (
+        {", ".join(f"{name} VARCHAR" for name in _INCOME_KEY_FIELDS)},
+        {", ".join(f"{name} DOUBLE" for name in INCOME_FIELDS[len(_INCOME_KEY_FIELDS):])},
+        PRIMARY KEY (ts_code, ann_date, end_date, report_type, update_flag)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_income_ann_date ON income (ann_date)",
+    """
+    CREATE TABLE IF NOT EXISTS sync_state (
+        name VARCHAR PRIMARY KEY,
+        value VARCHAR NOT NULL,
+        synced_at TIMESTAMP NOT NULL
+    )
+    """,
+]
+
+
+class FinancialDataStore:
+    """基于 DuckDB 的本地财务数据仓库.
+
+    方法是同步的，在事件循环中调用时使用 ``asyncio.to_thread``。
+
+    Attributes:
+        path: 数据库文件路径
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """打开（不存在时创建）数据仓库.
+
+        Args:
+            path: 数据库文件路径，":memory:" 表示内存数据库
+        """
+        import duckdb
+
+        self.path: str = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = duckdb.connect(self.path)
+        self._local = threading.local()
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def _cursor(self):
+        """获取当前线程的游标."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._conn.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    def close(self) -> None:
+        """关闭数据库连接."""
+        self._conn.close()
+
+    # 读取
+
+    def get_sync_state(self, name: str) -> str | None:
+        """获取同步进度.
+
+        Args:
+            name: 进度名称，如 "income_ann_date"
+
+        Returns:
+            进度值，未同步过时返回 None
+        """
+        row = (
+            self._cursor()
+            .execute("SELECT value FROM sync_state WHERE name = ?", [name])
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    # 写入
+
+    def replace_stock_basic(self, df: pd.DataFrame) -> None:
+        """用最新的股票列表替换本地数据.
+
+        Args:
+            df: 包含 STOCK_BASIC_FIELDS 的股票列表
+        """
+        df = df.reindex(columns=STOCK_BASIC_FIELDS)
+        cursor = self._cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("DELETE FROM stock_basic")
+            cursor.register("new_rows", df)
+            cursor.execute("INSERT INTO stock_basic SELECT * FROM new_rows")
+            cursor.unregister("new_rows")
+            self._set_sync_state(cursor, "stock_basic", str(len(df)))
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def upsert_income(self, df: pd.DataFrame, synced_ann_date: str) -> None:
+        """写入利润表并记录同步进度，两者在同一事务中.
+
+        Args:
+            df: 包含 INCOME_FIELDS 的利润表，可以为空
+            synced_ann_date: 已完整同步到的公告日期
+        """
+        df = df.reindex(columns=INCOME_FIELDS)
+        # update_flag 为主键的一部分，早期数据没有该字段
+        df["update_flag"] = df["update_flag"].fillna("0")
+        df = df.drop_duplicates(
+            ["ts_code", "ann_date", "end_date", "report_type", "update_flag"],
+            keep="last",
+        )
+        cursor = self._cursor()
+        cursor.execute("BEGIN")
+        try:
+            if not df.empty:
+                cursor.register("new_rows", df)
+                cursor.execute("INSERT OR REPLACE INTO income SELECT * FROM new_rows")
+                cursor.unregister("new_rows")
+            self._set_sync_state(cursor, "income_ann_date", synced_ann_date)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def export_parquet(self, directory: str | Path) -> None:
+        """把各表导出为 Parquet 快照.
+
+        先写临时文件再原子替换，读取方不会读到写了一半的文件。
+
+        Args:
+            directory: 快照目录
+        """
+        os.makedirs(directory, exist_ok=True)
+        cursor = self._cursor()
+        for table in TABLES:
+            path = os.path.join(directory, f"{table}.parquet")
+            tmp_path = f"{path}.tmp"
+            cursor.execute(
+                f"COPY (SELECT * FROM {table} ORDER BY ALL) "
+                f"TO '{tmp_path}' (FORMAT parquet, COMPRESSION zstd)"
+            )
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _set_sync_state(cursor, name: str, value: str) -> None:
+        cursor.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+            [name, value, datetime.now()],
+        )
+
+
+async def sync_stock_basic(
+    store: FinancialDataStore, client: AsyncTushareClient
+) -> int:
+    """全量同步股票列表（包括上市、退市和暂停上市的股票）.
+
+    Args:
+        store: 数据仓库
+        client: Tushare 客户端
+
+    Returns:
+        同步的股票数
+    """
+    frames = await asyncio.gather(
+        *[
+            client.stock_basic(list_status=status, fields=STOCK_BASIC_FIELDS)
+            for status in ("L", "D", "P")
+        ]
+    )
+    df = pd.concat(frames, ignore_index=True)
+    await asyncio.to_thread(store.replace_stock_basic, df)
+    logger.info(f"股票列表同步完成，共 {len(df)} 只")
+    return len(df)
+
+
+async def sync_income(
+    store: FinancialDataStore,
+    client: AsyncTushareClient,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> int:
+    """按公告日期增量同步全部 A 股的利润表.
+
+    从上次同步的公告日期开始（首次从 start_date 开始），逐日拉取合并报表和
+    单季合并报表。上次同步的当天可能还有之后才发布的公告，因此重新拉取这一天；
+    写入按主键覆盖，重复拉取不会产生重复行。每批公告日并发拉取，写入后推进
+    同步进度，中断后重新执行会从未完成的批次继续。
+
+    Args:
+        store: 数据仓库
+        client: Tushare 客户端
+        start_date: 首次同步的起始公告日期，默认 DEFAULT_SYNC_START
+        end_date: 同步截止公告日期（包含），默认今天
+
+    Returns:
+        同步的行数
+    """
+    synced = await asyncio.to_thread(store.get_sync_state, "income_ann_date")
+    if synced is not None:
+        first = _parse_date(synced)
+    else:
+        first = _parse_date(start_date or DEFAULT_SYNC_START)
+    last = _parse_date(end_date) if end_date else date.today()
+
+    days = [
+        (first + timedelta(days=i)).strftime("%Y%m%d")
+        for i in range((last - first).days + 1)
+    ]
+    total = 0
+    for i in range(0, len(days), _SYNC_BATCH_DAYS):
+        batch = days[i : i + _SYNC_BATCH_DAYS]
+        frames = await asyncio.gather(
+            *[
+                _fetch_income(client, ann_date, report_type)
+                for ann_date in batch
+                for report_type in ("1", "2")
+            ]
+        )
+        df = pd.concat(frames, ignore_index=True)
+        await asyncio.to_thread(store.upsert_income, df, batch[-1])
+        total += len(df)
+        logger.info(f"利润表已同步到 {batch[-1]}，本批 {len(df)} 行")
+    return total
+
+
+async def _fetch_income(
+    client: AsyncTushareClient, ann_date: str, report_type: str
+) -> pd.DataFrame:
+    """拉取某天公告的全部利润表，超过单页行数时翻页."""
+    frames = []
+    offset = 0
+    while True:
+        df = await client.income_vip(
+            ann_date=ann_date,
+            report_type=report_type,
+            fields=INCOME_FIELDS,
+            limit=_PAGE_SIZE,
+            offset=offset,
+        )
+        frames.append(df)
+        if len(df) < _PAGE_SIZE:
+            break
+        offset += _PAGE_SIZE
+    return pd.concat(frames, ignore_index=True)
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+async def _run_cli(args: argparse.Namespace) -> None:
+    """执行同步命令."""
+    store = FinancialDataStore(args.path)
+    try:
+        async with AsyncTushareClient() as client:
+            await sync_stock_basic(store, client)
+            rows = await sync_income(store, client, args.start, args.end)
+        await asyncio.to_thread(store.export_parquet, args.parquet_dir)
+        print(f"synced {rows} income rows up to {store.get_sync_state('income_ann_date')}")
+    finally:
+        store.close()
+
+
+def main() -> None:
+    """命令行入口."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Sync the local Tushare data store")
+    parser.add_argument(
+        "--path",
+        default=os.getenv("TUSHARE_STORE_PATH", DEFAULT_STORE_PATH),
+        help="DuckDB file path",
+    )
+    parser.add_argument(
+        "--parquet-dir",
+        default=parquet_dir(),
+        help="directory of the exported Parquet snapshots",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync = commands.add_parser("sync", help="sync stock basics and new income statements")
+    sync.add_argument(
+        "--start", help="first announcement date (YYYYMMDD) of the initial sync"
+    )
+    sync.add_argument("--end", help="last announcement date (YYYYMMDD), default today")
+    asyncio.run(_run_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""共享 DataFrame 缓存测试.
+
+验证零拷贝打开、版本替换、按快照版本刷新，以及多个分析脚本并发打开时的内存和耗时。
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oda_data import cache as cache_module
+from oda_data.cache import (
+    frame_source_version,
+    open_frame,
+    publish_frame,
+    refresh_snapshot_frames,
+)
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def _is_mapped(values: np.ndarray) -> bool:
+    """数组是否引用内存映射的文件."""
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+
+def _sample() -> pd.DataFrame:
+    """构造包含数值、字符串和缺失值的数据."""
+    return pd.DataFrame(
+        {
+            "ts_code": ["300059.SZ", "600030.SH", None, "300059.SZ"],
+            "n_income": [1.5, np.nan, 3.0, 4.0],
+            "rank": np.arange(4, dtype="int64"),
+            "flag": [True, False, True, False],
+        }
+    )
+
+
+def test_round_trip_zero_copy(tmp_path) -> None:
+    """打开的数据与发布时一致，列直接映射到缓存文件."""
+    publish_frame("sample", _sample(), str(tmp_path))
+
+    df = open_frame("sample", str(tmp_path))
+
+    pd.testing.assert_frame_equal(
+        df.astype({"ts_code": object}), _sample(), check_dtype=False
+    )
+    assert isinstance(df["ts_code"].dtype, pd.CategoricalDtype)
+    assert _is_mapped(df["n_income"].to_numpy())
+    assert _is_mapped(df["ts_code"].array.codes)
+
+    # 已有列只读，复制后可以修改
+    with pytest.raises(ValueError):
+        df.loc[0, "n_income"] = 100.0
+    df = df.copy()
+    df.loc[0, "n_income"] = 100.0
+    assert open_frame("sample", str(tmp_path))["n_income"].iloc[0] == 1.5
+
+
+def test_publish_replaces_version(tmp_path) -> None:
+    """发布新版本后旧版本被删除，已打开的旧版本仍可读取."""
+    publish_frame("sample", _sample(), str(tmp_path))
+    old = open_frame("sample", str(tmp_path))
+
+    publish_frame("sample", _sample().head(2), str(tmp_path), source_version="2")
+
+    assert len(open_frame("sample", str(tmp_path))) == 2
+    assert frame_source_version("sample", str(tmp_path)) == "2"
+    assert old["n_income"].sum() == 8.5
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 1
+
+
+def test_open_missing_and_invalid(tmp_path) -> None:
+    """未发布的数据集、非法名称和不支持的列类型."""
+    with pytest.raises(FileNotFoundError):
+        open_frame("missing", str(tmp_path))
+    with pytest.raises(ValueError):
+        publish_frame("../evil", _sample(), str(tmp_path))
+    with pytest.raises(TypeError):
+        publish_frame("objects", pd.DataFrame({"x": [{"a": 1}]}), str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_frame(tmp_path) -> None:
+    """空数据集也可以发布和打开."""
+    publish_frame("empty", _sample().head(0), str(tmp_path))
+
+    df = open_frame("empty", str(tmp_path))
+    assert list(df.columns) == list(_sample().columns)
+    assert df.empty
+
+
+def test_refresh_snapshot_frames(tmp_path) -> None:
+    """只发布有更新的快照."""
+    pytest.importorskip("duckdb")
+    from oda_data import FinancialDataReader
+    from tushare_mcp_server.store import FinancialDataStore
+
+    store = FinancialDataStore(":memory:")
+    store.replace_stock_basic(pd.DataFrame([{"ts_code": "300059.SZ", "name": "东方财富"}]))
+    store.export_parquet(tmp_path / "parquet")
+    reader = FinancialDataReader(tmp_path / "parquet")
+    directory = str(tmp_path / "frames")
+
+    assert refresh_snapshot_frames(reader, directory) == ["stock_basic", "income"]
+    assert refresh_snapshot_frames(reader, directory) == []
+
+    store.replace_stock_basic(
+        pd.DataFrame([{"ts_code": code} for code in ("300059.SZ", "600030.SH")])
+    )
+    # 保证修改时间变化
+    time.sleep(0.01)
+    store.export_parquet(tmp_path / "parquet")
+    assert "stock_basic" in refresh_snapshot_frames(reader, directory)
+    assert list(open_frame("stock_basic", directory)["ts_code"]) == [
+        "300059.SZ",
+        "600030.SH",
+    ]
+    reader.close()
+
+
+def test_refresh_failure_not_retried(tmp_path, monkeypatch) -> None:
+    """空间不足时不写入，快照更新前不再读取整张表重试."""
+    pytest.importorskip("duckdb")
+    from collections import namedtuple
+
+    from oda_data import FinancialDataReader
+    from tushare_mcp_server.store import FinancialDataStore
+
+    store = FinancialDataStore(":memory:")
+    store.replace_stock_basic(pd.DataFrame([{"ts_code": "300059.SZ", "name": "东方财富"}]))
+    store.export_parquet(tmp_path / "parquet")
+    reader = FinancialDataReader(tmp_path / "parquet")
+    directory = str(tmp_path / "frames")
+    queries = []
+    sql = reader.sql
+    monkeypatch.setattr(reader, "sql", lambda query: queries.append(query) or sql(query))
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(cache_module.shutil, "disk_usage", lambda path: usage(0, 0, 0))
+
+    with pytest.raises(OSError):
+        refresh_snapshot_frames(reader, directory)
+    # 空的利润表不需要空间，股票列表不再重试
+    assert refresh_snapshot_frames(reader, directory) == ["income"]
+    assert refresh_snapshot_frames(reader, directory) == []
+    assert [query.split()[-1] for query in queries] == ["stock_basic", "income"]
+    assert frame_source_version("stock_basic", directory) is None
+
+    # 快照更新后重新发布
+    monkeypatch.undo()
+    time.sleep(0.01)
+    store.export_parquet(tmp_path / "parquet")
+    assert refresh_snapshot_frames(reader, directory) == ["stock_basic", "income"]
+    reader.close()
+    store.close()
+
+
+# 基准测试的数据集：5000 只股票约一年的日线
+_BENCH_ROWS = 1_000_000
+_BENCH_WORKERS = 10
+
+_WORKER_SCRIPT = """
+import json, sys, time
+t = time.perf_counter()
+mode, path = sys.argv[1], sys.argv[2]
+if mode == "shared":
+    from oda_data.cache import open_frame
+    df = open_frame("daily", path)
+else:
+    import pandas as pd
+    df = pd.read_pickle(path)
+load = time.perf_counter() - t
+# 模拟分析：按股票汇总，访问全部数据
+result = df.groupby("ts_code", observed=True)["close"].mean().sum() + df["vol"].sum()
+private = 0
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        if line.startswith(("Private_Clean", "Private_Dirty")):
+            private += int(line.split()[1])
+import resource
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"load": load, "private_kb": private, "rss_kb": rss, "result": float(result)}))
+"""
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/smaps_rollup"), reason="需要 Linux 的 smaps_rollup"
+)
+class TestSharedFrameBenchmark:
+    """10 个分析进程并发加载同一数据集的内存和耗时."""
+
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        """同时发布到共享缓存和保存为进程私有加载的 pickle 文件."""
+        rng = np.random.default_rng(0)
+        codes = np.array([f"{i:06d}.SZ" for i in range(5000)])
+        df = pd.DataFrame(
+            {
+                "ts_code": codes[rng.integers(0, len(codes), _BENCH_ROWS)],
+                "trade_date": rng.integers(20200101, 20251231, _BENCH_ROWS).astype(str),
+                **{
+                    name: rng.random(_BENCH_ROWS)
+                    for name in ("open", "high", "low", "close", "vol", "amount")
+                },
+            }
+        )
+        frames = str(tmp_path / "frames")
+        publish_frame("daily", df, frames)
+        pickle_path = str(tmp_path / "daily.pkl")
+        df.to_pickle(pickle_path)
+        return frames, pickle_path
+
+    async def _run_workers(self, mode: str, path: str) -> list[dict]:
+        src = os.path.dirname(os.path.dirname(cache_module.__file__))
+        env = {**os.environ, "PYTHONPATH": src}
+
+        async def run() -> dict:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                _WORKER_SCRIPT,
+                mode,
+                path,
+                stdout=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            stdout, _ = await proc.communicate()
+            assert proc.returncode == 0
+            return json.loads(stdout)
+
+        return await asyncio.gather(*[run() for _ in range(_BENCH_WORKERS)])
+
+    async def test_concurrent_analyses(self, dataset) -> None:
+        """共享缓存的进程私有内存和加载耗时应明显低于各自加载."""
+        frames, pickle_path = dataset
+        private = await self._run_workers("private", pickle_path)
+        shared = await self._run_workers("shared", frames)
+
+        def summary(results: list[dict]) -> tuple[float, float, float]:
+            return (
+                max(r["load"] for r in results),
+                sum(r["private_kb"] for r in results) / 1024,
+                max(r["rss_kb"] for r in results) / 1024,
+            )
+
+        private_load, private_mb, private_rss = summary(private)
+        shared_load, shared_mb, shared_rss = summary(shared)
+        logger.info(
+            f"{_BENCH_WORKERS} 个进程加载 {_BENCH_ROWS} 行: "
+            f"各自加载 最大耗时 {private_load:.3f}s 私有内存合计 {private_mb:.0f}MB 峰值RSS {private_rss:.0f}MB; "
+            f"共享缓存 最大耗时 {shared_load:.3f}s 私有内存合计 {shared_mb:.0f}MB 峰值RSS {shared_rss:.0f}MB"
+        )
+
+        assert {r["result"] for r in shared} == {private[0]["result"]}
+        assert shared_mb < private_mb / 2
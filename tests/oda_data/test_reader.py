@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""oda_data 测试.
+
+验证分析脚本通过 execute_python_code_by_path 运行时可以导入 oda_data，读取快照和共享数据集。
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+import oda_data
+from oda_data import reader as reader_module
+from one_dragon_alpha.tool.code import execute_python_code_by_path
+from tushare_mcp_server.store import FinancialDataStore
+
+
+@pytest.fixture
+def parquet_dir(tmp_path, monkeypatch):
+    """导出包含股票列表和利润表的快照，并设为全局快照目录."""
+    store = FinancialDataStore(":memory:")
+    store.replace_stock_basic(
+        pd.DataFrame(
+            [
+                {"ts_code": "300059.SZ", "name": "东方财富", "list_status": "L"},
+                {"ts_code": "600030.SH", "name": "中信证券", "list_status": "L"},
+            ]
+        )
+    )
+    store.upsert_income(
+        pd.DataFrame(
+            [
+                {
+                    "ts_code": ts_code,
+                    "ann_date": "20250418",
+                    "end_date": "20250331",
+                    "report_type": "2",
+                    "update_flag": "1",
+                    "n_income_attr_p": value,
+                }
+                for ts_code, value in (("300059.SZ", 40.0), ("600030.SH", 60.0))
+            ]
+        ),
+        "20250418",
+    )
+    directory = tmp_path / "parquet"
+    store.export_parquet(directory)
+    store.close()
+
+    monkeypatch.setenv("TUSHARE_PARQUET_DIR", str(directory))
+    monkeypatch.setenv("ODA_FRAME_CACHE_DIR", str(tmp_path / "frames"))
+    monkeypatch.setattr(reader_module, "_reader", None)
+    yield directory
+    oda_data.close_reader()
+
+
+def test_module_helpers(parquet_dir) -> None:
+    """模块级函数读取全局快照."""
+    df = oda_data.income("300059.SZ", report_type="2", fields=["end_date", "n_income_attr_p"])
+    assert df.to_dict("records") == [{"end_date": "20250331", "n_income_attr_p": 40.0}]
+    assert list(oda_data.stock_basic(["ts_code"])["ts_code"]) == ["300059.SZ", "600030.SH"]
+    df = oda_data.sql("SELECT sum(n_income_attr_p) AS total FROM income")
+    assert df["total"].iloc[0] == 100.0
+
+
+def test_snapshot_missing(tmp_path, monkeypatch) -> None:
+    """快照不存在时报错."""
+    monkeypatch.setenv("TUSHARE_PARQUET_DIR", str(tmp_path / "missing"))
+    monkeypatch.setenv("ODA_FRAME_CACHE_DIR", str(tmp_path / "frames"))
+    monkeypatch.setattr(reader_module, "_reader", None)
+
+    assert oda_data.get_reader() is None
+    with pytest.raises(RuntimeError):
+        oda_data.stock_basic()
+
+
+async def test_script_imports_oda_data(parquet_dir, tmp_path) -> None:
+    """生成的分析脚本在子进程中直接 import oda_data，完整数据集从共享缓存打开."""
+    script = tmp_path / "main.py"
+    script.write_text(
+        "import json\n"
+        "import oda_data\n"
+        "df = oda_data.sql('SELECT ts_code FROM income ORDER BY n_income_attr_p DESC')\n"
+        "codes = oda_data.frame('stock_basic')['ts_code']\n"
+        "print(json.dumps([list(df['ts_code']), str(codes.dtype)]))\n",
+        encoding="utf-8",
+    )
+
+    response = await execute_python_code_by_path(str(script), timeout=60)
+
+    text = response.content[0]["text"]
+    assert "<returncode>0</returncode>" in text, text
+    stdout = text.split("<stdout>")[1].split("</stdout>")[0]
+    assert json.loads(stdout) == [["600030.SH", "300059.SZ"], "category"]
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""CompactingMemory 单元测试.
+
+验证历史工具结果压缩、近期轮次原样保留、token 预算裁剪，
+并在回放的长对话上统计 prompt 大小的节省比例。
+"""
+
+import pytest
+from agentscope.message import Msg
+
+from one_dragon_agent.core.agent.compacting_memory import CompactingMemory
+from one_dragon_agent.core.model.token_estimator import (
+    estimate_msg_tokens,
+    estimate_tokens,
+)
+from one_dragon_agent.core.system.json_codec import dumps_compact
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def _income_records(rows: int) -> str:
+    """创建利润表工具返回的 JSON 文本."""
+    return dumps_compact(
+        [
+            {
+                "ts_code": "300059.SZ",
+                "报告期": f"2024{i:04d}",
+                "营业收入": 123456789.0 + i,
+                "营业利润": 23456789.0 + i,
+                "净利润": 12345678.0 + i,
+                "基本每股收益": 0.5,
+            }
+            for i in range(rows)
+        ]
+    )
+
+
+def _turn(index: int, rows: int = 50) -> list[Msg]:
+    """创建一轮包含工具调用的对话."""
+    call_id = f"call_{index}"
+    return [
+        Msg(name="user", content=f"第 {index} 个问题：东方财富的营业收入？", role="user"),
+        Msg(
+            name="OneDragon",
+            content=[
+                {
+                    "type": "tool_use",
+                    "id": call_id,
+                    "name": "tushare_income",
+                    "input": {"ts_code": "300059.SZ"},
+                }
+            ],
+            role="assistant",
+        ),
+        Msg(
+            name="system",
+            content=[
+                {
+                    "type": "tool_result",
+                    "id": call_id,
+                    "name": "tushare_income",
+                    "output": [{"type": "text", "text": _income_records(rows)}],
+                }
+            ],
+            role="system",
+        ),
+        Msg(name="OneDragon", content=f"第 {index} 个回答：营业收入稳步增长。", role="assistant"),
+    ]
+
+
+def _tool_result_text(msg: Msg) -> str:
+    """获取消息中工具结果的文本."""
+    return msg.content[0]["output"][0]["text"]
+
+
+class TestTokenEstimator:
+    """token 估算测试."""
+
+    def test_ascii_and_cjk(self) -> None:
+        """测试英文按约 4 字符一个 token，中文按 1 字一个 token 估算."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("营业收入") == 4
+        assert estimate_tokens("营业收入abcd") == 5
+
+
+class TestCompactingMemory:
+    """CompactingMemory 测试."""
+
+    async def test_recent_turns_verbatim(self) -> None:
+        """测试近期轮次原样保留，历史工具结果被摘要替换."""
+        memory = CompactingMemory(keep_recent_turns=2, max_tool_result_chars=100)
+        for i in range(3):
+            await memory.add(_turn(i))
+
+        view = await memory.get_memory()
+
+        assert len(view) == 12
+        summary = _tool_result_text(view[2])
+        assert summary.startswith("[历史工具结果已压缩: tushare_income")
+        assert "共 50 条记录" in summary
+        assert view[2].content[0]["id"] == "call_0"
+        assert _tool_result_text(view[6]) == _income_records(50)
+        assert _tool_result_text(view[10]) == _income_records(50)
+        assert memory.stats.compacted_results == 1
+
+    async def test_storage_unchanged(self) -> None:
+        """测试压缩只影响视图，不修改存储的原始消息."""
+        memory = CompactingMemory(keep_recent_turns=1, max_tool_result_chars=100)
+        for i in range(2):
+            await memory.add(_turn(i))
+
+        await memory.get_memory()
+
+        assert _tool_result_text(memory.content[2][0]) == _income_records(50)
+
+    async def test_budget_drops_oldest_turns(self) -> None:
+        """测试超出 token 预算时从最早的轮次开始整轮丢弃."""
+        memory = CompactingMemory(
+            token_budget=200, keep_recent_turns=1, max_tool_result_chars=100
+        )
+        for i in range(10):
+            await memory.add(_turn(i))
+
+        view = await memory.get_memory()
+
+        assert memory.stats.dropped_turns > 0
+        assert view[0].role == "user"
+        assert view[-4:] == [msg for msg, _ in memory.content[-4:]]
+        # 工具调用与工具结果保持成对
+        call_ids = {b["id"] for m in view if not isinstance(m.content, str) for b in m.content}
+        assert all(m.content[0]["id"] in call_ids for m in view if m.role == "system")
+
+    async def test_recent_turns_never_dropped(self) -> None:
+        """测试近期轮次即使超出预算也不会被丢弃."""
+        memory = CompactingMemory(token_budget=10, keep_recent_turns=2)
+        for i in range(2):
+            await memory.add(_turn(i))
+
+        view = await memory.get_memory()
+
+        assert len(view) == 8
+        assert memory.stats.dropped_turns == 0
+
+    async def test_oversized_recent_turn_summarized(self) -> None:
+        """测试只剩近期轮次仍超出预算时，压缩近期轮次的大工具结果，最新一轮除外."""
+        memory = CompactingMemory(
+            token_budget=2000, keep_recent_turns=3, max_tool_result_chars=1000
+        )
+        await memory.add(_turn(0, rows=5))
+        await memory.add(_turn(1, rows=500))
+        await memory.add(_turn(2, rows=5))
+
+        view = await memory.get_memory()
+
+        assert len(view) == 12
+        assert memory.stats.dropped_turns == 0
+        assert memory.stats.compacted_results == 1
+        assert memory.stats.compacted_tokens <= memory.token_budget
+        assert _tool_result_text(view[2]) == _income_records(5)
+        assert "共 500 条记录" in _tool_result_text(view[6])
+        assert _tool_result_text(view[10]) == _income_records(5)
+
+    async def test_newest_turn_kept_over_budget(self) -> None:
+        """测试最新一轮即使超出预算也原样保留."""
+        memory = CompactingMemory(
+            token_budget=10, keep_recent_turns=2, max_tool_result_chars=100
+        )
+        await memory.add(_turn(0))
+        await memory.add(_turn(1))
+
+        view = await memory.get_memory()
+
+        assert "共 50 条记录" in _tool_result_text(view[2])
+        assert _tool_result_text(view[6]) == _income_records(50)
+
+
+@pytest.mark.benchmark
+class TestCompactionSavings:
+    """回放长对话，统计 prompt 大小的节省."""
+
+    async def test_replayed_conversation(self) -> None:
+        """逐轮回放 30 轮对话，累计每轮发送给模型的 prompt token."""
+        full_total = 0
+        compacted_total = 0
+        memory = CompactingMemory()
+
+        for i in range(30):
+            await memory.add(_turn(i))
+            view = await memory.get_memory()
+            full_total += sum(estimate_msg_tokens(m) for m, _ in memory.content)
+            compacted_total += sum(estimate_msg_tokens(m) for m in view)
+
+        saved = 1 - compacted_total / full_total
+        logger.info(
+            f"回放 30 轮对话 prompt token 累计: 原始 {full_total}, "
+            f"压缩后 {compacted_total}, 节省 {saved:.1%}"
+        )
+
+        assert memory.stats.compacted_tokens <= memory.token_budget
+        assert saved > 0.5
@@ -4,7 +4,7 @@
 import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 
 import pytest
 
@@ -141,13 +141,12 @@ class TestMySQLTokenPersistence:
         When: 调用 load_token
         Then: 返回正确的 token
         """
-        # Mock 数据库返回值
-        mock_row = Mock()
-        mock_row.oauth_access_token = sample_token.access_token
-        mock_row.oauth_refresh_token = sample_token.refresh_token
-        mock_row.oauth_expires_at = sample_token.expires_at
-        mock_row.oauth_metadata = json.dumps(
-            {"resource_url": sample_token.resource_url}
+        # Mock 数据库返回值（按 OAUTH_COLUMNS 的列顺序）
+        mock_row = (
+            sample_token.access_token,
+            sample_token.refresh_token,
+            sample_token.expires_at,
+            json.dumps({"resource_url": sample_token.resource_url}),
         )
 
         mock_result = MagicMock()
@@ -172,11 +171,12 @@ class TestMySQLTokenPersistence:
         When: 调用 load_token
         Then: resource_url 为 None
         """
-        mock_row = Mock()
-        mock_row.oauth_access_token = sample_token_no_resource_url.access_token
-        mock_row.oauth_refresh_token = sample_token_no_resource_url.refresh_token
-        mock_row.oauth_expires_at = sample_token_no_resource_url.expires_at
-        mock_row.oauth_metadata = None
+        mock_row = (
+            sample_token_no_resource_url.access_token,
+            sample_token_no_resource_url.refresh_token,
+            sample_token_no_resource_url.expires_at,
+            None,
+        )
 
         mock_result = MagicMock()
         mock_result.fetchone.return_value = mock_row
@@ -211,9 +211,7 @@ class TestMySQLTokenPersistence:
         When: 调用 load_token
         Then: 返回 None
         """
-        mock_row = Mock()
-        mock_row.oauth_access_token = None
-        mock_row.oauth_refresh_token = None
+        mock_row = (None, None, None, None)
 
         mock_result = MagicMock()
         mock_result.fetchone.return_value = mock_row
@@ -265,9 +263,7 @@ class TestMySQLTokenPersistence:
         When: 调用 has_token
         Then: 返回 True
         """
-        mock_row = Mock()
-        mock_row.oauth_access_token = "some-token"
-        mock_row.oauth_refresh_token = "some-refresh-token"
+        mock_row = ("some-token", "some-refresh-token", 1893456000000, None)
 
         mock_result = MagicMock()
         mock_result.fetchone.return_value = mock_row
@@ -285,9 +281,7 @@ class TestMySQLTokenPersistence:
         When: 调用 has_token
         Then: 返回 False
         """
-        mock_row = Mock()
-        mock_row.oauth_access_token = None
-        mock_row.oauth_refresh_token = None
+        mock_row = (None, None, None, None)
 
         mock_result = MagicMock()
         mock_result.fetchone.return_value = mock_row
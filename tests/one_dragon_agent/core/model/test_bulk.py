@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""模型配置批量导入导出测试.
+
+使用内存 SQLite 作为数据库替身，验证按名称新增或更新、逐项错误报告和 NDJSON 导出。
+"""
+
+import json
+
+import httpx
+import pytest
+from cryptography.fernet import Fernet
+from fastapi import FastAPI
+from sqlalchemy import event
+
+from one_dragon_agent.core.model.qwen.token_encryption import reset_token_encryption
+from one_dragon_agent.core.model.repository import config_count_cache, metadata
+from one_dragon_agent.core.model.router import get_db_session, router
+from one_dragon_agent.core.model.service import ModelConfigService
+
+
+def _openai_item(name: str, api_key: str = "sk-test", base_url: str = "https://api.openai.com") -> dict:
+    """创建 OpenAI 配置导入项."""
+    return {
+        "name": name,
+        "provider": "openai",
+        "base_url": base_url,
+        "api_key": api_key,
+        "models": [{"model_id": "gpt-4"}],
+    }
+
+
+@pytest.fixture
+async def session_maker(monkeypatch: pytest.MonkeyPatch):
+    """创建内存 SQLite 会话工厂，并统计执行的 INSERT 语句数."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    monkeypatch.setenv("TOKEN_ENCRYPTION_KEY", Fernet.generate_key().decode())
+    reset_token_encryption()
+    config_count_cache.clear()
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    inserts: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: inserts.append(statement)
+        if statement.startswith("INSERT")
+        else None,
+    )
+
+    maker = async_sessionmaker(engine)
+    maker.inserts = inserts
+    yield maker
+    await engine.dispose()
+    reset_token_encryption()
+    config_count_cache.clear()
+
+
+class TestBulkImport:
+    """批量导入测试."""
+
+    async def test_create_and_update(self, session_maker) -> None:
+        """测试第二次导入时更新已有配置，未提供 api_key 时保留原值."""
+        async with session_maker() as session:
+            service = ModelConfigService(session)
+            first = await service.bulk_import_model_configs(
+                [_openai_item(f"test_bulk_{i}") for i in range(3)]
+            )
+            second = await service.bulk_import_model_configs(
+                [
+                    _openai_item("test_bulk_0", api_key="", base_url="https://api.deepseek.com"),
+                    _openai_item("test_bulk_3"),
+                ]
+            )
+            internal = await service.get_model_config_internal(second.items[0].id)
+
+        assert (first.created, first.updated, first.failed) == (3, 0, 0)
+        assert (second.created, second.updated, second.failed) == (1, 1, 0)
+        assert second.items[0].status == "updated"
+        assert second.items[0].id == first.items[0].id
+        assert internal.base_url == "https://api.deepseek.com"
+        assert internal.api_key == "sk-test"
+        # 第一次导入一条多行 INSERT；第二次按更新列分为两组
+        assert len(session_maker.inserts) == 3
+
+    async def test_per_item_errors(self, session_maker) -> None:
+        """测试校验失败的配置单独报告，其余配置正常写入."""
+        items = [
+            _openai_item("test_bulk_ok"),
+            {"name": "test_bulk_bad", "provider": "unknown", "models": []},
+            _openai_item("test_bulk_ok"),
+            _openai_item("test_bulk_no_key", api_key=""),
+            {
+                "name": "test_bulk_qwen",
+                "provider": "qwen",
+                "models": [{"model_id": "qwen-max"}],
+                "oauth_token": {
+                    "access_token": "access",
+                    "refresh_token": "refresh",
+                    "expires_at": 1893456000000,
+                },
+            },
+        ]
+
+        async with session_maker() as session:
+            service = ModelConfigService(session)
+            result = await service.bulk_import_model_configs(items)
+            qwen = await service.get_model_config_internal(result.items[4].id)
+
+        assert [item.status for item in result.items] == [
+            "created",
+            "error",
+            "error",
+            "error",
+            "created",
+        ]
+        assert "provider" in result.items[1].error
+        assert result.items[2].error == "配置名称在导入数据中重复"
+        assert result.items[3].error == "OpenAI provider 必须提供 api_key"
+        assert qwen.oauth_access_token is not None
+        assert result.failed == 3
+
+
+class TestBulkApi:
+    """批量导入导出接口测试."""
+
+    @pytest.fixture
+    def app(self, session_maker, monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+        """创建使用 SQLite 会话的测试应用."""
+
+        async def override_session():
+            async with session_maker() as session:
+                yield session
+
+        class FakeMySQLService:
+            """只提供 get_session 的连接服务替身."""
+
+            async def get_session(self):
+                return session_maker()
+
+        monkeypatch.setattr(
+            "one_dragon_alpha.services.mysql.get_mysql_connection_service",
+            lambda: FakeMySQLService(),
+        )
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_db_session] = override_session
+        return app
+
+    async def test_import_then_export(self, app: FastAPI) -> None:
+        """测试导入后导出 NDJSON，导出内容不含密钥且可重新导入."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/models/configs/bulk",
+                json={"items": [_openai_item(f"test_bulk_{i}") for i in range(5)]},
+            )
+            assert response.status_code == 200
+            assert response.json()["created"] == 5
+
+            response = await client.get("/api/models/configs/export")
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in response.text.splitlines()]
+
+            response = await client.post("/api/models/configs/bulk", json={"items": lines})
+
+        assert len(lines) == 5
+        assert all("api_key" not in line for line in lines)
+        assert response.json()["updated"] == 5
+
+    async def test_export_invalid_provider(self, app: FastAPI) -> None:
+        """测试导出时不支持的 provider 返回 400."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/models/configs/export?provider=unknown")
+
+        assert response.status_code == 400
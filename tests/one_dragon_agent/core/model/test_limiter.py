@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""ModelCallLimiter 测试.
+
+验证并发上限、会话间公平轮转、token 预算、429 退避，
+以及 InstrumentedChatModel 排队时的状态回调。
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from one_dragon_agent.core.model.limiter import ModelCallLimiter
+from one_dragon_agent.core.model.usage import InstrumentedChatModel, ModelUsageRecorder
+
+
+class RateLimitError(Exception):
+    """与 openai.RateLimitError 字段一致的 429 异常."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str | None = None) -> None:
+        """初始化异常.
+
+        Args:
+            retry_after: Retry-After 响应头
+        """
+        super().__init__("rate limited")
+        headers = {} if retry_after is None else {"retry-after": retry_after}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class SlowModel:
+    """每次调用固定耗时并记录最大并发的假模型."""
+
+    model_name = "fake-model"
+    stream = False
+
+    def __init__(self, delay: float = 0.02) -> None:
+        """初始化假模型.
+
+        Args:
+            delay: 每次调用耗时（秒）
+        """
+        self._delay = delay
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, messages: list[dict], **kwargs):
+        """模拟一次调用."""
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self._delay)
+        self.running -= 1
+        usage = SimpleNamespace(input_tokens=10, output_tokens=5)
+        return SimpleNamespace(content=[{"type": "text", "text": "ok"}], usage=usage)
+
+
+_MESSAGES = [{"role": "user", "content": "东方财富的营业收入是多少？"}]
+
+
+class TestModelCallLimiter:
+    """ModelCallLimiter 测试."""
+
+    async def test_max_in_flight(self) -> None:
+        """测试并发调用数不超过上限."""
+        limiter = ModelCallLimiter(1, max_in_flight=2, tokens_per_minute=0)
+        model = SlowModel()
+
+        async def call() -> None:
+            permit = await limiter.acquire("test_session", 10)
+            try:
+                await model(_MESSAGES)
+            finally:
+                limiter.release(permit, 10)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert model.max_running == 2
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+
+    async def test_fair_across_sessions(self) -> None:
+        """测试排队调用在会话间轮转，后到会话不必等前一会话全部完成."""
+        limiter = ModelCallLimiter(1, max_in_flight=1, tokens_per_minute=0)
+        holder = await limiter.acquire("test_session_hold", 0)
+        order: list[str] = []
+
+        async def call(session_id: str, name: str) -> None:
+            permit = await limiter.acquire(session_id, 0)
+            order.append(name)
+            await asyncio.sleep(0)
+            limiter.release(permit, 0)
+
+        tasks = [
+            asyncio.create_task(call("test_session_a", f"a{i}")) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("test_session_b", "b0")))
+        await asyncio.sleep(0)
+
+        limiter.release(holder, 0)
+        await asyncio.gather(*tasks)
+
+        assert order == ["a0", "b0", "a1", "a2"]
+
+    async def test_tokens_per_minute(self) -> None:
+        """测试 token 预算用完后等待补充."""
+        limiter = ModelCallLimiter(1, max_in_flight=10, tokens_per_minute=6000)
+
+        first = await limiter.acquire("test_session", 6000)
+        start = time.perf_counter()
+        second = await limiter.acquire("test_session", 10)
+        waited = time.perf_counter() - start
+
+        limiter.release(first, 6000)
+        limiter.release(second, 10)
+        # 每秒补充 100 token，10 token 约需 0.1 秒
+        assert 0.05 <= waited < 1.0
+        assert second.wait_seconds == pytest.approx(waited, abs=0.02)
+
+    async def test_rate_limited_backoff(self) -> None:
+        """测试 429 后并发上限减半并按 Retry-After 暂停放行."""
+        limiter = ModelCallLimiter(1, max_in_flight=4, tokens_per_minute=0)
+
+        permit = await limiter.acquire("test_session", 0)
+        limiter.release(permit, 0, RateLimitError(retry_after="0.1"))
+        start = time.perf_counter()
+        permit = await limiter.acquire("test_session", 0)
+        waited = time.perf_counter() - start
+        limiter.release(permit, 0)
+
+        assert limiter.limit == pytest.approx(2.5)
+        assert waited >= 0.08
+
+    async def test_cancelled_waiter_removed(self) -> None:
+        """测试取消排队中的调用会将其移出队列."""
+        limiter = ModelCallLimiter(1, max_in_flight=1, tokens_per_minute=0)
+        holder = await limiter.acquire("test_session", 0)
+
+        task = asyncio.create_task(limiter.acquire("test_session", 0))
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        limiter.release(holder, 0)
+        assert limiter.queued == 0
+        assert limiter.in_flight == 0
+
+    async def test_release_right_after_cancel(self) -> None:
+        """测试取消排队调用后、其清理执行前归还许可，不会放行已取消的调用."""
+        limiter = ModelCallLimiter(1, max_in_flight=1, tokens_per_minute=0)
+        holder = await limiter.acquire("test_session", 0)
+
+        task = asyncio.create_task(limiter.acquire("test_session", 0))
+        await asyncio.sleep(0)
+        # 同一轮事件循环中取消并归还，acquire 的 except 还未执行
+        task.cancel()
+        limiter.release(holder, 0)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert limiter.queued == 0
+        assert limiter.in_flight == 0
+        permit = await asyncio.wait_for(limiter.acquire("test_session", 0), 1)
+        limiter.release(permit, 0)
+
+
+class TestInstrumentedChatModelLimiter:
+    """InstrumentedChatModel 使用限制器的测试."""
+
+    async def test_status_callbacks_when_queued(self) -> None:
+        """测试排队时先后通知 model_queued 和 model_dequeued."""
+        limiter = ModelCallLimiter(1, max_in_flight=1, tokens_per_minute=0)
+        statuses: list[dict] = []
+
+        async def on_status(status: dict) -> None:
+            statuses.append(status)
+
+        model = InstrumentedChatModel(
+            SlowModel(),
+            "test_session",
+            1,
+            "fake-model",
+            ModelUsageRecorder(),
+            limiter=limiter,
+            on_status=on_status,
+        )
+        holder = await limiter.acquire("test_session_other", 0)
+        call = asyncio.create_task(model(_MESSAGES))
+        await asyncio.sleep(0.02)
+        limiter.release(holder, 0)
+        await call
+
+        assert [s["hint"] for s in statuses] == ["model_queued", "model_dequeued"]
+        assert statuses[1]["queue_wait_ms"] >= 10
+        assert limiter.in_flight == 0
+
+    async def test_release_on_error(self) -> None:
+        """测试调用失败时归还许可并记录 429."""
+        limiter = ModelCallLimiter(1, max_in_flight=2, tokens_per_minute=0)
+
+        class FailingModel(SlowModel):
+            async def __call__(self, *args, **kwargs):
+                raise RateLimitError()
+
+        model = InstrumentedChatModel(
+            FailingModel(), "test_session", 1, "fake-model", ModelUsageRecorder(), limiter
+        )
+
+        with pytest.raises(RateLimitError):
+            await model(_MESSAGES)
+
+        assert limiter.in_flight == 0
+        assert limiter.limit == 1.0
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""模型配置游标分页测试."""
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from one_dragon_agent.core.model.repository import (
+    PUBLIC_COLUMNS,
+    ConfigCountCache,
+    ModelConfigRepository,
+    config_count_cache,
+    decode_cursor,
+    encode_cursor,
+    metadata,
+    model_configs_table,
+)
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+_BASE_TIME = datetime(2026, 1, 1)
+
+
+def _row(config_id: int) -> dict:
+    """创建一条数据库记录，每 3 条共用一个 created_at 以覆盖排序键相同的情况."""
+    created_at = _BASE_TIME + timedelta(seconds=config_id // 3)
+    is_openai = config_id % 2 == 1
+    return {
+        "id": config_id,
+        "name": f"test_config_{config_id}",
+        "provider": "openai" if is_openai else "qwen",
+        "base_url": "https://api.openai.com" if is_openai else "",
+        "api_key": "sk-secret",
+        "models": [
+            {"model_id": "gpt-4", "support_vision": True, "support_thinking": False}
+        ],
+        "is_active": True,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    """每个测试前后清空全局总数缓存."""
+    config_count_cache.clear()
+    yield
+    config_count_cache.clear()
+
+
+class TestCursor:
+    """游标编解码测试."""
+
+    def test_round_trip(self) -> None:
+        """测试游标编码后可还原排序键."""
+        created_at = datetime(2026, 2, 7, 12, 30, 0, 123456)
+
+        cursor = encode_cursor(created_at, 42)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    def test_invalid_cursor(self) -> None:
+        """测试无效游标抛出 ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestConfigCountCache:
+    """总数缓存测试."""
+
+    def test_expired_entry(self) -> None:
+        """测试过期的总数不再返回."""
+        cache = ConfigCountCache(ttl=0.0)
+        cache.set((None, None), 10)
+
+        time.sleep(0.001)
+
+        assert cache.get((None, None)) is None
+
+    def test_keyed_by_filters(self) -> None:
+        """测试不同过滤条件分别缓存."""
+        cache = ConfigCountCache()
+        cache.set((True, None), 10)
+
+        assert cache.get((True, None)) == 10
+        assert cache.get((None, None)) is None
+
+
+class TestGetConfigsAfter:
+    """get_configs_after 单元测试."""
+
+    async def test_projection_and_next_cursor(self) -> None:
+        """测试只查询公开列，并在有下一页时返回游标."""
+        statements = []
+        count_result = MagicMock()
+        count_result.scalar.return_value = 3
+        data_result = MagicMock()
+        data_result.fetchall.return_value = [
+            tuple(_row(i)[c.name] for c in PUBLIC_COLUMNS) for i in (5, 4, 3)
+        ]
+
+        async def mock_execute(stmt):
+            statements.append(str(stmt))
+            return count_result if len(statements) == 1 else data_result
+
+        session = AsyncMock(spec=AsyncSession)
+        session.execute = mock_execute
+
+        repository = ModelConfigRepository(session)
+        configs, next_cursor, total = await repository.get_configs_after(page_size=2)
+
+        assert [c.id for c in configs] == [5, 4]
+        assert total == 3
+        assert decode_cursor(next_cursor) == (configs[-1].created_at, 4)
+        assert "api_key" not in statements[1]
+        assert "oauth_access_token" not in statements[1]
+
+        # 第二次查询复用缓存的总数，只执行数据查询
+        await repository.get_configs_after(cursor=next_cursor, page_size=2)
+        assert len(statements) == 3
+
+
+@pytest.mark.benchmark
+class TestKeysetPaginationBenchmark:
+    """在 SQLite 上用 10 万条配置对比 OFFSET 分页与游标分页."""
+
+    @pytest.fixture
+    async def session(self):
+        """创建装有 10 万条配置的内存 SQLite 会话."""
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            rows = [_row(i) for i in range(1, 100_001)]
+            for start in range(0, len(rows), 10_000):
+                await conn.execute(
+                    model_configs_table.insert(), rows[start : start + 10_000]
+                )
+
+        async with async_sessionmaker(engine)() as session:
+            yield session
+        await engine.dispose()
+
+    async def test_deep_page(self, session: AsyncSession) -> None:
+        """测试翻到最后一页时游标分页远快于 OFFSET 分页，且结果一致."""
+        repository = ModelConfigRepository(session)
+        page_size = 20
+        last_page = 100_000 // page_size
+
+        start = time.perf_counter()
+        offset_configs, total = await repository.get_configs(
+            page=last_page, page_size=page_size
+        )
+        offset_seconds = time.perf_counter() - start
+
+        before = offset_configs[0]
+        cursor = encode_cursor(before.created_at, before.id + 1)
+        start = time.perf_counter()
+        keyset_configs, next_cursor, _ = await repository.get_configs_after(
+            cursor=cursor, page_size=page_size
+        )
+        keyset_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"10 万条配置最后一页: OFFSET {offset_seconds * 1000:.2f} ms, "
+            f"游标 {keyset_seconds * 1000:.2f} ms"
+        )
+
+        assert total == 100_000
+        assert [c.id for c in keyset_configs] == [c.id for c in offset_configs]
+        assert next_cursor is None
+        assert keyset_seconds < offset_seconds
+
+    async def test_walk_all_pages(self, session: AsyncSession) -> None:
+        """测试沿游标遍历全部配置不重复不遗漏."""
+        repository = ModelConfigRepository(session)
+        seen: list[int] = []
+        cursor = None
+
+        while True:
+            configs, cursor, _ = await repository.get_configs_after(
+                cursor=cursor, page_size=1000, provider="openai"
+            )
+            seen.extend(c.id for c in configs)
+            if cursor is None:
+                break
+
+        assert len(seen) == 50_000
+        assert seen == sorted(seen, reverse=True)
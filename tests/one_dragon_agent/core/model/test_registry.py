@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""ModelRegistry 单元测试."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from one_dragon_agent.core.model.model_factory import ModelFactory
+from one_dragon_agent.core.model.models import ModelConfigInternal, ModelInfo
+from one_dragon_agent.core.model.registry import ModelRegistry, get_model_registry
+
+
+def _config(config_id: int, base_url: str = "https://api.openai.com/v1") -> ModelConfigInternal:
+    """创建 OpenAI 配置."""
+    now = datetime(2026, 1, 1)
+    return ModelConfigInternal(
+        id=config_id,
+        name=f"Config {config_id}",
+        provider="openai",
+        base_url=base_url,
+        api_key="test-key",
+        is_active=True,
+        models=[
+            ModelInfo(model_id="gpt-4"),
+            ModelInfo(model_id="gpt-4-turbo"),
+        ],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+async def registry():
+    """创建独立的注册表."""
+    registry = ModelRegistry(max_connections=8, max_keepalive_connections=2)
+    yield registry
+    await registry.aclose()
+
+
+class TestModelRegistry:
+    """ModelRegistry 测试."""
+
+    def test_shares_instance_per_key(self, registry: ModelRegistry) -> None:
+        """测试同一 (config_id, model_id) 返回同一实例."""
+        config = _config(1)
+
+        first = registry.get_model(config, "gpt-4")
+        second = registry.get_model(config.model_copy(), "gpt-4")
+        other = registry.get_model(config, "gpt-4-turbo")
+
+        assert first is second
+        assert other is not first
+        assert registry.size() == 2
+
+    def test_shares_http_client_per_host(self, registry: ModelRegistry) -> None:
+        """测试同一主机的不同配置共享一个连接池."""
+        a = registry.get_model(_config(1), "gpt-4")
+        b = registry.get_model(_config(2), "gpt-4")
+        c = registry.get_model(_config(3, "https://api.deepseek.com"), "gpt-4")
+
+        assert a.client._client is b.client._client
+        assert c.client._client is not a.client._client
+        assert len(registry._http_clients) == 2
+
+    def test_rebuilds_after_config_update(self, registry: ModelRegistry) -> None:
+        """测试配置 updated_at 变化后重建实例."""
+        config = _config(1)
+        first = registry.get_model(config, "gpt-4")
+
+        updated = config.model_copy(
+            update={"updated_at": config.updated_at + timedelta(seconds=1)}
+        )
+
+        assert registry.get_model(updated, "gpt-4") is not first
+
+    def test_invalidate(self, registry: ModelRegistry) -> None:
+        """测试 invalidate 只移除对应配置的实例."""
+        first = registry.get_model(_config(1), "gpt-4")
+        kept = registry.get_model(_config(2), "gpt-4")
+
+        registry.invalidate(1)
+
+        assert registry.get_model(_config(1), "gpt-4") is not first
+        assert registry.get_model(_config(2), "gpt-4") is kept
+
+    def test_token_cache_clear_invalidates_global_registry(self) -> None:
+        """测试清除 token 缓存时移除全局注册表中的实例."""
+        registry = get_model_registry()
+        first = registry.get_model(_config(101), "gpt-4")
+
+        ModelFactory.clear_token_cache(101)
+
+        assert registry.get_model(_config(101), "gpt-4") is not first
+        registry.invalidate(101)
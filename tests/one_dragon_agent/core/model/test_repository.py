@@ -16,6 +16,7 @@ from one_dragon_agent.core.model.models import (
     ModelInfo,
 )
 from one_dragon_agent.core.model.repository import (
+    PUBLIC_COLUMNS,
     ModelConfigRepository,
     ModelConfigORM,
 )
@@ -242,10 +243,9 @@ class TestModelConfigRepository:
 
         # 模拟数据查询返回
         mock_data_result = MagicMock()
+        row = sample_config_response.model_dump()
         mock_data_result.fetchall.return_value = [
-            MagicMock(
-                _mapping=sample_config_response.model_dump()
-            ) for _ in range(5)
+            tuple(row[c.name] for c in PUBLIC_COLUMNS) for _ in range(5)
         ]
 
         # 设置 execute 返回不同的结果
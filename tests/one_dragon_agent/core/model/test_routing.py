@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""RoutedChatModel 测试.
+
+使用本地假的 OpenAI 兼容服务，验证出错时故障转移、首个响应块超时后对冲、
+按延迟 EWMA 选择端点，以及落败端点的延迟记录。
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from agentscope.model import OpenAIChatModel
+
+from one_dragon_agent.core.model.routing import (
+    EndpointTracker,
+    RoutedChatModel,
+    RoutingPolicy,
+)
+
+
+class FakeOpenAIServer:
+    """返回 chat.completion 的假 OpenAI 兼容服务."""
+
+    def __init__(self, text: str, delay: float = 0.0, status: int = 200) -> None:
+        """初始化假服务.
+
+        Args:
+            text: 回复内容
+            delay: 返回响应前的等待时间（秒）
+            status: HTTP 状态码，非 200 时返回错误
+        """
+        self.text = text
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        """服务地址."""
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def __aenter__(self) -> "FakeOpenAIServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """读取一个请求并返回完整响应."""
+        try:
+            header = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in header.decode().split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            await reader.readexactly(length)
+            self.requests += 1
+
+            await asyncio.sleep(self.delay)
+            if self.status != 200:
+                body = json.dumps({"error": {"message": "server error"}}).encode()
+                writer.write(
+                    f"HTTP/1.1 {self.status} Error\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                return
+
+            completion = json.dumps(_completion(self.text)).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                + f"Content-Length: {len(completion)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + completion
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _completion(text: str) -> dict:
+    """构造一个完整的 chat.completion."""
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "fake-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+    }
+
+
+def _model(server: FakeOpenAIServer) -> OpenAIChatModel:
+    """创建连接假服务的非流式模型."""
+    return OpenAIChatModel(
+        model_name="fake-model",
+        api_key="sk-test",
+        stream=False,
+        client_kwargs={"base_url": server.base_url, "max_retries": 0},
+    )
+
+
+def _text(response) -> str:
+    """提取响应的文本."""
+    return "".join(
+        block["text"] for block in response.content if block["type"] == "text"
+    )
+
+
+_MESSAGES = [{"role": "user", "content": "东方财富的营业收入是多少？"}]
+_PRIMARY = (1, "fake-model")
+_SECONDARY = (2, "fake-model")
+
+
+async def test_failover_on_error() -> None:
+    """首选端点返回 500 时转移到备用端点，并将首选端点标记为不健康."""
+    tracker = EndpointTracker()
+    async with (
+        FakeOpenAIServer("primary", status=500) as primary,
+        FakeOpenAIServer("secondary") as secondary,
+    ):
+        model = RoutedChatModel(
+            {_PRIMARY: _model(primary), _SECONDARY: _model(secondary)},
+            RoutingPolicy(),
+            tracker=tracker,
+        )
+
+        assert _text(await model(_MESSAGES)) == "secondary"
+        assert primary.requests == 1
+        assert tracker.get_stats(_PRIMARY).failures == 1
+        assert tracker.rank([_PRIMARY, _SECONDARY]) == [_SECONDARY, _PRIMARY]
+
+
+async def test_no_failover_raises() -> None:
+    """关闭故障转移时直接抛出首选端点的错误."""
+    async with (
+        FakeOpenAIServer("primary", status=500) as primary,
+        FakeOpenAIServer("secondary") as secondary,
+    ):
+        model = RoutedChatModel(
+            {_PRIMARY: _model(primary), _SECONDARY: _model(secondary)},
+            RoutingPolicy(failover=False),
+            tracker=EndpointTracker(),
+        )
+
+        with pytest.raises(Exception):
+            await model(_MESSAGES)
+        assert secondary.requests == 0
+
+
+async def test_hedge_slow_primary() -> None:
+    """首选端点超过对冲阈值未返回时，对冲请求更快的备用端点胜出."""
+    tracker = EndpointTracker()
+    async with (
+        FakeOpenAIServer("primary", delay=2.0) as primary,
+        FakeOpenAIServer("secondary") as secondary,
+    ):
+        model = RoutedChatModel(
+            {_PRIMARY: _model(primary), _SECONDARY: _model(secondary)},
+            RoutingPolicy(hedge_after=0.1),
+            tracker=tracker,
+        )
+
+        start = time.perf_counter()
+        text = _text(await model(_MESSAGES))
+
+        assert text == "secondary"
+        assert time.perf_counter() - start < 1.0
+        assert secondary.requests == 1
+        # 落败端点记录已等待的时间，但不视为失败
+        primary_stats = tracker.get_stats(_PRIMARY)
+        assert primary_stats.ttft_ewma >= 0.1
+        assert primary_stats.failures == 0
+        assert tracker.rank([_PRIMARY, _SECONDARY]) == [_SECONDARY, _PRIMARY]
+
+
+async def test_no_hedge_when_primary_fast() -> None:
+    """首选端点在阈值内返回时不发出对冲请求."""
+    async with (
+        FakeOpenAIServer("primary") as primary,
+        FakeOpenAIServer("secondary") as secondary,
+    ):
+        model = RoutedChatModel(
+            {_PRIMARY: _model(primary), _SECONDARY: _model(secondary)},
+            RoutingPolicy(hedge_after=1.0),
+            tracker=EndpointTracker(),
+        )
+
+        assert _text(await model(_MESSAGES)) == "primary"
+        assert secondary.requests == 0
+
+
+async def test_rank_prefers_fastest_healthy_endpoint() -> None:
+    """健康端点按 EWMA 升序，无样本的端点优先，不健康端点排在最后."""
+    tracker = EndpointTracker(alpha=0.5)
+    tracker.record_success((1, "a"), 0.4)
+    tracker.record_success((2, "b"), 0.2)
+    tracker.record_success((3, "c"), 0.1)
+    tracker.record_failure((3, "c"))
+
+    assert tracker.rank([(1, "a"), (2, "b"), (3, "c"), (4, "d")]) == [
+        (4, "d"),
+        (2, "b"),
+        (1, "a"),
+        (3, "c"),
+    ]
+
+    tracker.record_latency((2, "b"), 1.0)
+    assert tracker.get_stats((2, "b")).ttft_ewma == pytest.approx(0.6)
+    assert tracker.rank([(1, "a"), (2, "b")]) == [(1, "a"), (2, "b")]
+
+
+async def test_routes_to_fastest_endpoint() -> None:
+    """记录的延迟较低的备用端点被优先调用."""
+    tracker = EndpointTracker()
+    tracker.record_success(_PRIMARY, 0.5)
+    tracker.record_success(_SECONDARY, 0.05)
+    async with (
+        FakeOpenAIServer("primary") as primary,
+        FakeOpenAIServer("secondary") as secondary,
+    ):
+        model = RoutedChatModel(
+            {_PRIMARY: _model(primary), _SECONDARY: _model(secondary)},
+            RoutingPolicy(),
+            tracker=tracker,
+        )
+
+        assert _text(await model(_MESSAGES)) == "secondary"
+        assert primary.requests == 0
+
+
+class FakeStreamModel:
+    """按固定延迟产生累加响应块的假流式模型."""
+
+    model_name = "fake-model"
+    stream = True
+
+    def __init__(self, text: str, delay: float = 0.0) -> None:
+        """初始化假模型.
+
+        Args:
+            text: 回复内容，逐字产生
+            delay: 首个响应块前的等待时间（秒）
+        """
+        self._text = text
+        self._delay = delay
+        self.closed = False
+
+    async def __call__(self, messages: list[dict], **kwargs):
+        """返回流式响应."""
+        return self._stream()
+
+    async def _stream(self):
+        try:
+            await asyncio.sleep(self._delay)
+            for i in range(1, len(self._text) + 1):
+                yield SimpleNamespace(
+                    content=[{"type": "text", "text": self._text[:i]}], usage=None
+                )
+        finally:
+            self.closed = True
+
+
+async def test_hedge_stream_keeps_first_chunk() -> None:
+    """流式对冲时胜出端点的首个响应块不丢失，落败端点的流被关闭."""
+    primary = FakeStreamModel("primary", delay=2.0)
+    secondary = FakeStreamModel("secondary")
+    model = RoutedChatModel(
+        {_PRIMARY: primary, _SECONDARY: secondary},
+        RoutingPolicy(hedge_after=0.05),
+        tracker=EndpointTracker(),
+    )
+
+    response = await model(_MESSAGES)
+    chunks = [chunk.content[0]["text"] async for chunk in response]
+
+    assert chunks[0] == "s"
+    assert chunks[-1] == "secondary"
+    assert primary.closed
+    assert secondary.closed
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""模型配置行解码测试."""
+
+import json
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from one_dragon_agent.core.model.models import ModelConfigInternal, ModelConfigResponse
+from one_dragon_agent.core.model.repository import (
+    INTERNAL_COLUMNS,
+    OAUTH_COLUMNS,
+    PUBLIC_COLUMNS,
+    ModelConfigORM,
+    decode_internal_row,
+    decode_oauth_row,
+    decode_public_row,
+    metadata,
+    model_configs_table,
+)
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+_ROW_COUNT = 10_000
+
+
+def _record(config_id: int) -> dict:
+    """创建一条包含 OAuth 字段的数据库记录."""
+    now = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    return {
+        "id": config_id,
+        "name": f"test_config_{config_id}",
+        "provider": "openai",
+        "base_url": "https://api.openai.com",
+        "api_key": "sk-secret",
+        "models": [
+            {"model_id": "gpt-4", "support_vision": True, "support_thinking": False},
+            {"model_id": "gpt-4o", "support_vision": True, "support_thinking": True},
+        ],
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+        "oauth_access_token": "access",
+        "oauth_token_type": "Bearer",
+        "oauth_refresh_token": "refresh",
+        "oauth_expires_at": 1893456000000,
+        "oauth_scope": "openid",
+        "oauth_metadata": {"resource_url": "portal.qwen.ai"},
+    }
+
+
+class TestRowDecoders:
+    """行解码函数测试."""
+
+    def test_public_row(self) -> None:
+        """测试公开视图解码，models 为 JSON 字符串时也能解析."""
+        record = _record(1)
+        record["models"] = json.dumps(record["models"])
+
+        config = decode_public_row(tuple(record[c.name] for c in PUBLIC_COLUMNS))
+
+        assert config.id == 1
+        assert config.models[1].model_id == "gpt-4o"
+
+    def test_internal_row(self) -> None:
+        """测试内部视图解码包含 api_key 和 OAuth 字段."""
+        record = _record(1)
+        record["oauth_metadata"] = "not json"
+
+        data = decode_internal_row(tuple(record[c.name] for c in INTERNAL_COLUMNS))
+        config = ModelConfigInternal(**data)
+
+        assert config.api_key == "sk-secret"
+        assert config.oauth_expires_at == 1893456000000
+        assert config.oauth_metadata is None
+
+    def test_oauth_row(self) -> None:
+        """测试 OAuth 视图解码，缺少 token 时返回 None."""
+        record = _record(1)
+
+        fields = decode_oauth_row(tuple(record[c.name] for c in OAUTH_COLUMNS))
+
+        assert fields == {
+            "access_token": "access",
+            "refresh_token": "refresh",
+            "expires_at": 1893456000000,
+            "resource_url": "portal.qwen.ai",
+        }
+        assert decode_oauth_row((None, "refresh", None, None)) is None
+
+
+@pytest.mark.benchmark
+class TestRowDecodingBenchmark:
+    """在 SQLite 上解码 1 万行配置的吞吐量."""
+
+    @pytest.fixture
+    async def engine(self):
+        """创建装有 1 万条配置的内存 SQLite 引擎."""
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(
+                model_configs_table.insert(),
+                [_record(i) for i in range(1, _ROW_COUNT + 1)],
+            )
+        yield engine
+        await engine.dispose()
+
+    async def test_public_view(self, engine) -> None:
+        """对比投影查询 + 按位置解码与 SELECT * + 字典转换的吞吐量，结果应一致."""
+        async with engine.connect() as conn:
+            full_rows = (await conn.execute(select(model_configs_table))).fetchall()
+            public_rows = (await conn.execute(select(*PUBLIC_COLUMNS))).fetchall()
+
+        start = time.perf_counter()
+        via_dict = [
+            ModelConfigResponse(**ModelConfigORM.dict_to_orm(dict(row._mapping)))
+            for row in full_rows
+        ]
+        dict_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = [decode_public_row(row) for row in public_rows]
+        decode_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"解码 {_ROW_COUNT} 行公开视图: 字典转换 {_ROW_COUNT / dict_seconds:,.0f} 行/秒, "
+            f"按位置解码 {_ROW_COUNT / decode_seconds:,.0f} 行/秒"
+        )
+
+        assert decoded == via_dict
+
+    async def test_internal_view(self, engine) -> None:
+        """测试内部视图解码吞吐量."""
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(*INTERNAL_COLUMNS))).fetchall()
+
+        start = time.perf_counter()
+        decoded = [ModelConfigInternal(**decode_internal_row(row)) for row in rows]
+        seconds = time.perf_counter() - start
+
+        logger.info(f"解码 {_ROW_COUNT} 行内部视图: {_ROW_COUNT / seconds:,.0f} 行/秒")
+
+        assert len(decoded) == _ROW_COUNT
+        assert decoded[0].oauth_metadata == {"resource_url": "portal.qwen.ai"}
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""模型用量统计测试.
+
+使用假的内部模型验证 InstrumentedChatModel 对流式/非流式调用的计量，
+以及 ModelUsageRecorder 的聚合和 /api/models/usage 接口。
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import AsyncGenerator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from one_dragon_agent.core.model.limiter import ModelCallLimiter
+from one_dragon_agent.core.model.usage import (
+    InstrumentedChatModel,
+    ModelUsageRecorder,
+    get_model_usage_recorder,
+)
+from one_dragon_agent.core.model.usage_router import router
+
+_MESSAGES = [
+    {"role": "system", "content": "你是股票分析助手。"},
+    {"role": "user", "content": "东方财富的营业收入是多少？"},
+]
+
+
+class FailingModel:
+    """调用总是失败的假模型."""
+
+    model_name = "fake-model"
+    stream = False
+
+    async def __call__(self, *args, **kwargs):
+        """模拟限流错误."""
+        raise RuntimeError("rate limited")
+
+
+class FakeModel:
+    """返回固定内容的假模型."""
+
+    def __init__(self, stream: bool, with_usage: bool = True, delay: float = 0.0) -> None:
+        """初始化假模型.
+
+        Args:
+            stream: 是否流式返回
+            with_usage: 是否在响应中带 usage
+            delay: 首个响应块前的等待时间（秒）
+        """
+        self.model_name = "fake-model"
+        self.stream = stream
+        self._with_usage = with_usage
+        self._delay = delay
+
+    def _response(self, text: str) -> SimpleNamespace:
+        """创建与 ChatResponse 字段一致的响应."""
+        usage = (
+            SimpleNamespace(input_tokens=100, output_tokens=20)
+            if self._with_usage
+            else None
+        )
+        return SimpleNamespace(content=[{"type": "text", "text": text}], usage=usage)
+
+    async def __call__(self, messages: list[dict], tools=None, **kwargs):
+        """模拟一次模型调用."""
+        await asyncio.sleep(self._delay)
+        if not self.stream:
+            return self._response("营业收入为 100 亿元")
+        return self._stream()
+
+    async def _stream(self) -> AsyncGenerator[SimpleNamespace, None]:
+        """模拟累加式流式输出."""
+        text = ""
+        for part in ["营业收入", "为 100 亿元"]:
+            text += part
+            yield self._response(text)
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def recorder() -> ModelUsageRecorder:
+    """创建独立的用量记录器."""
+    return ModelUsageRecorder()
+
+
+class TestInstrumentedChatModel:
+    """InstrumentedChatModel 测试."""
+
+    async def test_non_stream_call(self, recorder: ModelUsageRecorder) -> None:
+        """测试非流式调用记录模型返回的 usage."""
+        model = InstrumentedChatModel(
+            FakeModel(stream=False), "test_session", 1, "fake-model", recorder
+        )
+
+        response = await model(_MESSAGES)
+
+        stats = recorder.get_session_stats("test_session")
+        assert response.content[0]["text"] == "营业收入为 100 亿元"
+        assert stats.calls == 1
+        assert stats.prompt_tokens == 100
+        assert stats.completion_tokens == 20
+        assert model.model_name == "fake-model"
+        assert model.stream is False
+
+    async def test_stream_call_measures_ttft(self, recorder: ModelUsageRecorder) -> None:
+        """测试流式调用在消费完毕后记录，首 token 时间小于总耗时."""
+        model = InstrumentedChatModel(
+            FakeModel(stream=True, delay=0.02), "test_session", 1, "fake-model", recorder
+        )
+
+        chunks = [chunk async for chunk in await model(_MESSAGES)]
+
+        stats = recorder.get_session_stats("test_session")
+        assert len(chunks) == 2
+        assert stats.calls == 1
+        assert 0.02 <= stats.ttft_seconds < stats.latency_seconds
+
+    async def test_estimates_without_usage(self, recorder: ModelUsageRecorder) -> None:
+        """测试模型未返回 usage 时估算 token."""
+        model = InstrumentedChatModel(
+            FakeModel(stream=False, with_usage=False), "test_session", 1, "fake-model", recorder
+        )
+
+        await model(_MESSAGES)
+
+        stats = recorder.get_session_stats("test_session")
+        assert stats.prompt_tokens > 0
+        assert stats.completion_tokens > 0
+
+    async def test_error_recorded(self, recorder: ModelUsageRecorder) -> None:
+        """测试调用失败时记录错误并抛出原异常."""
+        model = InstrumentedChatModel(
+            FailingModel(), "test_session", 1, "fake-model", recorder
+        )
+
+        with pytest.raises(RuntimeError):
+            await model(_MESSAGES)
+
+        assert recorder.get_session_stats("test_session").errors == 1
+
+    async def test_closed_stream_not_recorded(self, recorder: ModelUsageRecorder) -> None:
+        """测试提前关闭的流（如落败的对冲）不计入用量，也不按成功调整并发上限."""
+        limiter = ModelCallLimiter(1, max_in_flight=4, tokens_per_minute=0)
+        limiter.limit = 2.0
+        model = InstrumentedChatModel(
+            FakeModel(stream=True, delay=0.02),
+            "test_session",
+            1,
+            "fake-model",
+            recorder,
+            limiter=limiter,
+        )
+
+        stream = await model(_MESSAGES)
+        await anext(stream)
+        await stream.aclose()
+
+        assert recorder.get_session_stats("test_session") is None
+        assert limiter.in_flight == 0
+        assert limiter.limit == 2.0
+
+
+class TestModelUsageRecorder:
+    """ModelUsageRecorder 测试."""
+
+    def test_iterations_per_turn(self, recorder: ModelUsageRecorder) -> None:
+        """测试按轮次统计迭代次数，并同时按会话和配置聚合."""
+        for calls in (3, 5):
+            recorder.begin_turn("test_session")
+            for _ in range(calls):
+                recorder.record("test_session", 1, "gpt-4", 10, 2, 0.1, 0.5)
+
+        session_stats = recorder.get_session_stats("test_session")
+        config_stats = recorder.get_all_config_stats()[(1, "gpt-4")]
+
+        assert session_stats.turns == 2
+        assert session_stats.max_iterations == 5
+        assert session_stats.prompt_tokens == 80
+        assert config_stats.calls == 8
+
+    def test_bounded_sessions(self) -> None:
+        """测试只保留最近活跃的会话，按配置的用量不受影响."""
+        recorder = ModelUsageRecorder(max_sessions=2)
+        for session_id in ("s1", "s2", "s1", "s3"):
+            recorder.begin_turn(session_id)
+            recorder.record(session_id, 1, "gpt-4", 10, 2, 0.1, 0.5)
+
+        assert set(recorder.get_all_session_stats()) == {"s1", "s3"}
+        assert list(recorder._turn_iterations) == ["s1", "s3"]
+        assert recorder.get_all_config_stats()[(1, "gpt-4")].calls == 4
+
+
+class TestModelUsageApi:
+    """/api/models/usage 接口测试."""
+
+    @pytest.fixture
+    def client(self):
+        """创建测试客户端，测试后清空全局记录."""
+        app = FastAPI()
+        app.include_router(router)
+        yield TestClient(app)
+        get_model_usage_recorder().clear()
+
+    def test_get_usage(self, client: TestClient) -> None:
+        """测试获取全部用量统计."""
+        recorder = get_model_usage_recorder()
+        recorder.begin_turn("test_session")
+        recorder.record("test_session", 1, "gpt-4", 100, 20, 0.2, 1.0)
+        recorder.record("test_session", 1, "gpt-4", 300, 40, 0.4, 3.0)
+
+        response = client.get("/api/models/usage")
+
+        assert response.status_code == 200
+        data = response.json()
+        session = data["sessions"]["test_session"]
+        assert session["calls"] == 2
+        assert session["avg_latency_ms"] == pytest.approx(2000)
+        assert session["avg_iterations"] == 2
+        assert data["configs"][0]["config_id"] == 1
+        assert data["configs"][0]["prompt_tokens"] == 400
+
+    def test_unknown_session_404(self, client: TestClient) -> None:
+        """测试没有调用记录的会话返回 404."""
+        response = client.get("/api/models/usage/sessions/test_session_missing")
+
+        assert response.status_code == 404
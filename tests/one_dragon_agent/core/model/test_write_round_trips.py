@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""模型配置写操作的 SQL 语句数基准测试.
+
+在 SQLite 上统计每次 API 调用执行的 SQL 语句数、事务提交次数和耗时。
+"""
+
+import time
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from one_dragon_agent.core.model.models import (
+    ModelConfigCreate,
+    ModelConfigUpdate,
+    ModelInfo,
+)
+from one_dragon_agent.core.model.qwen.token_encryption import reset_token_encryption
+from one_dragon_agent.core.model.repository import metadata
+from one_dragon_agent.core.model.service import ModelConfigService
+from one_dragon_agent.core.system.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class StatementCounter:
+    """统计引擎执行的 SQL 语句和提交次数."""
+
+    def __init__(self) -> None:
+        """初始化计数器."""
+        self.statements: list[str] = []
+        self.commits = 0
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        """记录一条 SQL 语句."""
+        self.statements.append(statement.split(None, 1)[0].upper())
+
+    def on_commit(self, conn) -> None:
+        """记录一次提交."""
+        self.commits += 1
+
+    def reset(self) -> None:
+        """清空计数."""
+        self.statements.clear()
+        self.commits = 0
+
+
+@pytest.fixture
+async def counted_session():
+    """创建内存 SQLite 会话及其 SQL 语句计数器."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter.on_execute)
+    event.listen(engine.sync_engine, "commit", counter.on_commit)
+
+    async with async_sessionmaker(engine)() as session:
+        yield session, counter
+    await engine.dispose()
+
+
+def _create_request(name: str, provider: str = "openai") -> ModelConfigCreate:
+    """创建配置请求."""
+    if provider == "qwen":
+        return ModelConfigCreate(
+            name=name,
+            provider="qwen",
+            base_url="",
+            api_key="",
+            models=[ModelInfo(model_id="qwen-max")],
+            oauth_token={
+                "access_token": "access",
+                "refresh_token": "refresh",
+                "expires_at": 1893456000000,
+                "resource_url": "portal.qwen.ai",
+            },
+        )
+    return ModelConfigCreate(
+        name=name,
+        provider="openai",
+        base_url="https://api.openai.com",
+        api_key="sk-test",
+        models=[ModelInfo(model_id="gpt-4")],
+    )
+
+
+@pytest.mark.benchmark
+class TestWriteRoundTrips:
+    """创建、更新配置的 SQL 语句数测试."""
+
+    async def _measure(self, counter: StatementCounter, label: str, call) -> object:
+        """执行一次调用并记录语句数和耗时."""
+        counter.reset()
+        start = time.perf_counter()
+        try:
+            return await call
+        finally:
+            logger.info(
+                f"{label}: {len(counter.statements)} 条语句 {counter.statements}, "
+                f"{counter.commits} 次提交, {(time.perf_counter() - start) * 1000:.2f} ms"
+            )
+
+    async def test_create(self, counted_session: tuple[AsyncSession, StatementCounter]) -> None:
+        """测试创建配置只执行一条 INSERT，响应与数据库记录一致."""
+        session, counter = counted_session
+        service = ModelConfigService(session)
+
+        created = await self._measure(
+            counter, "创建 OpenAI 配置", service.create_model_config(_create_request("test_openai"))
+        )
+
+        assert counter.statements == ["INSERT"]
+        assert counter.commits == 1
+        assert created == await service.get_model_config(created.id)
+
+    async def test_create_qwen_with_token(
+        self,
+        counted_session: tuple[AsyncSession, StatementCounter],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """测试 Qwen 配置与 OAuth token 在同一条 INSERT 中写入."""
+        monkeypatch.setenv("TOKEN_ENCRYPTION_KEY", Fernet.generate_key().decode())
+        reset_token_encryption()
+        session, counter = counted_session
+        service = ModelConfigService(session)
+
+        created = await self._measure(
+            counter, "创建 Qwen 配置", service.create_model_config(_create_request("test_qwen", "qwen"))
+        )
+
+        assert counter.statements == ["INSERT"]
+        assert counter.commits == 1
+        internal = await service.get_model_config_internal(created.id)
+        assert internal.oauth_access_token is not None
+        assert internal.oauth_expires_at == 1893456000000
+        reset_token_encryption()
+
+    async def test_update(self, counted_session: tuple[AsyncSession, StatementCounter]) -> None:
+        """测试更新配置在一个事务内执行 UPDATE 和一次读取."""
+        session, counter = counted_session
+        service = ModelConfigService(session)
+        created = await service.create_model_config(_create_request("test_update"))
+
+        updated = await self._measure(
+            counter,
+            "更新配置",
+            service.update_model_config(
+                created.id,
+                ModelConfigUpdate(name="test_update_renamed", updated_at=created.updated_at),
+            ),
+        )
+
+        assert counter.statements == ["UPDATE", "SELECT"]
+        assert counter.commits == 1
+        assert updated.name == "test_update_renamed"
+        assert updated.created_at == created.created_at
+
+    async def test_update_conflict(
+        self, counted_session: tuple[AsyncSession, StatementCounter]
+    ) -> None:
+        """测试乐观锁冲突和记录不存在不需要额外查询即可区分."""
+        session, counter = counted_session
+        service = ModelConfigService(session)
+        created = await service.create_model_config(_create_request("test_conflict"))
+        stale = ModelConfigUpdate(name="test_conflict_renamed", updated_at=created.created_at.replace(year=2000))
+
+        with pytest.raises(ValueError, match="已被其他用户修改"):
+            await self._measure(counter, "乐观锁冲突", service.update_model_config(created.id, stale))
+        assert counter.statements == ["UPDATE", "SELECT"]
+
+        with pytest.raises(ValueError, match="不存在"):
+            await self._measure(counter, "更新不存在的配置", service.update_model_config(created.id + 1, stale))
+        assert counter.statements == ["UPDATE", "SELECT"]
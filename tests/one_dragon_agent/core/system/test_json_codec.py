@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""JSON 编解码模块单元测试."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from one_dragon_agent.core.model.models import ModelInfo
+from one_dragon_agent.core.system.json_codec import (
+    JsonBackend,
+    JsonCodec,
+    JsonDecodeError,
+    dumps_compact,
+    get_json_codec,
+    set_json_codec,
+)
+
+
+def _available_backends() -> list[JsonBackend]:
+    """获取当前环境已安装的后端.
+
+    Returns:
+        可用后端列表
+    """
+    backends = [JsonBackend.STDLIB]
+    for backend in (JsonBackend.ORJSON, JsonBackend.MSGSPEC):
+        try:
+            JsonCodec(backend)
+            backends.append(backend)
+        except ValueError:
+            pass
+    return backends
+
+
+@pytest.fixture
+def tool_payload() -> list[dict]:
+    """创建典型的 tushare 工具返回数据.
+
+    Returns:
+        记录列表
+    """
+    return [
+        {"ts_code": "000001.SZ", "股票名称": "平安银行", "营业收入": 123456789.0, "基本每股收益": 0.5},
+        {"ts_code": "300059.SZ", "股票名称": "东方财富", "营业收入": 987654321.25, "基本每股收益": None},
+    ]
+
+
+@pytest.fixture
+def reset_codec():
+    """测试后恢复默认编解码器."""
+    yield
+    set_json_codec(None)
+
+
+class TestJsonCodec:
+    """JsonCodec 测试."""
+
+    @pytest.mark.parametrize("backend", _available_backends())
+    def test_dumps_matches_stdlib(self, backend: JsonBackend, tool_payload: list[dict]) -> None:
+        """测试所有后端输出与标准库紧凑格式字节一致.
+
+        Given: 包含中文、整数、浮点数和 None 的工具数据
+        When: 使用各个后端序列化
+        Then: 输出与 json.dumps(ensure_ascii=False, separators=(",", ":")) 一致
+        """
+        expected = json.dumps(tool_payload, ensure_ascii=False, separators=(",", ":"))
+
+        codec = JsonCodec(backend)
+
+        assert codec.dumps(tool_payload) == expected
+        assert codec.dumpb(tool_payload) == expected.encode("utf-8")
+        assert codec.loads(codec.dumpb(tool_payload)) == tool_payload
+
+    @pytest.mark.parametrize("backend", _available_backends())
+    def test_dumps_fallback_types(self, backend: JsonBackend) -> None:
+        """测试后端原生不支持的类型通过 default 处理.
+
+        Given: 包含 Pydantic 模型和 datetime 的对象
+        When: 序列化
+        Then: Pydantic 模型转为 dict，datetime 转为 ISO 字符串
+        """
+        codec = JsonCodec(backend)
+        obj = {
+            "model": ModelInfo(model_id="gpt-4"),
+            "at": datetime(2026, 1, 2, 3, 4, 5),
+        }
+
+        result = codec.loads(codec.dumps(obj))
+
+        assert result["model"] == {
+            "model_id": "gpt-4",
+            "support_vision": False,
+            "support_thinking": False,
+        }
+        assert result["at"] == "2026-01-02T03:04:05"
+
+    @pytest.mark.parametrize("backend", _available_backends())
+    def test_loads_invalid_raises_codec_error(self, backend: JsonBackend) -> None:
+        """测试所有后端的解码失败都抛出统一的 JsonDecodeError.
+
+        Given: 不完整的 JSON 数据
+        When: 使用各个后端反序列化
+        Then: 抛出 JsonDecodeError，且它是 ValueError 的子类
+        """
+        codec = JsonCodec(backend)
+
+        with pytest.raises(JsonDecodeError):
+            codec.loads(b'{"analyse_id": ')
+        with pytest.raises(ValueError):
+            codec.loads("not json")
+
+    def test_unknown_backend_raises(self) -> None:
+        """测试指定不存在的后端抛出异常."""
+        with pytest.raises(ValueError):
+            JsonCodec("not-a-backend")
+
+    def test_env_selects_backend(self, monkeypatch, reset_codec) -> None:
+        """测试通过环境变量 JSON_BACKEND 指定后端."""
+        monkeypatch.setenv("JSON_BACKEND", "stdlib")
+        set_json_codec(None)
+
+        assert get_json_codec().backend == JsonBackend.STDLIB
+        assert dumps_compact({"a": "中"}) == '{"a":"中"}'
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""指标模块单元测试."""
+
+import tracemalloc
+
+import pytest
+
+from one_dragon_agent.core.system.metrics import Histogram, MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry 测试."""
+
+    def test_render_counter_and_gauge(self) -> None:
+        """测试计数器和仪表按 Prometheus 文本格式输出."""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "测试计数", ("outcome",))
+        counter.labels("ok").inc()
+        counter.labels("ok").inc(2)
+        registry.gauge("test_running", "测试仪表").labels().set(3)
+
+        text = registry.render()
+
+        assert "# TYPE test_total counter" in text
+        assert 'test_total{outcome="ok"} 3' in text
+        assert "test_running 3" in text
+
+    def test_render_histogram_cumulative(self) -> None:
+        """测试直方图按累计桶输出，边界值落入对应的 le 桶."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "test_seconds", "测试耗时", ("route",), buckets=(0.1, 1.0)
+        ).labels("/chat/stream")
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'test_seconds_bucket{route="/chat/stream",le="0.1"} 2' in text
+        assert 'test_seconds_bucket{route="/chat/stream",le="1"} 3' in text
+        assert 'test_seconds_bucket{route="/chat/stream",le="+Inf"} 4' in text
+        assert 'test_seconds_count{route="/chat/stream"} 4' in text
+        assert 'test_seconds_sum{route="/chat/stream"} 5.65' in text
+
+    def test_same_family_returned(self) -> None:
+        """测试重复注册返回同一指标，类型不同时报错."""
+        registry = MetricsRegistry()
+        family = registry.gauge("test_gauge", "测试")
+
+        assert registry.gauge("test_gauge", "测试") is family
+        with pytest.raises(ValueError):
+            registry.counter("test_gauge", "测试")
+
+    def test_collect_hook_errors_ignored(self) -> None:
+        """测试采集钩子出错不影响其他指标输出."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("test_sessions", "测试").labels()
+
+        def _broken() -> None:
+            raise RuntimeError("db down")
+
+        registry.add_collect_hook(_broken)
+        registry.add_collect_hook(lambda: gauge.set(7))
+
+        assert "test_sessions 7" in registry.render()
+
+    def test_observe_does_not_allocate(self) -> None:
+        """测试直方图记录不产生持续的内存分配."""
+        histogram = Histogram((0.1, 1.0, 10.0))
+        histogram.observe(0.5)
+
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(10000):
+            histogram.observe(0.5)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert after - before < 1024
+        assert histogram.count == 10001
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""tushare_sql_query 工具测试."""
+
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from oda_data import FinancialDataReader, close_reader
+from oda_data import reader as reader_module
+from one_dragon_alpha.agent.tushare.tools.sql import tushare_sql_query
+from tushare_mcp_server.store import FinancialDataStore
+
+
+@pytest.fixture
+def local_reader(tmp_path, monkeypatch):
+    """导出包含若干利润表的快照，作为全局读取器."""
+    store = FinancialDataStore(":memory:")
+    store.upsert_income(
+        pd.DataFrame(
+            [
+                {
+                    "ts_code": f"60000{i}.SH",
+                    "ann_date": "20250125",
+                    "end_date": "20241231",
+                    "report_type": "2",
+                    "update_flag": "1",
+                    "n_income_attr_p": float(i * 100),
+                }
+                for i in range(5)
+            ]
+        ),
+        "20250125",
+    )
+    store.export_parquet(tmp_path)
+    store.close()
+    reader = FinancialDataReader(tmp_path)
+    monkeypatch.setattr(reader_module, "_reader", reader)
+    yield reader
+    close_reader()
+
+
+def _text(response) -> str:
+    return response.content[0]["text"]
+
+
+async def test_query_returns_compact_rows(local_reader) -> None:
+    """返回列名和数据行，超过行数上限时标记截断."""
+    response = await tushare_sql_query(
+        "SELECT ts_code, n_income_attr_p FROM income "
+        "WHERE end_date = '20241231' ORDER BY n_income_attr_p DESC LIMIT 2"
+    )
+    assert json.loads(_text(response)) == {
+        "columns": ["ts_code", "n_income_attr_p"],
+        "rows": [["600004.SH", 400.0], ["600003.SH", 300.0]],
+        "truncated": False,
+    }
+
+    columns, rows, truncated = local_reader.query("SELECT * FROM range(10)", max_rows=3)
+    assert columns == ["range"]
+    assert len(rows) == 3
+    assert truncated
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "DELETE FROM income",
+        "SELECT 1; DROP TABLE income",
+        "COPY income TO 'income.csv'",
+        "SET enable_external_access = true",
+        "SELECT * FROM read_csv('/etc/hostname')",
+        "CREATE OR REPLACE VIEW income AS SELECT 1",
+    ],
+)
+async def test_rejects_writes_and_file_access(local_reader, sql: str) -> None:
+    """拒绝写入、多条语句和文件访问，并以错误信息返回给模型."""
+    response = await tushare_sql_query(sql)
+
+    assert _text(response).startswith("<error>")
+    assert local_reader.query("SELECT count(*) FROM income")[1] == [(5,)]
+
+
+async def test_query_timeout(local_reader) -> None:
+    """超时的查询被中断."""
+    with pytest.raises(TimeoutError):
+        local_reader.query("SELECT count(*) FROM range(10000000000) a", timeout=0.2)
+
+
+async def test_store_not_synced(monkeypatch) -> None:
+    """快照不存在时提示使用其他工具."""
+    monkeypatch.setattr(reader_module, "_reader", None)
+    monkeypatch.setenv("TUSHARE_PARQUET_DIR", "/nonexistent/parquet")
+
+    assert "尚未同步" in _text(await tushare_sql_query("SELECT 1"))
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""分析 Agent 缓存测试.
+
+验证超过容量时淘汰空闲的 Agent 并保存记忆、再次使用时恢复记忆、
+使用中的 Agent 不被淘汰，以及 50 个分析的会话的内存占用。
+"""
+
+import asyncio
+import gc
+import tracemalloc
+
+import pytest
+from agentscope.agent import ReActAgent
+from agentscope.formatter import OpenAIChatFormatter
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+from agentscope.model import OpenAIChatModel
+from agentscope.tool import (
+    Toolkit,
+    insert_text_file,
+    view_text_file,
+    write_text_file,
+)
+
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_alpha.chat.analyse_agent_cache import AnalyseAgentCache
+from one_dragon_alpha.tool.code import execute_python_code_by_path
+
+logger = get_logger(__name__)
+
+_MODEL = OpenAIChatModel(
+    model_name="placeholder",
+    api_key="placeholder",
+    client_args={"base_url": "https://placeholder.com"},
+)
+
+
+class AgentFactory:
+    """创建与会话中相同结构的分析 Agent，并记录创建次数."""
+
+    def __init__(self) -> None:
+        """初始化工厂."""
+        self.created: list[int] = []
+
+    async def __call__(self, analyse_id: int) -> ReActAgent:
+        """创建分析 Agent."""
+        self.created.append(analyse_id)
+        await asyncio.sleep(0)
+        toolkit = Toolkit()
+        toolkit.register_tool_function(view_text_file)
+        toolkit.register_tool_function(write_text_file)
+        toolkit.register_tool_function(insert_text_file)
+        toolkit.register_tool_function(execute_python_code_by_path)
+        return ReActAgent(
+            name=f"OdaAnalyseByCode{analyse_id}",
+            sys_prompt="analyse",
+            model=_MODEL,
+            memory=InMemoryMemory(),
+            formatter=OpenAIChatFormatter(),
+            toolkit=toolkit,
+        )
+
+
+def _cache(tmp_path, max_agents: int) -> tuple[AnalyseAgentCache, AgentFactory]:
+    """创建记忆文件保存在临时目录的缓存."""
+    factory = AgentFactory()
+    cache = AnalyseAgentCache(
+        factory,
+        lambda analyse_id: str(tmp_path / f"{analyse_id}.json"),
+        max_agents=max_agents,
+    )
+    return cache, factory
+
+
+async def _iterate(agent: ReActAgent, analyse_id: int, rounds: int = 1) -> None:
+    """模拟一次分析：写代码、执行并查看输出."""
+    for i in range(rounds):
+        await agent.memory.add(
+            [
+                Msg("user", f"分析 {analyse_id} 第 {i} 轮", "user"),
+                Msg("assistant", "import oda_data\n" + "x = 1\n" * 600, "assistant"),
+                Msg("system", "stdout " * 1200, "system"),
+            ]
+        )
+
+
+async def test_evicted_agent_rehydrates_memory(tmp_path) -> None:
+    """超过容量时淘汰最久未用的 Agent，再次获取时恢复记忆."""
+    cache, factory = _cache(tmp_path, max_agents=2)
+    for analyse_id in (1, 2):
+        await _iterate(await cache.get(analyse_id), analyse_id)
+    await cache.get(1)
+
+    await cache.get(3)
+
+    assert 2 not in cache and 1 in cache and 3 in cache
+    assert (tmp_path / "2.json").exists()
+
+    agent = await cache.get(2)
+
+    memory = await agent.memory.get_memory()
+    assert memory[0].content == "分析 2 第 0 轮"
+    assert len(memory) == 3
+    assert factory.created == [1, 2, 3, 2]
+    assert 1 not in cache
+
+
+async def test_agent_in_use_not_evicted(tmp_path) -> None:
+    """使用中的 Agent 不被淘汰，使用结束后再按容量淘汰."""
+    cache, _ = _cache(tmp_path, max_agents=1)
+
+    async with cache.use(1) as agent:
+        await cache.get(2)
+        assert 1 in cache and 2 not in cache
+        await _iterate(agent, 1)
+
+    async with cache.use(3):
+        pass
+
+    assert len(cache) == 1 and 3 in cache
+    assert len(await (await cache.get(1)).memory.get_memory()) == 3
+
+
+async def test_concurrent_get_creates_once(tmp_path) -> None:
+    """并发获取同一个分析 ID 只创建一次 Agent."""
+    cache, factory = _cache(tmp_path, max_agents=2)
+
+    agents = await asyncio.gather(*(cache.get(1) for _ in range(5)))
+
+    assert all(agent is agents[0] for agent in agents)
+    assert factory.created == [1]
+
+
+async def test_clear_keeps_memory(tmp_path) -> None:
+    """清空缓存（切换模型）后重建的 Agent 保留原有记忆，运行中的记忆在结束后保存."""
+    cache, _ = _cache(tmp_path, max_agents=4)
+    await _iterate(await cache.get(1), 1)
+
+    async with cache.use(2) as agent:
+        await cache.clear()
+        await _iterate(agent, 2)
+
+    assert len(cache) == 0
+    assert len(await (await cache.get(1)).memory.get_memory()) == 3
+    assert len(await (await cache.get(2)).memory.get_memory()) == 3
+
+
+async def test_corrupt_memory_file_starts_empty(tmp_path) -> None:
+    """记忆文件损坏时以空记忆重建."""
+    cache, _ = _cache(tmp_path, max_agents=1)
+    (tmp_path / "1.json").write_text("{", encoding="utf-8")
+
+    agent = await cache.get(1)
+
+    assert await agent.memory.get_memory() == []
+
+
+async def _session_memory(tmp_path, max_agents: int) -> int:
+    """50 个分析、每个 5 轮迭代后仍被引用的内存字节数."""
+    gc.collect()
+    tracemalloc.start()
+    cache, _ = _cache(tmp_path, max_agents=max_agents)
+    for analyse_id in range(1, 51):
+        async with cache.use(analyse_id) as agent:
+            await _iterate(agent, analyse_id, rounds=5)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(cache) == min(max_agents, 50)
+    return current
+
+
+@pytest.mark.benchmark
+async def test_session_memory_benchmark(tmp_path) -> None:
+    """50 个分析的会话，不淘汰与保留 4 个 Agent 的内存占用."""
+    unbounded = await _session_memory(tmp_path / "unbounded", max_agents=50)
+    (tmp_path / "bounded").mkdir()
+    bounded = await _session_memory(tmp_path / "bounded", max_agents=4)
+
+    logger.info(
+        f"50 个分析的会话内存: 不淘汰 {unbounded / 2**20:.1f}MB, "
+        f"保留 4 个 {bounded / 2**20:.1f}MB"
+    )
+    assert bounded < unbounded / 4
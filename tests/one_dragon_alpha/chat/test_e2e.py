@@ -7,6 +7,7 @@
 
 import os
 from typing import AsyncGenerator
+from unittest.mock import Mock
 
 import pytest
 import pytest_asyncio
@@ -19,6 +20,7 @@ from one_dragon_agent.core.model.models import (
 from one_dragon_agent.core.model.service import ModelConfigService
 from one_dragon_agent.core.system.log import get_logger
 from one_dragon_alpha.chat.chat_session import ChatSession
+from agentscope.agent import ReActAgent
 from agentscope.memory import InMemoryMemory
 
 logger = get_logger(__name__)
@@ -414,7 +416,7 @@ async def test_switch_model_clears_analyse_cache(test_configs):
         memory=memory,
     )
 
-    # 第一次聊天请求（会初始化 _analyse_by_code_map）
+    # 第一次聊天请求
     async for message in session.chat(
         user_input="你好",
         model_config_id=config1.id,
@@ -425,8 +427,10 @@ async def test_switch_model_clears_analyse_cache(test_configs):
             break
 
     # 模拟创建一个分析 Agent
-    session._analyse_by_code_map[1] = "fake_analyse_agent"
-    logger.info(f"分析 Agent 缓存: {session._analyse_by_code_map}")
+    fake_analyse_agent = Mock(spec=ReActAgent)
+    fake_analyse_agent.memory = InMemoryMemory()
+    session._analyse_agents._agents[1] = fake_analyse_agent
+    assert 1 in session._analyse_agents
 
     # 切换到不同配置
     async for message in session.chat(
@@ -439,6 +443,6 @@ async def test_switch_model_clears_analyse_cache(test_configs):
             break
 
     # 验证分析 Agent 缓存被清空
-    assert len(session._analyse_by_code_map) == 0, "切换模型时应清空分析 Agent 缓存"
+    assert len(session._analyse_agents) == 0, "切换模型时应清空分析 Agent 缓存"
 
     logger.info("测试通过: 分析 Agent 缓存已清空")
@@ -15,7 +15,10 @@ from agentscope.memory import InMemoryMemory
 from agentscope.model import OpenAIChatModel
 
 from one_dragon_agent.core.model.models import ModelConfigInternal, ModelInfo
+from one_dragon_agent.core.model.routing import RoutedChatModel, RoutingPolicy
+from one_dragon_agent.core.model.usage import InstrumentedChatModel
 from one_dragon_alpha.chat.chat_session import ChatSession
+from one_dragon_alpha.session.session import Session
 
 
 # ============================================================================
@@ -169,7 +172,7 @@ async def test_analyse_agent_uses_same_config_and_model(tushare_session, mock_co
     main_agent_model = tushare_session.agent.model
 
     # 创建一个真实的分析 Agent（不是 Mock）
-    analyse_agent = await tushare_session._get_analyse_by_code_agent(1)
+    analyse_agent = await tushare_session._analyse_agents.get(1)
 
     # 验证分析 Agent 使用与主 Agent 相同的模型
     assert analyse_agent.model == main_agent_model
@@ -178,6 +181,12 @@ async def test_analyse_agent_uses_same_config_and_model(tushare_session, mock_co
     os.environ.pop("TUSHARE_API_TOKEN", None)
 
 
+async def _empty_chat(self, user_input):
+    """不调用模型的 Session.chat."""
+    return
+    yield
+
+
 @pytest.mark.asyncio
 @pytest.mark.timeout(10)
 async def test_switching_model_clears_analyse_agent_cache(tushare_session, mock_config):
@@ -187,11 +196,71 @@ async def test_switching_model_clears_analyse_agent_cache(tushare_session, mock_
 
     # 手动添加一个分析 Agent 到缓存
     mock_analyse_agent = Mock(spec=ReActAgent)
-    tushare_session._analyse_by_code_map[1] = mock_analyse_agent
-    assert 1 in tushare_session._analyse_by_code_map
+    mock_analyse_agent.memory = InMemoryMemory()
+    tushare_session._analyse_agents._agents[1] = mock_analyse_agent
+    assert 1 in tushare_session._analyse_agents
 
-    # 切换到不同的模型
-    tushare_session.set_model(mock_config, "gpt-4-turbo")
+    # 切换到不同的模型，聊天开始前清空缓存
+    with patch.object(Session, "chat", _empty_chat):
+        async for _ in tushare_session.chat("你好", mock_config.id, "gpt-4-turbo", mock_config):
+            pass
 
     # 验证分析 Agent 缓存被清空
-    assert len(tushare_session._analyse_by_code_map) == 0
+    assert len(tushare_session._analyse_agents) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_set_model_wraps_instrumented_model(tushare_session, mock_config):
+    """测试设置模型后主 Agent 使用记录用量的模型包装."""
+    tushare_session.set_model(mock_config, "gpt-4")
+
+    model = tushare_session.agent.model
+
+    assert isinstance(model, InstrumentedChatModel)
+    assert isinstance(model.model, OpenAIChatModel)
+    assert model.session_id == "test_session_001"
+    assert model.config_id == 1
+    assert model.model_id == "gpt-4"
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_sessions_share_model_instance(tushare_session, mock_config):
+    """测试不同会话选择同一模型时共享内部模型实例."""
+    other_session = ChatSession(session_id="test_session_002", memory=InMemoryMemory())
+
+    tushare_session.set_model(mock_config, "gpt-4")
+    other_session.set_model(mock_config, "gpt-4")
+
+    first = tushare_session.agent.model
+    second = other_session.agent.model
+    assert first is not second
+    assert first.model is second.model
+    assert second.session_id == "test_session_002"
+
+
+async def test_set_model_with_fallbacks(tushare_session, mock_config):
+    """测试带备用端点时使用路由模型，路由参数不变时复用 Agent."""
+    policy = RoutingPolicy(fallbacks=[(mock_config, "gpt-4-turbo")], hedge_after=1.0)
+
+    tushare_session.set_model(mock_config, "gpt-4", policy)
+    agent = tushare_session.agent
+    assert isinstance(agent.model, RoutedChatModel)
+    assert list(agent.model.endpoints) == [(1, "gpt-4"), (1, "gpt-4-turbo")]
+    assert all(
+        isinstance(model, InstrumentedChatModel)
+        for model in agent.model.endpoints.values()
+    )
+
+    tushare_session.set_model(
+        mock_config,
+        "gpt-4",
+        RoutingPolicy(fallbacks=[(mock_config, "gpt-4-turbo")], hedge_after=1.0),
+    )
+    assert tushare_session.agent is agent
+
+    # 去掉备用端点后恢复为单个模型
+    tushare_session.set_model(mock_config, "gpt-4")
+    assert tushare_session.agent is not agent
+    assert isinstance(tushare_session.agent.model, InstrumentedChatModel)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""分析工作目录管理测试.
+
+验证配额统计、已不存在的会话的工作目录回收、tmpfs 临时目录，
+以及凭据通过环境变量传入脚本而不写入工作目录。
+"""
+
+import json
+import os
+import time
+
+import pytest
+from agentscope.memory import InMemoryMemory
+
+from one_dragon_alpha.chat.chat_session import ChatSession
+from one_dragon_alpha.chat.workspace_manager import (
+    WorkspaceManager,
+    WorkspaceQuotaExceeded,
+)
+from one_dragon_alpha.tool.code import execute_python_code_by_path
+
+
+@pytest.fixture
+def manager(tmp_path) -> WorkspaceManager:
+    """工作目录和临时目录都在临时路径下的管理器."""
+    return WorkspaceManager(
+        root=str(tmp_path / "analyse_by_code"),
+        scratch_root=str(tmp_path / "scratch"),
+        session_quota=1000,
+        total_quota=3000,
+        session_ttl=3600,
+    )
+
+
+def _write(manager: WorkspaceManager, session_id: str, analyse_id: int, size: int) -> str:
+    """在分析的工作目录中写入指定大小的文件."""
+    directory = manager.analysis_dir(session_id, analyse_id)
+    with open(os.path.join(directory, "result.json"), "wb") as f:
+        f.write(b"0" * size)
+    return directory
+
+
+def _age(directory: str, seconds: float) -> None:
+    """把目录及其中文件的修改时间提前."""
+    past = time.time() - seconds
+    for name in os.listdir(directory):
+        os.utime(os.path.join(directory, name), (past, past))
+    os.utime(directory, (past, past))
+
+
+def test_quota(manager) -> None:
+    """会话占用超过配额时拒绝，其他会话不受影响；全部占用超过总配额时都拒绝."""
+    _write(manager, "s1", 1, 600)
+    _write(manager, "s1", 2, 600)
+    manager.record_usage("s1", 1)
+    manager.check_quota("s1")
+
+    manager.record_usage("s1", 2)
+
+    assert manager.session_usage("s1") == 1200
+    with pytest.raises(WorkspaceQuotaExceeded):
+        manager.check_quota("s1")
+    manager.check_quota("s2")
+
+    for analyse_id in (1, 2):
+        _write(manager, "s2", analyse_id, 900)
+        manager.record_usage("s2", analyse_id)
+    with pytest.raises(WorkspaceQuotaExceeded):
+        manager.check_quota("s3")
+
+
+def test_collect_expired_sessions(manager, tmp_path) -> None:
+    """回收不存在且超过保留时间的会话，在内存中的会话和最近修改的保留."""
+    old_active = _write(manager, "active", 1, 10)
+    old_gone = _write(manager, "gone", 1, 10)
+    recent_gone = _write(manager, "recent", 1, 10)
+    scratch = manager.scratch_dir("gone", 1)
+    _age(old_active, 7200)
+    _age(old_gone, 7200)
+    _age(scratch, 7200)
+
+    removed = manager.collect(["active"])
+
+    assert removed == ["gone-1"]
+    assert not os.path.exists(old_gone) and not os.path.exists(scratch)
+    assert os.path.exists(old_active) and os.path.exists(recent_gone)
+    assert manager.total_usage() == 20
+
+
+def test_collect_over_total_quota(manager) -> None:
+    """全部占用超过总配额时，从最久未修改的开始提前回收不存在的会话."""
+    for i, age in enumerate((300, 200, 100)):
+        _age(_write(manager, f"gone{i}", 1, 1200), age)
+    _write(manager, "active", 1, 1200)
+
+    removed = manager.collect(["active"])
+
+    assert removed == ["gone0-1", "gone1-1"]
+    assert manager.total_usage() == 2400
+
+
+def test_record_usage_during_collect(manager, monkeypatch) -> None:
+    """回收扫描期间结束的分析，统计不会被扫描结果覆盖."""
+    _write(manager, "s1", 1, 100)
+    manager.record_usage("s1", 1)
+    scan = manager._scan_workspace
+    finished = []
+
+    def scan_then_finish(session_id: str, name: str):
+        usage = scan(session_id, name)
+        if not finished:
+            # 扫描到旧的占用之后，分析写入结果并重新统计
+            finished.append(name)
+            _write(manager, "s1", 1, 500)
+            manager.record_usage("s1", 1)
+        return usage
+
+    monkeypatch.setattr(manager, "_scan_workspace", scan_then_finish)
+    manager.collect(["s1"])
+
+    assert manager.session_usage("s1") == 500
+
+
+async def test_credentials_passed_by_env(manager, tmp_path, monkeypatch) -> None:
+    """凭据和临时目录通过子进程环境变量传入，工作目录中没有 .env 文件."""
+    monkeypatch.setenv("TUSHARE_API_TOKEN", "secret")
+    directory = manager.analysis_dir("s1", 1)
+    script = os.path.join(directory, "main.py")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(
+            "import json, os, tempfile\n"
+            "print(json.dumps([os.environ['TUSHARE_API_TOKEN'], tempfile.gettempdir()]))\n"
+        )
+
+    response = await execute_python_code_by_path(
+        script, timeout=60, env=manager.script_env("s1", 1)
+    )
+
+    text = response.content[0]["text"]
+    stdout = text.split("<stdout>")[1].split("</stdout>")[0]
+    assert json.loads(stdout) == ["secret", str(tmp_path / "scratch" / "s1-1")]
+    assert os.listdir(directory) == ["main.py"]
+
+
+async def test_server_env_not_inherited(manager, monkeypatch) -> None:
+    """白名单之外的服务进程环境变量对脚本不可见，代理等白名单中的变量可见."""
+    monkeypatch.setenv("MYSQL_PASSWORD", "secret")
+    monkeypatch.setenv("CONTEXT7_API_KEY", "secret")
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy:3128")
+    directory = manager.analysis_dir("s1", 1)
+    script = os.path.join(directory, "main.py")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(
+            "import json, os\n"
+            "print(json.dumps([os.getenv('MYSQL_PASSWORD'), "
+            "os.getenv('CONTEXT7_API_KEY'), os.getenv('HTTPS_PROXY'), "
+            "'PATH' in os.environ]))\n"
+        )
+
+    response = await execute_python_code_by_path(
+        script, timeout=60, env=manager.script_env("s1", 1)
+    )
+
+    text = response.content[0]["text"]
+    stdout = text.split("<stdout>")[1].split("</stdout>")[0]
+    assert json.loads(stdout) == [None, None, "http://proxy:3128", True]
+
+
+async def test_analyse_refused_over_quota(tmp_path, monkeypatch) -> None:
+    """会话超过配额时 analyse_by_code 返回错误，不创建分析."""
+    monkeypatch.setenv("WORKSPACE_DIR", str(tmp_path))
+    session = ChatSession("s1", InMemoryMemory())
+    session._workspaces = WorkspaceManager(session_quota=100)
+    _write(session._workspaces, "s1", 1, 200)
+    session._workspaces.record_usage("s1", 1)
+
+    response = await session.analyse_by_code("分析")
+
+    assert "超过配额" in json.loads(response.content[0]["text"])["error"]
+    assert len(session._analyse_agents) == 0
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""聊天流中内联分析结果的测试.
+
+验证 display_analyse_by_code_result 工具结果完成后推送 analyse_result 帧，
+以及大小上限、文件缺失和原有的结果查询接口。
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+from agentscope.message import Msg
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from one_dragon_alpha.server.chat.router import chat_frame_generator, router
+from one_dragon_alpha.server.dependencies import get_context
+from one_dragon_alpha.session.session import Session
+from one_dragon_alpha.session.session_message import SessionMessage
+
+_SESSION_ID = "session_1"
+
+
+def _tool_result_msg(analyse_id: int, tool_call_id: str = "call_1") -> Msg:
+    """构造 display_analyse_by_code_result 的工具结果消息."""
+    return Msg(
+        name="system",
+        role="system",
+        content=[
+            {
+                "type": "tool_result",
+                "id": tool_call_id,
+                "name": "display_analyse_by_code_result",
+                "output": [
+                    {"type": "text", "text": json.dumps({"analyse_id": analyse_id})}
+                ],
+            }
+        ],
+    )
+
+
+class FakeSession:
+    """依次产生给定消息的假会话."""
+
+    busy = Session.busy
+    turn = Session.turn
+
+    def __init__(self, messages: list[SessionMessage]) -> None:
+        """初始化假会话.
+
+        Args:
+            messages: 本轮产生的消息
+        """
+        self.session_id = _SESSION_ID
+        self._turn_running = False
+        self._messages = messages
+
+    async def chat(self, user_input, model_config_id, model_id, config, routing=None):
+        """产生消息，最后产生响应结束标记."""
+        for message in self._messages:
+            yield message
+        yield SessionMessage(None, False, True)
+
+
+def _write_result(workspace, analyse_id: int, result: dict) -> None:
+    """写入分析结果文件."""
+    directory = workspace / "analyse_by_code" / f"{_SESSION_ID}-{analyse_id}"
+    directory.mkdir(parents=True)
+    (directory / "result.json").write_text(json.dumps(result), encoding="utf-8")
+
+
+async def _frames(messages: list[SessionMessage]) -> list[dict]:
+    """运行一轮并解析全部帧."""
+    frames = []
+    async for frame in chat_frame_generator(
+        _SESSION_ID, FakeSession(messages), "hi", 1, "gpt-4", Mock()
+    ):
+        frames.append(json.loads(frame))
+    return frames
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """设置工作目录."""
+    monkeypatch.setenv("WORKSPACE_DIR", str(tmp_path))
+    return tmp_path
+
+
+async def test_result_inlined_after_tool_result(workspace) -> None:
+    """工具结果完成后紧接着推送解析后的结果，流式中间块和重复打印不推送."""
+    result = {"echarts_list": [{"series": [{"data": [1, 2, 3]}]}]}
+    _write_result(workspace, 3, result)
+    msg = _tool_result_msg(3)
+
+    frames = await _frames(
+        [
+            SessionMessage(msg, False, False),
+            SessionMessage(msg, True, False),
+            SessionMessage(msg, True, False),
+        ]
+    )
+
+    assert [frame["type"] for frame in frames] == [
+        "message_update",
+        "message_completed",
+        "analyse_result",
+        "message_completed",
+        "response_completed",
+    ]
+    payload = frames[2]["message"]
+    assert payload["analyse_id"] == 3
+    assert payload["result"] == result
+    assert not payload["truncated"]
+    assert payload["report"]["original_points"] == 3
+
+
+async def test_oversized_result_not_inlined(workspace, monkeypatch) -> None:
+    """超过大小上限时只通知，客户端改为调用结果查询接口."""
+    monkeypatch.setenv("ANALYSE_RESULT_INLINE_MAX_BYTES", "16")
+    _write_result(workspace, 1, {"echarts_list": [{"data": list(range(100))}]})
+
+    frames = await _frames([SessionMessage(_tool_result_msg(1), True, False)])
+
+    assert frames[1]["type"] == "analyse_result"
+    assert frames[1]["message"]["result"] is None
+    assert frames[1]["message"]["truncated"]
+
+
+async def test_missing_result_skipped(workspace) -> None:
+    """结果文件不存在时不推送，不影响本轮其他帧."""
+    frames = await _frames([SessionMessage(_tool_result_msg(9), True, False)])
+
+    assert [frame["type"] for frame in frames] == [
+        "message_completed",
+        "response_completed",
+    ]
+
+
+def test_endpoint_still_serves_result(workspace) -> None:
+    """重新加载页面时仍可通过接口获取结果."""
+    _write_result(workspace, 2, {"echarts_list": []})
+    context = Mock()
+    context.session_service.get_session.return_value = Mock()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_context] = lambda: context
+
+    response = TestClient(app).post(
+        "/chat/get_analyse_by_code_result",
+        json={"session_id": _SESSION_ID, "analyse_id": 2},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["result"] == {"echarts_list": []}
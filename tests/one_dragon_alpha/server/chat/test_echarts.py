@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""ECharts 结果后处理测试.
+
+验证 LTTB 降采样与逐点实现一致、类目轴多序列对齐、[x, y] 序列、
+类型化数组编码，以及结果接口返回的大小报告。
+"""
+
+import base64
+import json
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_alpha.server.chat.echarts import (
+    ResultReport,
+    downsample_option,
+    encode_typed_array,
+    lttb_indices,
+    process_result,
+)
+from one_dragon_alpha.server.chat.router import router
+from one_dragon_alpha.server.dependencies import get_context
+
+logger = get_logger(__name__)
+
+
+def _reference_lttb(x: list[float], y: list[float], threshold: int) -> list[int]:
+    """逐点计算的 LTTB 参考实现."""
+    n = len(x)
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if i == threshold - 3:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            avg_x = sum(x[end:next_end]) / (next_end - end)
+            avg_y = sum(y[end:next_end]) / (next_end - end)
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def _prices(n: int, seed: int = 0) -> list[float]:
+    """随机游走的价格序列."""
+    rng = np.random.default_rng(seed)
+    return (100 + np.cumsum(rng.normal(0, 1, n))).round(2).tolist()
+
+
+def test_lttb_matches_reference() -> None:
+    """与逐点实现选出相同的点，首尾保留，极值保留."""
+    y = _prices(5000)
+    x = list(range(len(y)))
+
+    keep = lttb_indices(np.array(x, float), np.array(y), 300)
+
+    assert keep.tolist() == _reference_lttb(x, y, 300)
+    assert int(np.argmax(y)) in keep
+    assert int(np.argmin(y)) in keep
+
+
+def test_lttb_short_series_unchanged() -> None:
+    """点数不超过目标时原样保留."""
+    assert lttb_indices(np.arange(5.0), np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_category_axis_series_stay_aligned() -> None:
+    """类目轴上的序列按同一组下标降采样，类目和各序列保持对齐."""
+    n = 10000
+    dates = [f"d{i}" for i in range(n)]
+    close = _prices(n, seed=1)
+    ma = _prices(n, seed=2)
+    volume = list(range(n))
+    option = {
+        "xAxis": {"type": "category", "data": dates},
+        "series": [
+            {"type": "line", "data": close},
+            {"type": "line", "data": ma, "areaStyle": {}},
+            {"type": "bar", "data": volume},
+        ],
+    }
+    report = ResultReport()
+
+    downsample_option(option, 500, report)
+
+    kept = [int(d[1:]) for d in option["xAxis"]["data"]]
+    assert 250 <= len(kept) <= 500
+    assert kept == sorted(kept)
+    assert option["series"][0]["data"] == [close[i] for i in kept]
+    assert option["series"][1]["data"] == [ma[i] for i in kept]
+    assert option["series"][2]["data"] == kept
+    assert report.original_points == 3 * n
+    assert report.delivered_points == 3 * len(kept)
+    assert report.downsampled_series == 2
+
+
+def test_pair_series_and_unsupported_data() -> None:
+    """[x, y] 序列各自降采样；含缺失值的序列和长度不一致的类目轴不处理."""
+    y = _prices(3000)
+    with_gap = _prices(3000)
+    with_gap[10] = None
+    option = {
+        "xAxis": [{"type": "time"}, {"type": "category", "data": list(range(3000))}],
+        "series": [
+            {"type": "line", "data": [[f"2020-{i}", v] for i, v in enumerate(y)]},
+            {"type": "line", "xAxisIndex": 1, "data": with_gap},
+        ],
+    }
+    report = ResultReport()
+
+    downsample_option(option, 200, report)
+
+    assert len(option["series"][0]["data"]) == 200
+    assert option["series"][0]["data"][-1] == ["2020-2999", y[-1]]
+    assert option["series"][1]["data"] == with_gap
+    assert report.downsampled_series == 1
+
+
+def test_typed_array_encoding() -> None:
+    """长数组编码后可还原，短小数保持 JSON."""
+    values = (np.arange(1000) / 7).tolist()
+
+    encoded = encode_typed_array(values)
+
+    assert encoded["$typed"] == "float64"
+    decoded = np.frombuffer(base64.b64decode(encoded["data"]), dtype=np.float64)
+    assert decoded.tolist() == values
+
+    pairs = [[float(i), float(i) / 4] for i in range(1000)]
+    encoded = encode_typed_array(pairs)
+    assert encoded["$typed"] == "float32"
+    assert encoded["shape"] == [1000, 2]
+
+    assert encode_typed_array([1, 2, 3]) is None
+    assert encode_typed_array([float(i % 10) for i in range(1000)]) is None
+
+
+def test_process_result_typed() -> None:
+    """typed 编码作用于降采样后的序列数据."""
+    result = {
+        "echarts_list": [
+            {"series": [{"type": "line", "data": [[i / 3, i / 7] for i in range(5000)]}]}
+        ]
+    }
+
+    report = process_result(result, max_points=1000, encoding="typed")
+
+    data = result["echarts_list"][0]["series"][0]["data"]
+    assert data["shape"] == [1000, 2]
+    assert report.delivered_points == 1000
+
+
+def test_endpoint_reports_sizes(tmp_path, monkeypatch) -> None:
+    """结果接口返回降采样后的结果和大小报告."""
+    monkeypatch.setenv("WORKSPACE_DIR", str(tmp_path))
+    directory = tmp_path / "analyse_by_code" / "session_1-1"
+    directory.mkdir(parents=True)
+    n = 20000
+    option = {
+        "xAxis": {"type": "category", "data": [str(20000101 + i) for i in range(n)]},
+        "series": [{"type": "line", "data": _prices(n)}],
+    }
+    (directory / "result.json").write_text(json.dumps({"echarts_list": [option]}))
+    context = Mock()
+    context.session_service.get_session.return_value = Mock()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_context] = lambda: context
+
+    response = TestClient(app).post(
+        "/chat/get_analyse_by_code_result",
+        json={"session_id": "session_1", "analyse_id": 1, "max_points": 1000},
+    )
+
+    body = response.json()
+    assert len(body["result"]["echarts_list"][0]["series"][0]["data"]) == 1000
+    report = body["report"]
+    assert report["original_points"] == n
+    assert report["delivered_points"] == 1000
+    assert report["delivered_bytes"] < report["original_bytes"] / 10
+
+
+@pytest.mark.benchmark
+def test_lttb_benchmark() -> None:
+    """30 年日线（约 1 万点）的 10 个序列降采样到 2000 点的耗时."""
+    series = [np.array(_prices(10000, seed=i)) for i in range(10)]
+    x = np.arange(10000, dtype=np.float64)
+
+    start = time.perf_counter()
+    for y in series:
+        lttb_indices(x, y, 2000)
+    seconds = time.perf_counter() - start
+
+    reference_start = time.perf_counter()
+    _reference_lttb(x.tolist(), series[0].tolist(), 2000)
+    reference_seconds = (time.perf_counter() - reference_start) * len(series)
+
+    logger.info(
+        f"LTTB 10 个 1 万点序列 → 2000 点: 向量化 {seconds * 1000:.1f}ms, "
+        f"逐点实现 {reference_seconds * 1000:.1f}ms"
+    )
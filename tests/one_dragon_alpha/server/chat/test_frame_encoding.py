@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""聊天流帧编码测试.
+
+验证 encode_chat_frame 的输出与 ChatResponse.model_dump_json() 字节一致，
+并提供单帧编码耗时的微基准。
+"""
+
+import time
+
+import pytest
+
+from one_dragon_agent.core.system.json_codec import (
+    JsonBackend,
+    JsonCodec,
+    set_json_codec,
+)
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_alpha.server.chat.router import (
+    ChatResponse,
+    ChatResponseType,
+    encode_chat_frame,
+)
+
+logger = get_logger(__name__)
+
+# 典型帧的黄金输出（由 ChatResponse.model_dump_json() 生成）
+_GOLDEN_TEXT_FRAME = (
+    '{"session_id":"test_session_001","type":"message_update",'
+    '"message":{"id":"msg_1","name":"OneDragon","role":"assistant",'
+    '"content":[{"type":"text","text":"你好，\\"东方财富\\"的营业收入如下：\\n"}],'
+    '"metadata":null,"timestamp":"2026-02-10 10:00:00.123"}}'
+)
+
+
+def _text_message() -> dict:
+    """创建普通文本消息.
+
+    Returns:
+        Msg.to_dict() 格式的消息
+    """
+    return {
+        "id": "msg_1",
+        "name": "OneDragon",
+        "role": "assistant",
+        "content": [{"type": "text", "text": "你好，\"东方财富\"的营业收入如下：\n"}],
+        "metadata": None,
+        "timestamp": "2026-02-10 10:00:00.123",
+    }
+
+
+def _tool_message() -> dict:
+    """创建包含工具调用和工具结果的消息.
+
+    Returns:
+        Msg.to_dict() 格式的消息
+    """
+    return {
+        "id": "msg_2",
+        "name": "OneDragon",
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "call_1",
+                "name": "tushare_income",
+                "input": {"ts_code": "300059.SZ", "report_type": "1", "period": None},
+            },
+            {
+                "type": "tool_result",
+                "id": "call_1",
+                "name": "tushare_income",
+                "output": [
+                    {
+                        "type": "text",
+                        "text": '[{"ts_code":"300059.SZ","营业收入":123456789.0}]',
+                    }
+                ],
+            },
+        ],
+        "metadata": {"step": 3, "ratio": 0.25, "ok": True},
+        "timestamp": "2026-02-10 10:00:01.456",
+    }
+
+
+@pytest.fixture(params=[b.value for b in JsonBackend])
+def codec_backend(request):
+    """依次使用每个已安装的后端作为默认编解码器."""
+    try:
+        set_json_codec(JsonCodec(request.param))
+    except ValueError:
+        pytest.skip(f"JSON 后端 {request.param} 未安装")
+    yield request.param
+    set_json_codec(None)
+
+
+class TestEncodeChatFrame:
+    """encode_chat_frame 黄金测试."""
+
+    def test_golden_text_frame(self, codec_backend: str) -> None:
+        """测试普通文本帧与黄金输出字节一致."""
+        frame = encode_chat_frame(
+            "test_session_001", ChatResponseType.MESSAGE_UPDATE, _text_message()
+        )
+
+        assert frame == _GOLDEN_TEXT_FRAME
+
+    @pytest.mark.parametrize(
+        ("response_type", "message"),
+        [
+            (ChatResponseType.MESSAGE_UPDATE, _text_message()),
+            (ChatResponseType.MESSAGE_COMPLETED, _tool_message()),
+            (ChatResponseType.RESPONSE_COMPLETED, {}),
+            (ChatResponseType.ERROR, {"hint": "模型配置已禁用"}),
+        ],
+    )
+    def test_matches_pydantic(
+        self, codec_backend: str, response_type: ChatResponseType, message: dict
+    ) -> None:
+        """测试各类帧与 ChatResponse.model_dump_json() 字节一致."""
+        expected = ChatResponse(
+            session_id="test_session_001", type=response_type, message=message
+        ).model_dump_json()
+
+        frame = encode_chat_frame("test_session_001", response_type, message)
+
+        assert frame == expected
+
+
+@pytest.mark.benchmark
+class TestEncodeChatFrameBenchmark:
+    """单帧编码耗时微基准."""
+
+    def test_per_frame_cost(self) -> None:
+        """对比 Pydantic 构造 + model_dump_json 与快速编码路径的单帧耗时."""
+        rounds = 5000
+        message = _tool_message()
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            ChatResponse(
+                session_id="test_session_001",
+                type=ChatResponseType.MESSAGE_UPDATE,
+                message=message,
+            ).model_dump_json()
+        pydantic_us = (time.perf_counter() - start) / rounds * 1e6
+
+        results = {"pydantic": pydantic_us}
+        for backend in JsonBackend:
+            try:
+                set_json_codec(JsonCodec(backend))
+            except ValueError:
+                continue
+            start = time.perf_counter()
+            for _ in range(rounds):
+                encode_chat_frame(
+                    "test_session_001", ChatResponseType.MESSAGE_UPDATE, message
+                )
+            results[backend.value] = (time.perf_counter() - start) / rounds * 1e6
+        set_json_codec(None)
+
+        for name, cost in results.items():
+            logger.info(f"单帧编码耗时 {name}: {cost:.2f} us")
+
+        assert all(cost > 0 for cost in results.values())
@@ -224,6 +224,7 @@ async def test_valid_config_and_model_id_succeeds(
 
     # 模拟 Session
     mock_tushare_session = MagicMock()
+    mock_tushare_session.busy = False
     mock_tushare_session.chat = AsyncMock()
     async def mock_chat_gen():
         from one_dragon_alpha.session.session_message import SessionMessage
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""聊天 WebSocket 传输测试.
+
+使用假的 Session 和上下文，验证单连接多轮次复用、中断和状态广播，
+并提供 SSE 与 WebSocket 单轮延迟对比的负载测试。
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from one_dragon_agent.core.model.models import ModelConfigInternal, ModelInfo
+from one_dragon_agent.core.system.log import get_logger
+from one_dragon_alpha.server.chat.router import (
+    chat_frame_generator,
+    get_db_session,
+    router,
+)
+from one_dragon_alpha.server.dependencies import get_context
+from one_dragon_alpha.server.ws_manager import WebSocketConnectionManager
+from one_dragon_alpha.session.session import Session
+from one_dragon_alpha.session.session_message import SessionMessage
+
+logger = get_logger(__name__)
+
+
+class FakeSession:
+    """按固定节奏产生响应块的假会话.
+
+    进行中轮次的标记复用 Session 的实现。
+    """
+
+    busy = Session.busy
+    turn = Session.turn
+
+    def __init__(
+        self, chunks: int = 3, delay: float = 0.0, status: dict | None = None
+    ) -> None:
+        """初始化假会话.
+
+        Args:
+            chunks: 每轮产生的消息块数量
+            delay: 每个消息块之间的等待时间（秒）
+            status: 每轮开始时产生的状态，模拟模型调用排队
+        """
+        self.session_id = ""
+        self._turn_running = False
+        self._chunks = chunks
+        self._delay = delay
+        self._status = status
+        self.interrupt = AsyncMock()
+
+    async def chat(
+        self,
+        user_input: str,
+        model_config_id: int,
+        model_id: str,
+        config,
+        routing=None,
+    ):
+        """产生若干消息块，最后产生响应结束标记."""
+        if self._status is not None:
+            yield SessionMessage(None, False, False, status=self._status)
+        for i in range(self._chunks):
+            if self._delay:
+                await asyncio.sleep(self._delay)
+            msg = Mock()
+            msg.to_dict.return_value = {"id": "msg_1", "content": f"{user_input}-{i}"}
+            yield SessionMessage(msg, i == self._chunks - 1, False)
+        yield SessionMessage(None, False, True)
+
+
+@pytest.fixture
+def mock_config() -> Mock:
+    """创建模型配置 Mock."""
+    config = Mock(spec=ModelConfigInternal)
+    config.id = 1
+    config.name = "Test Config"
+    config.is_active = True
+    config.models = [ModelInfo(model_id="gpt-4")]
+    return config
+
+
+@pytest.fixture
+def sessions() -> dict[str, FakeSession]:
+    """创建测试会话."""
+    return {
+        "test_session_a": FakeSession(),
+        "test_session_b": FakeSession(),
+        "test_session_slow": FakeSession(chunks=50, delay=0.05),
+        "test_session_queued": FakeSession(
+            chunks=1, status={"hint": "model_queued", "queue_position": 2}
+        ),
+    }
+
+
+@pytest.fixture
+def client(sessions: dict[str, FakeSession], mock_config: Mock):
+    """创建挂载聊天路由的测试客户端."""
+    context = Mock()
+    context.session_service.get_session.side_effect = sessions.get
+    context.session_service.create_session.return_value = "test_session_a"
+    context.chat_ws_manager = WebSocketConnectionManager(max_queue_size=8)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_context] = lambda: context
+    app.dependency_overrides[get_db_session] = lambda: Mock()
+
+    with (
+        patch(
+            "one_dragon_alpha.server.chat.router._load_model_config_for_ws",
+            AsyncMock(return_value=mock_config),
+        ),
+        patch(
+            "one_dragon_alpha.server.chat.router.validate_model_config",
+            AsyncMock(return_value=mock_config),
+        ),
+    ):
+        yield TestClient(app)
+
+
+def _chat(session_id: str | None, user_input: str = "hi") -> dict:
+    """构造聊天请求消息."""
+    return {
+        "type": "chat",
+        "session_id": session_id,
+        "user_input": user_input,
+        "model_config_id": 1,
+        "model_id": "gpt-4",
+    }
+
+
+def _receive_turn(ws, session_id: str) -> list[dict]:
+    """接收一个会话的帧，直到该轮次结束."""
+    frames = []
+    while True:
+        frame = ws.receive_json()
+        if frame["session_id"] != session_id:
+            continue
+        frames.append(frame)
+        if frame["type"] == "status" and frame["message"]["hint"] == "turn_completed":
+            return frames
+
+
+class TestChatWebSocket:
+    """/chat/ws 端点测试."""
+
+    def test_connected_status(self, client: TestClient) -> None:
+        """测试连接后首先收到 connected 状态."""
+        with client.websocket_connect("/chat/ws") as ws:
+            frame = ws.receive_json()
+
+        assert frame["type"] == "status"
+        assert frame["message"] == {"hint": "connected"}
+
+    def test_multiple_turns_on_one_connection(self, client: TestClient) -> None:
+        """测试同一连接上依次完成多轮对话，帧格式与 SSE 一致."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            for i in range(3):
+                ws.send_json(_chat("test_session_a", f"q{i}"))
+                frames = _receive_turn(ws, "test_session_a")
+
+                types = [f["type"] for f in frames]
+                assert types == [
+                    "status",
+                    "message_update",
+                    "message_update",
+                    "message_completed",
+                    "response_completed",
+                    "status",
+                ]
+                assert frames[1]["message"]["content"] == f"q{i}-0"
+
+    def test_concurrent_sessions_multiplexed(self, client: TestClient) -> None:
+        """测试两个会话的轮次在同一连接上并发进行."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat("test_session_a"))
+            ws.send_json(_chat("test_session_b"))
+
+            completed = set()
+            while len(completed) < 2:
+                frame = ws.receive_json()
+                if frame["type"] == "response_completed":
+                    completed.add(frame["session_id"])
+
+        assert completed == {"test_session_a", "test_session_b"}
+
+    def test_session_status_forwarded(self, client: TestClient) -> None:
+        """测试会话产生的排队状态以 status 帧发送."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat("test_session_queued"))
+            frames = _receive_turn(ws, "test_session_queued")
+
+        assert frames[1]["type"] == "status"
+        assert frames[1]["message"] == {"hint": "model_queued", "queue_position": 2}
+        assert frames[2]["type"] == "message_completed"
+
+    def test_new_session_created(self, client: TestClient) -> None:
+        """测试不传 session_id 时创建新会话."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat(None))
+            frames = _receive_turn(ws, "test_session_a")
+
+        assert frames[-2]["type"] == "response_completed"
+
+    def test_interrupt(self, client: TestClient, sessions: dict[str, FakeSession]) -> None:
+        """测试通过同一连接中断进行中的轮次."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat("test_session_slow"))
+            ws.send_json({"type": "interrupt", "session_id": "test_session_slow"})
+
+            while True:
+                frame = ws.receive_json()
+                if frame["type"] == "status" and frame["message"]["hint"] == "interrupted":
+                    break
+
+        sessions["test_session_slow"].interrupt.assert_awaited_once()
+
+    def test_busy_session_rejected(self, client: TestClient) -> None:
+        """测试同一会话已有进行中轮次时返回错误."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat("test_session_slow"))
+            ws.send_json(_chat("test_session_slow"))
+
+            while True:
+                frame = ws.receive_json()
+                if frame["type"] == "error":
+                    break
+
+        assert "busy" in frame["message"]["hint"]
+
+    def test_busy_session_rejected_across_connections(self, client: TestClient) -> None:
+        """测试另一个连接已在同一会话上进行轮次时返回错误."""
+        with (
+            client.websocket_connect("/chat/ws") as ws1,
+            client.websocket_connect("/chat/ws") as ws2,
+        ):
+            ws1.receive_json()
+            ws2.receive_json()
+            ws1.send_json(_chat("test_session_slow"))
+            while ws1.receive_json()["type"] != "message_update":
+                pass
+
+            ws2.send_json(_chat("test_session_slow"))
+            frame = ws2.receive_json()
+
+        assert frame["type"] == "error"
+        assert "busy" in frame["message"]["hint"]
+
+    def test_busy_session_rejected_across_transports(self, client: TestClient) -> None:
+        """测试 WebSocket 轮次进行中时同一会话的 SSE 请求返回 409."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat("test_session_slow"))
+            while ws.receive_json()["type"] != "message_update":
+                pass
+
+            response = client.post("/chat/stream", json=_chat("test_session_slow"))
+
+        assert response.status_code == 409
+
+    async def test_racing_turns_on_one_session(self) -> None:
+        """测试同时通过检查的两个轮次中，后开始的一个以错误帧结束."""
+        session = FakeSession(chunks=2)
+        first = chat_frame_generator("s", session, "a", 1, "gpt-4", Mock())
+        second = chat_frame_generator("s", session, "b", 1, "gpt-4", Mock())
+
+        await anext(first)
+        frames = [frame async for frame in second]
+        rest = [frame async for frame in first]
+
+        assert len(frames) == 1
+        assert '"type":"error"' in frames[0]
+        assert '"type":"response_completed"' in rest[-1]
+        assert not session.busy
+
+    def test_unknown_session_error(self, client: TestClient) -> None:
+        """测试不存在的会话返回错误帧."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_json(_chat("test_session_missing"))
+            frame = ws.receive_json()
+
+        assert frame["type"] == "error"
+        assert "Session not found" in frame["message"]["hint"]
+
+    def test_invalid_message_error(self, client: TestClient) -> None:
+        """测试非法消息返回错误帧且连接保持可用."""
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            ws.send_text("not json")
+            frame = ws.receive_json()
+            assert frame["type"] == "error"
+
+            ws.send_json(_chat("test_session_a"))
+            frames = _receive_turn(ws, "test_session_a")
+
+        assert frames[-2]["type"] == "response_completed"
+
+
+class TestWebSocketConnectionManager:
+    """WebSocketConnectionManager 测试."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.timeout(10)
+    async def test_broadcast_drops_when_queue_full(self) -> None:
+        """测试状态广播在发送队列满时丢弃而不阻塞."""
+        manager = WebSocketConnectionManager(max_queue_size=2)
+        websocket = AsyncMock()
+
+        async def _blocked_send(_: str) -> None:
+            # 发送永远阻塞，模拟读取缓慢的客户端
+            await asyncio.sleep(3600)
+
+        websocket.send_text.side_effect = _blocked_send
+
+        connection = await manager.connect(websocket)
+        manager.subscribe(connection.connection_id, "test_session_a")
+
+        queued = [manager.broadcast("test_session_a", f"frame-{i}") for i in range(5)]
+        await manager.disconnect(connection.connection_id)
+
+        # 第一帧被发送任务取走，之后队列最多容纳 2 帧
+        assert sum(queued) <= 3
+        assert manager.get_session_connections("test_session_a") == []
+
+
+@pytest.mark.benchmark
+class TestTransportLatency:
+    """SSE 与 WebSocket 单轮延迟对比."""
+
+    def test_per_turn_latency(self, client: TestClient) -> None:
+        """对比每轮都新建 HTTP 请求的 SSE 与复用连接的 WebSocket."""
+        turns = 50
+
+        start = time.perf_counter()
+        for _ in range(turns):
+            response = client.post("/chat/stream", json=_chat("test_session_a"))
+            assert "response_completed" in response.text
+        sse_ms = (time.perf_counter() - start) / turns * 1000
+
+        with client.websocket_connect("/chat/ws") as ws:
+            ws.receive_json()
+            start = time.perf_counter()
+            for _ in range(turns):
+                ws.send_json(_chat("test_session_a"))
+                _receive_turn(ws, "test_session_a")
+            ws_ms = (time.perf_counter() - start) / turns * 1000
+
+        logger.info(f"单轮延迟 SSE: {sse_ms:.2f} ms, WebSocket: {ws_ms:.2f} ms")
+
+        assert sse_ms > 0
+        assert ws_ms > 0
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""健康检查与就绪检查端点测试."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from one_dragon_alpha.server.dependencies import get_context
+from one_dragon_alpha.server.health import monitor as monitor_module
+from one_dragon_alpha.server.health.monitor import (
+    ComponentHealth,
+    HealthMonitor,
+    check_tushare,
+)
+from one_dragon_alpha.server.health.router import router
+
+
+class CountingCheck:
+    """记录调用次数的假检查."""
+
+    def __init__(self, healthy: bool = True, delay: float = 0.0) -> None:
+        """初始化假检查.
+
+        Args:
+            healthy: 检查结果是否健康
+            delay: 检查耗时（秒）
+        """
+        self.healthy = healthy
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> ComponentHealth:
+        """执行检查."""
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return ComponentHealth(self.healthy, False, "ok" if self.healthy else "down")
+
+
+@pytest.fixture
+def database() -> CountingCheck:
+    """创建数据库假检查."""
+    return CountingCheck()
+
+
+@pytest.fixture
+def monitor(database: CountingCheck) -> HealthMonitor:
+    """创建只包含假检查的健康监视器."""
+    return HealthMonitor(
+        interval=60,
+        timeout=0.5,
+        checks={
+            "database": (database, True),
+            "tushare": (CountingCheck(healthy=False), False),
+        },
+    )
+
+
+@pytest.fixture
+def client(monitor: HealthMonitor) -> TestClient:
+    """创建挂载健康检查路由的测试客户端."""
+    context = Mock()
+    context.health_monitor = monitor
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_context] = lambda: context
+    return TestClient(app)
+
+
+class TestHealthEndpoints:
+    """/healthz 与 /readyz 测试."""
+
+    def test_healthz(self, client: TestClient) -> None:
+        """测试存活检查总是返回 ok."""
+        response = client.get("/healthz")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_readyz_starting(self, client: TestClient) -> None:
+        """测试首轮检查完成前返回 503."""
+        response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    def test_readyz_uses_cached_snapshot(
+        self, client: TestClient, monitor: HealthMonitor, database: CountingCheck
+    ) -> None:
+        """测试探针多次请求只读取快照，不会重复执行检查.
+
+        非必需依赖（tushare）不健康时仍然就绪。
+        """
+        asyncio.run(monitor.refresh())
+
+        for _ in range(100):
+            response = client.get("/readyz")
+            assert response.status_code == 200
+
+        body = response.json()
+        assert database.calls == 1
+        assert body["status"] == "ready"
+        assert body["components"]["database"]["required"] is True
+        assert body["components"]["tushare"]["healthy"] is False
+
+    def test_readyz_required_unhealthy(
+        self, client: TestClient, monitor: HealthMonitor, database: CountingCheck
+    ) -> None:
+        """测试必需依赖不健康时返回 503."""
+        database.healthy = False
+        asyncio.run(monitor.refresh())
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+    def test_readyz_stale(self, client: TestClient, monitor: HealthMonitor) -> None:
+        """测试快照长时间未刷新时返回 503."""
+        asyncio.run(monitor.refresh())
+        monitor.snapshot.checked_at = time.time() - monitor.interval * 4
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "stale"
+
+
+class TestHealthMonitor:
+    """HealthMonitor 测试."""
+
+    async def test_check_timeout(self, database: CountingCheck) -> None:
+        """测试检查超时记为不健康，且保留是否必需的标记."""
+        database.delay = 1.0
+        monitor = HealthMonitor(interval=60, timeout=0.05, checks={"database": (database, True)})
+
+        snapshot = await monitor.refresh()
+
+        assert not snapshot.ready
+        assert "超时" in snapshot.components["database"].detail
+        assert snapshot.components["database"].required is True
+
+    async def test_start_and_stop(self, monitor: HealthMonitor, database: CountingCheck) -> None:
+        """测试后台任务启动后立即执行首轮检查，并可停止."""
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert database.calls == 1
+        assert monitor.snapshot is not None
+
+    async def test_check_tushare_default_host(self, monkeypatch) -> None:
+        """测试未设置 TUSHARE_API_URL 时检查 Tushare 客户端实际使用的默认地址."""
+        from tushare_mcp_server import client as client_module
+
+        monkeypatch.setenv("TUSHARE_API_TOKEN", "test_token")
+        monkeypatch.delenv("TUSHARE_API_URL", raising=False)
+        monkeypatch.setattr(client_module, "_client", None)
+        writer = Mock(wait_closed=AsyncMock())
+        open_connection = AsyncMock(return_value=(Mock(), writer))
+        monkeypatch.setattr(monitor_module.asyncio, "open_connection", open_connection)
+
+        try:
+            health = await check_tushare()
+        finally:
+            await client_module.close_tushare_client()
+
+        open_connection.assert_awaited_once_with("api.waditu.com", 80)
+        assert health.healthy
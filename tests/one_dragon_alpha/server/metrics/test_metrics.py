@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""/metrics 端点与指标中间件测试."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from agentscope.message import Msg
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from one_dragon_alpha.server.context import OneDragonAlphaContext
+from one_dragon_alpha.server.metrics.middleware import MetricsMiddleware
+from one_dragon_alpha.server.metrics.router import router
+from one_dragon_alpha.session.response_queue import CoalescingResponseQueue
+from one_dragon_alpha.session.session_message import SessionMessage
+
+
+@pytest.fixture
+def client():
+    """创建挂载指标中间件和端点的测试客户端."""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"item_id": item_id}
+
+    context = Mock()
+    context.session_service.session_count.return_value = 3
+    context.chat_ws_manager.active_connections = {"conn_1": Mock()}
+    service = Mock()
+    service.pool_stats.return_value = {"size": 5, "overflow": 0, "checked_out": 2, "checked_in": 3}
+
+    with (
+        patch.object(OneDragonAlphaContext, "_instance", context),
+        patch(
+            "one_dragon_alpha.services.mysql.current_mysql_connection_service",
+            return_value=service,
+        ),
+    ):
+        yield TestClient(app)
+
+
+class TestMetricsEndpoint:
+    """/metrics 端点测试."""
+
+    def test_route_template_label(self, client: TestClient) -> None:
+        """测试请求耗时按路由模板聚合，而不是按实际路径."""
+        for item_id in range(3):
+            client.get(f"/items/{item_id}")
+
+        text = client.get("/metrics").text
+
+        assert 'oda_http_request_duration_seconds_count{method="GET",route="/items/{item_id}"}' in text
+        assert "/items/0" not in text
+
+    def test_unmatched_route_label(self, client: TestClient) -> None:
+        """测试未匹配的路径归入同一标签."""
+        client.get("/not-found-a")
+        client.get("/not-found-b")
+
+        text = client.get("/metrics").text
+
+        assert 'route="<unmatched>"' in text
+        assert "not-found" not in text
+
+    def test_service_gauges(self, client: TestClient) -> None:
+        """测试会话数、WebSocket 连接数和连接池状态."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "oda_chat_sessions 3" in response.text
+        assert "oda_chat_ws_connections 1" in response.text
+        assert 'oda_db_pool_connections{state="checked_out"} 2' in response.text
+        assert "# TYPE oda_qwen_oauth_sessions gauge" in response.text
+
+    async def test_response_queue_metrics(self, client: TestClient) -> None:
+        """测试响应队列的合并、丢弃和最高水位计入全局指标."""
+
+        def sample(text: str, name: str) -> float:
+            line = next(line for line in text.splitlines() if line.startswith(f"{name} "))
+            return float(line.split()[1])
+
+        names = (
+            "oda_response_queue_high_water",
+            "oda_response_queue_coalesced_total",
+            "oda_response_queue_dropped_total",
+        )
+        before = client.get("/metrics").text
+        queue = CoalescingResponseQueue(maxsize=1)
+        msg = Msg(name="assistant", content="a", role="assistant")
+        await queue.put(SessionMessage(msg, False, False))
+        # 同一消息的更新合并，其他消息的更新因队列已满丢弃
+        await queue.put(SessionMessage(msg, False, False))
+        await queue.put(SessionMessage(Msg(name="assistant", content="b", role="assistant"), False, False))
+        queue.close()
+
+        after = client.get("/metrics").text
+
+        assert sample(after, names[0]) >= 1
+        assert sample(after, names[1]) - sample(before, names[1]) == 1
+        assert sample(after, names[2]) - sample(before, names[2]) == 2
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Tests for the migration runner and schema check.
+
+SQLite stands in for MySQL; the migration files used here are written in
+the SQL subset both databases accept.
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table
+
+from one_dragon_alpha.services.mysql.migration import (
+    DEFAULT_MIGRATIONS_DIR,
+    MigrationError,
+    MigrationRunner,
+    load_migrations,
+    prepare_database,
+    verify_schema,
+)
+
+
+def _write(directory: Path, files: dict[str, str]) -> Path:
+    """Write migration files into a directory."""
+    for name, sql in files.items():
+        (directory / name).write_text(sql, encoding="utf-8")
+    return directory
+
+
+_FILES = {
+    "001_create_items.sql": (
+        "-- create items\n"
+        "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name VARCHAR(50));\n"
+    ),
+    "002_add_items_index.sql": (
+        "ALTER TABLE items ADD COLUMN price INTEGER;\n"
+        "CREATE INDEX idx_items_name ON items (name);\n"
+    ),
+}
+
+
+@pytest.fixture
+async def engine():
+    """Create an in-memory SQLite engine."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    yield engine
+    await engine.dispose()
+
+
+class TestLoadMigrations:
+    """Test cases for loading migration files."""
+
+    def test_repository_migrations(self) -> None:
+        """Test the bundled migrations load in version order."""
+        migrations = load_migrations(DEFAULT_MIGRATIONS_DIR)
+
+        assert [m.version for m in migrations][:4] == ["001", "002", "003", "004"]
+        assert migrations[0].created_tables() == ["model_configs"]
+        assert len(migrations[2].statements()) == 7
+
+    def test_duplicate_version(self, tmp_path: Path) -> None:
+        """Test two files with the same version are rejected."""
+        _write(tmp_path, {"001_a.sql": "SELECT 1;", "001_b.sql": "SELECT 2;"})
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            load_migrations(tmp_path)
+
+
+class TestMigrationRunner:
+    """Test cases for MigrationRunner."""
+
+    async def test_migrate_records_versions(self, engine, tmp_path: Path) -> None:
+        """Test pending migrations apply once in order."""
+        runner = MigrationRunner(engine, _write(tmp_path, _FILES))
+
+        first = await runner.migrate()
+        second = await runner.migrate()
+        status = await runner.status()
+
+        assert [m.version for m in first] == ["001", "002"]
+        assert second == []
+        assert all(applied for _, applied in status)
+
+    async def test_failed_migration_stays_pending(
+        self, engine, tmp_path: Path
+    ) -> None:
+        """Test a failing file is not recorded and later files do not run."""
+        files = dict(_FILES)
+        files["002_add_items_index.sql"] = "ALTER TABLE missing ADD COLUMN x INTEGER;"
+        files["003_later.sql"] = "CREATE TABLE later (id INTEGER);"
+        runner = MigrationRunner(engine, _write(tmp_path, files))
+
+        with pytest.raises(MigrationError, match="002_add_items_index.sql"):
+            await runner.migrate()
+
+        status = {m.version: applied for m, applied in await runner.status()}
+        assert status == {"001": True, "002": False, "003": False}
+
+    async def test_untracked_tables_require_baseline(
+        self, engine, tmp_path: Path
+    ) -> None:
+        """Test a hand-created schema must be baselined before migrating."""
+        directory = _write(tmp_path, _FILES)
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(
+                "CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR(50))"
+            )
+        runner = MigrationRunner(engine, directory)
+
+        with pytest.raises(MigrationError, match="baseline"):
+            await runner.migrate()
+
+        recorded = await runner.baseline("001")
+        applied = await runner.migrate()
+
+        assert [m.version for m in recorded] == ["001"]
+        assert [m.version for m in applied] == ["002"]
+
+
+class TestVerifySchema:
+    """Test cases for verify_schema."""
+
+    async def test_reports_missing_index(self, engine, tmp_path: Path) -> None:
+        """Test missing columns and indexes are reported by name."""
+        metadata = MetaData()
+        Table(
+            "items",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("name", String(50)),
+            Column("price", Integer),
+            Index("idx_items_name", "name"),
+            Index("idx_items_price", "price"),
+        )
+        await MigrationRunner(engine, _write(tmp_path, _FILES)).migrate()
+
+        problems = await verify_schema(engine, metadata)
+
+        assert problems == ["missing index items.idx_items_price"]
+
+
+class TestPrepareDatabase:
+    """Test cases for prepare_database."""
+
+    async def test_verifies_schema_after_failed_migration(self) -> None:
+        """Test the schema is still checked when migrating fails."""
+        service = Mock()
+        with (
+            patch(
+                "one_dragon_alpha.services.mysql.connection_service.get_mysql_connection_service",
+                return_value=service,
+            ),
+            patch.object(
+                MigrationRunner,
+                "migrate",
+                AsyncMock(side_effect=MigrationError("003 failed")),
+            ),
+            patch(
+                "one_dragon_alpha.services.mysql.migration.verify_schema",
+                AsyncMock(return_value=["missing table items"]),
+            ) as verify,
+        ):
+            problems = await prepare_database(auto_migrate=True)
+
+        verify.assert_awaited_once()
+        assert problems == ["003 failed", "missing table items"]
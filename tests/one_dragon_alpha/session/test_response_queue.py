@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""会话响应队列测试.
+
+验证有界队列对累加式消息块的合并、满队列时的背压策略，
+以及消费端提前退出时 Session 会取消 Agent 任务。
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import Any
+
+import pytest
+from agentscope.message import Msg
+
+from one_dragon_alpha.session.response_queue import CoalescingResponseQueue
+from one_dragon_alpha.session.session import Session
+from one_dragon_alpha.session.session_message import SessionMessage
+
+
+def _chunk(msg: Msg, last: bool = False) -> SessionMessage:
+    """创建消息块."""
+    return SessionMessage(msg, last, False)
+
+
+class FakeAgent:
+    """持续输出累加式消息块的假 Agent."""
+
+    def __init__(self, chunks: int, delay: float = 0.0) -> None:
+        """初始化假 Agent.
+
+        Args:
+            chunks: 每条消息的更新次数
+            delay: 每次更新之间的等待时间（秒）
+        """
+        self.id = "fake_agent"
+        self.cancelled = False
+        self._chunks = chunks
+        self._delay = delay
+        self._hook = None
+
+    def register_instance_hook(self, hook_type: str, hook_name: str, hook) -> None:
+        """注册 pre_print hook."""
+        self._hook = hook
+
+    async def __call__(self, msg: Msg) -> Msg:
+        """逐字输出用户消息，模拟流式回复."""
+        reply = Msg(name="assistant", content="", role="assistant")
+        try:
+            for i in range(self._chunks):
+                await asyncio.sleep(self._delay)
+                reply.content = f"{reply.content}{i % 10}"
+                await self._hook(self, {"msg": reply, "last": False})
+            await self._hook(self, {"msg": reply, "last": True})
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return reply
+
+
+class TestCoalescingResponseQueue:
+    """CoalescingResponseQueue 测试."""
+
+    async def test_updates_coalesced(self) -> None:
+        """测试同一消息未被消费的更新只保留最新的一块."""
+        queue = CoalescingResponseQueue(maxsize=4)
+        msg = Msg(name="assistant", content="a", role="assistant")
+
+        for _ in range(10):
+            await queue.put(_chunk(msg))
+        await queue.put(_chunk(msg, last=True))
+
+        assert queue.qsize() == 1
+        item = await queue.get()
+        assert item.message_completed
+        assert queue.stats.coalesced == 10
+        assert queue.stats.high_water_mark == 1
+
+    async def test_order_preserved_across_messages(self) -> None:
+        """测试合并后不同消息之间的顺序保持不变."""
+        queue = CoalescingResponseQueue(maxsize=4)
+        first = Msg(name="assistant", content="1", role="assistant")
+        second = Msg(name="assistant", content="2", role="assistant")
+
+        await queue.put(_chunk(first))
+        await queue.put(_chunk(second))
+        await queue.put(_chunk(first, last=True))
+        await queue.put(SessionMessage(None, False, True))
+
+        items = [await queue.get() for _ in range(3)]
+
+        assert [i.msg for i in items[:2]] == [first, second]
+        assert items[0].message_completed
+        assert items[2].response_completed
+
+    async def test_full_queue_drops_updates(self) -> None:
+        """测试队列满时丢弃新消息的更新块."""
+        queue = CoalescingResponseQueue(maxsize=2)
+        msgs = [Msg(name="assistant", content=str(i), role="assistant") for i in range(3)]
+
+        for msg in msgs:
+            await queue.put(_chunk(msg))
+
+        assert queue.qsize() == 2
+        assert queue.stats.dropped == 1
+
+    @pytest.mark.timeout(5)
+    async def test_full_queue_blocks_completed(self) -> None:
+        """测试队列满时完成块等待空间，消费后继续."""
+        queue = CoalescingResponseQueue(maxsize=1)
+        await queue.put(SessionMessage(None, False, False))
+
+        put_task = asyncio.create_task(queue.put(SessionMessage(None, False, True)))
+        await asyncio.sleep(0.01)
+        assert not put_task.done()
+
+        await queue.get()
+        await put_task
+        assert (await queue.get()).response_completed
+
+    @pytest.mark.timeout(5)
+    async def test_close_releases_producer(self) -> None:
+        """测试关闭队列后等待中的生产者被释放，后续写入被丢弃."""
+        queue = CoalescingResponseQueue(maxsize=1)
+        await queue.put(SessionMessage(None, False, False))
+        put_task = asyncio.create_task(queue.put(SessionMessage(None, False, True)))
+        await asyncio.sleep(0.01)
+
+        queue.close()
+        await put_task
+        await queue.put(SessionMessage(None, False, True))
+
+        assert queue.qsize() == 0
+        assert queue.stats.dropped == 3
+
+
+class TestSessionBackpressure:
+    """Session 背压与断开处理测试."""
+
+    @pytest.mark.timeout(10)
+    async def test_slow_consumer_bounded(self) -> None:
+        """测试消费缓慢时队列长度有界且最终内容完整."""
+        agent = FakeAgent(chunks=200)
+        session = Session("test_session", agent, memory=None, max_queue_size=4)
+
+        items = []
+        async for item in session.chat("hi"):
+            items.append(item)
+            await asyncio.sleep(0.001)
+
+        stats = session.response_queue.stats
+        assert items[-1].response_completed
+        assert items[-2].message_completed
+        assert len(items[-2].msg.content) == 200
+        assert stats.high_water_mark <= 4
+        assert stats.coalesced > 0
+
+    @pytest.mark.timeout(10)
+    async def test_consumer_exit_cancels_agent(self) -> None:
+        """测试消费端提前关闭生成器时取消 Agent 任务."""
+        agent = FakeAgent(chunks=1000, delay=0.01)
+        session = Session("test_session", agent, memory=None)
+
+        async with aclosing(session.chat("hi")) as stream:
+            async for _ in stream:
+                break
+
+        await asyncio.sleep(0.05)
+
+        assert agent.cancelled
+        assert session.response_queue.closed
+
+    @pytest.mark.timeout(10)
+    async def test_next_turn_after_cancel(self) -> None:
+        """测试被取消的轮次不会影响下一轮的响应流."""
+        agent = FakeAgent(chunks=5, delay=0.01)
+        session = Session("test_session", agent, memory=None)
+
+        async with aclosing(session.chat("first")) as stream:
+            async for _ in stream:
+                break
+
+        items = [item async for item in session.chat("second")]
+
+        assert items[-1].response_completed
+        assert sum(item.response_completed for item in items) == 1
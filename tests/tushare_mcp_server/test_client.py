@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""AsyncTushareClient 测试.
+
+使用本地 HTTP 服务回放录制的 Tushare Pro 响应，验证请求协议、DataFrame 解析、
+错误处理、连接复用和相同并发请求的合并。
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from one_dragon_agent.core.system.metrics import get_metrics_registry
+from tushare_mcp_server import main
+from tushare_mcp_server.client import (
+    AsyncTushareClient,
+    TushareError,
+    close_tushare_client,
+)
+
+_RECORDINGS = Path(__file__).parent / "recordings"
+
+
+class ReplayServer:
+    """按接口名回放 recordings 目录下录制响应的 keep-alive HTTP 服务."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """初始化服务.
+
+        Args:
+            delay: 每个响应前的等待时间（秒），模拟慢接口
+        """
+        self.delay = delay
+        self.requests: list[dict] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        """服务地址."""
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/dataapi"
+
+    async def __aenter__(self) -> "ReplayServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """在一个连接上依次处理多个请求."""
+        self.connections += 1
+        try:
+            while True:
+                header = await reader.readuntil(b"\r\n\r\n")
+                request_line, *lines = header.decode().split("\r\n")
+                length = 0
+                for line in lines:
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = json.loads(await reader.readexactly(length))
+                body["path"] = request_line.split()[1]
+                self.requests.append(body)
+                await asyncio.sleep(self.delay)
+
+                recording = _RECORDINGS / f"{body['api_name']}.json"
+                if recording.exists():
+                    status, payload = "200 OK", recording.read_bytes()
+                else:
+                    status, payload = "404 Not Found", b"{}"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def test_query_returns_dataframe() -> None:
+    """按 DataApi 协议发送请求并解析为 DataFrame."""
+    async with (
+        ReplayServer() as server,
+        AsyncTushareClient(token="test-token", base_url=server.base_url) as client,
+    ):
+        df = await client.income(
+            ts_code="300059.SZ",
+            report_type="1",
+            fields=["ts_code", "ann_date", "end_date", "revenue", "n_income_attr_p"],
+        )
+
+    assert list(df.columns) == [
+        "ts_code",
+        "ann_date",
+        "end_date",
+        "revenue",
+        "n_income_attr_p",
+    ]
+    assert len(df) == 2
+    assert df.iloc[0]["n_income_attr_p"] == 1826000000.0
+    assert server.requests == [
+        {
+            "api_name": "income",
+            "token": "test-token",
+            "params": {"ts_code": "300059.SZ", "report_type": "1"},
+            "fields": "ts_code,ann_date,end_date,revenue,n_income_attr_p",
+            "path": "/dataapi/income",
+        }
+    ]
+
+
+async def test_error_code_raises() -> None:
+    """接口返回非 0 错误码时抛出 TushareError."""
+    async with (
+        ReplayServer() as server,
+        AsyncTushareClient(token="test-token", base_url=server.base_url) as client,
+    ):
+        with pytest.raises(TushareError) as exc_info:
+            await client.daily(ts_code="300059.SZ")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.unknown_api()
+
+    assert exc_info.value.code == 40203
+    assert exc_info.value.api_name == "daily"
+
+
+async def test_connections_reused() -> None:
+    """并发和连续的请求复用连接池中的连接."""
+    async with (
+        ReplayServer() as server,
+        AsyncTushareClient(
+            token="test-token", base_url=server.base_url, max_connections=2
+        ) as client,
+    ):
+        results = await asyncio.gather(
+            *[
+                client.stock_basic(fields="ts_code,name", offset=i * 100)
+                for i in range(10)
+            ]
+        )
+        await client.stock_basic(fields="ts_code,name")
+
+    assert all(len(df) == 4 for df in results)
+    assert len(server.requests) == 11
+    assert server.connections <= 2
+
+
+async def test_stock_basic_by_name_like(monkeypatch) -> None:
+    """MCP 工具通过全局客户端查询并按名称模糊匹配."""
+    async with ReplayServer() as server:
+        monkeypatch.setenv("TUSHARE_API_URL", server.base_url)
+        try:
+            records = await main.stock_basic_by_name_like("东财")
+        finally:
+            await close_tushare_client()
+
+    assert records == [{"ts_code": "300059.SZ", "股票名称": "东方财富"}]
+
+
+def _counter(name: str, api_name: str) -> float:
+    """读取 Tushare 计数器的当前值."""
+    family = get_metrics_registry().counter(name, "", ("api_name",))
+    return family.labels(api_name).value
+
+
+async def test_concurrent_identical_calls_coalesced() -> None:
+    """相同的并发调用共享一次上游请求，各自得到独立的 DataFrame."""
+    coalesced_before = _counter("oda_tushare_coalesced_total", "income")
+    async with (
+        ReplayServer(delay=0.2) as server,
+        AsyncTushareClient(token="test-token", base_url=server.base_url) as client,
+    ):
+        results = await asyncio.gather(
+            client.income(ts_code="300059.SZ", report_type="1", period=None),
+            client.income(report_type="1", ts_code="300059.SZ"),
+            client.income(ts_code="300059.SZ", report_type="1"),
+            client.income(ts_code="600030.SH", report_type="1"),
+        )
+
+        # 请求结束后不再合并
+        await client.income(ts_code="300059.SZ", report_type="1")
+
+    assert len(server.requests) == 3
+    assert _counter("oda_tushare_coalesced_total", "income") - coalesced_before == 2
+    assert results[0] is not results[1]
+    results[0]["name"] = "东方财富"
+    assert "name" not in results[1].columns
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request() -> None:
+    """一个调用方取消时，其他调用方仍得到合并请求的结果."""
+    async with (
+        ReplayServer(delay=0.2) as server,
+        AsyncTushareClient(token="test-token", base_url=server.base_url) as client,
+    ):
+        first = asyncio.create_task(client.stock_basic(fields="ts_code,name"))
+        second = asyncio.create_task(client.stock_basic(fields="ts_code, name"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+
+        df = await second
+
+    assert first.cancelled()
+    assert len(df) == 4
+    assert len(server.requests) == 1
+
+
+async def test_mcp_income_coalesced(monkeypatch) -> None:
+    """多个会话同时查询同一公司的利润表时只发起一次上游请求."""
+    async with ReplayServer(delay=0.2) as server:
+        monkeypatch.setenv("TUSHARE_API_URL", server.base_url)
+        try:
+            results = await asyncio.gather(
+                *[main.income(ts_code="300059.SZ", report_type="1") for _ in range(5)]
+            )
+        finally:
+            await close_tushare_client()
+
+    assert len(server.requests) == 1
+    assert all(records == results[0] for records in results)
+    assert results[0][0]["净利润(不含少数股东损益)"] == 1826000000.0
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""FinancialDataStore 测试.
+
+验证按公告日期的增量同步、翻页、同步进度、Parquet 快照导出，以及 MCP 工具从快照查询。
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from oda_data import FinancialDataReader, close_reader
+from tushare_mcp_server import main, store as store_module
+from tushare_mcp_server.store import (
+    INCOME_FIELDS,
+    FinancialDataStore,
+    sync_income,
+    sync_stock_basic,
+)
+
+
+def _income_row(ts_code: str, ann_date: str, end_date: str, report_type: str) -> dict:
+    """构造一行利润表."""
+    return {
+        "ts_code": ts_code,
+        "ann_date": ann_date,
+        "f_ann_date": ann_date,
+        "end_date": end_date,
+        "report_type": report_type,
+        "comp_type": "1",
+        "update_flag": "1",
+        "revenue": 1000.0,
+        "n_income_attr_p": 100.0 if report_type == "1" else 40.0,
+    }
+
+
+class FakeTushareClient:
+    """按公告日期返回固定利润表并记录请求的假客户端."""
+
+    def __init__(self, rows: list[dict]) -> None:
+        """初始化假客户端.
+
+        Args:
+            rows: 全部利润表行
+        """
+        self._rows = rows
+        self.income_requests: list[tuple[str, str, int]] = []
+
+    async def stock_basic(self, list_status: str, fields: list[str]) -> pd.DataFrame:
+        """返回股票列表."""
+        if list_status != "L":
+            return pd.DataFrame(columns=fields)
+        return pd.DataFrame(
+            [
+                {"ts_code": "300059.SZ", "name": "东方财富", "list_status": "L"},
+                {"ts_code": "600030.SH", "name": "中信证券", "list_status": "L"},
+            ]
+        )
+
+    async def income_vip(
+        self,
+        ann_date: str,
+        report_type: str,
+        fields: list[str],
+        limit: int,
+        offset: int,
+    ) -> pd.DataFrame:
+        """返回某天公告的利润表的一页."""
+        self.income_requests.append((ann_date, report_type, offset))
+        rows = [
+            row
+            for row in self._rows
+            if row["ann_date"] == ann_date and row["report_type"] == report_type
+        ]
+        return pd.DataFrame(rows[offset : offset + limit], columns=fields)
+
+
+@pytest.fixture
+def store():
+    """创建内存数据仓库."""
+    store = FinancialDataStore(":memory:")
+    yield store
+    store.close()
+
+
+def _export(store: FinancialDataStore, directory) -> FinancialDataReader:
+    """导出快照并创建读取器."""
+    store.export_parquet(directory)
+    return FinancialDataReader(directory)
+
+
+async def test_sync_income_incremental(store: FinancialDataStore, tmp_path) -> None:
+    """首次从起始日期同步，之后从上次同步的公告日期开始拉取."""
+    client = FakeTushareClient(
+        [
+            _income_row("300059.SZ", "20250418", "20250331", "1"),
+            _income_row("300059.SZ", "20250418", "20250331", "2"),
+            _income_row("600030.SH", "20250419", "20250331", "1"),
+        ]
+    )
+
+    rows = await sync_income(store, client, "20250417", "20250418")
+    assert rows == 2
+    assert store.get_sync_state("income_ann_date") == "20250418"
+    assert {request[0] for request in client.income_requests} == {
+        "20250417",
+        "20250418",
+    }
+
+    client.income_requests.clear()
+    rows = await sync_income(store, client, end_date="20250420")
+    assert rows == 3
+    assert {request[0] for request in client.income_requests} == {
+        "20250418",
+        "20250419",
+        "20250420",
+    }
+
+    # 重复同步同一天不会产生重复行
+    store.upsert_income(
+        pd.DataFrame([_income_row("600030.SH", "20250419", "20250331", "1")]),
+        "20250420",
+    )
+    reader = _export(store, tmp_path)
+    df = reader.income("600030.SH")
+    reader.close()
+    assert len(df) == 1
+    assert list(df.columns) == INCOME_FIELDS
+
+
+async def test_sync_same_day_twice(store: FinancialDataStore, tmp_path) -> None:
+    """同一天同步两次，第二次拉取到当天之后发布的公告，已有的行不重复."""
+    rows = [_income_row("300059.SZ", "20250418", "20250331", "1")]
+    client = FakeTushareClient(rows)
+    await sync_income(store, client, "20250418", "20250418")
+
+    rows.append(_income_row("600030.SH", "20250418", "20250331", "1"))
+    await sync_income(store, client, end_date="20250418")
+
+    assert store.get_sync_state("income_ann_date") == "20250418"
+    reader = _export(store, tmp_path)
+    counts = [len(reader.income(code)) for code in ("300059.SZ", "600030.SH")]
+    reader.close()
+    assert counts == [1, 1]
+
+
+async def test_sync_income_pages(store: FinancialDataStore, monkeypatch) -> None:
+    """单页行数达到上限时翻页拉取."""
+    monkeypatch.setattr(store_module, "_PAGE_SIZE", 2)
+    client = FakeTushareClient(
+        [
+            _income_row(f"60000{i}.SH", "20250418", "20250331", "1")
+            for i in range(5)
+        ]
+    )
+
+    assert await sync_income(store, client, "20250418", "20250418") == 5
+    offsets = [r[2] for r in client.income_requests if r[1] == "1"]
+    assert offsets == [0, 2, 4]
+
+
+async def test_income_filters(store: FinancialDataStore, tmp_path) -> None:
+    """按报告类型、公告日期和报告期过滤，按公告日期倒序返回."""
+    store.upsert_income(
+        pd.DataFrame(
+            [
+                _income_row("300059.SZ", "20241015", "20240930", "1"),
+                _income_row("300059.SZ", "20250418", "20250331", "1"),
+                _income_row("300059.SZ", "20250418", "20250331", "2"),
+            ]
+        ),
+        "20250418",
+    )
+    reader = _export(store, tmp_path)
+
+    df = reader.income("300059.SZ", report_type="1")
+    assert list(df["end_date"]) == ["20250331", "20240930"]
+    df = reader.income("300059.SZ", start_ann_date="20250101", period="20250331")
+    assert len(df) == 2
+    df = reader.income("300059.SZ", end_ann_date="20241231", fields=["end_date"])
+    assert list(df.columns) == ["end_date"]
+    with pytest.raises(ValueError):
+        reader.income("300059.SZ", fields=["revenue; DROP TABLE income"])
+    reader.close()
+
+
+async def test_export_replaces_snapshot(store: FinancialDataStore, tmp_path) -> None:
+    """重新导出后读取器读到新数据，导出不残留临时文件."""
+    reader = _export(store, tmp_path)
+    assert reader.has_income()
+    assert reader.income("300059.SZ").empty
+
+    store.upsert_income(
+        pd.DataFrame([_income_row("300059.SZ", "20250418", "20250331", "1")]),
+        "20250418",
+    )
+    store.export_parquet(tmp_path)
+
+    assert len(reader.income("300059.SZ")) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "income.parquet",
+        "stock_basic.parquet",
+    ]
+    reader.close()
+
+
+async def test_mcp_tools_use_snapshot(tmp_path, monkeypatch) -> None:
+    """快照存在时 MCP 工具从本地查询，不访问 Tushare，同步进程可同时持有数据库文件."""
+    local = FinancialDataStore(tmp_path / "tushare.duckdb")
+    await sync_stock_basic(local, FakeTushareClient([]))
+    local.upsert_income(
+        pd.DataFrame([_income_row("300059.SZ", "20250418", "20250331", "1")]),
+        "20250418",
+    )
+    local.export_parquet(tmp_path / "parquet")
+
+    monkeypatch.setenv("TUSHARE_PARQUET_DIR", str(tmp_path / "parquet"))
+    monkeypatch.setattr(main, "get_tushare_client", None)
+    try:
+        stocks = await main.stock_basic_by_name_like("东财")
+        records = await main.income(ts_code="300059.SZ", report_type="1")
+    finally:
+        close_reader()
+        local.close()
+
+    assert stocks == [{"ts_code": "300059.SZ", "股票名称": "东方财富"}]
+    assert records[0]["报告期"] == "20250331"
+    assert records[0]["净利润(不含少数股东损益)"] == 100.0